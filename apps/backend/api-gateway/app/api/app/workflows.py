@@ -36,6 +36,7 @@ from app.models import (
     WorkflowResponse,
     WorkflowUpdate,
 )
+from app.services.workflow_cache import get_workflow_cache
 from app.services.workflow_engine_http_client import get_workflow_engine_client
 from app.services.workflow_scheduler_http_client import get_workflow_scheduler_client
 
@@ -49,10 +50,6 @@ from pydantic import BaseModel
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Workflow validation and data cache
-WORKFLOW_CACHE = {}
-CACHE_TTL = 300  # 5 minutes TTL for workflow data
-
 PLACEHOLDER_VALUE = "{{$placeholder}}"
 
 TOKEN_FIELD_KEYWORDS: Tuple[str, ...] = (
@@ -87,7 +84,8 @@ def _build_external_node_requirements() -> Dict[Tuple[str, str], Dict[str, Any]]
         return requirements
 
     try:
-        specs = node_spec_registry.list_all_specs()
+        # Snapshot summaries carry the configuration schema without importing spec modules
+        specs = node_spec_registry.list_spec_summaries()
     except Exception as exc:  # pragma: no cover - registry failures
         logger.warning(f"⚠️ Failed to load node specs for configuration status: {exc}")
         return requirements
@@ -200,33 +198,46 @@ class WorkflowDetailResponseModel(BaseModel):
     message: Optional[str] = None
 
 
-def _get_cached_workflow(workflow_id: str, user_id: str):
-    """Get cached workflow data if available and not expired"""
-    cache_key = f"{workflow_id}_{user_id}"
-    if cache_key in WORKFLOW_CACHE:
-        cached_data, timestamp = WORKFLOW_CACHE[cache_key]
-        if time.time() - timestamp < CACHE_TTL:
-            logger.info(f"📋 Using cached workflow data for {workflow_id}")
-            return cached_data
-        else:
-            # Remove expired cache entry
-            del WORKFLOW_CACHE[cache_key]
-    return None
+async def _clear_workflow_cache(workflow_id: Optional[str], user_id: str):
+    """Clear cached workflow data and the user's listings on every replica"""
+    await get_workflow_cache().invalidate(workflow_id, user_id)
+    logger.info(f"📋 Cleared cached workflow data for {workflow_id}")
+
 
+# Execution/deployment states that will change without any gateway request
+_TRANSIENT_STATUSES = frozenset(
+    {"NEW", "PENDING", "RUNNING", "PAUSED", "WAITING", "WAITING_FOR_HUMAN", "DEPLOYING"}
+)
+_STATUS_FIELDS = (
+    "deployment_status",
+    "latest_execution_status",
+    "last_execution_status",
+)
 
-def _cache_workflow(workflow_id: str, user_id: str, workflow_data: dict):
-    """Cache workflow data for future use"""
-    cache_key = f"{workflow_id}_{user_id}"
-    WORKFLOW_CACHE[cache_key] = (workflow_data, time.time())
-    logger.info(f"📋 Cached workflow data for {workflow_id}")
 
+def _has_transient_status(workflow: Any) -> bool:
+    """Whether a workflow payload shows a run or deployment still in progress"""
+    if not isinstance(workflow, dict):
+        return False
+    for record in (workflow, workflow.get("metadata")):
+        if isinstance(record, dict):
+            for field in _STATUS_FIELDS:
+                status = record.get(field)
+                if isinstance(status, str) and status.upper() in _TRANSIENT_STATUSES:
+                    return True
+    return False
 
-def _clear_workflow_cache(workflow_id: str, user_id: str):
-    """Clear cached workflow data when workflow is modified"""
-    cache_key = f"{workflow_id}_{user_id}"
-    if cache_key in WORKFLOW_CACHE:
-        del WORKFLOW_CACHE[cache_key]
-        logger.info(f"📋 Cleared cached workflow data for {workflow_id}")
+
+def _cacheable_workflow(result: Any) -> bool:
+    # A workflow mid-run or mid-deploy is re-read until it settles, so its cached
+    # copy never outlives the status change made by the engine or scheduler
+    return result is not None and not _has_transient_status(result.get("workflow"))
+
+
+def _cacheable_listing(page: Any) -> bool:
+    # The client reports engine errors as an empty page; never cache those
+    workflows = page.get("workflows")
+    return bool(workflows) and not any(_has_transient_status(w) for w in workflows)
 
 
 def _normalize_provider_key(
@@ -888,6 +899,9 @@ async def create_workflow(request: WorkflowCreate, deps: AuthenticatedDeps = Dep
 
         logger.info(f"✅ Workflow created: {workflow_data['id']}")
 
+        # New workflow appears in the user's listings
+        await _clear_workflow_cache(workflow_data["id"], deps.current_user.sub)
+
         # Return result from workflow engine v2 as-is using JSONResponse to bypass validation
         return JSONResponse(content=result)
 
@@ -1123,119 +1137,126 @@ async def _inject_credentials_into_configurations(
     return workflow_data, credentials_changed
 
 
-@router.get("/{workflow_id}")
-async def get_workflow(workflow_id: str, deps: AuthenticatedDeps = Depends()):
-    """
-    Get a workflow with user access control and OAuth credential injection.
-    Only updates database when credentials have changed.
-    通过ID获取工作流（支持用户访问控制和OAuth凭证注入，仅在凭证变更时更新数据库）
-    """
-    try:
-        logger.info(f"🔍 Getting workflow {workflow_id} using RLS with JWT token")
+async def _fetch_normalized_workflow(http_client, workflow_id: str, access_token: str):
+    """Fetch a workflow from the engine and normalize its payload (cache loader)"""
+    result = await http_client.get_workflow(workflow_id, access_token)
 
-        # Get HTTP client
-        settings = get_settings()
-        http_client = await get_workflow_engine_client()
+    # Debug logging to diagnose the issue
+    try:
+        logger.info(
+            f"🐛 DEBUG: Result type: {type(result)}, Result keys: {result.keys() if isinstance(result, dict) else 'N/A'}"
+        )
+    except Exception:
+        pass
 
-        # Get workflow via HTTP with JWT token for RLS
-        result = await http_client.get_workflow(workflow_id, deps.access_token)
+    # Normalize possibly stringified JSON from the engine/gateway boundary
+    if isinstance(result, str):
+        import json
 
-        # Debug logging to diagnose the issue
+        logger.warning("⚠️ Result is a string, attempting to parse as JSON")
         try:
-            logger.info(
-                f"🐛 DEBUG: Result type: {type(result)}, Result keys: {result.keys() if isinstance(result, dict) else 'N/A'}"
-            )
+            result = json.loads(result)
         except Exception:
-            pass
-
-        # Normalize possibly stringified JSON from the engine/gateway boundary
-        if isinstance(result, str):
-            import json
-
-            logger.warning("⚠️ Result is a string, attempting to parse as JSON")
-            try:
-                result = json.loads(result)
-            except Exception:
-                logger.error("❌ Failed to parse engine result JSON string")
-                raise HTTPException(
-                    status_code=500, detail="Invalid response format from workflow engine"
-                )
-
-        if not isinstance(result, dict):
-            logger.error(f"❌ Result is not a dict: {type(result)}")
+            logger.error("❌ Failed to parse engine result JSON string")
             raise HTTPException(
                 status_code=500, detail="Invalid response format from workflow engine"
             )
 
-        if not result.get("found", False) or not result.get("workflow"):
-            raise NotFoundError("Workflow")
+    if not isinstance(result, dict):
+        logger.error(f"❌ Result is not a dict: {type(result)}")
+        raise HTTPException(status_code=500, detail="Invalid response format from workflow engine")
 
-        # Normalize workflow payload shapes to avoid treating strings like dicts
-        workflow_data = result["workflow"]
-        import json as _json
+    if not result.get("found", False) or not result.get("workflow"):
+        raise NotFoundError("Workflow")
 
-        # Some backends may double-encode the workflow payload
-        if isinstance(workflow_data, str):
-            try:
-                workflow_data = _json.loads(workflow_data)
-            except Exception:
-                logger.error("❌ Workflow payload is a string but not valid JSON; rejecting")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Invalid workflow payload format from workflow engine",
-                )
+    # Normalize workflow payload shapes to avoid treating strings like dicts
+    workflow_data = result["workflow"]
+    import json as _json
+
+    # Some backends may double-encode the workflow payload
+    if isinstance(workflow_data, str):
+        try:
+            workflow_data = _json.loads(workflow_data)
+        except Exception:
+            logger.error("❌ Workflow payload is a string but not valid JSON; rejecting")
+            raise HTTPException(
+                status_code=500,
+                detail="Invalid workflow payload format from workflow engine",
+            )
 
-        # Ensure nodes list is in a normalized structure
-        nodes = []
-        raw_nodes = None
-        if isinstance(workflow_data, dict):
-            raw_nodes = workflow_data.get("nodes")
-            if raw_nodes is None and isinstance(workflow_data.get("workflow_data"), dict):
-                raw_nodes = workflow_data["workflow_data"].get("nodes")
+    # Ensure nodes list is in a normalized structure
+    nodes = []
+    raw_nodes = None
+    if isinstance(workflow_data, dict):
+        raw_nodes = workflow_data.get("nodes")
+        if raw_nodes is None and isinstance(workflow_data.get("workflow_data"), dict):
+            raw_nodes = workflow_data["workflow_data"].get("nodes")
 
-        # If nodes were delivered as a JSON string, parse them
-        if isinstance(raw_nodes, str):
-            try:
-                raw_nodes = _json.loads(raw_nodes)
-            except Exception:
-                logger.warning("⚠️ Nodes are string but not JSON; defaulting to empty list")
-                raw_nodes = []
-
-        if isinstance(raw_nodes, list):
-            for nd in raw_nodes:
-                # Coerce node to dict
-                if isinstance(nd, str):
-                    try:
-                        nd = _json.loads(nd)
-                    except Exception:
-                        # Skip malformed node
-                        continue
-
-                if not isinstance(nd, dict):
+    # If nodes were delivered as a JSON string, parse them
+    if isinstance(raw_nodes, str):
+        try:
+            raw_nodes = _json.loads(raw_nodes)
+        except Exception:
+            logger.warning("⚠️ Nodes are string but not JSON; defaulting to empty list")
+            raw_nodes = []
+
+    if isinstance(raw_nodes, list):
+        for nd in raw_nodes:
+            # Coerce node to dict
+            if isinstance(nd, str):
+                try:
+                    nd = _json.loads(nd)
+                except Exception:
+                    # Skip malformed node
                     continue
 
-                # Ensure configurations is a dict (not a string)
-                cfg = nd.get("configurations")
-                if isinstance(cfg, str):
-                    try:
-                        nd["configurations"] = _json.loads(cfg)
-                    except Exception:
-                        nd["configurations"] = {}
-                elif cfg is None:
+            if not isinstance(nd, dict):
+                continue
+
+            # Ensure configurations is a dict (not a string)
+            cfg = nd.get("configurations")
+            if isinstance(cfg, str):
+                try:
+                    nd["configurations"] = _json.loads(cfg)
+                except Exception:
                     nd["configurations"] = {}
+            elif cfg is None:
+                nd["configurations"] = {}
 
-                nodes.append(nd)
+            nodes.append(nd)
 
-            # Write normalized nodes back
-            if "nodes" in workflow_data:
-                workflow_data["nodes"] = nodes
-            elif "workflow_data" in workflow_data and isinstance(
-                workflow_data["workflow_data"], dict
-            ):
-                workflow_data["workflow_data"]["nodes"] = nodes
+        # Write normalized nodes back
+        if "nodes" in workflow_data:
+            workflow_data["nodes"] = nodes
+        elif "workflow_data" in workflow_data and isinstance(workflow_data["workflow_data"], dict):
+            workflow_data["workflow_data"]["nodes"] = nodes
+
+    # Store normalized workflow back into result for downstream flow
+    result["workflow"] = workflow_data
+    return result
 
-        # Store normalized workflow back into result for downstream flow
-        result["workflow"] = workflow_data
+
+@router.get("/{workflow_id}")
+async def get_workflow(workflow_id: str, deps: AuthenticatedDeps = Depends()):
+    """
+    Get a workflow with user access control and OAuth credential injection.
+    Only updates database when credentials have changed.
+    通过ID获取工作流（支持用户访问控制和OAuth凭证注入，仅在凭证变更时更新数据库）
+    """
+    try:
+        logger.info(f"🔍 Getting workflow {workflow_id} using RLS with JWT token")
+
+        # Get HTTP client
+        settings = get_settings()
+        http_client = await get_workflow_engine_client()
+
+        # Get workflow via HTTP with JWT token for RLS (cached per user, single-flight)
+        workflow_cache = get_workflow_cache()
+        result = await workflow_cache.get_or_load(
+            workflow_cache.workflow_key(workflow_id, deps.current_user.sub),
+            lambda: _fetch_normalized_workflow(http_client, workflow_id, deps.access_token),
+            cacheable=_cacheable_workflow,
+        )
 
         logger.info(f"✅ Workflow retrieved: {workflow_id}")
 
@@ -1280,7 +1301,7 @@ async def get_workflow(workflow_id: str, deps: AuthenticatedDeps = Depends()):
                 logger.info(f"✅ Workflow {workflow_id} updated with fresh OAuth credentials")
 
                 # Clear cache since workflow was updated
-                _clear_workflow_cache(workflow_id, deps.current_user.sub)
+                await _clear_workflow_cache(workflow_id, deps.current_user.sub)
 
                 # Refetch to get updated version
                 result = await http_client.get_workflow(workflow_id, deps.access_token)
@@ -1368,7 +1389,7 @@ async def update_workflow(
         workflow = Workflow(**result["workflow"])
 
         # Clear cache since workflow was updated
-        _clear_workflow_cache(workflow_id, deps.current_user.sub)
+        await _clear_workflow_cache(workflow_id, deps.current_user.sub)
 
         logger.info(f"✅ Workflow updated: {workflow_id}")
 
@@ -1404,7 +1425,7 @@ async def delete_workflow(workflow_id: str, deps: AuthenticatedDeps = Depends())
             raise HTTPException(status_code=500, detail="Failed to delete workflow")
 
         # Clear cache since workflow was deleted
-        _clear_workflow_cache(workflow_id, deps.current_user.sub)
+        await _clear_workflow_cache(workflow_id, deps.current_user.sub)
 
         logger.info(f"✅ Workflow deleted: {workflow_id}")
 
@@ -1440,13 +1461,19 @@ async def list_workflows(
         # Parse tags
         tag_list = tags.split(",") if tags else None
 
-        # List workflows via HTTP using JWT token for RLS
-        result = await http_client.list_workflows(
-            access_token=deps.access_token,  # Pass JWT token for RLS
-            active_only=active_only,
-            tags=tag_list,
-            limit=limit,
-            offset=offset,
+        # List workflows via HTTP using JWT token for RLS (pages cached per user version)
+        workflow_cache = get_workflow_cache()
+        result = await workflow_cache.get_or_load(
+            workflow_cache.listing_key(deps.current_user.sub, active_only, tags, limit, offset),
+            lambda: http_client.list_workflows(
+                access_token=deps.access_token,  # Pass JWT token for RLS
+                active_only=active_only,
+                tags=tag_list,
+                limit=limit,
+                offset=offset,
+            ),
+            ttl=workflow_cache.list_ttl,
+            cacheable=_cacheable_listing,
         )
 
         # Convert workflows to lightweight summaries with logo_url
@@ -1569,6 +1596,8 @@ async def execute_workflow(
             )
         else:
             logger.info(f"✅ Workflow execution started: {execution_id}")
+            # The latest execution status is part of the cached workflow and listings
+            await _clear_workflow_cache(workflow_id, deps.current_user.sub)
 
         return WorkflowExecutionResponse(
             execution_id=execution_id,
@@ -1684,6 +1713,7 @@ async def trigger_manual_workflow(
         logger.info(
             f"✅ Manual trigger successful: {workflow_id}, execution_id: {result.get('execution_id', 'N/A')}"
         )
+        await _clear_workflow_cache(workflow_id, deps.current_user.sub)
 
         # Return ExecutionResult
         return ExecutionResult(
@@ -1713,27 +1743,21 @@ async def deploy_workflow(
         logger.info(f"📦 Deploying workflow {workflow_id} for user {deps.current_user.sub}")
 
         # Check cache first to avoid redundant workflow fetches
-        cached_workflow = _get_cached_workflow(workflow_id, deps.current_user.sub)
-
-        if cached_workflow:
-            workflow_data = cached_workflow
-            logger.info(f"📋 Using cached workflow data for deployment: {workflow_id}")
-        else:
-            # Get the workflow from workflow engine
-            workflow_engine_client = await get_workflow_engine_client()
-            workflow_result = await workflow_engine_client.get_workflow(
-                workflow_id, deps.current_user.sub
+        workflow_engine_client = await get_workflow_engine_client()
+        workflow_cache = get_workflow_cache()
+        try:
+            workflow_result = await workflow_cache.get_or_load(
+                workflow_cache.workflow_key(workflow_id, deps.current_user.sub),
+                lambda: _fetch_normalized_workflow(
+                    workflow_engine_client, workflow_id, deps.access_token
+                ),
+                cacheable=_cacheable_workflow,
             )
+        except NotFoundError:
+            logger.error(f"❌ Error deploying workflow {workflow_id}: Workflow not found")
+            raise HTTPException(status_code=404, detail="Workflow not found")
 
-            # Check if workflow exists (workflow engine returns found:true/false and workflow data)
-            if not workflow_result.get("found", False) or not workflow_result.get("workflow"):
-                logger.error(f"❌ Error deploying workflow {workflow_id}: Workflow not found")
-                raise HTTPException(status_code=404, detail="Workflow not found")
-
-            workflow_data = workflow_result["workflow"]
-
-            # Cache the workflow data for future deployments
-            _cache_workflow(workflow_id, deps.current_user.sub, workflow_data)
+        workflow_data = workflow_result["workflow"]
 
         # Inject OAuth credentials into workflow nodes
         workflow_data_with_credentials = await _inject_oauth_credentials(
@@ -1762,7 +1786,7 @@ async def deploy_workflow(
                 logger.info(f"✅ Workflow {workflow_id} updated with OAuth credentials")
 
                 # Clear cache since workflow was updated
-                _clear_workflow_cache(workflow_id, deps.current_user.sub)
+                await _clear_workflow_cache(workflow_id, deps.current_user.sub)
 
         # Get workflow scheduler client
         scheduler_client = await get_workflow_scheduler_client()
@@ -1786,6 +1810,9 @@ async def deploy_workflow(
             f"deployment_id: {result.get('deployment_id', 'N/A')}"
         )
 
+        # Deployment status is part of the cached workflow and listings
+        await _clear_workflow_cache(workflow_id, deps.current_user.sub)
+
         # Return DeploymentResult
         return DeploymentResult(
             deployment_id=result.get("deployment_id", ""),
@@ -1830,6 +1857,9 @@ async def undeploy_workflow(
 
         logger.info(f"✅ Workflow undeployed successfully: {workflow_id}")
 
+        # Deployment status is part of the cached workflow and listings
+        await _clear_workflow_cache(workflow_id, deps.current_user.sub)
+
         return ResponseModel(success=True, message="Workflow undeployed successfully")
 
     except HTTPException:
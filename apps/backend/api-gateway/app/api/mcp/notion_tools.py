@@ -3,6 +3,7 @@ Streamlined Notion MCP API - Consolidated and simplified tools
 减少工具数量，提高易用性的精简版Notion MCP集成
 """
 
+import asyncio
 import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
@@ -18,6 +19,7 @@ from app.models import (
     MCPTool,
     MCPToolsResponse,
 )
+from app.services.notion_retrieval import BlockNode, NotionClientPool, NotionRetriever
 from app.utils.logger import get_logger
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
@@ -39,8 +41,15 @@ class NotionMCPService:
     """Streamlined MCP service for Notion operations with fewer, more powerful tools."""
 
     def __init__(self):
-        # No global client - create per-request with user's token
-        pass
+        # Clients are pooled per user token, each with its own 3 rps budget
+        self._clients = NotionClientPool(
+            lambda token, limiter: NotionClient(auth_token=token, rate_limiter=limiter)
+        )
+        self._retriever = NotionRetriever()
+
+    async def close(self) -> None:
+        """Close pooled Notion clients."""
+        await self._clients.close()
 
     def get_available_tools(self) -> MCPToolsResponse:
         """Get available streamlined Notion tools."""
@@ -367,9 +376,9 @@ class NotionMCPService:
             response._execution_time_ms = round((time.time() - start_time) * 1000, 2)
             return response
 
-        # Create client with user's token
+        # Reuse the pooled client for the user's token
         try:
-            client = NotionClient(auth_token=access_token)
+            client = await self._clients.get(access_token)
         except Exception as e:
             response = MCPInvokeResponse(
                 content=[
@@ -414,6 +423,7 @@ class NotionMCPService:
         except NotionAuthError as e:
             error_msg = f"Notion authentication failed: {str(e)}"
             logger.error(error_msg)
+            await self._clients.discard(access_token)
             response = MCPInvokeResponse(
                 content=[MCPContentItem(type="text", text=error_msg)],
                 isError=True,
@@ -439,10 +449,6 @@ class NotionMCPService:
                 content=[MCPContentItem(type="text", text=error_msg)],
                 isError=True,
             )
-        finally:
-            # Always close the client
-            if "client" in locals():
-                await client.close()
 
         response._tool_name = tool_name
         response._execution_time_ms = round((time.time() - start_time) * 1000, 2)
@@ -943,8 +949,6 @@ class NotionMCPService:
         content_format = params.get("content_format", "full")
         ai_format = params.get("ai_format", "structured")
 
-        documents = []
-
         # If search_query provided, find documents first
         if search_query and not page_ids:
             search_results = await client.search(query=search_query, page_size=max_documents)
@@ -955,17 +959,19 @@ class NotionMCPService:
             pages = [item for item in results if isinstance(item, NotionPage)]
             page_ids = [page.id for page in pages[:max_documents]]
 
-        # Retrieve each document
-        for page_id in page_ids:
+        # Retrieve documents concurrently; the per-token rate limiter paces requests
+        async def retrieve(page_id: str) -> Dict[str, Any]:
             try:
                 document = {
                     "page_id": page_id,
                     "retrieved_at": datetime.now(timezone.utc).isoformat(),
                 }
 
+                # The page's last_edited_time also keys the block tree cache
+                page = await client.get_page(page_id)
+
                 # Get page properties
                 if include_properties:
-                    page = await client.get_page(page_id)
                     document["properties"] = {
                         "title": self._extract_title(page),
                         "url": page.url,
@@ -1015,22 +1021,25 @@ class NotionMCPService:
 
                 # Get page content blocks
                 if include_blocks:
-                    blocks = await client.get_block_children(page_id)
-                    document["content"] = await self._format_blocks_content(
-                        client, blocks.results, content_format, include_children
+                    tree = await self._retriever.get_block_tree(
+                        client,
+                        page_id,
+                        last_edited_time=getattr(page, "last_edited_time", None),
+                        include_children=include_children,
                     )
+                    document["content"] = self._format_blocks_content(tree, content_format)
 
-                documents.append(document)
+                return document
 
             except Exception as e:
                 logger.error(f"Error retrieving document {page_id}: {e}")
-                documents.append(
-                    {
-                        "page_id": page_id,
-                        "error": str(e),
-                        "retrieved_at": datetime.now(timezone.utc).isoformat(),
-                    }
-                )
+                return {
+                    "page_id": page_id,
+                    "error": str(e),
+                    "retrieved_at": datetime.now(timezone.utc).isoformat(),
+                }
+
+        documents = list(await asyncio.gather(*(retrieve(page_id) for page_id in page_ids)))
 
         result = {
             "action": "retrieve_documents",
@@ -1055,83 +1064,92 @@ class NotionMCPService:
         else:
             return result
 
-    async def _format_blocks_content(
-        self, client: NotionClient, blocks: List, content_format: str, include_children: bool
+    def _format_blocks_content(
+        self, nodes: List[BlockNode], content_format: str
     ) -> List[Dict[str, Any]]:
-        """Format block content based on specified format."""
+        """Format a fetched block tree based on specified format."""
         formatted_blocks = []
 
-        for block in blocks:
+        for node in nodes:
+            block = node.block
+            block_type = getattr(block.type, "value", block.type)
             if content_format == "text_only":
-                # Extract only text content
+                # Extract only text content, children flattened in reading order
                 text_content = self._extract_text_from_block(block)
                 if text_content:
                     formatted_blocks.append({"type": "text", "content": text_content})
-            elif content_format == "structured":
+                formatted_blocks.extend(self._format_blocks_content(node.children, content_format))
+                continue
+
+            if content_format == "structured":
                 # Organized hierarchy
                 formatted_block = {
                     "id": block.id,
-                    "type": block.type,
+                    "type": block_type,
                     "content": self._extract_text_from_block(block),
                     "created_time": (
                         block.created_time.isoformat()
-                        if hasattr(block, "created_time") and block.created_time
+                        if getattr(block, "created_time", None)
                         else None
                     ),
                     "last_edited_time": (
                         block.last_edited_time.isoformat()
-                        if hasattr(block, "last_edited_time") and block.last_edited_time
+                        if getattr(block, "last_edited_time", None)
                         else None
                     ),
                 }
-                formatted_blocks.append(formatted_block)
             else:  # full format
                 # All block details
                 formatted_block = {
                     "id": block.id,
-                    "object": block.object,
-                    "type": block.type,
+                    "object": getattr(block, "object", "block"),
+                    "type": block_type,
                     "created_time": (
                         block.created_time.isoformat()
-                        if hasattr(block, "created_time") and block.created_time
+                        if getattr(block, "created_time", None)
                         else None
                     ),
                     "last_edited_time": (
                         block.last_edited_time.isoformat()
-                        if hasattr(block, "last_edited_time") and block.last_edited_time
+                        if getattr(block, "last_edited_time", None)
                         else None
                     ),
                     "created_by": (
                         getattr(block.created_by, "id", None)
-                        if hasattr(block, "created_by") and block.created_by
+                        if getattr(block, "created_by", None)
                         else None
                     ),
                     "last_edited_by": (
                         getattr(block.last_edited_by, "id", None)
-                        if hasattr(block, "last_edited_by") and block.last_edited_by
+                        if getattr(block, "last_edited_by", None)
                         else None
                     ),
-                    "has_children": block.has_children if hasattr(block, "has_children") else False,
-                    "archived": block.archived if hasattr(block, "archived") else False,
+                    "has_children": getattr(block, "has_children", False),
+                    "archived": getattr(block, "archived", False),
                     "content": self._extract_block_content(block),
                 }
-                formatted_blocks.append(formatted_block)
 
-            # Include children if requested
-            if include_children and hasattr(block, "has_children") and block.has_children:
-                try:
-                    children = await client.get_block_children(block.id)
-                    formatted_block["children"] = await self._format_blocks_content(
-                        client, children.results, content_format, include_children
-                    )
-                except Exception as e:
-                    logger.warning(f"Could not retrieve children for block {block.id}: {e}")
+            if node.children:
+                formatted_block["children"] = self._format_blocks_content(
+                    node.children, content_format
+                )
+            formatted_blocks.append(formatted_block)
 
         return formatted_blocks
 
     def _extract_text_from_block(self, block) -> str:
         """Extract plain text from a block."""
         try:
+            # SDK blocks keep the type-specific payload as a dict in .content
+            content = getattr(block, "content", None)
+            if isinstance(content, dict):
+                text = content.get("rich_text") or content.get("title") or []
+                if isinstance(text, str):
+                    return text
+                return "".join(
+                    item.get("plain_text", "") for item in text if isinstance(item, dict)
+                )
+
             block_type = block.type
             if hasattr(block, block_type):
                 block_data = getattr(block, block_type)
@@ -1146,6 +1164,10 @@ class NotionMCPService:
     def _extract_block_content(self, block) -> Dict[str, Any]:
         """Extract full block content."""
         try:
+            content = getattr(block, "content", None)
+            if isinstance(content, dict):
+                return content
+
             block_type = block.type
             if hasattr(block, block_type):
                 block_data = getattr(block, block_type)
@@ -1449,9 +1471,9 @@ class NotionMCPService:
         # Include content preview
         if include_content_preview and doc_object == "page":
             try:
-                blocks = await client.get_block_children(doc_id)
+                blocks = await client.get_block_children(doc_id, page_size=3)
                 preview_text = ""
-                for block in blocks.results[:3]:  # First 3 blocks
+                for block in blocks.get("blocks", [])[:3]:  # First 3 blocks
                     text = self._extract_text_from_block(block)
                     if text:
                         preview_text += text + " "
@@ -1468,8 +1490,8 @@ class NotionMCPService:
         if include_child_count:
             try:
                 if doc_object == "page":
-                    blocks = await client.get_block_children(doc_id)
-                    metadata["child_blocks_count"] = len(blocks.results)
+                    blocks = await self._retriever.fetch_children(client, doc_id)
+                    metadata["child_blocks_count"] = len(blocks)
                 elif doc_object == "database":
                     # For databases, count pages
                     db_results = await client.query_database(doc_id, page_size=1)
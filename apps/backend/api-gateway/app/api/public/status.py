@@ -62,6 +62,12 @@ async def get_system_status():
     except Exception as e:
         http_health = {"healthy": False, "error": str(e)}
 
+    # Workflow engine connection pool: reuse, latency and circuit breaker
+    from app.services.workflow_engine_http_client import get_workflow_engine_client
+
+    engine_client = await get_workflow_engine_client()
+    engine_stats = engine_client.get_stats()
+
     # Determine overall system health
     overall_healthy = db_health.get("overall", False) and http_health.get("healthy", False)
 
@@ -85,6 +91,12 @@ async def get_system_status():
             "status": "healthy" if http_health.get("healthy") else "unhealthy",
             "details": http_health,
         },
+        "workflow_engine_client": {
+            "status": (
+                "healthy" if engine_stats["circuit_breaker"]["state"] == "closed" else "degraded"
+            ),
+            "details": engine_stats,
+        },
         "redis": {
             "status": "healthy" if db_health.get("redis") else "unhealthy",
             "connection": db_health.get("details", {}).get("redis", "unknown"),
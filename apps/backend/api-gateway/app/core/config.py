@@ -50,6 +50,14 @@ class DatabaseSettings(BaseSettings):
     CACHE_TTL_RATE_LIMIT: int = Field(default=3600, description="限流计数器过期时间（秒）")
     CACHE_TTL_SESSION_STATE: int = Field(default=7200, description="会话状态缓存过期时间（秒）")
 
+    # Workflow definition / listing cache (per worker, invalidated via Redis pub/sub)
+    WORKFLOW_CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024, description="工作流缓存最大字节数")
+    WORKFLOW_CACHE_TTL: int = Field(default=300, description="工作流定义缓存过期时间（秒）")
+    WORKFLOW_LIST_CACHE_TTL: int = Field(default=30, description="工作流列表缓存过期时间（秒）")
+    WORKFLOW_CACHE_INVALIDATION_CHANNEL: str = Field(
+        default="workflow_cache:invalidate", description="工作流缓存失效广播频道"
+    )
+
 
 class AuthSettings(BaseSettings):
     """认证相关配置"""
@@ -61,6 +69,24 @@ class AuthSettings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=60, description="访问令牌过期时间（分钟）")
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7, description="刷新令牌过期时间（天）")
 
+    # Local Supabase JWT verification (avoids an Auth API round trip per new token)
+    JWT_LOCAL_VERIFICATION_ENABLED: bool = Field(default=True, description="启用本地JWT签名验证")
+    SUPABASE_JWT_SECRET: str = Field(
+        default_factory=lambda: os.getenv("SUPABASE_JWT_SECRET", ""),
+        description="Supabase JWT密钥（HS256签名令牌）",
+    )
+    JWT_JWKS_URL: Optional[str] = Field(
+        default=None, description="JWKS地址（默认 {SUPABASE_URL}/auth/v1/.well-known/jwks.json）"
+    )
+    JWT_JWKS_REFRESH_SECONDS: int = Field(default=600, description="JWKS后台刷新间隔（秒）")
+    JWT_AUDIENCE: str = Field(default="authenticated", description="JWT audience")
+    JWT_L1_CACHE_SIZE: int = Field(default=10000, description="进程内已验证令牌缓存大小")
+    JWT_REMOTE_VERIFY_PATHS: List[str] = Field(
+        # Integrations read, connect and revoke third-party OAuth credentials
+        default=["/api/v1/app/integrations"],
+        description="需要远程校验（撤销敏感）的路径前缀",
+    )
+
     # Authentication Toggle
     ENABLE_AUTH: bool = Field(default=True, description="启用认证（测试时可设为False）")
     SUPABASE_AUTH_ENABLED: bool = Field(default=True, description="启用Supabase认证")
@@ -121,6 +147,19 @@ class ServiceSettings(BaseSettings):
     # Note: Workflow Engine V2 is the only version - V1 is deprecated and removed
     # HTTP client is the only option now - gRPC removed
 
+    # Workflow Engine HTTP client pool
+    WORKFLOW_ENGINE_MAX_CONNECTIONS: int = Field(default=100, description="工作流引擎最大连接数")
+    WORKFLOW_ENGINE_MAX_KEEPALIVE: int = Field(default=40, description="工作流引擎保活连接数")
+    WORKFLOW_ENGINE_KEEPALIVE_EXPIRY: float = Field(default=60.0, description="工作流引擎空闲连接保活时间(秒)")
+    WORKFLOW_ENGINE_POOL_TIMEOUT: float = Field(
+        default=2.0, description="等待连接池空闲连接的超时(秒)，超时快速失败而非排队"
+    )
+    WORKFLOW_ENGINE_HTTP2: bool = Field(default=True, description="工作流引擎启用HTTP/2")
+    WORKFLOW_ENGINE_BREAKER_FAILURES: int = Field(default=5, description="连续失败多少次后熔断工作流引擎调用")
+    WORKFLOW_ENGINE_BREAKER_RECOVERY_SECONDS: float = Field(
+        default=15.0, description="熔断后多久放行探测请求(秒)"
+    )
+
     @property
     def workflow_agent_http_url(self) -> str:
         """获取工作流代理的 HTTP URL"""
@@ -227,9 +266,8 @@ class SecuritySettings(BaseSettings):
 
     # Rate Limiting
     RATE_LIMIT_STORAGE: str = Field(default="redis", description="限流存储类型 (redis, memory)")
-    RATE_LIMIT_STRATEGY: str = Field(
-        default="sliding_window", description="限流策略 (fixed_window, sliding_window)"
-    )
+    RATE_LIMIT_STRATEGY: str = Field(default="token_bucket", description="限流策略 (token_bucket)")
+    RATE_LIMIT_LOCAL_SYNC_SECONDS: float = Field(default=1.0, description="本地令牌租约与Redis同步间隔（秒）")
 
 
 class AppSettings(BaseSettings):
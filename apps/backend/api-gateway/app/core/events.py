@@ -46,6 +46,18 @@ async def startup_event(app: FastAPI) -> None:
     # 初始化直接PostgreSQL连接池 (性能优化)
     await initialize_direct_postgresql()
 
+    # 加载JWKS并启动后台轮换（本地JWT验证）
+    await initialize_jwt_verifier()
+
+    # 订阅工作流缓存失效广播
+    await initialize_workflow_cache()
+
+    # 建立到工作流引擎的长连接池
+    await initialize_workflow_engine_client()
+
+    # 预建节点搜索索引
+    await initialize_node_search_index()
+
     # 执行健康检查
     await perform_startup_health_checks()
 
@@ -68,6 +80,15 @@ async def shutdown_event(app: FastAPI) -> None:
     # 关闭直接PostgreSQL连接池
     await cleanup_direct_postgresql()
 
+    # 停止JWKS后台刷新任务（需在等待挂起任务之前）
+    await cleanup_jwt_verifier()
+
+    # 停止工作流缓存失效订阅
+    await cleanup_workflow_cache()
+
+    # 关闭工作流引擎连接池
+    await cleanup_workflow_engine_client()
+
     # 清理其他资源
     await cleanup_resources(app)
 
@@ -153,6 +174,107 @@ async def cleanup_direct_postgresql() -> None:
         logger.error(f"❌ Error cleaning up direct PostgreSQL pool: {e}")
 
 
+async def initialize_jwt_verifier() -> None:
+    """加载JWKS并启动后台密钥轮换"""
+    logger = get_logger(__name__)
+
+    try:
+        from app.services.jwt_verifier import get_jwt_verifier
+
+        verifier = get_jwt_verifier()
+        await verifier.start()
+        if verifier.enabled:
+            logger.info("✅ Local JWT verification enabled")
+        else:
+            logger.warning("⚠️ Local JWT verification disabled, using Supabase Auth API")
+
+    except Exception as e:
+        logger.warning(f"⚠️ JWT verifier initialization failed: {e}")
+
+
+async def cleanup_jwt_verifier() -> None:
+    """停止JWKS后台刷新"""
+    logger = get_logger(__name__)
+
+    try:
+        from app.services.jwt_verifier import close_jwt_verifier
+
+        await close_jwt_verifier()
+    except Exception as e:
+        logger.error(f"❌ Error stopping JWT verifier: {e}")
+
+
+async def initialize_workflow_cache() -> None:
+    """启动工作流缓存的跨副本失效订阅"""
+    logger = get_logger(__name__)
+
+    try:
+        from app.services.workflow_cache import start_workflow_cache
+
+        await start_workflow_cache()
+        logger.info("✅ Workflow cache invalidation listener started")
+
+    except Exception as e:
+        logger.warning(f"⚠️ Workflow cache initialization failed: {e}")
+
+
+async def initialize_node_search_index() -> None:
+    """预建 search_nodes 使用的节点规范索引"""
+    logger = get_logger(__name__)
+
+    try:
+        from app.api.mcp.tools import mcp_service
+
+        count = await asyncio.to_thread(mcp_service.node_knowledge.warm_search_index)
+        logger.info(f"✅ Node search index built for {count} node specs")
+
+    except Exception as e:
+        logger.warning(f"⚠️ Node search index warm-up failed: {e}")
+
+
+async def cleanup_workflow_cache() -> None:
+    """停止工作流缓存失效订阅"""
+    logger = get_logger(__name__)
+
+    try:
+        from app.services.workflow_cache import close_workflow_cache
+
+        await close_workflow_cache()
+    except Exception as e:
+        logger.error(f"❌ Error stopping workflow cache: {e}")
+
+
+async def initialize_workflow_engine_client() -> None:
+    """打开工作流引擎HTTP连接池"""
+    logger = get_logger(__name__)
+
+    try:
+        from app.services.workflow_engine_http_client import get_workflow_engine_client
+
+        client = await get_workflow_engine_client()
+        await client.start()
+        if client.connected:
+            logger.info("✅ Workflow engine connection pool ready")
+        else:
+            logger.warning("⚠️ Workflow engine not reachable yet, will connect on first call")
+
+    except Exception as e:
+        logger.warning(f"⚠️ Workflow engine client initialization failed: {e}")
+
+
+async def cleanup_workflow_engine_client() -> None:
+    """关闭工作流引擎HTTP连接池"""
+    logger = get_logger(__name__)
+
+    try:
+        from app.services.workflow_engine_http_client import get_workflow_engine_client
+
+        client = await get_workflow_engine_client()
+        await client.close()
+    except Exception as e:
+        logger.error(f"❌ Error closing workflow engine client: {e}")
+
+
 async def perform_startup_health_checks() -> None:
     """执行启动时的健康检查"""
     logger = get_logger(__name__)
@@ -229,6 +351,16 @@ async def cleanup_resources(app: FastAPI) -> None:
         if hasattr(app.state, "db_manager"):
             delattr(app.state, "db_manager")
 
+        # 关闭Notion连接池
+        from app.api.mcp.notion_tools import notion_mcp_service
+
+        await notion_mcp_service.close()
+
+        # 关闭外部API SDK共享连接池
+        from shared.sdks.transport import close_transports
+
+        await close_transports()
+
         # 等待异步任务完成
         pending_tasks = [task for task in asyncio.all_tasks() if not task.done()]
         if pending_tasks:
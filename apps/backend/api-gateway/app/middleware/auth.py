@@ -223,6 +223,11 @@ def _validate_jwt_format_middleware(token: str) -> bool:
     return True
 
 
+def requires_remote_verification(path: str) -> bool:
+    """Whether a path is revocation-sensitive and must bypass local JWT verification."""
+    return any(path.startswith(prefix) for prefix in settings.JWT_REMOTE_VERIFY_PATHS)
+
+
 async def authenticate_supabase_user(request: Request) -> AuthResult:
     """Supabase OAuth 用户认证"""
     try:
@@ -287,18 +292,22 @@ async def authenticate_supabase_user(request: Request) -> AuthResult:
 
             return AuthResult(success=False, error="empty_token")
 
-        # Log token extraction details
-        token_details = {
-            "token_length": len(token),
-            "token_prefix": token[:20] + "..." if len(token) > 20 else token,
-            "token_suffix": "..." + token[-10:] if len(token) > 30 else "",
-            "segment_count": len(token.split(".")),
-            "appears_base64": all(c.isalnum() or c in "-_=" for c in token.replace(".", "")),
-        }
-        logger.debug(f"Token extraction details: {token_details}")
+        def _token_details() -> Dict[str, Any]:
+            return {
+                "token_length": len(token),
+                "token_prefix": token[:20] + "..." if len(token) > 20 else token,
+                "token_suffix": "..." + token[-10:] if len(token) > 30 else "",
+                "segment_count": len(token.split(".")),
+                "appears_base64": all(c.isalnum() or c in "-_=" for c in token.replace(".", "")),
+            }
+
+        # Log token extraction details (built only when debug logging is on: hot path)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Token extraction details: {_token_details()}")
 
         # Early validation of JWT format to prevent malformed tokens from reaching Supabase
         if not _validate_jwt_format_middleware(token):
+            token_details = _token_details()
             # Log detailed information about malformed tokens for pattern analysis
             malformed_pattern = {
                 "error_type": "malformed_jwt_token",
@@ -333,8 +342,10 @@ async def authenticate_supabase_user(request: Request) -> AuthResult:
 
             return AuthResult(success=False, error="malformed_token")
 
-        # 验证 JWT Token
-        user_data = await verify_supabase_token(token)
+        # 验证 JWT Token (revocation-sensitive routes always check with Supabase)
+        user_data = await verify_supabase_token(
+            token, require_remote=requires_remote_verification(request.url.path)
+        )
         if not user_data:
             logger.info(
                 f"JWT token validation failed with Supabase. "
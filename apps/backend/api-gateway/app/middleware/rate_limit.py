@@ -1,28 +1,33 @@
 """
 Rate Limiting Middleware for Three-Layer API Architecture
 支持按路径前缀、用户ID、IP地址的分层限流策略
+
+Token bucket per key, evaluated atomically by a Lua script on an async Redis
+client, with a process-local pre-bucket in front of it.
 """
 
-import json
+import asyncio
+import logging
+import math
+import random
 import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
-    import redis
+    import redis.asyncio as redis
 
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
     redis = None
-from typing import Any, Dict, Optional
 
 from app.core.config import get_settings
+from fastapi import Request
+from fastapi.responses import JSONResponse
 
 settings = get_settings()
-import logging
-
 logger = logging.getLogger("app.middleware.rate_limit")
-from fastapi import HTTPException, Request, Response
-from fastapi.responses import JSONResponse
 
 
 class RateLimitConfig:
@@ -57,114 +62,335 @@ class RateLimitConfig:
     }
 
 
-class RateLimiter:
-    """Redis based rate limiter with sliding window algorithm"""
+# Token bucket over one or more keys, all-or-nothing, in a single round trip.
+# Each bucket is a hash {tokens, ts}; refill is computed lazily from elapsed time,
+# so memory per key is O(1) regardless of request volume.
+#   KEYS[i]            bucket key
+#   ARGV[1]            now (milliseconds)
+#   ARGV[3i-1..3i+1]   capacity, refill rate (tokens/ms), tokens wanted (lease size)
+# Returns {granted_1, ..., granted_n, remaining_1, ..., remaining_n, retry_after_ms};
+# granted is 0 for every key when any bucket has less than one token.
+TOKEN_BUCKET_LUA = """
+local now = tonumber(ARGV[1])
+local n = #KEYS
+local tokens = {}
+local retry_after = 0
+for i = 1, n do
+    local capacity = tonumber(ARGV[3 * i - 1])
+    local rate = tonumber(ARGV[3 * i])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local current = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if current == nil or ts == nil then
+        current = capacity
+        ts = now
+    end
+    current = math.min(capacity, current + math.max(0, now - ts) * rate)
+    tokens[i] = current
+    if current < 1 then
+        retry_after = math.max(retry_after, math.ceil((1 - current) / rate))
+    end
+end
+local result = {}
+for i = 1, n do
+    local capacity = tonumber(ARGV[3 * i - 1])
+    local rate = tonumber(ARGV[3 * i])
+    local granted = 0
+    if retry_after == 0 then
+        granted = math.max(1, math.min(math.floor(tokens[i]), tonumber(ARGV[3 * i + 1])))
+    end
+    local left = tokens[i] - granted
+    redis.call('HSET', KEYS[i], 'tokens', tostring(left), 'ts', tostring(now))
+    redis.call('PEXPIRE', KEYS[i], math.ceil(capacity / rate) + 1000)
+    result[i] = granted
+    result[n + i] = math.floor(left)
+end
+result[2 * n + 1] = retry_after
+return result
+"""
+
+
+@lru_cache(maxsize=256)
+def parse_limit(limit_str: str) -> tuple[int, int]:
+    """解析限流配置字符串，返回 (count, seconds)"""
+    parts = limit_str.split("/")
+    if len(parts) != 2:
+        raise ValueError(f"Invalid limit format: {limit_str}")
+
+    count = int(parts[0])
+    time_unit = parts[1].lower()
+
+    if time_unit == "second":
+        seconds = 1
+    elif time_unit == "minute":
+        seconds = 60
+    elif time_unit == "hour":
+        seconds = 3600
+    elif time_unit == "day":
+        seconds = 86400
+    else:
+        raise ValueError(f"Unsupported time unit: {time_unit}")
+
+    return count, seconds
+
+
+class _LocalLease:
+    """Tokens this process already took from the shared Redis bucket."""
+
+    __slots__ = ("tokens", "remaining", "expires_at", "denied_until", "syncing")
 
     def __init__(self):
-        self.redis_client = None
-        self._init_redis()
+        self.tokens = 0
+        self.remaining = 0
+        self.expires_at = 0.0
+        self.denied_until = 0.0
+        # Set while a Redis sync for this key is in flight (single-flight)
+        self.syncing: Optional[asyncio.Future] = None
+
+
+class RateLimiter:
+    """Redis token-bucket rate limiter with a process-local pre-bucket.
+
+    Each process leases small batches of tokens from the shared Redis bucket
+    (one Lua call, all limits of a request at once) and serves requests from
+    the lease until it runs out or expires after ``sync_interval`` seconds.
+    Rejections are remembered locally until the bucket's retry-after, so a
+    client hammering a limit costs no Redis round trips.
+
+    Leases can only under-admit: at most one unused batch per key per process
+    is dropped when a lease expires.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        sync_interval: float = 1.0,
+        max_lease: int = 50,
+        max_local_keys: int = 100000,
+    ):
+        self.redis_client = redis_client
+        self.sync_interval = sync_interval
+        self.max_lease = max_lease
+        self.max_local_keys = max_local_keys
+        self._script = None
+        self._leases: Dict[str, _LocalLease] = {}
+        self._redis_disabled = False
+        self.stats = {"local": 0, "redis_calls": 0, "rejected": 0, "errors": 0}
+
+    def _get_script(self):
+        if self._script is None:
+            if self.redis_client is None and not self._redis_disabled:
+                self.redis_client = self._init_redis()
+            if self.redis_client is None:
+                return None
+            self._script = self.redis_client.register_script(TOKEN_BUCKET_LUA)
+        return self._script
 
     def _init_redis(self):
-        """初始化Redis连接"""
-        try:
-            if REDIS_AVAILABLE and settings.REDIS_URL:
-                self.redis_client = redis.from_url(
+        """初始化异步Redis连接（首次使用时）"""
+        if not REDIS_AVAILABLE:
+            logger.warning("Redis module not available, rate limiting disabled")
+        elif not settings.REDIS_URL:
+            logger.warning("Redis URL not configured, rate limiting disabled")
+        else:
+            try:
+                client = redis.from_url(
                     settings.REDIS_URL,
                     decode_responses=True,
                     socket_connect_timeout=5,
                     socket_timeout=5,
                 )
-                # 测试连接
-                self.redis_client.ping()
-                logger.info("Rate limiter Redis connected")
-            else:
-                if not REDIS_AVAILABLE:
-                    logger.warning("Redis module not available, rate limiting disabled")
-                else:
-                    logger.warning("Redis URL not configured, rate limiting disabled")
-        except Exception as e:
-            logger.error(f"Failed to connect to Redis for rate limiting: {e}")
-            self.redis_client = None
-
-    def _parse_limit(self, limit_str: str) -> tuple[int, int]:
-        """解析限流配置字符串，返回 (count, seconds)"""
-        parts = limit_str.split("/")
-        if len(parts) != 2:
-            raise ValueError(f"Invalid limit format: {limit_str}")
-
-        count = int(parts[0])
-        time_unit = parts[1].lower()
-
-        if time_unit == "second":
-            seconds = 1
-        elif time_unit == "minute":
-            seconds = 60
-        elif time_unit == "hour":
-            seconds = 3600
-        elif time_unit == "day":
-            seconds = 86400
-        else:
-            raise ValueError(f"Unsupported time unit: {time_unit}")
-
-        return count, seconds
-
-    async def check_rate_limit(
-        self, key: str, limit_str: str, request: Request
-    ) -> tuple[bool, Dict[str, Any]]:
+                logger.info("Rate limiter Redis client created")
+                return client
+            except Exception as e:
+                logger.error(f"Failed to create Redis client for rate limiting: {e}")
+        self._redis_disabled = True
+        return None
+
+    def _lease_size(self, count: int, window_seconds: int) -> int:
+        # One sync interval of refill or 1% of the bucket, capped to a tenth of the bucket
+        wanted = max(math.ceil(count / window_seconds * self.sync_interval), count // 100)
+        return max(1, min(self.max_lease, count // 10, wanted))
+
+    def _lease(self, key: str) -> _LocalLease:
+        lease = self._leases.get(key)
+        if lease is None:
+            if len(self._leases) >= self.max_local_keys:
+                self._prune(time.monotonic())
+            lease = self._leases[key] = _LocalLease()
+        return lease
+
+    def _prune(self, now: float) -> None:
+        stale = [
+            key
+            for key, lease in self._leases.items()
+            if lease.expires_at <= now and lease.denied_until <= now
+        ]
+        for key in stale:
+            del self._leases[key]
+        if len(self._leases) >= self.max_local_keys:
+            self._leases.clear()
+
+    async def acquire(self, buckets: List[Tuple[str, str]]) -> Tuple[bool, Dict[str, Any]]:
         """
-        检查是否超过限流
+        Take one token from every (key, limit_str) bucket, or none of them.
 
         Returns:
-            (allowed: bool, info: dict)
+            (allowed: bool, info: dict); info["key"] names the reported bucket
         """
-        if not self.redis_client:
+        script = self._get_script()
+        if script is None:
             # Redis不可用时允许所有请求
             return True, {"status": "no_limit", "reason": "redis_unavailable"}
 
-        try:
-            count, window_seconds = self._parse_limit(limit_str)
-            current_time = int(time.time())
-            window_start = current_time - window_seconds
-
-            # 使用滑动窗口算法
-            pipe = self.redis_client.pipeline()
-
-            # 移除过期的记录
-            pipe.zremrangebyscore(key, 0, window_start)
-
-            # 获取当前窗口内的请求数
-            pipe.zcard(key)
-
-            # 添加当前请求
-            pipe.zadd(key, {f"{current_time}:{hash(str(request.url))}": current_time})
-
-            # 设置过期时间
-            pipe.expire(key, window_seconds + 10)
-
-            results = pipe.execute()
-            current_count = results[1]  # zcard 的结果
-
-            allowed = current_count < count
+        parsed = [(key, *parse_limit(limit_str)) for key, limit_str in buckets]
+        leases = [self._lease(key) for key, _, _ in parsed]
+        synced = False
+
+        # A concurrent request may drain a lease while we await Redis; re-check after syncing
+        for _ in range(3):
+            now = time.monotonic()
+            for (key, count, window_seconds), lease in zip(parsed, leases):
+                if lease.denied_until > now:
+                    self.stats["rejected"] += 1
+                    return False, self._info(
+                        key, count, window_seconds, 0, lease.denied_until - now
+                    )
+                if lease.expires_at <= now:
+                    # Expired leases are dropped so limit changes and resets propagate
+                    lease.tokens = 0
+
+            missing = [i for i, lease in enumerate(leases) if lease.tokens < 1]
+            if not missing:
+                for lease in leases:
+                    lease.tokens -= 1
+                if not synced:
+                    self.stats["local"] += 1
+                return True, self._allowed_info(parsed, leases)
+
+            in_flight = [leases[i].syncing for i in missing if leases[i].syncing is not None]
+            if in_flight:
+                # Another request is already refilling these leases; share its result
+                await asyncio.wait(in_flight)
+                continue
+
+            # Top up leases that are about to expire in the same round trip
+            refresh = missing + [
+                i
+                for i, lease in enumerate(leases)
+                if lease.tokens >= 1
+                and lease.syncing is None
+                and lease.expires_at - now < self.sync_interval / 2
+            ]
+            future = asyncio.get_running_loop().create_future()
+            for i in refresh:
+                leases[i].syncing = future
+            try:
+                status, info = await self._sync(parsed, leases, refresh)
+            finally:
+                for i in refresh:
+                    leases[i].syncing = None
+                future.set_result(None)
+            synced = True
+            if status == "denied":
+                return False, info
+            if status == "error":
+                # Redis错误时允许请求
+                return True, info
+
+        # Lost the race for fresh leases on every retry: take exactly one token per bucket
+        # straight from Redis so the shared bucket still decides
+        status, info = await self._sync(parsed, leases, list(range(len(parsed))), lease_size=1)
+        if status == "denied":
+            return False, info
+        if status == "error":
+            return True, info
+        for lease in leases:
+            lease.tokens -= 1
+        return True, self._allowed_info(parsed, leases)
+
+    async def _sync(
+        self,
+        parsed: List[Tuple[str, int, int]],
+        leases: List[_LocalLease],
+        missing: List[int],
+        lease_size: Optional[int] = None,
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Lease tokens for the given buckets from Redis: ("ok" | "denied" | "error", info)."""
+        keys = [parsed[i][0] for i in missing]
+        args: List[Any] = [int(time.time() * 1000)]
+        for i in missing:
+            _, count, window_seconds = parsed[i]
+            rate_per_ms = count / (window_seconds * 1000)
+            args += [count, rate_per_ms, lease_size or self._lease_size(count, window_seconds)]
 
-            info = {
-                "status": "allowed" if allowed else "rejected",
-                "current_count": current_count,
-                "limit": count,
-                "window_seconds": window_seconds,
-                "reset_time": current_time + (window_seconds - (current_time % window_seconds)),
-                "retry_after": 1 if not allowed else None,
-            }
+        try:
+            self.stats["redis_calls"] += 1
+            result = await self._script(keys=keys, args=args)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Rate limit check error {keys}: {e}")
+            return "error", {"status": "error", "reason": str(e)}
+
+        n = len(missing)
+        retry_after_ms = int(result[2 * n])
+        now = time.monotonic()
+        if retry_after_ms > 0:
+            self.stats["rejected"] += 1
+            culprit = None
+            for j, i in enumerate(missing):
+                if int(result[n + j]) < 1:
+                    leases[i].denied_until = now + retry_after_ms / 1000
+                    culprit = i if culprit is None else culprit
+            key, count, window_seconds = parsed[missing[0] if culprit is None else culprit]
+            return "denied", self._info(key, count, window_seconds, 0, retry_after_ms / 1000)
+
+        for j, i in enumerate(missing):
+            leases[i].tokens += int(result[j])
+            leases[i].remaining = int(result[n + j])
+            # Jittered so leases taken in the same burst do not all resync together
+            leases[i].expires_at = now + self.sync_interval * random.uniform(0.5, 1.0)
+        return "ok", None
+
+    def _allowed_info(
+        self, parsed: List[Tuple[str, int, int]], leases: List[_LocalLease]
+    ) -> Dict[str, Any]:
+        # Report the tightest bucket
+        best = min(range(len(parsed)), key=lambda i: leases[i].tokens + leases[i].remaining)
+        key, count, window_seconds = parsed[best]
+        remaining = leases[best].tokens + leases[best].remaining
+        return self._info(key, count, window_seconds, remaining, None)
+
+    @staticmethod
+    def _info(
+        key: str, count: int, window_seconds: int, remaining: int, retry_after: Optional[float]
+    ) -> Dict[str, Any]:
+        allowed = retry_after is None
+        return {
+            "status": "allowed" if allowed else "rejected",
+            "key": key,
+            "limit": count,
+            "remaining": max(0, remaining),
+            "current_count": count - max(0, remaining),
+            "window_seconds": window_seconds,
+            "reset_time": int(time.time() + (retry_after or 0)),
+            "retry_after": None if allowed else max(1, math.ceil(retry_after)),
+        }
 
-            return allowed, info
+    async def check_rate_limit(
+        self, key: str, limit_str: str, request: Optional[Request] = None
+    ) -> tuple[bool, Dict[str, Any]]:
+        """
+        检查是否超过限流
 
-        except Exception as e:
-            logger.error(f"Rate limit check error [{key}]: {e}")
-            # Redis错误时允许请求
-            return True, {"status": "error", "reason": str(e)}
+        Returns:
+            (allowed: bool, info: dict)
+        """
+        return await self.acquire([(key, limit_str)])
 
 
 # 全局限流器实例
-rate_limiter = RateLimiter()
+rate_limiter = RateLimiter(sync_interval=settings.RATE_LIMIT_LOCAL_SYNC_SECONDS)
 
 
 def get_client_identifier(request: Request) -> str:
@@ -220,29 +446,31 @@ async def check_rate_limit_for_request(request: Request) -> tuple[bool, Dict[str
         # 非三层API路径，不限流
         return True, {"status": "no_limit", "reason": "non_layered_api"}
 
-    # 检查特定路径限制
+    # 路径限制与全局限制在一次Redis调用中原子检查
+    # Hash tag keeps one client's buckets in the same cluster slot for the multi-key script
+    prefix = f"rate_limit:tb:{{{layer}:{identifier}}}"
+    buckets = []
     specific_limit = limits.get(path)
     if specific_limit:
-        key = f"rate_limit:{layer}:{identifier}:{path}"
-        allowed, info = await rate_limiter.check_rate_limit(key, specific_limit, request)
-        if not allowed:
-            info["limit_type"] = "path_specific"
-            info["path"] = path
-            return False, info
-
-    # 检查全局限制
+        buckets.append((f"{prefix}:{path}", specific_limit))
     global_keys = [k for k in limits.keys() if not k.startswith("/")]
     if global_keys:
-        global_key = global_keys[0]
-        global_limit = limits[global_key]
-        key = f"rate_limit:{layer}:{identifier}:global"
-        allowed, info = await rate_limiter.check_rate_limit(key, global_limit, request)
-        if not allowed:
+        buckets.append((f"{prefix}:global", limits[global_keys[0]]))
+    if not buckets:
+        return True, {"status": "allowed", "layer": layer}
+
+    allowed, info = await rate_limiter.acquire(buckets)
+    if not allowed:
+        if info.get("key", "").endswith(":global"):
             info["limit_type"] = "global"
             info["layer"] = layer
-            return False, info
+        else:
+            info["limit_type"] = "path_specific"
+            info["path"] = path
+        return False, info
 
-    return True, {"status": "allowed", "layer": layer}
+    info["layer"] = layer
+    return True, info
 
 
 async def rate_limit_middleware(request: Request, call_next):
@@ -271,9 +499,7 @@ async def rate_limit_middleware(request: Request, call_next):
         headers.update(
             {
                 "X-RateLimit-Limit": str(info.get("limit", 0)),
-                "X-RateLimit-Remaining": str(
-                    max(0, info.get("limit", 0) - info.get("current_count", 0))
-                ),
+                "X-RateLimit-Remaining": str(info.get("remaining", 0)),
                 "X-RateLimit-Reset": str(info.get("reset_time", 0)),
             }
         )
@@ -297,9 +523,7 @@ async def rate_limit_middleware(request: Request, call_next):
     # 添加限流信息到响应头
     if info.get("limit"):
         response.headers["X-RateLimit-Limit"] = str(info["limit"])
-        response.headers["X-RateLimit-Remaining"] = str(
-            max(0, info["limit"] - info.get("current_count", 0))
-        )
+        response.headers["X-RateLimit-Remaining"] = str(info.get("remaining", 0))
         if info.get("reset_time"):
             response.headers["X-RateLimit-Reset"] = str(info["reset_time"])
 
@@ -3,12 +3,21 @@ JWT Token Verification for Frontend Authentication with Caching
 支持缓存的JWT令牌验证服务
 """
 
+import asyncio
 import hashlib
 import logging
 from datetime import datetime
 from typing import Any, Dict, Optional
 
 from app.services.cache import cache_service
+from app.services.jwt_verifier import (
+    LocalVerificationUnavailable,
+    TokenVerificationError,
+    claims_to_user_data,
+    get_jwt_verifier,
+    get_token_cache,
+)
+from jose import jwt
 
 logger = logging.getLogger("app.services.auth_service")
 
@@ -37,29 +46,98 @@ def _validate_jwt_format(token: str) -> bool:
     return True
 
 
-async def verify_supabase_token(token: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+def _unverified_exp(token: str) -> Optional[float]:
+    """Read ``exp`` without verifying, to bound how long a remote result is cached."""
+    try:
+        return jwt.get_unverified_claims(token).get("exp")
+    except Exception:
+        return None
+
+
+async def _verify_with_supabase(token: str, token_hash: str) -> Optional[Dict[str, Any]]:
+    """Verify a token remotely with the Supabase Auth API (honors revocation)."""
+    # Create a new Supabase client to avoid DNS caching issues
+    from app.core.config import settings
+    from supabase import create_client
+
+    if not settings.SUPABASE_URL or not settings.SUPABASE_SECRET_KEY:
+        logger.error("Supabase configuration missing")
+        return None
+
+    def _get_user():
+        supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SECRET_KEY)
+        return supabase.auth.get_user(token)
+
+    # Create client with retry for DNS issues
+    max_retries = 3
+    for attempt in range(max_retries):
+        try:
+            # The Supabase client is synchronous; keep it off the event loop
+            response = await asyncio.to_thread(_get_user)
+            break
+        except Exception as e:
+            if "name resolution" in str(e) and attempt < max_retries - 1:
+                logger.warning(
+                    f"DNS resolution failed, retrying... " f"(attempt {attempt + 1}/{max_retries})"
+                )
+                await asyncio.sleep(1)  # Wait 1 second before retry
+                continue
+            else:
+                raise
+
+    if response and response.user and response.user.id:
+        logger.info(f"Token verified for user: {response.user.email}")
+        return {
+            "id": response.user.id,  # AuthUser expects 'id' field
+            "sub": response.user.id,
+            "email": response.user.email,
+            "email_confirmed_at": (
+                response.user.email_confirmed_at.isoformat()
+                if response.user.email_confirmed_at
+                else None
+            ),
+            "created_at": (
+                response.user.created_at.isoformat() if response.user.created_at else None
+            ),
+            "user_metadata": response.user.user_metadata,
+            "app_metadata": response.user.app_metadata,
+            # Add token validation metadata
+            "validated_at": datetime.now().isoformat(),
+            "token_hash": token_hash[:16],  # Store partial hash for debugging
+        }
+
+    logger.error("Invalid token - no user data returned")
+    return None
+
+
+async def verify_supabase_token(
+    token: str, use_cache: bool = True, require_remote: bool = False
+) -> Optional[Dict[str, Any]]:
     """
-    Verify JWT token with Supabase Auth with caching support
+    Verify JWT token with caching support
     支持缓存的JWT令牌验证
 
+    Lookup order: in-process cache (L1) -> local signature verification ->
+    Redis cache (L2) -> Supabase Auth API. Local verification cannot see
+    revoked sessions, so revocation-sensitive callers pass
+    ``require_remote=True`` to always ask Supabase.
+
     Args:
         token: JWT access token from frontend Supabase client
         use_cache: Whether to use cache for token validation (default: True)
+        require_remote: Skip caches and local verification; check with Supabase
 
     Returns:
         User data if token is valid, None otherwise
     """
     try:
-        # Log token analysis for debugging
-        token_info = {
-            "token_length": len(token) if token else 0,
-            "token_prefix": token[:10] + "..." if token and len(token) > 10 else token,
-            "segment_count": len(token.split(".")) if token else 0,
-        }
-        logger.debug(f"JWT token analysis: {token_info}")
-
         # Early validation of JWT format
         if not _validate_jwt_format(token):
+            token_info = {
+                "token_length": len(token) if token else 0,
+                "token_prefix": token[:10] + "..." if token and len(token) > 10 else token,
+                "segment_count": len(token.split(".")) if token else 0,
+            }
             logger.warning(
                 f"Invalid JWT token format: token does not contain exactly 3 segments. "
                 f"Token info: {token_info}"
@@ -68,76 +146,53 @@ async def verify_supabase_token(token: str, use_cache: bool = True) -> Optional[
 
         # Create token hash for caching
         token_hash = hashlib.sha256(token.encode()).hexdigest()
+        l1_cache = get_token_cache()
 
-        # Try to get from cache first
-        if use_cache:
-            cached_user_data = await cache_service.get_cached_jwt_validation(token_hash)
-            if cached_user_data:
-                logger.info(f"Cache hit for JWT token {token_hash[:8]}...")
-                return cached_user_data
-
-        # Token not in cache or cache disabled, verify with Supabase
-        # Create a new Supabase client to avoid DNS caching issues
-        from app.core.config import settings
-        from supabase import create_client
-
-        if not settings.SUPABASE_URL or not settings.SUPABASE_SECRET_KEY:
-            logger.error("Supabase configuration missing")
-            return None
-
-        # Create client with retry for DNS issues
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SECRET_KEY)
-                response = supabase.auth.get_user(token)
-                break
-            except Exception as e:
-                if "name resolution" in str(e) and attempt < max_retries - 1:
-                    logger.warning(
-                        f"DNS resolution failed, retrying... "
-                        f"(attempt {attempt + 1}/{max_retries})"
-                    )
-                    import time
-
-                    time.sleep(1)  # Wait 1 second before retry
-                    continue
+        if not require_remote:
+            if use_cache:
+                user_data = l1_cache.get(token_hash)
+                if user_data:
+                    return user_data
+
+            verifier = get_jwt_verifier()
+            if verifier.enabled:
+                try:
+                    claims = await verifier.verify(token)
+                except TokenVerificationError as e:
+                    logger.info(f"Local JWT verification rejected token {token_hash[:8]}...: {e}")
+                    return None
+                except LocalVerificationUnavailable as e:
+                    logger.debug(f"Local JWT verification unavailable, using Supabase: {e}")
                 else:
-                    raise
-
-        if response and response.user and response.user.id:
-            user_data = {
-                "id": response.user.id,  # AuthUser expects 'id' field
-                "sub": response.user.id,
-                "email": response.user.email,
-                "email_confirmed_at": (
-                    response.user.email_confirmed_at.isoformat()
-                    if response.user.email_confirmed_at
-                    else None
-                ),
-                "created_at": (
-                    response.user.created_at.isoformat() if response.user.created_at else None
-                ),
-                "user_metadata": response.user.user_metadata,
-                "app_metadata": response.user.app_metadata,
-                # Add token validation metadata
-                "validated_at": datetime.now().isoformat(),
-                "token_hash": token_hash[:16],  # Store partial hash for debugging
-            }
+                    user_data = claims_to_user_data(claims, token_hash)
+                    if use_cache:
+                        l1_cache.put(token_hash, user_data, exp=claims.get("exp"))
+                    return user_data
 
-            # Cache the validation result if cache is enabled
+            # Try the shared Redis cache next
             if use_cache:
-                cache_success = await cache_service.cache_jwt_validation(token_hash, user_data)
-                if cache_success:
-                    logger.info(f"JWT validation cached for token {token_hash[:8]}...")
-                else:
-                    logger.error(f"Failed to cache JWT validation for token {token_hash[:8]}...")
+                cached_user_data = await cache_service.get_cached_jwt_validation(token_hash)
+                if cached_user_data:
+                    logger.debug(f"Cache hit for JWT token {token_hash[:8]}...")
+                    l1_cache.put(token_hash, cached_user_data, exp=_unverified_exp(token))
+                    return cached_user_data
+
+        # Token not in cache, not verifiable locally, or revocation-sensitive
+        user_data = await _verify_with_supabase(token, token_hash)
+        if not user_data:
+            l1_cache.invalidate(token_hash)
+            return None
 
-            logger.info(f"Token verified for user: {response.user.email}")
-            return user_data
+        # Cache the validation result if cache is enabled
+        if use_cache:
+            l1_cache.put(token_hash, user_data, exp=_unverified_exp(token))
+            cache_success = await cache_service.cache_jwt_validation(token_hash, user_data)
+            if cache_success:
+                logger.info(f"JWT validation cached for token {token_hash[:8]}...")
+            else:
+                logger.error(f"Failed to cache JWT validation for token {token_hash[:8]}...")
 
-        logger.error("Invalid token - no user data returned")
-        return None
+        return user_data
 
     except Exception as e:
         logger.exception(f"Token verification failed: {e}")
@@ -157,6 +212,7 @@ async def invalidate_user_token_cache(user_id: str) -> bool:
     """
     try:
         # Invalidate user-specific caches
+        get_token_cache().invalidate_user(user_id)
         invalidation_results = await cache_service.invalidate_user_cache(user_id)
 
         successful_invalidations = sum(1 for success in invalidation_results.values() if success)
@@ -182,6 +238,7 @@ async def invalidate_token_cache(token: str) -> bool:
     """
     try:
         token_hash = hashlib.sha256(token.encode()).hexdigest()
+        get_token_cache().invalidate(token_hash)
         success = await cache_service.invalidate_jwt_cache(token_hash)
 
         if success:
@@ -208,8 +265,11 @@ async def get_auth_cache_stats() -> Dict[str, Any]:
         stats = cache_service.get_stats()
         health = await cache_service.health_check()
 
+        l1_cache = get_token_cache()
         return {
             "cache_stats": stats,
+            "local_token_cache": {"size": len(l1_cache), **l1_cache.stats},
+            "local_jwt_verification": get_jwt_verifier().enabled,
             "health_status": health,
             "cache_enabled": True,
             "features": {
@@ -0,0 +1,85 @@
+"""
+Circuit breaker for calls to internal services
+内部服务调用熔断器
+
+closed -> open after ``failure_threshold`` consecutive failures; while open,
+calls are rejected immediately instead of queueing on a slow or dead
+dependency. After ``recovery_timeout`` a limited number of probe calls are let
+through (half-open): one success closes the circuit, one failure re-opens it.
+Probes that never report back (e.g. cancelled) are replaced after another
+``recovery_timeout``.
+"""
+
+import time
+from typing import Any, Dict
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        self.name = name
+        self.retry_in = retry_in
+        super().__init__(f"{name} unavailable (circuit open, retry in {retry_in:.1f}s)")
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 15.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.stats = {"rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        # In half-open, _opened_at marks when the current probes were let through
+        if (
+            self._state != self.CLOSED
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._opened_at = time.monotonic()
+            self._probes = 0
+        return self._state
+
+    def before_call(self) -> None:
+        """Reserve a call slot or raise CircuitOpenError."""
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return
+        self.stats["rejected"] += 1
+        retry_in = max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.stats["opened"] += 1
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self._failures, **self.stats}
@@ -0,0 +1,272 @@
+"""
+Local Supabase JWT verification with an in-process claims cache
+本地JWT签名验证与进程内缓存
+
+Supabase access tokens are verified in-process instead of calling the Supabase
+Auth API for every new token:
+
+- HS256 tokens are checked against the project's JWT secret
+- RS256/ES256 tokens are checked against the project's JWKS, fetched once and
+  rotated in the background (an unknown ``kid`` triggers a rate-limited refetch)
+- Verified claims are kept in a bounded LRU keyed by token hash and never
+  outlive the token's ``exp``
+
+When no key material is available the verifier reports "unavailable" and the
+caller falls back to the remote Supabase check.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from app.core.config import settings
+from jose import jwt
+from jose.exceptions import JWTError
+
+logger = logging.getLogger("app.services.jwt_verifier")
+
+_ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+# Minimum spacing between JWKS refetches triggered by unknown key ids
+_JWKS_MISS_REFRESH_INTERVAL = 30
+
+
+class TokenVerificationError(Exception):
+    """Token was checked locally and is invalid (bad signature, expired, wrong audience)."""
+
+
+class LocalVerificationUnavailable(Exception):
+    """No key material to verify this token locally; use the remote check."""
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified user data keyed by token hash, honoring ``exp``."""
+
+    def __init__(self, max_size: int = 10000, max_ttl: int = 1800):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, token_hash: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(token_hash)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        expires_at, user_data = entry
+        if expires_at <= (now if now is not None else time.time()):
+            del self._entries[token_hash]
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(token_hash)
+        self.stats["hits"] += 1
+        return user_data
+
+    def put(
+        self,
+        token_hash: str,
+        user_data: Dict[str, Any],
+        exp: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        now = now if now is not None else time.time()
+        expires_at = now + self.max_ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now:
+            return
+        self._entries[token_hash] = (expires_at, user_data)
+        self._entries.move_to_end(token_hash)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, token_hash: str) -> bool:
+        return self._entries.pop(token_hash, None) is not None
+
+    def invalidate_user(self, user_id: str) -> int:
+        stale = [key for key, (_, data) in self._entries.items() if data.get("sub") == user_id]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def claims_to_user_data(claims: Dict[str, Any], token_hash: str) -> Dict[str, Any]:
+    """Build the same user_data shape the remote Supabase check produces."""
+    return {
+        "id": claims["sub"],  # AuthUser expects 'id' field
+        "sub": claims["sub"],
+        "email": claims.get("email"),
+        "role": claims.get("role"),
+        "aud": claims.get("aud"),
+        "iss": claims.get("iss"),
+        "exp": claims.get("exp"),
+        "iat": claims.get("iat"),
+        "session_id": claims.get("session_id"),
+        "user_metadata": claims.get("user_metadata") or {},
+        "app_metadata": claims.get("app_metadata") or {},
+        "validated_at": datetime.now().isoformat(),
+        "token_hash": token_hash[:16],
+    }
+
+
+class SupabaseJWTVerifier:
+    """Verifies Supabase access tokens locally (HS256 secret or JWKS)."""
+
+    def __init__(
+        self,
+        jwt_secret: Optional[str] = None,
+        jwks_url: Optional[str] = None,
+        audience: str = "authenticated",
+        jwks_refresh_seconds: int = 600,
+    ):
+        self.jwt_secret = jwt_secret or None
+        self.jwks_url = jwks_url or None
+        self.audience = audience
+        self.jwks_refresh_seconds = jwks_refresh_seconds
+        self._jwks: Dict[str, Dict[str, Any]] = {}
+        self._jwks_fetched_at = 0.0
+        self._jwks_attempted_at = 0.0
+        self._jwks_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.jwt_secret or self.jwks_url)
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """Return verified claims, or raise TokenVerificationError / LocalVerificationUnavailable."""
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise TokenVerificationError(f"Malformed JWT header: {e}") from e
+
+        algorithm = header.get("alg")
+        if algorithm == "HS256":
+            if not self.jwt_secret:
+                raise LocalVerificationUnavailable("No JWT secret configured for HS256 tokens")
+            key: Any = self.jwt_secret
+        elif algorithm in _ASYMMETRIC_ALGORITHMS:
+            key = await self._get_signing_key(header.get("kid"))
+        else:
+            raise LocalVerificationUnavailable(f"Unsupported JWT algorithm: {algorithm}")
+
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                options={"require_aud": True, "require_exp": True, "require_sub": True},
+            )
+        except JWTError as e:
+            raise TokenVerificationError(str(e)) from e
+
+    async def _get_signing_key(self, kid: Optional[str]) -> Dict[str, Any]:
+        if not self.jwks_url:
+            raise LocalVerificationUnavailable("No JWKS URL configured")
+        if kid in self._jwks and not self._jwks_stale():
+            return self._jwks[kid]
+
+        # Unknown kid (key rotation) or stale set: refetch, but not on every miss
+        if time.time() - self._jwks_attempted_at >= _JWKS_MISS_REFRESH_INTERVAL:
+            await self.refresh_jwks()
+        if kid in self._jwks:
+            return self._jwks[kid]
+        raise LocalVerificationUnavailable(f"Signing key {kid} not found in JWKS")
+
+    def _jwks_stale(self) -> bool:
+        # Stale keys are still usable; the background task normally keeps them fresh
+        return time.time() - self._jwks_fetched_at > 2 * self.jwks_refresh_seconds
+
+    async def refresh_jwks(self) -> bool:
+        if not self.jwks_url:
+            return False
+        requested_at = time.time()
+        async with self._jwks_lock:
+            if self._jwks_fetched_at >= requested_at:
+                # Another caller refreshed while we waited for the lock
+                return True
+            self._jwks_attempted_at = time.time()
+            try:
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    response = await client.get(self.jwks_url)
+                    response.raise_for_status()
+                    keys = response.json().get("keys", [])
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to refresh JWKS from {self.jwks_url}: {e}")
+                return False
+
+            self._jwks = {key["kid"]: key for key in keys if key.get("kid")}
+            self._jwks_fetched_at = time.time()
+            logger.debug(f"✅ Loaded {len(self._jwks)} JWKS signing keys")
+            return True
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.jwks_refresh_seconds)
+            await self.refresh_jwks()
+
+    async def start(self) -> None:
+        if self.jwks_url and self._refresh_task is None:
+            await self.refresh_jwks()
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+
+def _default_jwks_url() -> Optional[str]:
+    if settings.JWT_JWKS_URL:
+        return settings.JWT_JWKS_URL
+    if settings.SUPABASE_URL and settings.SUPABASE_URL != "https://your-project-id.supabase.co":
+        return f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json"
+    return None
+
+
+_jwt_verifier: Optional[SupabaseJWTVerifier] = None
+_token_cache: Optional[VerifiedTokenCache] = None
+
+
+def get_jwt_verifier() -> SupabaseJWTVerifier:
+    global _jwt_verifier
+    if _jwt_verifier is None:
+        local_enabled = settings.JWT_LOCAL_VERIFICATION_ENABLED
+        _jwt_verifier = SupabaseJWTVerifier(
+            jwt_secret=settings.SUPABASE_JWT_SECRET if local_enabled else None,
+            jwks_url=_default_jwks_url() if local_enabled else None,
+            audience=settings.JWT_AUDIENCE,
+            jwks_refresh_seconds=settings.JWT_JWKS_REFRESH_SECONDS,
+        )
+    return _jwt_verifier
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = VerifiedTokenCache(
+            max_size=settings.JWT_L1_CACHE_SIZE, max_ttl=settings.CACHE_TTL_JWT_TOKEN
+        )
+    return _token_cache
+
+
+async def close_jwt_verifier() -> None:
+    global _jwt_verifier
+    if _jwt_verifier is not None:
+        await _jwt_verifier.close()
+        _jwt_verifier = None
@@ -7,8 +7,11 @@ and search functionality for LLM clients through MCP tools.
 
 import os
 import sys
+import threading
 from typing import Any, Dict, List, Optional
 
+from app.services.node_search_index import NodeSearchIndex
+
 # Import from shared module - Docker has shared/ in /app/shared/
 from shared.node_specs.base import NodeSpec
 from shared.node_specs.registry import node_spec_registry
@@ -22,6 +25,28 @@ class NodeKnowledgeService:
         self.registry = node_spec_registry
         if self.registry is None:
             print("Warning: Node registry not available")
+        self._search_index: Optional[NodeSearchIndex] = None
+        self._search_index_lock = threading.Lock()
+
+    def warm_search_index(self) -> int:
+        """Build the search index ahead of the first search; returns the spec count."""
+        if self.registry is None:
+            return 0
+        return len(self._get_search_index(self.registry.list_all_specs()).specs)
+
+    def _get_search_index(self, specs: List[Any]) -> NodeSearchIndex:
+        """Index for the current specs, rebuilt only when the registry's spec set changes."""
+        index = self._search_index
+        if index is not None and index.fingerprint == NodeSearchIndex.fingerprint_of(specs):
+            return index
+        with self._search_index_lock:
+            index = self._search_index
+            if index is None or index.fingerprint != NodeSearchIndex.fingerprint_of(specs):
+                index = NodeSearchIndex(
+                    specs, lambda spec: self._serialize_node_spec(spec, True, True)
+                )
+                self._search_index = index
+            return index
 
     def get_node_types(self, type_filter: Optional[str] = None) -> Dict[str, List[str]]:
         """
@@ -179,6 +204,9 @@ class NodeKnowledgeService:
         """
         Search nodes by description and capabilities.
 
+        Matches subtypes, names, tags, descriptions, parameters and ports
+        (see ``NodeSearchIndex``); misspelled or partial subtypes still match.
+
         Args:
             query: Search query describing desired functionality
             max_results: Maximum number of results to return
@@ -195,52 +223,9 @@ class NodeKnowledgeService:
             return []
 
         try:
-            all_specs = self.registry.list_all_specs()
-            query_lower = query.lower()
-
-            # Simple text search in description and parameter names
-            matches = []
-            for spec in all_specs:
-                score = 0
-
-                # Search in description
-                if query_lower in spec.description.lower():
-                    score += 10
-
-                # Search in parameter names and descriptions (handle both formats)
-                score += self._search_in_parameters(spec, query_lower)
-
-                # Search in port names and descriptions
-                score += self._search_in_ports(spec, query_lower)
-
-                if score > 0:
-                    matches.append((spec, score))
-
-            # Sort by relevance score and limit results
-            matches.sort(key=lambda x: x[1], reverse=True)
-            matches = matches[:max_results]
-
-            # Format results
-            results = []
-            for spec, score in matches:
-                if include_details:
-                    result = self._serialize_node_spec(spec, True, True)
-                    result["relevance_score"] = score
-                else:
-                    # Handle both BaseNodeSpec (new format) and NodeSpec (old format)
-                    node_type = getattr(spec, "node_type", None) or getattr(spec, "type", None)
-                    if hasattr(node_type, "value"):  # Handle enum values
-                        node_type = node_type.value
-
-                    result = {
-                        "node_type": str(node_type) if node_type else "unknown",
-                        "subtype": getattr(spec, "subtype", "unknown"),
-                        "description": getattr(spec, "description", ""),
-                        "relevance_score": score,
-                    }
-                results.append(result)
-
-            return results
+            # Ranked with BM25 over an index built once from the registry
+            index = self._get_search_index(self.registry.list_all_specs())
+            return index.results(query, max_results, include_details)
         except Exception as e:
             print(f"Error searching nodes: {e}")
             return []
@@ -579,46 +564,3 @@ class NodeKnowledgeService:
             return type_map[normalized]
 
         return ""
-
-    def _search_in_parameters(self, spec, query_lower: str) -> int:
-        """Search in parameters handling both old and new formats."""
-        score = 0
-        try:
-            # Try old format first (ParameterDef objects)
-            if hasattr(spec, "parameters") and spec.parameters is not None:
-                for param in spec.parameters:
-                    if hasattr(param, "name") and query_lower in param.name.lower():
-                        score += 5
-                    if hasattr(param, "description") and query_lower in param.description.lower():
-                        score += 3
-
-            # Try new format (configurations dict)
-            elif hasattr(spec, "configurations") and spec.configurations:
-                for name, config in spec.configurations.items():
-                    if query_lower in name.lower():
-                        score += 5
-                    if isinstance(config, dict) and "description" in config:
-                        if query_lower in config["description"].lower():
-                            score += 3
-
-        except Exception:
-            pass  # Don't fail search if parameter access fails
-        return score
-
-    def _search_in_ports(self, spec, query_lower: str) -> int:
-        """Search in ports handling both old and new formats."""
-        score = 0
-        try:
-            input_ports = getattr(spec, "input_ports", [])
-            output_ports = getattr(spec, "output_ports", [])
-            all_ports = input_ports + output_ports
-
-            for port in all_ports:
-                if hasattr(port, "name") and query_lower in port.name.lower():
-                    score += 3
-                if hasattr(port, "description") and query_lower in port.description.lower():
-                    score += 2
-
-        except Exception:
-            pass  # Don't fail search if port access fails
-        return score
@@ -0,0 +1,301 @@
+"""
+Search index over node specifications for the node knowledge MCP tools.
+
+Built once from the node spec registry (and rebuilt only if the set of specs
+changes) so ``search_nodes`` no longer scans and re-serializes every spec per
+call:
+
+- each spec is tokenized into fields (subtype, name, tags, description,
+  parameters, ports) and stored in an inverted index;
+- documents are ranked with BM25F: per-field length normalisation and field
+  boosts, so a subtype or tag hit outranks a passing mention in a port;
+- query terms missing from the vocabulary expand to vocabulary terms they are
+  a prefix of, or are close misspellings of; the whole query is also matched
+  against subtypes by prefix and similarity ("gmai" -> GMAIL);
+- summary and detailed result payloads are serialized at build time, and
+  rankings of recent queries are kept in a small LRU (the workflow agent
+  repeats queries while generating).
+"""
+
+import difflib
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Field boosts for BM25F
+FIELD_WEIGHTS: Dict[str, float] = {
+    "subtype": 4.0,
+    "name": 2.5,
+    "tags": 2.0,
+    "description": 1.5,
+    "parameters": 1.0,
+    "ports": 0.5,
+}
+K1 = 1.2
+B = 0.75
+PREFIX_DISCOUNT = 0.7
+FUZZY_DISCOUNT = 0.5
+SUBTYPE_MATCH_BONUS = 2.0
+FUZZY_CUTOFF = 0.8
+QUERY_CACHE_SIZE = 512
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from i in into is it of on or that the this to want with"
+    " node nodes".split()
+)
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _normalize(token: str) -> str:
+    # Plural folding is enough for short spec texts ("requests" -> "request")
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: Any) -> List[str]:
+    """Lower-cased word tokens; snake_case and camelCase are split into words."""
+    if not isinstance(text, str) or not text:
+        return []
+    return [_normalize(t) for t in _WORD.findall(_CAMEL.sub(" ", text).lower())]
+
+
+def _query_terms(query: str) -> List[str]:
+    terms = [t for t in tokenize(query) if t not in _STOPWORDS]
+    return list(dict.fromkeys(terms)) or list(dict.fromkeys(tokenize(query)))
+
+
+def _text(value: Any) -> str:
+    return value if isinstance(value, str) else ""
+
+
+def _iter(value: Any) -> Iterable:
+    try:
+        return list(value) if value is not None else []
+    except TypeError:
+        return []  # Mock or other non-iterable attribute
+
+
+def spec_fields(spec: Any) -> Dict[str, str]:
+    """Searchable text of a spec by field, tolerant of legacy and partial specs."""
+    params: List[str] = []
+    parameters = getattr(spec, "parameters", None)
+    if parameters is not None:
+        for param in _iter(parameters):
+            params += [_text(getattr(param, "name", "")), _text(getattr(param, "description", ""))]
+    else:
+        configurations = getattr(spec, "configurations", None)
+        if isinstance(configurations, dict):
+            for name, config in configurations.items():
+                params.append(_text(name))
+                if isinstance(config, dict):
+                    params.append(_text(config.get("description")))
+
+    ports: List[str] = []
+    for port in _iter(getattr(spec, "input_ports", [])) + _iter(getattr(spec, "output_ports", [])):
+        ports += [_text(getattr(port, "name", "")), _text(getattr(port, "description", ""))]
+
+    tags = getattr(spec, "tags", None)
+    return {
+        "subtype": _text(getattr(spec, "subtype", "")),
+        "name": _text(getattr(spec, "name", "")),
+        "tags": " ".join(t for t in tags if isinstance(t, str)) if isinstance(tags, list) else "",
+        "description": _text(getattr(spec, "description", "")),
+        "parameters": " ".join(params),
+        "ports": " ".join(ports),
+    }
+
+
+def spec_node_type(spec: Any) -> str:
+    node_type = getattr(spec, "node_type", None) or getattr(spec, "type", None)
+    if hasattr(node_type, "value"):  # Handle enum values
+        node_type = node_type.value
+    return str(node_type) if node_type else "unknown"
+
+
+class NodeSearchIndex:
+    """BM25F inverted index over a fixed list of node specs."""
+
+    def __init__(
+        self,
+        specs: Sequence[Any],
+        serialize: Callable[[Any], Dict[str, Any]],
+        field_weights: Optional[Dict[str, float]] = None,
+    ):
+        self.specs = list(specs)
+        self.fingerprint = self.fingerprint_of(self.specs)
+        weights = field_weights or FIELD_WEIGHTS
+
+        self.summaries: List[Dict[str, Any]] = []
+        self.details: List[Dict[str, Any]] = []
+        field_tokens: List[Dict[str, List[str]]] = []
+        for spec in self.specs:
+            fields = spec_fields(spec)
+            field_tokens.append({f: tokenize(fields.get(f, "")) for f in weights})
+            self.summaries.append(
+                {
+                    "node_type": spec_node_type(spec),
+                    "subtype": getattr(spec, "subtype", "unknown"),
+                    "description": getattr(spec, "description", ""),
+                }
+            )
+            self.details.append(serialize(spec))
+
+        n_docs = len(self.specs)
+        avg_len = {
+            f: (sum(len(doc[f]) for doc in field_tokens) / n_docs if n_docs else 0.0) or 1.0
+            for f in weights
+        }
+
+        # term -> {doc: length-normalised, boosted term frequency}
+        weighted_tf: Dict[str, Dict[int, float]] = {}
+        for doc, fields in enumerate(field_tokens):
+            for field, tokens in fields.items():
+                if not tokens:
+                    continue
+                norm = 1 - B + B * len(tokens) / avg_len[field]
+                counts: Dict[str, int] = {}
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+                for token, count in counts.items():
+                    postings = weighted_tf.setdefault(token, {})
+                    postings[doc] = postings.get(doc, 0.0) + weights[field] * count / norm
+
+        # Final per-posting scores, so a query is a sum over a few short lists
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        for term, docs in weighted_tf.items():
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[term] = [(doc, idf * tf / (K1 + tf)) for doc, tf in docs.items()]
+        self.vocabulary: List[str] = sorted(self.postings)
+
+        self._subtype_keys = [
+            re.sub(r"[^a-z0-9]", "", _text(summary["subtype"]).lower())
+            for summary in self.summaries
+        ]
+        self._expansions: Dict[str, List[Tuple[str, float]]] = {}
+        self._query_cache: "OrderedDict[Tuple[str, int], List[Tuple[int, float]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint_of(specs: Sequence[Any]) -> Tuple[int, ...]:
+        return tuple(id(spec) for spec in specs)
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Index terms for one query term, with a weight for inexact matches."""
+        if term in self.postings:
+            return [(term, 1.0)]
+        cached = self._expansions.get(term)
+        if cached is not None:
+            return cached
+        expansions: List[Tuple[str, float]] = []
+        if len(term) >= 3:
+            i = bisect_left(self.vocabulary, term)
+            while i < len(self.vocabulary) and self.vocabulary[i].startswith(term):
+                expansions.append((self.vocabulary[i], PREFIX_DISCOUNT))
+                i += 1
+                if len(expansions) >= 20:
+                    break
+        if not expansions and len(term) >= 4:
+            expansions = [(close, FUZZY_DISCOUNT) for close in self._close_matches(term)]
+        if len(self._expansions) < 4096:
+            self._expansions[term] = expansions
+        return expansions
+
+    def _close_matches(self, term: str) -> List[str]:
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(term)  # b-side analysis is cached across candidates
+        max_delta = int(len(term) * (1 - FUZZY_CUTOFF)) + 1
+        scored = []
+        for candidate in self.vocabulary:
+            if abs(len(candidate) - len(term)) > max_delta:
+                continue
+            matcher.set_seq1(candidate)
+            if (
+                matcher.real_quick_ratio() >= FUZZY_CUTOFF
+                and matcher.quick_ratio() >= FUZZY_CUTOFF
+                and matcher.ratio() >= FUZZY_CUTOFF
+            ):
+                scored.append((matcher.ratio(), candidate))
+        return [candidate for _, candidate in sorted(scored, reverse=True)[:3]]
+
+    def search(self, query: str, max_results: int = 10) -> List[Tuple[int, float]]:
+        """(doc, score) pairs, best first."""
+        key = (query, max_results)
+        with self._cache_lock:
+            ranked = self._query_cache.get(key)
+            if ranked is not None:
+                self._query_cache.move_to_end(key)
+                return ranked
+        ranked = self._rank(query, max_results)
+        with self._cache_lock:
+            self._query_cache[key] = ranked
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return ranked
+
+    def _rank(self, query: str, max_results: int) -> List[Tuple[int, float]]:
+        terms = _query_terms(query)
+        if not terms:
+            return []
+
+        scores: Dict[int, float] = {}
+        matched_terms: Dict[int, int] = {}
+        for term in terms:
+            hit_docs = set()
+            for index_term, weight in self._expand(term):
+                for doc, score in self.postings[index_term]:
+                    scores[doc] = scores.get(doc, 0.0) + weight * score
+                    hit_docs.add(doc)
+            for doc in hit_docs:
+                matched_terms[doc] = matched_terms.get(doc, 0) + 1
+
+        # Subtype lookup for the query as a whole ("http request", "gmai", "slak")
+        key = "".join(terms)
+        if len(key) >= 3:
+            matcher = difflib.SequenceMatcher()
+            matcher.set_seq2(key)
+            for doc, subtype_key in enumerate(self._subtype_keys):
+                if not subtype_key:
+                    continue
+                if subtype_key.startswith(key):
+                    bonus = SUBTYPE_MATCH_BONUS
+                else:
+                    if len(key) < 4:
+                        continue
+                    matcher.set_seq1(subtype_key)
+                    if not (
+                        matcher.real_quick_ratio() >= FUZZY_CUTOFF
+                        and matcher.quick_ratio() >= FUZZY_CUTOFF
+                        and matcher.ratio() >= FUZZY_CUTOFF
+                    ):
+                        continue
+                    bonus = SUBTYPE_MATCH_BONUS * FUZZY_DISCOUNT
+                scores[doc] = scores.get(doc, 0.0) + bonus
+                matched_terms[doc] = len(terms)
+
+        # A single identifier ("send_email") must match all its parts; phrases at least half
+        required = len(terms) if len(query.split()) == 1 else (len(terms) + 1) // 2
+        ranked = [
+            (doc, score)
+            for doc, score in scores.items()
+            if score > 0 and matched_terms.get(doc, 0) >= required
+        ]
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked[:max_results]
+
+    def results(
+        self, query: str, max_results: int = 10, include_details: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Result payloads with ``relevance_score`` (copied from the prebuilt ones)."""
+        payloads = self.details if include_details else self.summaries
+        return [
+            {**payloads[doc], "relevance_score": round(score, 4)}
+            for doc, score in self.search(query, max_results)
+        ]
+
+
+__all__ = ["NodeSearchIndex", "spec_fields", "tokenize"]
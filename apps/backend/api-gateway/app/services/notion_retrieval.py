@@ -0,0 +1,255 @@
+"""
+Concurrent, rate-limit-aware Notion retrieval
+Notion 并发检索与块树缓存
+
+- One pooled NotionClient per integration token, so keep-alive connections are
+  reused across MCP tool calls
+- An async token bucket per integration keeps every request under Notion's
+  ~3 requests/second budget; a 429 pauses the whole bucket
+- Block children are fetched level by level with bounded concurrency instead of
+  one request after another
+- Block trees are cached by (block_id, last_edited_time), so an unchanged page is
+  served without any block request. Notion rounds last_edited_time to the
+  minute, so entries also carry a TTL
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Separate documents; their content is retrieved on request, not inlined
+_LEAF_BLOCK_TYPES = ("child_page", "child_database")
+
+
+class AsyncTokenBucket:
+    """Async token bucket shared by every request made with one integration token."""
+
+    def __init__(self, rate: float = 3.0, burst: int = 3):
+        self.rate = rate
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def penalize(self, seconds: float) -> None:
+        """Stop handing out tokens for the given time (Notion answered 429)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+@dataclass
+class _PooledClient:
+    client: Any
+    limiter: AsyncTokenBucket
+    last_used: float
+
+
+class NotionClientPool:
+    """Reuses one client (and its rate limiter) per access token."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[str, AsyncTokenBucket], Any],
+        max_clients: int = 100,
+        idle_timeout: float = 600,
+        rate: float = 3.0,
+        burst: int = 3,
+    ):
+        self._factory = client_factory
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.rate = rate
+        self.burst = burst
+        self._clients: "OrderedDict[str, _PooledClient]" = OrderedDict()
+
+    @staticmethod
+    def _key(access_token: str) -> str:
+        return hashlib.sha256(access_token.encode()).hexdigest()
+
+    async def get(self, access_token: str) -> Any:
+        key = self._key(access_token)
+        now = time.monotonic()
+        entry = self._clients.get(key)
+        if entry is not None:
+            entry.last_used = now
+            self._clients.move_to_end(key)
+            return entry.client
+
+        limiter = AsyncTokenBucket(self.rate, self.burst)
+        self._clients[key] = _PooledClient(self._factory(access_token, limiter), limiter, now)
+
+        stale = [
+            k
+            for k, e in self._clients.items()
+            if now - e.last_used > self.idle_timeout and k != key
+        ]
+        while len(self._clients) - len(stale) > self.max_clients:
+            stale.append(next(k for k in self._clients if k not in stale))
+        for k in stale:
+            await self._close(self._clients.pop(k))
+        return self._clients[key].client
+
+    async def discard(self, access_token: str) -> None:
+        """Drop the client for a token Notion rejected."""
+        entry = self._clients.pop(self._key(access_token), None)
+        if entry is not None:
+            await self._close(entry)
+
+    async def _close(self, entry: _PooledClient) -> None:
+        try:
+            await entry.client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close Notion client: {e}")
+
+    async def close(self) -> None:
+        while self._clients:
+            _, entry = self._clients.popitem()
+            await self._close(entry)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+@dataclass
+class BlockNode:
+    """A Notion block with its (possibly fetched) children."""
+
+    block: Any
+    children: List["BlockNode"] = field(default_factory=list)
+
+
+def _block_type(block: Any) -> str:
+    block_type = getattr(block, "type", None)
+    return getattr(block_type, "value", block_type)
+
+
+class NotionRetriever:
+    """Fetches block trees with bounded concurrency and caches them by edit time."""
+
+    def __init__(
+        self,
+        concurrency: int = 6,
+        max_depth: int = 8,
+        max_blocks: int = 2000,
+        cache_size: int = 512,
+        cache_ttl: float = 600,
+    ):
+        self.concurrency = concurrency
+        self.max_depth = max_depth
+        self.max_blocks = max_blocks
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: "OrderedDict[Tuple[str, str, bool], Tuple[float, List[BlockNode]]]" = (
+            OrderedDict()
+        )
+        self.stats = {"cache_hits": 0, "cache_misses": 0, "requests": 0}
+
+    async def fetch_children(self, client: Any, block_id: str) -> List[Any]:
+        """All direct children of a block, following pagination."""
+        blocks: List[Any] = []
+        cursor = None
+        while True:
+            self.stats["requests"] += 1
+            page = await client.get_block_children(block_id, start_cursor=cursor)
+            blocks.extend(page.get("blocks", []))
+            cursor = page.get("next_cursor")
+            if not page.get("has_more") or not cursor:
+                return blocks
+
+    async def get_block_tree(
+        self,
+        client: Any,
+        block_id: str,
+        last_edited_time: Optional[Any] = None,
+        include_children: bool = True,
+    ) -> List[BlockNode]:
+        """
+        Children of block_id as BlockNodes, nested when include_children is set.
+
+        Trees are cached only when last_edited_time (of block_id itself) is known.
+        """
+        key = None
+        if last_edited_time is not None:
+            edited = getattr(last_edited_time, "isoformat", lambda: str(last_edited_time))()
+            key = (block_id, edited, include_children)
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return entry[1]
+            self.stats["cache_misses"] += 1
+
+        roots = [BlockNode(block) for block in await self.fetch_children(client, block_id)]
+        if include_children:
+            await self._expand(client, roots)
+
+        if key is not None:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, roots)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return roots
+
+    async def _expand(self, client: Any, level: List[BlockNode]) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        total = len(level)
+
+        async def load(node: BlockNode) -> None:
+            async with semaphore:
+                try:
+                    children = await self.fetch_children(client, node.block.id)
+                except Exception as e:
+                    logger.warning(f"Could not retrieve children for block {node.block.id}: {e}")
+                    return
+            node.children = [BlockNode(child) for child in children]
+
+        for _ in range(self.max_depth):
+            expandable = [
+                node
+                for node in level
+                if getattr(node.block, "has_children", False)
+                and _block_type(node.block) not in _LEAF_BLOCK_TYPES
+            ]
+            if not expandable or total >= self.max_blocks:
+                return
+            await asyncio.gather(*(load(node) for node in expandable))
+            level = [child for node in expandable for child in node.children]
+            total += len(level)
+
+    def invalidate(self, block_id: str) -> None:
+        for key in [k for k in self._cache if k[0] == block_id]:
+            del self._cache[key]
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+__all__ = [
+    "AsyncTokenBucket",
+    "BlockNode",
+    "NotionClientPool",
+    "NotionRetriever",
+]
@@ -0,0 +1,335 @@
+"""
+Workflow definition and listing cache
+工作流定义与列表缓存
+
+Shared by all workflow endpoints of one worker:
+
+- Entries are stored as serialized JSON in an LRU bounded by total bytes, with a
+  per-entry TTL. Every read decodes a fresh copy, so callers may mutate it
+- Concurrent misses for the same key share one engine call (single-flight)
+- Create/update/delete publish an invalidation on a Redis channel; every replica
+  drops the workflow and bumps the owner's listing version
+- Listing pages are cached per user under that version stamp, so one bump
+  orphans all of the user's pages (they age out of the LRU)
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.services.workflow_cache")
+
+InvalidationHandler = Callable[[Dict[str, Any]], None]
+
+
+class ByteLRUCache:
+    """LRU of JSON-serializable values, bounded by the total size of their encodings."""
+
+    def __init__(self, max_bytes: int, default_ttl: float):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.current_bytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "rejected": 0}
+
+    def get(self, key: Hashable, now: Optional[float] = None) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        expires_at, data = entry
+        if expires_at <= (now if now is not None else time.monotonic()):
+            self.pop(key)
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return json.loads(data)
+
+    def put(
+        self, key: Hashable, value: Any, ttl: Optional[float] = None, now: Optional[float] = None
+    ) -> bool:
+        data = json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+        if len(data) > self.max_bytes:
+            self.stats["rejected"] += 1
+            return False
+        self.pop(key)
+        now = now if now is not None else time.monotonic()
+        self._entries[key] = (now + (ttl if ttl is not None else self.default_ttl), data)
+        self.current_bytes += len(data)
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.current_bytes -= len(evicted)
+            self.stats["evictions"] += 1
+        return True
+
+    def pop(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.current_bytes -= len(entry[1])
+        return True
+
+    def pop_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        stale = [key for key in self._entries if predicate(key)]
+        for key in stale:
+            self.pop(key)
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+class InProcessInvalidationBus:
+    """Stand-in for Redis pub/sub that delivers to subscribers in this process."""
+
+    def __init__(self):
+        self._handlers: List[InvalidationHandler] = []
+
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        self._handlers.append(handler)
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        for handler in list(self._handlers):
+            handler(message)
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisInvalidationBus(InProcessInvalidationBus):
+    """Broadcasts invalidations to every gateway replica over a Redis channel."""
+
+    def __init__(self, channel: str, reconnect_delay: float = 5.0):
+        super().__init__()
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._listener: Optional[asyncio.Task] = None
+
+    async def _get_client(self):
+        from app.core.database import get_redis_manager
+
+        return await get_redis_manager().get_client_direct()
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        if self._listener is None:
+            # Not started (tests, scripts): nothing else to notify
+            return
+        try:
+            client = await self._get_client()
+            await client.publish(self.channel, json.dumps(message))
+        except Exception as e:
+            # Other replicas fall back to their TTL
+            logger.warning(f"⚠️ Failed to publish workflow cache invalidation: {e}")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                client = await self._get_client()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(self.channel)
+                logger.info(f"📡 Listening for workflow cache invalidations on {self.channel}")
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        try:
+                            payload = json.loads(message["data"])
+                        except (TypeError, ValueError):
+                            continue
+                        for handler in list(self._handlers):
+                            handler(payload)
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Workflow cache invalidation listener error: {e}")
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+class WorkflowCache:
+    """Workflow definitions per (workflow, user) and listing pages per user."""
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 300,
+        list_ttl: float = 30,
+        bus: Optional[InProcessInvalidationBus] = None,
+    ):
+        self.ttl = ttl
+        self.list_ttl = list_ttl
+        self._store = ByteLRUCache(max_bytes, ttl)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._list_versions: Dict[str, int] = {}
+        # Bumped on every invalidation; loads that straddle one are not cached
+        self._epoch = 0
+        self.instance_id = uuid.uuid4().hex
+        self.bus = bus or InProcessInvalidationBus()
+        self.bus.subscribe(self._on_message)
+        self.stats = {"loads": 0, "shared_loads": 0, "invalidations": 0}
+
+    @staticmethod
+    def workflow_key(workflow_id: str, user_id: str) -> Tuple[str, str, str]:
+        return ("workflow", workflow_id, user_id)
+
+    def listing_key(self, user_id: str, *params: Any) -> Tuple[Any, ...]:
+        return ("list", user_id, self._list_versions.get(user_id, 0), *params)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self._store.get(key)
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        return self._store.put(key, value, ttl)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        cacheable: Callable[[Any], bool] = lambda value: value is not None,
+    ) -> Any:
+        """Return the cached value for key, or run loader once for all concurrent callers."""
+        value = self._store.get(key)
+        if value is not None:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["shared_loads"] += 1
+            try:
+                shared = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The leading request was cancelled; load on our own
+                return await self.get_or_load(key, loader, ttl, cacheable)
+            # Followers get their own copy; the leader's caller may mutate its result
+            return copy.deepcopy(shared)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        epoch = self._epoch
+        try:
+            self.stats["loads"] += 1
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure does not log a warning
+            future.exception()
+            raise
+        else:
+            if epoch == self._epoch and cacheable(value):
+                self._store.put(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def invalidate(self, workflow_id: Optional[str] = None, user_id: Optional[str] = None):
+        """Drop a workflow (all users) and the owner's listings here and on every replica."""
+        message = {"workflow_id": workflow_id, "user_id": user_id, "origin": self.instance_id}
+        self._apply(message)
+        await self.bus.publish(message)
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        if message.get("origin") != self.instance_id:
+            self._apply(message)
+
+    def _apply(self, message: Dict[str, Any]) -> None:
+        workflow_id = message.get("workflow_id")
+        user_id = message.get("user_id")
+        self._epoch += 1
+        self.stats["invalidations"] += 1
+        if workflow_id:
+            self._store.pop_where(lambda key: key[0] == "workflow" and key[1] == workflow_id)
+        if user_id:
+            self._list_versions[user_id] = self._list_versions.get(user_id, 0) + 1
+        else:
+            # Owner unknown: every user's listing may include this workflow
+            self._store.pop_where(lambda key: key[0] == "list")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            **self._store.stats,
+            "entries": len(self._store),
+            "bytes": self._store.current_bytes,
+            "max_bytes": self._store.max_bytes,
+        }
+
+    def clear(self) -> None:
+        self._store.clear()
+        self._list_versions.clear()
+        self._epoch += 1
+
+
+_workflow_cache: Optional[WorkflowCache] = None
+
+
+def get_workflow_cache() -> WorkflowCache:
+    global _workflow_cache
+    if _workflow_cache is None:
+        _workflow_cache = WorkflowCache(
+            max_bytes=settings.WORKFLOW_CACHE_MAX_BYTES,
+            ttl=settings.WORKFLOW_CACHE_TTL,
+            list_ttl=settings.WORKFLOW_LIST_CACHE_TTL,
+            bus=RedisInvalidationBus(settings.WORKFLOW_CACHE_INVALIDATION_CHANNEL),
+        )
+    return _workflow_cache
+
+
+async def start_workflow_cache() -> None:
+    await get_workflow_cache().bus.start()
+
+
+async def close_workflow_cache() -> None:
+    global _workflow_cache
+    if _workflow_cache is not None:
+        await _workflow_cache.bus.close()
+        _workflow_cache = None
+
+
+__all__ = [
+    "ByteLRUCache",
+    "InProcessInvalidationBus",
+    "RedisInvalidationBus",
+    "WorkflowCache",
+    "get_workflow_cache",
+    "start_workflow_cache",
+    "close_workflow_cache",
+]
@@ -1,19 +1,137 @@
 """
 HTTP Client for Workflow Engine Service
 Replaces the gRPC client with HTTP/FastAPI calls
+
+One long-lived AsyncClient (opened and closed by the FastAPI lifespan) carries
+every gateway -> engine call, so TCP connections are kept alive and reused.
+Each endpoint has its own timeout, the pool timeout is short so a saturated
+pool fails fast, and a circuit breaker rejects calls outright while the
+engine keeps failing instead of letting them pile up.
 """
 
 import asyncio
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
 
 import httpx
 from app.core.config import get_settings
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
 from app.utils.logger import log_error, log_info
 
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from opentelemetry import metrics as otel_metrics
+
+    OTEL_METRICS_AVAILABLE = True
+except ImportError:
+    OTEL_METRICS_AVAILABLE = False
+
 settings = get_settings()
 
+# Per-endpoint read timeouts (seconds); connect is always 5s
+ENDPOINT_TIMEOUTS: Dict[str, float] = {
+    "health": 5.0,
+    "node_templates": 30.0,
+    "create_workflow": 60.0,  # complex workflows with many nodes take a while
+    "update_workflow": 60.0,
+    "get_workflow": 30.0,
+    "list_workflows": 30.0,
+    "delete_workflow": 30.0,
+    "execute_async": 10.0,  # returns immediately with an execution_id
+    "execute_sync": 300.0,  # long-running workflows
+    "execution_status": 10.0,  # polled frequently
+    "cancel_execution": 15.0,
+    "execution_history": 30.0,
+    "execution_logs": 90.0,  # logs queries can be slow
+}
+
+# Engine responses that count against the circuit breaker
+_UNHEALTHY_STATUSES = frozenset({502, 503, 504})
+
+
+class EngineClientMetrics:
+    """Per-endpoint latency and error counts, plus connection reuse."""
+
+    def __init__(self, sample_size: int = 512):
+        self.sample_size = sample_size
+        self.connections_opened = 0
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+        self._histogram = None
+        self._connections_counter = None
+        if OTEL_METRICS_AVAILABLE:
+            meter = otel_metrics.get_meter("api-gateway-workflow-engine-client")
+            self._histogram = meter.create_histogram(
+                name="workflow_engine_client_duration_seconds",
+                description="Gateway to workflow engine request duration",
+                unit="s",
+            )
+            self._connections_counter = meter.create_counter(
+                name="workflow_engine_client_connections_total",
+                description="TCP connections opened to the workflow engine",
+                unit="1",
+            )
+
+    def _endpoint(self, endpoint: str) -> Dict[str, Any]:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = {
+                "requests": 0,
+                "errors": 0,
+                "rejected": 0,
+                "latencies": deque(maxlen=self.sample_size),
+            }
+            self._endpoints[endpoint] = stats
+        return stats
+
+    def record(self, endpoint: str, seconds: float, status: str) -> None:
+        stats = self._endpoint(endpoint)
+        stats["requests"] += 1
+        if status == "error" or status.startswith("5"):
+            stats["errors"] += 1
+        stats["latencies"].append(seconds)
+        if self._histogram is not None:
+            self._histogram.record(seconds, {"endpoint": endpoint, "status": status})
+
+    def record_rejected(self, endpoint: str) -> None:
+        self._endpoint(endpoint)["rejected"] += 1
+
+    def record_connection(self) -> None:
+        self.connections_opened += 1
+        if self._connections_counter is not None:
+            self._connections_counter.add(1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        endpoints = {}
+        total = 0
+        for endpoint, stats in self._endpoints.items():
+            latencies: Deque[float] = stats["latencies"]
+            ordered = sorted(latencies)
+            total += stats["requests"]
+            endpoints[endpoint] = {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "rejected": stats["rejected"],
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2) if ordered else 0.0,
+                "p95_ms": round(ordered[int(len(ordered) * 0.95)] * 1000, 2) if ordered else 0.0,
+            }
+        return {
+            "requests": total,
+            "connections_opened": self.connections_opened,
+            # Share of requests that went out on an already-open connection
+            "connection_reuse_ratio": (
+                round(1 - min(self.connections_opened, total) / total, 3) if total else 0.0
+            ),
+            "endpoints": endpoints,
+        }
+
 
 class WorkflowEngineHTTPClient:
     """
@@ -25,33 +143,91 @@ class WorkflowEngineHTTPClient:
         # Always use Workflow Engine V2 (V1 is deprecated and removed)
         self.base_url = settings.workflow_engine_http_url  # Port 8002 runs Workflow Engine V2
         self._api_prefix = "/v2"  # V2 API prefix
-        # Separate timeouts for different operations
-        self.connect_timeout = httpx.Timeout(5.0, connect=5.0)
-        self.execute_timeout = httpx.Timeout(
-            300.0, connect=5.0
-        )  # 5 minutes for long-running workflows
-        self.query_timeout = httpx.Timeout(60.0, connect=5.0)  # Longer timeout for queries
-        self.logs_timeout = httpx.Timeout(90.0, connect=5.0)  # Extra long timeout for logs queries
+        # A pool wait longer than this fails fast instead of queueing behind a slow engine
+        self._pool_timeout = settings.WORKFLOW_ENGINE_POOL_TIMEOUT
+        self.timeouts = {
+            endpoint: httpx.Timeout(seconds, connect=5.0, pool=self._pool_timeout)
+            for endpoint, seconds in ENDPOINT_TIMEOUTS.items()
+        }
         self.connected = False
-        # Connection pool for better performance
-        self._client = None
-        self._limits = httpx.Limits(max_keepalive_connections=10, max_connections=20)
+        # One long-lived pool; HTTP/2 is negotiated over TLS, cleartext stays on
+        # HTTP/1.1 keep-alive
+        self._client: Optional[httpx.AsyncClient] = None
+        self._limits = httpx.Limits(
+            max_connections=settings.WORKFLOW_ENGINE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.WORKFLOW_ENGINE_MAX_KEEPALIVE,
+            keepalive_expiry=settings.WORKFLOW_ENGINE_KEEPALIVE_EXPIRY,
+        )
+        self._http2 = settings.WORKFLOW_ENGINE_HTTP2 and HTTP2_AVAILABLE
+        self._transport: Optional[httpx.AsyncBaseTransport] = None
+        self.breaker = CircuitBreaker(
+            "workflow_engine",
+            failure_threshold=settings.WORKFLOW_ENGINE_BREAKER_FAILURES,
+            recovery_timeout=settings.WORKFLOW_ENGINE_BREAKER_RECOVERY_SECONDS,
+        )
+        self.metrics = EngineClientMetrics()
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client with connection pooling"""
+        """Get or create the pooled HTTP client"""
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
-                timeout=self.connect_timeout,
+                timeout=self.timeouts["get_workflow"],
                 limits=self._limits,
-                http2=True,  # Enable HTTP/2 for multiplexing
+                http2=self._http2,
+                transport=self._transport,
             )
         return self._client
 
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.metrics.record_connection()
+
+    async def _request(self, endpoint: str, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Send one request to the engine through the pooled client.
+
+        Raises CircuitOpenError without touching the network while the engine
+        is considered down. Connection failures, timeouts and 502/503/504
+        count against the breaker.
+        """
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self.metrics.record_rejected(endpoint)
+            raise
+
+        kwargs.setdefault("timeout", self.timeouts[endpoint])
+        client = await self._get_client()
+        started = time.perf_counter()
+        try:
+            response = await client.request(
+                method, f"{self.base_url}{path}", extensions={"trace": self._trace}, **kwargs
+            )
+        except httpx.TransportError:
+            self.breaker.record_failure()
+            self.metrics.record(endpoint, time.perf_counter() - started, "error")
+            raise
+
+        if response.status_code in _UNHEALTHY_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        self.metrics.record(endpoint, time.perf_counter() - started, str(response.status_code))
+        return response
+
+    async def start(self):
+        """Open the connection pool at application startup"""
+        await self._get_client()
+        try:
+            await self.connect()
+        except Exception:
+            # The engine may start after the gateway; calls reconnect lazily
+            pass
+
     async def connect(self):
         """Test connection to workflow engine service"""
         try:
-            client = await self._get_client()
-            response = await client.get(f"{self.base_url}/health")
+            response = await self._request("health", "GET", "/health")
             response.raise_for_status()
             self.connected = True
             log_info(f"✅ Connected to Workflow Engine at {self.base_url}")
@@ -64,9 +240,24 @@ class WorkflowEngineHTTPClient:
         """Close HTTP connection and client"""
         if self._client and not self._client.is_closed:
             await self._client.aclose()
+        self._client = None
         self.connected = False
         log_info("Closed Workflow Engine HTTP connection")
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection reuse, latency and circuit breaker state"""
+        return {
+            "base_url": self.base_url,
+            "http2": self._http2,
+            "pool": {
+                "max_connections": self._limits.max_connections,
+                "max_keepalive_connections": self._limits.max_keepalive_connections,
+                "keepalive_expiry": self._limits.keepalive_expiry,
+            },
+            "circuit_breaker": self.breaker.get_stats(),
+            **self.metrics.snapshot(),
+        }
+
     async def list_all_node_templates(
         self,
         category_filter: Optional[str] = None,
@@ -89,9 +280,11 @@ class WorkflowEngineHTTPClient:
                 f"📨 HTTP request to {self.base_url}{self._api_prefix}/workflows/node-templates"
             )
 
-            client = await self._get_client()
-            response = await client.get(
-                f"{self.base_url}{self._api_prefix}/workflows/node-templates", params=params
+            response = await self._request(
+                "node_templates",
+                "GET",
+                f"{self._api_prefix}/workflows/node-templates",
+                params=params,
             )
             response.raise_for_status()
 
@@ -240,13 +433,14 @@ class WorkflowEngineHTTPClient:
             if settings_dict:
                 v2_payload["settings"] = settings_dict
 
-            # Use dedicated client with query_timeout for create operations
-            # Complex workflows with many nodes need longer processing time
-            async with httpx.AsyncClient(timeout=self.query_timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}{self._api_prefix}/workflows", json=v2_payload, headers=headers
-                )
-                response.raise_for_status()
+            response = await self._request(
+                "create_workflow",
+                "POST",
+                f"{self._api_prefix}/workflows",
+                json=v2_payload,
+                headers=headers,
+            )
+            response.raise_for_status()
 
             data = response.json()
             log_info(f"✅ Created workflow: {data.get('workflow', {}).get('id', 'unknown')}")
@@ -273,28 +467,26 @@ class WorkflowEngineHTTPClient:
         try:
             log_info(f"📨 HTTP request to get workflow: {workflow_id}")
 
-            # Use individual client with proper timeout
             headers = {"Authorization": f"Bearer {access_token}"}
             path = f"{self._api_prefix}/workflows/{workflow_id}"
 
-            async with httpx.AsyncClient(timeout=self.query_timeout) as client:
-                response = await client.get(f"{self.base_url}{path}", headers=headers)
-                response.raise_for_status()
-                data = response.json()
+            response = await self._request("get_workflow", "GET", path, headers=headers)
+            response.raise_for_status()
+            data = response.json()
 
-                # Debug: Check the type of data returned
+            # Debug: Check the type of data returned
+            log_info(
+                f"🐛 DEBUG HTTP Client: data type = {type(data)}, is_dict = {isinstance(data, dict)}"
+            )
+            if isinstance(data, str):
                 log_info(
-                    f"🐛 DEBUG HTTP Client: data type = {type(data)}, is_dict = {isinstance(data, dict)}"
+                    f"🐛 DEBUG HTTP Client: data is a string, length = {len(data)}, first 100 chars = {data[:100]}"
                 )
-                if isinstance(data, str):
-                    log_info(
-                        f"🐛 DEBUG HTTP Client: data is a string, length = {len(data)}, first 100 chars = {data[:100]}"
-                    )
-                elif isinstance(data, dict):
-                    log_info(f"🐛 DEBUG HTTP Client: data keys = {list(data.keys())}")
+            elif isinstance(data, dict):
+                log_info(f"🐛 DEBUG HTTP Client: data keys = {list(data.keys())}")
 
-                log_info(f"✅ Retrieved workflow: {workflow_id}")
-                return data
+            log_info(f"✅ Retrieved workflow: {workflow_id}")
+            return data
 
         except httpx.HTTPStatusError as e:
             log_error(f"❌ HTTP error getting workflow: {e.response.status_code}")
@@ -332,20 +524,14 @@ class WorkflowEngineHTTPClient:
             if access_token:
                 headers["Authorization"] = f"Bearer {access_token}"
 
-            # Use appropriate timeout for async vs sync execution
             # Async execution should return immediately with execution_id, so use short timeout
-            timeout = httpx.Timeout(10.0, connect=5.0) if async_execution else self.execute_timeout
+            endpoint = "execute_async" if async_execution else "execute_sync"
 
             log_info(
                 f"📨 HTTP request to execute workflow: {workflow_id} (async: {async_execution})"
             )
 
-            # Use pooled client for better connection handling
-            client = await self._get_client()
-
             # Time the HTTP request to debug performance
-            import time
-
             start_time = time.time()
 
             v2_payload: Dict[str, Any] = {
@@ -361,11 +547,12 @@ class WorkflowEngineHTTPClient:
             if user_id:
                 v2_payload["user_id"] = user_id
 
-            response = await client.post(
-                f"{self.base_url}{self._api_prefix}/workflows/{workflow_id}/execute",
+            response = await self._request(
+                endpoint,
+                "POST",
+                f"{self._api_prefix}/workflows/{workflow_id}/execute",
                 json=v2_payload,
                 headers=headers,
-                timeout=timeout,
             )
 
             end_time = time.time()
@@ -421,15 +608,14 @@ class WorkflowEngineHTTPClient:
                 f"📨 HTTP request to get execution status: {execution_id}"
             )
 
-            async with httpx.AsyncClient(timeout=self.query_timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}{self._api_prefix}/executions/{execution_id}"
-                )
-                response.raise_for_status()
+            response = await self._request(
+                "execution_status", "GET", f"{self._api_prefix}/executions/{execution_id}"
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                logging.getLogger(__name__).debug(f"✅ Retrieved execution status: {execution_id}")
-                return data
+            data = response.json()
+            logging.getLogger(__name__).debug(f"✅ Retrieved execution status: {execution_id}")
+            return data
 
         except httpx.HTTPStatusError as e:
             log_error(f"❌ HTTP error getting execution status: {e.response.status_code}")
@@ -446,13 +632,14 @@ class WorkflowEngineHTTPClient:
         try:
             log_info(f"📨 HTTP request to cancel execution: {execution_id}")
 
-            async with httpx.AsyncClient(timeout=self.query_timeout) as client:
-                response = await client.post(f"{self.base_url}/v2/executions/{execution_id}/cancel")
-                response.raise_for_status()
+            response = await self._request(
+                "cancel_execution", "POST", f"{self._api_prefix}/executions/{execution_id}/cancel"
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                log_info(f"✅ Cancelled execution: {execution_id}")
-                return data
+            data = response.json()
+            log_info(f"✅ Cancelled execution: {execution_id}")
+            return data
 
         except httpx.HTTPStatusError as e:
             log_error(f"❌ HTTP error cancelling execution: {e.response.status_code}")
@@ -471,16 +658,17 @@ class WorkflowEngineHTTPClient:
         try:
             log_info(f"📨 HTTP request to get execution history: {workflow_id}")
 
-            async with httpx.AsyncClient(timeout=self.query_timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}{self._api_prefix}/workflows/{workflow_id}/executions",
-                    params={"limit": limit},
-                )
-                response.raise_for_status()
+            response = await self._request(
+                "execution_history",
+                "GET",
+                f"{self._api_prefix}/workflows/{workflow_id}/executions",
+                params={"limit": limit},
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                log_info(f"✅ Retrieved execution history: {workflow_id}")
-                return data
+            data = response.json()
+            log_info(f"✅ Retrieved execution history: {workflow_id}")
+            return data
 
         except httpx.HTTPStatusError as e:
             log_error(f"❌ HTTP error getting execution history: {e.response.status_code}")
@@ -538,12 +726,12 @@ class WorkflowEngineHTTPClient:
             log_info(f"🐛 DEBUG: Update request JSON: {json.dumps(update_data, indent=2)}")
             log_info(f"🐛 DEBUG: URL: {self.base_url}{self._api_prefix}/workflows/{workflow_id}")
 
-            # Use dedicated client with query_timeout for update operations
-            # Complex workflows with many nodes need longer processing time
-            async with httpx.AsyncClient(timeout=self.query_timeout) as client:
-                response = await client.put(
-                    f"{self.base_url}{self._api_prefix}/workflows/{workflow_id}", json=update_data
-                )
+            response = await self._request(
+                "update_workflow",
+                "PUT",
+                f"{self._api_prefix}/workflows/{workflow_id}",
+                json=update_data,
+            )
 
             # Log response details before checking status
             log_info(f"🐛 DEBUG: Response status: {response.status_code}")
@@ -580,16 +768,17 @@ class WorkflowEngineHTTPClient:
         try:
             log_info(f"📨 HTTP request to delete workflow: {workflow_id}")
 
-            async with httpx.AsyncClient(timeout=self.query_timeout) as client:
-                response = await client.delete(
-                    f"{self.base_url}{self._api_prefix}/workflows/{workflow_id}",
-                    params={"user_id": user_id},
-                )
-                response.raise_for_status()
+            response = await self._request(
+                "delete_workflow",
+                "DELETE",
+                f"{self._api_prefix}/workflows/{workflow_id}",
+                params={"user_id": user_id},
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                log_info(f"✅ Deleted workflow: {workflow_id}")
-                return data
+            data = response.json()
+            log_info(f"✅ Deleted workflow: {workflow_id}")
+            return data
 
         except httpx.HTTPStatusError as e:
             log_error(f"❌ HTTP error deleting workflow: {e.response.status_code}")
@@ -628,14 +817,17 @@ class WorkflowEngineHTTPClient:
 
             log_info(f"📨 HTTP request to list workflows using RLS")
 
-            async with httpx.AsyncClient(timeout=self.query_timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}{self._api_prefix}/workflows", params=params, headers=headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                log_info(f"✅ Listed workflows using RLS")
-                return data
+            response = await self._request(
+                "list_workflows",
+                "GET",
+                f"{self._api_prefix}/workflows",
+                params=params,
+                headers=headers,
+            )
+            response.raise_for_status()
+            data = response.json()
+            log_info(f"✅ Listed workflows using RLS")
+            return data
 
         except httpx.HTTPStatusError as e:
             log_error(f"❌ HTTP error listing workflows: {e.response.status_code}")
@@ -661,7 +853,6 @@ class WorkflowEngineHTTPClient:
 
             logging.getLogger(__name__).debug(f"📋 Getting execution logs for: {execution_id}")
 
-            client = await self._get_client()
             headers = {}
             if access_token:
                 headers["Authorization"] = f"Bearer {access_token}"
@@ -673,11 +864,12 @@ class WorkflowEngineHTTPClient:
                     if value is not None:
                         query_params[key] = value
 
-            response = await client.get(
-                f"{self.base_url}{self._api_prefix}/workflows/executions/{execution_id}/logs",
+            response = await self._request(
+                "execution_logs",
+                "GET",
+                f"{self._api_prefix}/workflows/executions/{execution_id}/logs",
                 headers=headers,
                 params=query_params,
-                timeout=self.logs_timeout,  # Use dedicated logs timeout (90s)
             )
             response.raise_for_status()
             result = response.json()
@@ -710,6 +902,7 @@ class WorkflowEngineHTTPClient:
         try:
             log_info(f"📡 Starting log stream for execution: {execution_id}")
 
+            self.breaker.before_call()
             client = await self._get_client()
             headers = {}
             if access_token:
@@ -720,8 +913,14 @@ class WorkflowEngineHTTPClient:
                 "GET",
                 f"{self.base_url}{self._api_prefix}/executions/{execution_id}/logs/stream",
                 headers=headers,
-                timeout=httpx.Timeout(connect=5.0, read=None),  # No read timeout for streaming
+                # No read timeout for streaming
+                timeout=httpx.Timeout(None, connect=5.0, pool=self._pool_timeout),
+                extensions={"trace": self._trace},
             ) as response:
+                if response.status_code in _UNHEALTHY_STATUSES:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
                 response.raise_for_status()
 
                 async for chunk in response.aiter_text():
@@ -737,6 +936,10 @@ class WorkflowEngineHTTPClient:
                             # Skip malformed JSON
                             continue
 
+        except httpx.TransportError as e:
+            self.breaker.record_failure()
+            log_error(f"Error streaming execution logs {execution_id}: {e}")
+            raise
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 log_info(f"📭 Execution {execution_id} not found for streaming")
@@ -0,0 +1,204 @@
+"""
+Tests for local Supabase JWT verification and the in-process verified token cache
+"""
+
+import time
+
+import pytest
+from app.core.config import settings
+from app.main import app
+from app.middleware.auth import authenticate_supabase_user
+from app.services import auth_service
+from app.services.jwt_verifier import (
+    LocalVerificationUnavailable,
+    SupabaseJWTVerifier,
+    TokenVerificationError,
+    VerifiedTokenCache,
+)
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+SECRET = "super-secret-jwt-token-with-at-least-32-characters"
+
+
+def _claims(**overrides):
+    now = int(time.time())
+    claims = {
+        "sub": "user-1",
+        "email": "ada@example.com",
+        "aud": "authenticated",
+        "role": "authenticated",
+        "iat": now,
+        "exp": now + 3600,
+        "user_metadata": {"name": "Ada"},
+    }
+    claims.update(overrides)
+    return claims
+
+
+def _hs256(**overrides):
+    return jwt.encode(_claims(**overrides), SECRET, algorithm="HS256")
+
+
+@pytest.fixture
+def local_auth(monkeypatch):
+    """Route verify_supabase_token through a fresh HS256 verifier and L1 cache."""
+    verifier = SupabaseJWTVerifier(jwt_secret=SECRET)
+    cache = VerifiedTokenCache(max_size=100)
+    remote_calls = []
+
+    async def fake_remote(token, token_hash):
+        remote_calls.append(token)
+        return {"id": "user-1", "sub": "user-1", "email": "ada@example.com"}
+
+    async def no_redis(token_hash):
+        return None
+
+    monkeypatch.setattr(auth_service, "get_jwt_verifier", lambda: verifier)
+    monkeypatch.setattr(auth_service, "get_token_cache", lambda: cache)
+    monkeypatch.setattr(auth_service, "_verify_with_supabase", fake_remote)
+    monkeypatch.setattr(auth_service.cache_service, "get_cached_jwt_validation", no_redis)
+    return verifier, cache, remote_calls
+
+
+class _Request:
+    def __init__(self, path, token):
+        self.url = type("URL", (), {"path": path})()
+        self.method = "GET"
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+
+class TestVerifiedTokenCache:
+    def test_entries_honor_exp_and_size(self):
+        cache = VerifiedTokenCache(max_size=2, max_ttl=1000)
+        cache.put("a", {"sub": "u1"}, exp=110, now=100)
+        cache.put("b", {"sub": "u2"}, now=100)
+        cache.put("c", {"sub": "u1"}, now=100)
+
+        assert cache.get("a", now=101) is None  # evicted as least recently used
+        assert cache.get("c", now=2000) is None  # max_ttl elapsed
+        cache.put("d", {"sub": "u2"}, exp=50, now=100)  # already expired
+        assert cache.get("d", now=100) is None
+        assert cache.invalidate_user("u2") == 1
+
+
+class TestSupabaseJWTVerifier:
+    @pytest.mark.asyncio
+    async def test_hs256_valid_and_invalid(self):
+        verifier = SupabaseJWTVerifier(jwt_secret=SECRET)
+
+        assert (await verifier.verify(_hs256()))["sub"] == "user-1"
+        with pytest.raises(TokenVerificationError):
+            await verifier.verify(_hs256(exp=int(time.time()) - 10))
+        with pytest.raises(TokenVerificationError):
+            await verifier.verify(_hs256(aud="anon"))
+        with pytest.raises(TokenVerificationError):
+            await verifier.verify(jwt.encode(_claims(), "x" * 40, algorithm="HS256"))
+
+    @pytest.mark.asyncio
+    async def test_hs256_without_secret_is_unavailable(self):
+        with pytest.raises(LocalVerificationUnavailable):
+            await SupabaseJWTVerifier().verify(_hs256())
+
+    @pytest.mark.asyncio
+    async def test_rs256_with_jwks_rotation(self, monkeypatch):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_jwk = jwk.construct(
+            private_key.public_key().public_bytes(
+                serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+            ),
+            "RS256",
+        ).to_dict()
+        public_jwk["kid"] = "key-2"
+        token = jwt.encode(_claims(), pem, algorithm="RS256", headers={"kid": "key-2"})
+
+        verifier = SupabaseJWTVerifier(jwks_url="https://example.supabase.co/jwks")
+        fetches = []
+
+        async def fake_refresh():
+            fetches.append(1)
+            verifier._jwks = {"key-2": public_jwk}
+            verifier._jwks_fetched_at = verifier._jwks_attempted_at = time.time()
+            return True
+
+        monkeypatch.setattr(verifier, "refresh_jwks", fake_refresh)
+
+        assert (await verifier.verify(token))["sub"] == "user-1"
+        assert (await verifier.verify(token))["sub"] == "user-1"
+        assert len(fetches) == 1
+
+
+class TestVerifySupabaseToken:
+    @pytest.mark.asyncio
+    async def test_local_verification_skips_remote(self, local_auth):
+        _, cache, remote_calls = local_auth
+        token = _hs256()
+
+        user = await auth_service.verify_supabase_token(token)
+
+        assert user["id"] == "user-1"
+        assert user["user_metadata"] == {"name": "Ada"}
+        assert remote_calls == []
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_signature_is_rejected_without_remote(self, local_auth):
+        _, _, remote_calls = local_auth
+        forged = jwt.encode(_claims(), "y" * 40, algorithm="HS256")
+
+        assert await auth_service.verify_supabase_token(forged) is None
+        assert remote_calls == []
+
+    @pytest.mark.asyncio
+    async def test_revocation_sensitive_check_goes_remote(self, local_auth):
+        _, _, remote_calls = local_auth
+        token = _hs256()
+
+        await auth_service.verify_supabase_token(token)
+        await auth_service.verify_supabase_token(token, require_remote=True)
+
+        assert remote_calls == [token]
+
+    @pytest.mark.asyncio
+    async def test_mounted_integration_routes_go_remote(self, local_auth):
+        _, _, remote_calls = local_auth
+        app_paths = list(app.openapi()["paths"])
+        for prefix in settings.JWT_REMOTE_VERIFY_PATHS:
+            assert any(path.startswith(prefix) for path in app_paths), prefix
+        token = _hs256()
+
+        for path in ["/api/v1/app/workflows", "/api/v1/app/integrations/slack/channels"]:
+            result = await authenticate_supabase_user(_Request(path, token))
+            assert result.success
+
+        assert remote_calls == [token]
+
+    @pytest.mark.asyncio
+    async def test_unavailable_falls_back_to_remote(self, local_auth):
+        verifier, _, remote_calls = local_auth
+        verifier.jwt_secret = None
+        verifier.jwks_url = "https://example.supabase.co/jwks"
+        token = _hs256()
+
+        assert (await auth_service.verify_supabase_token(token))["id"] == "user-1"
+        assert remote_calls == [token]
+
+    @pytest.mark.asyncio
+    async def test_cached_verification_adds_microseconds(self, local_auth):
+        token = _hs256()
+        await auth_service.verify_supabase_token(token)
+
+        rounds = 2000
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await auth_service.verify_supabase_token(token)
+        per_call_us = (time.perf_counter() - start) / rounds * 1e6
+
+        print(f"\nverify_supabase_token L1 hit: {per_call_us:.1f} us/call")
+        assert per_call_us < 1000
@@ -0,0 +1,154 @@
+"""
+Tests for the node spec search index: ranking, prefix/fuzzy subtype matching,
+rebuilds on registry changes, and a relevance/latency benchmark against the
+previous substring scan over the real node specs.
+"""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+from app.services.node_knowledge_service import NodeKnowledgeService
+from app.services.node_search_index import NodeSearchIndex, spec_fields, tokenize
+
+# Query -> subtype a workflow author would expect near the top
+BENCHMARK_QUERIES = {
+    "send a slack message": "SLACK",
+    "http request": "HTTP_REQUEST",
+    "schedule cron": "CRON",
+    "calender event": "GOOGLE_CALENDAR",
+    "vector database memory": "VECTOR_DATABASE",
+    "notion page": "NOTION",
+    "if condition": "IF",
+    "ask a human for approval": "GMAIL_INTERACTION",
+    "claude": "ANTHROPIC_CLAUDE",
+    "gmai": "GMAIL_INTERACTION",
+    "slak": "SLACK",
+    "telegram": "TELEGRAM_ACTION",
+}
+
+
+def substring_scan_search(specs, query, max_results=10):
+    """The previous linear substring scan, kept as the baseline for the benchmark."""
+    query_lower = query.lower()
+    matches = []
+    for spec in specs:
+        fields = spec_fields(spec)
+        score = 10 if query_lower in fields["description"].lower() else 0
+        score += 5 if query_lower in fields["parameters"].lower() else 0
+        score += 3 if query_lower in fields["ports"].lower() else 0
+        if score:
+            matches.append((spec, score))
+    matches.sort(key=lambda m: m[1], reverse=True)
+    return matches[:max_results]
+
+
+def _spec(node_type, subtype, description, tags=None):
+    spec = Mock()
+    spec.node_type = node_type
+    spec.subtype = subtype
+    spec.description = description
+    spec.parameters = []
+    spec.input_ports = []
+    spec.output_ports = []
+    spec.tags = tags or []
+    return spec
+
+
+@pytest.fixture
+def service():
+    return NodeKnowledgeService()
+
+
+def test_tokenize_splits_identifiers_and_folds_plurals():
+    assert tokenize("HTTP_REQUEST sends Requests") == ["http", "request", "send", "request"]
+    assert tokenize("channelId") == ["channel", "id"]
+    assert tokenize(None) == []
+
+
+def test_bm25_ranks_subtype_and_tag_hits_above_passing_mentions():
+    specs = [
+        _spec("ACTION", "DATA_TRANSFORMATION", "Transform data; can post results to slack"),
+        _spec("EXTERNAL_ACTION", "SLACK", "Send messages", tags=["slack", "chat"]),
+        _spec("FLOW", "WAIT", "Wait for a duration"),
+    ]
+    index = NodeSearchIndex(specs, lambda spec: {"subtype": spec.subtype, "detail": True})
+
+    ranked = index.results("slack", include_details=True)
+    assert [r["subtype"] for r in ranked] == ["SLACK", "DATA_TRANSFORMATION"]
+    assert ranked[0]["detail"] is True and ranked[0]["relevance_score"] > 0
+
+    assert index.results("slak")[0]["subtype"] == "SLACK"  # fuzzy
+    assert index.results("transf")[0]["subtype"] == "DATA_TRANSFORMATION"  # prefix
+    # Most terms of a long query must match
+    assert index.results("nonexistent slack functionality xyz") == []
+
+
+def test_index_is_reused_until_registry_specs_change():
+    registry = Mock()
+    first = [_spec("FLOW", "WAIT", "Wait for a duration")]
+    registry.list_all_specs.return_value = first
+    service = NodeKnowledgeService()
+    service.registry = registry
+
+    assert service.warm_search_index() == 1
+    index = service._search_index
+    assert service.search_nodes("wait")[0]["subtype"] == "WAIT"
+    assert service._search_index is index
+
+    registry.list_all_specs.return_value = first + [_spec("FLOW", "DELAY", "Delay then wait")]
+    assert {r["subtype"] for r in service.search_nodes("wait")} == {"WAIT", "DELAY"}
+    assert service._search_index is not index
+
+
+def test_returned_payloads_are_copies(service):
+    first = service.search_nodes("http request", include_details=True)[0]
+    first["description"] = "mutated"
+    assert service.search_nodes("http request", include_details=True)[0]["description"] != (
+        "mutated"
+    )
+
+
+def test_benchmark_against_substring_scan(service):
+    """Relevance (hit@3) of the index versus the previous linear scan, and its query cache."""
+    specs = service.registry.list_all_specs()
+    service.warm_search_index()
+    index = service._search_index
+
+    def hit_at_3(subtypes, expected):
+        return expected in subtypes[:3]
+
+    new_hits = sum(
+        hit_at_3([r["subtype"] for r in service.search_nodes(q, max_results=3)], expected)
+        for q, expected in BENCHMARK_QUERIES.items()
+    )
+    old_hits = sum(
+        hit_at_3([spec.subtype for spec, _ in substring_scan_search(specs, q, 3)], expected)
+        for q, expected in BENCHMARK_QUERIES.items()
+    )
+    assert new_hits >= len(BENCHMARK_QUERIES) - 1
+    assert new_hits > old_hits
+
+    rounds = 50
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for q in BENCHMARK_QUERIES:
+            index._rank(q, 10)  # uncached ranking
+    index_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for q in BENCHMARK_QUERIES:
+            substring_scan_search(specs, q, 10)
+    scan_seconds = time.perf_counter() - started
+
+    print(
+        f"\nnode search over {len(specs)} specs: hit@3 {new_hits}/{len(BENCHMARK_QUERIES)} "
+        f"(scan {old_hits}), {index_seconds / rounds / len(BENCHMARK_QUERIES) * 1e6:.0f}us/query "
+        f"(scan {scan_seconds / rounds / len(BENCHMARK_QUERIES) * 1e6:.0f}us)"
+    )
+    # Timings are informational only; repeat queries must be answered from the
+    # query cache with exactly the uncached ranking
+    for q in BENCHMARK_QUERIES:
+        ranked = index.search(q, 10)
+        assert index.search(q, 10) is ranked
+        assert ranked == index._rank(q, 10)
@@ -0,0 +1,197 @@
+"""
+Tests for concurrent, rate-limited Notion retrieval against a local fake Notion server
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from app.api.mcp.notion_tools import NotionMCPService
+from app.services.notion_retrieval import AsyncTokenBucket, NotionClientPool, NotionRetriever
+
+from shared.sdks.notion_sdk import NotionClient
+from shared.sdks.transport import ProviderTransport
+
+USER = {"object": "user", "id": "user-1"}
+EDITED = "2025-01-01T00:00:00.000Z"
+
+
+def _block(block_id, text, has_children=False, block_type="toggle"):
+    return {
+        "object": "block",
+        "id": block_id,
+        "type": block_type,
+        "has_children": has_children,
+        "created_time": EDITED,
+        "created_by": USER,
+        "last_edited_time": EDITED,
+        "last_edited_by": USER,
+        block_type: {"rich_text": [{"plain_text": text}]},
+    }
+
+
+class FakeNotion:
+    """Serves pages and nested toggles with a fixed latency and records request times."""
+
+    def __init__(self, pages=3, depth=3, fanout=2, latency=0.02):
+        self.latency = latency
+        self.requests = []
+        self.page_edited = {}
+        self.children = {}
+        for p in range(pages):
+            page_id = f"page-{p}"
+            self.page_edited[page_id] = EDITED
+            self._grow(page_id, depth, fanout)
+
+    def _grow(self, parent, depth, fanout):
+        blocks = []
+        for i in range(fanout):
+            block_id = f"{parent}.{i}"
+            blocks.append(_block(block_id, f"text {block_id}", has_children=depth > 1))
+            if depth > 1:
+                self._grow(block_id, depth - 1, fanout)
+        self.children[parent] = blocks
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(time.monotonic())
+        await asyncio.sleep(self.latency)
+        parts = request.url.path.strip("/").split("/")  # v1/<kind>/<id>[/children]
+        if parts[1] == "pages":
+            page_id = parts[2]
+            return httpx.Response(
+                200,
+                json={
+                    "object": "page",
+                    "id": page_id,
+                    "created_time": EDITED,
+                    "created_by": USER,
+                    "last_edited_time": self.page_edited[page_id],
+                    "last_edited_by": USER,
+                    "url": f"https://notion.so/{page_id}",
+                    "parent": {"type": "workspace", "workspace": True},
+                    "properties": {},
+                },
+            )
+
+        # Paginate children one block per response to exercise cursors
+        blocks = self.children.get(parts[2], [])
+        start = int(request.url.params.get("start_cursor") or 0)
+        has_more = start + 1 < len(blocks)
+        return httpx.Response(
+            200,
+            json={
+                "object": "list",
+                "results": blocks[start : start + 1],
+                "next_cursor": str(start + 1) if has_more else None,
+                "has_more": has_more,
+            },
+        )
+
+    def client(self, token, limiter):
+        transport = ProviderTransport("notion", http_transport=httpx.MockTransport(self.handler))
+        return NotionClient(auth_token=token, rate_limiter=limiter, transport=transport)
+
+
+@pytest.fixture
+def service():
+    fake = FakeNotion()
+    service = NotionMCPService()
+    # Fast budget so the test stays quick; production uses Notion's 3 rps
+    service._clients = NotionClientPool(fake.client, rate=40, burst=4)
+    yield service, fake
+
+
+async def _retrieve(service, page_ids):
+    client = await service._clients.get("secret_token")
+    return await service._retrieve_documents(
+        client,
+        {"page_ids": page_ids, "include_children": True, "content_format": "structured"},
+    )
+
+
+class TestNotionRetrieval:
+    @pytest.mark.asyncio
+    async def test_retrieves_nested_tree_and_caches_unchanged_pages(self, service):
+        service, fake = service
+
+        result = await _retrieve(service, ["page-0", "page-1", "page-2"])
+
+        assert result["successful_retrievals"] == 3
+        root = result["documents"][0]["content"]
+        assert [b["content"] for b in root] == ["text page-0.0", "text page-0.1"]
+        assert root[0]["children"][1]["children"][0]["id"] == "page-0.0.1.0"
+        # 3 pages x (1 page + 7 parents x 2 paginated calls)
+        assert len(fake.requests) == 45
+
+        fake.requests.clear()
+        await _retrieve(service, ["page-0", "page-1", "page-2"])
+        assert len(fake.requests) == 3  # only the page lookups
+
+        fake.page_edited["page-1"] = "2025-01-02T00:00:00.000Z"
+        fake.requests.clear()
+        await _retrieve(service, ["page-0", "page-1", "page-2"])
+        assert len(fake.requests) == 3 + 14
+
+    @pytest.mark.asyncio
+    async def test_requests_stay_within_budget_and_overlap(self, service):
+        service, fake = service
+
+        start = time.monotonic()
+        await _retrieve(service, ["page-0", "page-1", "page-2"])
+        elapsed = time.monotonic() - start
+
+        # Serial retrieval would take 45 x 20 ms; the 40 rps budget allows ~1.0 s
+        assert elapsed < 45 * fake.latency + 0.5
+        window = [t for t in fake.requests if t - fake.requests[0] < 0.5]
+        assert len(window) <= 4 + 40 * 0.5 + 1
+
+    @pytest.mark.asyncio
+    async def test_pool_reuses_client_per_token(self, service):
+        service, _ = service
+
+        first = await service._clients.get("secret_a")
+        assert await service._clients.get("secret_a") is first
+        assert await service._clients.get("secret_b") is not first
+
+        await service.close()
+        assert len(service._clients) == 0
+
+
+class TestAsyncTokenBucket:
+    @pytest.mark.asyncio
+    async def test_paces_and_pauses_after_429(self):
+        bucket = AsyncTokenBucket(rate=20, burst=2)
+
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        assert time.monotonic() - start >= 4 / 20 - 0.02
+
+        bucket.penalize(0.1)
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start >= 0.09
+
+
+def test_retriever_skips_child_pages():
+    class Block:
+        def __init__(self, block_type):
+            self.id = block_type
+            self.type = block_type
+            self.has_children = True
+
+    class Client:
+        def __init__(self):
+            self.calls = []
+
+        async def get_block_children(self, block_id, start_cursor=None):
+            self.calls.append(block_id)
+            if block_id == "root":
+                return {"blocks": [Block("child_page"), Block("toggle")]}
+            return {"blocks": []}
+
+    client = Client()
+    asyncio.run(NotionRetriever().get_block_tree(client, "root"))
+
+    assert client.calls == ["root", "toggle"]
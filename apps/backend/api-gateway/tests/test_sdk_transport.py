@@ -0,0 +1,159 @@
+"""
+Tests for the shared SDK transport: pooling, adaptive rate limiting and retries
+"""
+
+import time
+
+import httpx
+import pytest
+
+from shared.sdks.transport import (
+    AdaptiveRateLimiter,
+    ProviderTransport,
+    RetryPolicy,
+    throttle_delay,
+)
+
+FAST_RETRY = RetryPolicy(max_retries=3, base_delay=0.001, max_delay=0.01)
+
+
+def _transport(handler, **kwargs):
+    return ProviderTransport(
+        "test", retry=FAST_RETRY, http_transport=httpx.MockTransport(handler), **kwargs
+    )
+
+
+class TestAsyncTransport:
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_only_that_credential(self):
+        calls = []
+
+        async def handler(request):
+            calls.append((request.headers["Authorization"], time.monotonic()))
+            if request.headers["Authorization"] == "Bearer a" and len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0.2"})
+            return httpx.Response(200, json={"ok": True})
+
+        transport = _transport(handler)
+        start = time.monotonic()
+        response = await transport.request(
+            "POST", "https://x/y", headers={"Authorization": "Bearer a"}
+        )
+        assert response.status_code == 200
+        assert calls[1][1] - start >= 0.19
+
+        other = time.monotonic()
+        await transport.request("GET", "https://x/y", headers={"Authorization": "Bearer b"})
+        assert time.monotonic() - other < 0.1
+
+        metrics = transport.metrics.snapshot()
+        assert metrics["throttled"] == 1
+        assert metrics["retries"] == 1
+        assert metrics["status_counts"] == {429: 1, 200: 2}
+
+    @pytest.mark.asyncio
+    async def test_exhausted_remaining_holds_back_the_next_request(self):
+        responses = [
+            httpx.Response(
+                200, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.15"}
+            ),
+            httpx.Response(200),
+        ]
+
+        async def handler(request):
+            return responses.pop(0)
+
+        transport = _transport(handler)
+        await transport.request("GET", "https://x/y", headers={"Authorization": "t"})
+        start = time.monotonic()
+        await transport.request("GET", "https://x/y", headers={"Authorization": "t"})
+
+        assert time.monotonic() - start >= 0.14
+
+    @pytest.mark.asyncio
+    async def test_server_errors_retry_only_idempotent_methods(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request.method)
+            return httpx.Response(503)
+
+        transport = _transport(handler)
+        assert (await transport.request("POST", "https://x/y")).status_code == 503
+        assert (await transport.request("GET", "https://x/y")).status_code == 503
+
+        assert calls == ["POST"] + ["GET"] * 4
+
+    @pytest.mark.asyncio
+    async def test_connection_failures_retry_then_raise(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(1)
+            if len(calls) < 3:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200)
+
+        transport = _transport(handler)
+        assert (await transport.request("POST", "https://x/y")).status_code == 200
+
+        async def down(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        with pytest.raises(httpx.ConnectError):
+            await _transport(down).request("GET", "https://x/y", max_retries=1)
+
+    @pytest.mark.asyncio
+    async def test_client_is_pooled_per_loop(self):
+        transport = ProviderTransport("test")
+        client = transport.async_client()
+        assert transport.async_client() is client
+
+        await transport.aclose()
+        assert client.is_closed
+        assert transport.async_client() is not client
+        await transport.aclose()
+
+
+def test_sync_requests_share_retry_handling():
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"ok": True})
+
+    transport = _transport(handler)
+    response = transport.request_sync("POST", "https://slack.com/api/chat.postMessage", json={})
+
+    assert response.json() == {"ok": True}
+    assert transport.metrics.retries == 1
+    transport.close_sync()
+
+
+def test_long_retry_after_is_returned_to_the_caller():
+    transport = _transport(lambda request: httpx.Response(429, headers={"Retry-After": "3600"}))
+
+    assert transport.request_sync("GET", "https://x/y").status_code == 429
+    assert transport.metrics.retries == 0
+
+
+def test_throttle_delay_understands_provider_headers():
+    github = httpx.Response(
+        403,
+        headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 30)},
+    )
+    assert 28 <= throttle_delay(github) <= 30
+    assert throttle_delay(httpx.Response(429, headers={"Retry-After": "7"})) == 7
+    assert throttle_delay(httpx.Response(200, headers={"X-RateLimit-Remaining": "5"})) is None
+
+
+def test_limiter_paces_to_rate_after_burst():
+    limiter = AdaptiveRateLimiter(rate=20, burst=2)
+
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire_sync()
+
+    assert time.monotonic() - start >= 4 / 20 - 0.02
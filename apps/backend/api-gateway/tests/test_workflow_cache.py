@@ -0,0 +1,192 @@
+"""
+Tests for the bounded workflow cache, single-flight loading and cross-replica invalidation
+"""
+
+import asyncio
+
+import pytest
+from app.services.workflow_cache import ByteLRUCache, InProcessInvalidationBus, WorkflowCache
+
+
+def _workflow(workflow_id: str, size: int = 10):
+    return {"found": True, "workflow": {"id": workflow_id, "nodes": ["x" * size]}}
+
+
+class TestByteLRUCache:
+    def test_evicts_by_bytes_and_expires(self):
+        cache = ByteLRUCache(max_bytes=250, default_ttl=10)
+        cache.put("a", _workflow("a", 60), now=0)
+        cache.put("b", _workflow("b", 60), now=0)
+        assert cache.get("a", now=1) is not None  # a is now most recently used
+        cache.put("c", _workflow("c", 60), now=1)
+
+        assert "b" not in cache
+        assert cache.current_bytes <= 250
+        assert cache.get("a", now=11) is None
+        assert not cache.put("huge", _workflow("huge", 500))
+
+    def test_reads_are_independent_copies(self):
+        cache = ByteLRUCache(max_bytes=1000, default_ttl=10)
+        cache.put("a", _workflow("a"))
+        cache.get("a")["workflow"]["nodes"].clear()
+
+        assert cache.get("a")["workflow"]["nodes"] == ["x" * 10]
+
+
+class TestWorkflowCache:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_load_once(self):
+        cache = WorkflowCache()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return _workflow("wf1")
+
+        key = cache.workflow_key("wf1", "u1")
+        results = await asyncio.gather(*(cache.get_or_load(key, loader) for _ in range(20)))
+
+        assert len(calls) == 1
+        assert all(r["workflow"]["id"] == "wf1" for r in results)
+        assert results[0] is not results[1]
+        assert await cache.get_or_load(key, loader) == results[0]
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_and_uncacheable_loads_are_not_cached(self):
+        cache = WorkflowCache()
+
+        async def failing():
+            raise RuntimeError("engine down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", failing)
+
+        async def empty():
+            return {"workflows": []}
+
+        await cache.get_or_load("k", empty, cacheable=lambda page: bool(page["workflows"]))
+        assert cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_replicas(self):
+        bus = InProcessInvalidationBus()
+        replica_a, replica_b = WorkflowCache(bus=bus), WorkflowCache(bus=bus)
+        for replica in (replica_a, replica_b):
+            replica.put(replica.workflow_key("wf1", "u1"), _workflow("wf1"))
+            replica.put(replica.listing_key("u1", True, None, 50, 0), {"workflows": [1]})
+
+        await replica_a.invalidate("wf1", "u1")
+
+        for replica in (replica_a, replica_b):
+            assert replica.get(replica.workflow_key("wf1", "u1")) is None
+            assert replica.get(replica.listing_key("u1", True, None, 50, 0)) is None
+
+    @pytest.mark.asyncio
+    async def test_load_straddling_an_invalidation_is_not_cached(self):
+        cache = WorkflowCache()
+        key = cache.workflow_key("wf1", "u1")
+
+        async def slow_loader():
+            await asyncio.sleep(0.01)
+            return _workflow("wf1")
+
+        load = asyncio.create_task(cache.get_or_load(key, slow_loader))
+        await asyncio.sleep(0)
+        await cache.invalidate("wf1", "u1")
+        await load
+
+        assert cache.get(key) is None
+
+
+class TestWorkflowEndpointCaching:
+    @pytest.fixture
+    def endpoints(self, monkeypatch):
+        from app.api.app import workflows
+
+        cache = WorkflowCache()
+        monkeypatch.setattr(workflows, "get_workflow_cache", lambda: cache)
+        return workflows, cache
+
+    @staticmethod
+    def _deps():
+        from types import SimpleNamespace
+
+        return SimpleNamespace(
+            current_user=SimpleNamespace(sub="u1"),
+            access_token="jwt-token",
+            request=SimpleNamespace(state=SimpleNamespace(trace_id=None)),
+        )
+
+    def test_in_progress_runs_and_deployments_are_not_cached(self, endpoints):
+        workflows, _ = endpoints
+        settled = {"workflow": {"metadata": {"deployment_status": "DEPLOYED"}}}
+        running = {"workflow": {"metadata": {"last_execution_status": "RUNNING"}}}
+        deploying = {"workflow": {"deployment_status": "deploying"}}
+
+        assert workflows._cacheable_workflow(settled)
+        assert not workflows._cacheable_workflow(running)
+        assert not workflows._cacheable_workflow(deploying)
+        assert workflows._cacheable_listing({"workflows": [{"latest_execution_status": "SUCCESS"}]})
+        assert not workflows._cacheable_listing(
+            {
+                "workflows": [
+                    {"latest_execution_status": "SUCCESS"},
+                    {"latest_execution_status": "RUNNING"},
+                ]
+            }
+        )
+
+    @pytest.mark.asyncio
+    async def test_execute_invalidates_the_cached_workflow(self, endpoints, monkeypatch):
+        from app.models import WorkflowExecutionRequest
+
+        workflows, cache = endpoints
+        key = cache.workflow_key("wf1", "u1")
+        cache.put(key, _workflow("wf1"))
+
+        class Engine:
+            async def execute_workflow(self, workflow_id, user_id, inputs, **kwargs):
+                return {"success": True, "execution_id": "e1", "execution": {"status": "RUNNING"}}
+
+        async def engine_client():
+            return Engine()
+
+        monkeypatch.setattr(workflows, "get_workflow_engine_client", engine_client)
+        await workflows.execute_workflow("wf1", WorkflowExecutionRequest(inputs={}), self._deps())
+
+        assert cache.get(key) is None
+
+    @pytest.mark.asyncio
+    async def test_deploy_fetches_the_workflow_with_the_callers_token(self, endpoints, monkeypatch):
+        workflows, cache = endpoints
+        tokens = []
+
+        class Engine:
+            async def get_workflow(self, workflow_id, access_token):
+                tokens.append(access_token)
+                return _workflow(workflow_id)
+
+        class Scheduler:
+            async def deploy_workflow(self, workflow_id, user_id, trace_id=None):
+                return {"success": True, "deployment_id": "d1", "status": "DEPLOYED"}
+
+        async def engine_client():
+            return Engine()
+
+        async def scheduler_client():
+            return Scheduler()
+
+        async def no_credentials(workflow_data, user_id):
+            return workflow_data
+
+        monkeypatch.setattr(workflows, "get_workflow_engine_client", engine_client)
+        monkeypatch.setattr(workflows, "get_workflow_scheduler_client", scheduler_client)
+        monkeypatch.setattr(workflows, "_inject_oauth_credentials", no_credentials)
+
+        result = await workflows.deploy_workflow("wf1", self._deps())
+
+        assert tokens == ["jwt-token"]
+        assert result.deployment_id == "d1"
+        assert cache.get(cache.workflow_key("wf1", "u1")) is None
@@ -0,0 +1,126 @@
+"""
+Tests for the pooled workflow engine HTTP client: connection reuse, per-endpoint
+timeouts and the circuit breaker
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.workflow_engine_http_client import WorkflowEngineHTTPClient
+
+
+async def _start_engine_stub(connections):
+    """Minimal keep-alive HTTP/1.1 server that counts accepted connections."""
+
+    async def handle(reader, writer):
+        connections.append(1)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        await reader.readexactly(int(line.split(b":")[1]))
+                body = b'{"status": "RUNNING"}'
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def _mock_client(handler):
+    client = WorkflowEngineHTTPClient()
+    client.base_url = "http://engine"
+    client._transport = httpx.MockTransport(handler)
+    client.connected = True
+    return client
+
+
+class TestWorkflowEngineHTTPClient:
+    @pytest.mark.asyncio
+    async def test_calls_reuse_pooled_connections(self):
+        connections = []
+        server, port = await _start_engine_stub(connections)
+        client = WorkflowEngineHTTPClient()
+        client.base_url = f"http://127.0.0.1:{port}"
+        try:
+            await client.start()
+            for i in range(20):
+                assert (await client.get_execution_status(f"exec-{i}"))["status"] == "RUNNING"
+            await asyncio.gather(*(client.get_execution_status(f"c-{i}") for i in range(10)))
+
+            stats = client.get_stats()
+            assert len(connections) <= 11
+            assert stats["connections_opened"] == len(connections)
+            assert stats["requests"] == 31
+            assert stats["connection_reuse_ratio"] >= 0.6
+            assert stats["endpoints"]["execution_status"]["requests"] == 30
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_endpoints_use_their_own_timeouts(self):
+        seen = {}
+
+        async def handler(request):
+            seen[request.url.path] = request.extensions["timeout"]
+            return httpx.Response(200, json={"execution_id": "e1", "workflows": []})
+
+        client = _mock_client(handler)
+        await client.execute_workflow("wf1", "u1", async_execution=True)
+        await client.get_execution_status("e1")
+        await client.close()
+
+        assert seen["/v2/workflows/wf1/execute"]["read"] == 10.0
+        assert seen["/v2/executions/e1"]["read"] == 10.0
+        assert seen["/v2/executions/e1"]["pool"] == client._pool_timeout
+
+    @pytest.mark.asyncio
+    async def test_breaker_stops_calls_to_a_failing_engine(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(503)
+
+        client = _mock_client(handler)
+        client.breaker = CircuitBreaker("workflow_engine", failure_threshold=3, recovery_timeout=60)
+
+        for _ in range(10):
+            result = await client.get_execution_status("e1")
+            assert result["success"] is False
+
+        assert len(calls) == 3
+        assert "circuit open" in result["error"]
+        assert client.get_stats()["endpoints"]["execution_status"]["rejected"] == 7
+        await client.close()
+
+
+def test_breaker_half_opens_after_recovery_timeout():
+    breaker = CircuitBreaker("engine", failure_threshold=2, recovery_timeout=0.05)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
@@ -0,0 +1,45 @@
+"""
+Node Spec Snapshot Builder
+
+Regenerates shared/node_specs/registry_snapshot.json, the prebuilt index
+(type, subtype, name, description, tags, configuration schema, params) that
+lets services list node specs without importing every spec module. Run it
+after adding or changing a node spec.
+
+Usage:
+    python scripts/build_node_spec_snapshot.py          # Rewrite the snapshot
+    python scripts/build_node_spec_snapshot.py --check  # Exit 1 if it is stale
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shared.node_specs import SPEC_SOURCES, __version__
+from shared.node_specs.loader import SNAPSHOT_PATH, read_snapshot, write_snapshot
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the node spec registry snapshot")
+    parser.add_argument(
+        "--check", action="store_true", help="Only verify that the snapshot is up to date"
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        if read_snapshot(SPEC_SOURCES, __version__) is None:
+            print(f"❌ {SNAPSHOT_PATH} is missing or stale; run this script to rebuild it")
+            return 1
+        print(f"✅ {SNAPSHOT_PATH} is up to date")
+        return 0
+
+    snapshot = write_snapshot(SPEC_SOURCES, __version__)
+    print(f"✅ Wrote {len(snapshot['specs'])} node specs to {SNAPSHOT_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,13 +7,16 @@ across all backend services in the workflow_engine_v2 architecture.
 
 import logging
 import os
-from typing import Optional
+from typing import Any, Optional
 
 from supabase import Client, create_client
 from supabase.lib.client_options import ClientOptions
 
 logger = logging.getLogger(__name__)
 
+# PostgREST "function not found in the schema cache" and PostgreSQL undefined_function
+MISSING_FUNCTION_ERROR_CODES = ("PGRST202", "42883")
+
 
 def create_supabase_client() -> Optional[Client]:
     """
@@ -106,4 +109,24 @@ def create_user_supabase_client(access_token: str) -> Optional[Client]:
         return None
 
 
-__all__ = ["create_supabase_client", "create_supabase_anon_client", "create_user_supabase_client"]
+def is_missing_function_error(error: Any) -> bool:
+    """
+    Whether an RPC failed because the SQL function does not exist (migration not applied).
+
+    Accepts the raised exception or its string form; anything else (timeouts, constraint
+    violations, permission errors) is a failure of that call only.
+    """
+    code = getattr(error, "code", None)
+    if code in MISSING_FUNCTION_ERROR_CODES:
+        return True
+    text = str(error)
+    return any(code in text for code in MISSING_FUNCTION_ERROR_CODES)
+
+
+__all__ = [
+    "MISSING_FUNCTION_ERROR_CODES",
+    "create_supabase_client",
+    "create_supabase_anon_client",
+    "create_user_supabase_client",
+    "is_missing_function_error",
+]
@@ -1,6 +1,13 @@
-# ACTION node specifications
-from .DATA_TRANSFORMATION import DATA_TRANSFORMATION_ACTION_SPEC
-from .HTTP_REQUEST import HTTP_REQUEST_ACTION_SPEC
+# ACTION node specifications (imported on first access)
+from ..loader import lazy_exports
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "DATA_TRANSFORMATION_ACTION_SPEC": "DATA_TRANSFORMATION",
+        "HTTP_REQUEST_ACTION_SPEC": "HTTP_REQUEST",
+    },
+)
 
 __all__ = [
     "HTTP_REQUEST_ACTION_SPEC",
@@ -1,14 +1,15 @@
-# AI_AGENT node specifications
-from .OPENAI_CHATGPT import OPENAI_CHATGPT_SPEC
+# AI_AGENT node specifications (imported on first access)
+from ..loader import lazy_exports
 
-try:
-    from .ANTHROPIC_CLAUDE import ANTHROPIC_CLAUDE_SPEC  # type: ignore
-except Exception:  # pragma: no cover - optional spec may have JSON-like examples
-    ANTHROPIC_CLAUDE_SPEC = None  # type: ignore
-try:
-    from .GOOGLE_GEMINI import GOOGLE_GEMINI_SPEC  # type: ignore
-except Exception:  # pragma: no cover - optional spec may have JSON-like examples
-    GOOGLE_GEMINI_SPEC = None  # type: ignore
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "OPENAI_CHATGPT_SPEC": "OPENAI_CHATGPT",
+        "ANTHROPIC_CLAUDE_SPEC": "ANTHROPIC_CLAUDE",
+        "GOOGLE_GEMINI_SPEC": "GOOGLE_GEMINI",
+    },
+    optional=("ANTHROPIC_CLAUDE_SPEC", "GOOGLE_GEMINI_SPEC"),
+)
 
 __all__ = [
     "OPENAI_CHATGPT_SPEC",
@@ -1,5 +1,12 @@
-# EXTERNAL_ACTION node specifications
-from .SLACK import SLACK_EXTERNAL_ACTION_SPEC
+# EXTERNAL_ACTION node specifications (imported on first access)
+from ..loader import lazy_exports
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "SLACK_EXTERNAL_ACTION_SPEC": "SLACK",
+    },
+)
 
 __all__ = [
     "SLACK_EXTERNAL_ACTION_SPEC",
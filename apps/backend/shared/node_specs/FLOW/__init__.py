@@ -1,11 +1,18 @@
-# FLOW node specifications
-from .DELAY import DELAY_FLOW_SPEC
-from .FILTER import FILTER_FLOW_SPEC
-from .IF import IF_FLOW_SPEC
-from .LOOP import LOOP_FLOW_SPEC
-from .MERGE import MERGE_FLOW_SPEC
-from .SORT import SORT_FLOW_SPEC
-from .WAIT import WAIT_FLOW_SPEC
+# FLOW node specifications (imported on first access)
+from ..loader import lazy_exports
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "DELAY_FLOW_SPEC": "DELAY",
+        "FILTER_FLOW_SPEC": "FILTER",
+        "IF_FLOW_SPEC": "IF",
+        "LOOP_FLOW_SPEC": "LOOP",
+        "MERGE_FLOW_SPEC": "MERGE",
+        "SORT_FLOW_SPEC": "SORT",
+        "WAIT_FLOW_SPEC": "WAIT",
+    },
+)
 
 __all__ = [
     "IF_FLOW_SPEC",
@@ -1,5 +1,12 @@
-# HUMAN_IN_THE_LOOP node specifications
-from .SLACK_INTERACTION import SLACK_INTERACTION_SPEC
+# HUMAN_IN_THE_LOOP node specifications (imported on first access)
+from ..loader import lazy_exports
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "SLACK_INTERACTION_SPEC": "SLACK_INTERACTION",
+    },
+)
 
 __all__ = [
     "SLACK_INTERACTION_SPEC",
@@ -1,7 +1,14 @@
-# MEMORY node specifications
-from .CONVERSATION_BUFFER import CONVERSATION_BUFFER_MEMORY_SPEC
-from .KEY_VALUE_STORE import KEY_VALUE_STORE_MEMORY_SPEC
-from .VECTOR_DATABASE import VECTOR_DATABASE_MEMORY_SPEC
+# MEMORY node specifications (imported on first access)
+from ..loader import lazy_exports
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "CONVERSATION_BUFFER_MEMORY_SPEC": "CONVERSATION_BUFFER",
+        "KEY_VALUE_STORE_MEMORY_SPEC": "KEY_VALUE_STORE",
+        "VECTOR_DATABASE_MEMORY_SPEC": "VECTOR_DATABASE",
+    },
+)
 
 __all__ = [
     "VECTOR_DATABASE_MEMORY_SPEC",
@@ -1,9 +1,16 @@
-# TOOL node specifications
-from .DISCORD_MCP_TOOL import DISCORD_MCP_TOOL_SPEC
-from .FIRECRAWL_MCP_TOOL import FIRECRAWL_MCP_TOOL_SPEC
-from .GOOGLE_CALENDAR_MCP_TOOL import GOOGLE_CALENDAR_MCP_TOOL_SPEC
-from .NOTION_MCP_TOOL import NOTION_MCP_TOOL_SPEC
-from .SLACK_MCP_TOOL import SLACK_MCP_TOOL_SPEC
+# TOOL node specifications (imported on first access)
+from ..loader import lazy_exports
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "DISCORD_MCP_TOOL_SPEC": "DISCORD_MCP_TOOL",
+        "FIRECRAWL_MCP_TOOL_SPEC": "FIRECRAWL_MCP_TOOL",
+        "GOOGLE_CALENDAR_MCP_TOOL_SPEC": "GOOGLE_CALENDAR_MCP_TOOL",
+        "NOTION_MCP_TOOL_SPEC": "NOTION_MCP_TOOL",
+        "SLACK_MCP_TOOL_SPEC": "SLACK_MCP_TOOL",
+    },
+)
 
 __all__ = [
     "NOTION_MCP_TOOL_SPEC",
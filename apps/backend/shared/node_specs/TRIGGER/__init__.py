@@ -1,10 +1,17 @@
-# TRIGGER node specifications
-from .CRON import CRON_TRIGGER_SPEC
-from .EMAIL import EMAIL_TRIGGER_SPEC
-from .GITHUB import GITHUB_TRIGGER_SPEC
-from .MANUAL import MANUAL_TRIGGER_SPEC
-from .SLACK import SLACK_TRIGGER_SPEC
-from .WEBHOOK import WEBHOOK_TRIGGER_SPEC
+# TRIGGER node specifications (imported on first access)
+from ..loader import lazy_exports
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "CRON_TRIGGER_SPEC": "CRON",
+        "EMAIL_TRIGGER_SPEC": "EMAIL",
+        "GITHUB_TRIGGER_SPEC": "GITHUB",
+        "MANUAL_TRIGGER_SPEC": "MANUAL",
+        "SLACK_TRIGGER_SPEC": "SLACK",
+        "WEBHOOK_TRIGGER_SPEC": "WEBHOOK",
+    },
+)
 
 __all__ = [
     "MANUAL_TRIGGER_SPEC",
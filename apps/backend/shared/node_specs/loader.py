@@ -0,0 +1,293 @@
+"""
+Lazy loading for the node spec registry.
+
+Importing every spec module (and building its pydantic model) costs each
+service a noticeable amount of cold-start time, although a process usually
+needs only a handful of specs. The registry therefore:
+
+- knows which attribute of which module defines each spec (``SPEC_SOURCES`` in
+  ``shared.node_specs``; the ``TYPE.SUBTYPE`` key is also the module path) and
+  imports a module only when that spec is looked up;
+- reads a prebuilt, versioned snapshot (``registry_snapshot.json``) with each
+  spec's type, subtype, name, description, tags, configuration schema and
+  input/output params, so listing keys and summaries needs no spec imports.
+
+The snapshot records a fingerprint of the spec sources. If it is missing or
+stale, the registry logs a warning and falls back to importing spec modules.
+Regenerate it after changing a spec::
+
+    python scripts/build_node_spec_snapshot.py
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PACKAGE = __name__.rsplit(".", 1)[0]
+PACKAGE_DIR = Path(__file__).resolve().parent
+SNAPSHOT_PATH = PACKAGE_DIR / "registry_snapshot.json"
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Files besides the spec modules whose changes can alter a snapshot
+_EXTRA_SOURCES = (
+    PACKAGE_DIR / "base.py",
+    PACKAGE_DIR.parent / "models" / "node_enums.py",
+)
+
+# BaseNodeSpec fields kept in the snapshot (examples are large and rarely needed)
+SUMMARY_FIELDS = (
+    "name",
+    "description",
+    "version",
+    "tags",
+    "configurations",
+    "input_params",
+    "output_params",
+    "attached_nodes",
+)
+
+
+def load_spec_attribute(module: str, attribute: str, package: str = PACKAGE) -> Any:
+    """Import ``package.module`` and return ``attribute`` from it."""
+    return getattr(import_module(f"{package}.{module}"), attribute)
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str], optional: Iterable[str] = ()
+) -> Callable[[str], Any]:
+    """Module ``__getattr__`` (PEP 562) that imports spec constants on first access.
+
+    ``exports`` maps an attribute name to the submodule defining it; names in
+    ``optional`` resolve to None when their module fails to import.
+    """
+    optional = frozenset(optional)
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        try:
+            return load_spec_attribute(exports[name], name, package)
+        except Exception:
+            if name in optional:
+                return None
+            raise
+
+    return __getattr__
+
+
+@dataclass(frozen=True)
+class NodeSpecSummary:
+    """Snapshot entry of a node spec, usable where the full spec object is not needed."""
+
+    type: str
+    subtype: str
+    attribute: str
+    name: str = ""
+    description: str = ""
+    version: str = ""
+    tags: List[str] = field(default_factory=list)
+    configurations: Dict[str, Any] = field(default_factory=dict)
+    input_params: Dict[str, Any] = field(default_factory=dict)
+    output_params: Dict[str, Any] = field(default_factory=dict)
+    attached_nodes: Optional[List[str]] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.type}.{self.subtype}"
+
+    @classmethod
+    def from_spec(cls, spec: Any, attribute: str) -> "NodeSpecSummary":
+        data = spec.model_dump(mode="json", include=set(SUMMARY_FIELDS) | {"type", "subtype"})
+        return cls(attribute=attribute, **data)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
+
+def source_fingerprint(sources: Dict[str, str]) -> str:
+    """Hash of the files that define the registered specs."""
+    paths = {PACKAGE_DIR.joinpath(*key.split(".")).with_suffix(".py") for key in sources}
+    paths.update(_EXTRA_SOURCES)
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(path.relative_to(PACKAGE_DIR.parent).as_posix().encode())
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def build_snapshot(sources: Dict[str, str], registry_version: str) -> Dict[str, Any]:
+    """Import every spec and serialize the snapshot document (optional specs that fail are left out)."""
+    specs = {}
+    for key, attribute in sources.items():
+        try:
+            spec = load_spec_attribute(key, attribute)
+        except Exception as e:
+            logger.warning(f"⚠️ Skipping node spec {key} in snapshot: {type(e).__name__}: {e}")
+            continue
+        if spec is not None:
+            specs[key] = NodeSpecSummary.from_spec(spec, attribute).to_json()
+    return {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "registry_version": registry_version,
+        "source_fingerprint": source_fingerprint(sources),
+        "specs": specs,
+    }
+
+
+def write_snapshot(
+    sources: Dict[str, str], registry_version: str, path: Path = SNAPSHOT_PATH
+) -> Dict[str, Any]:
+    snapshot = build_snapshot(sources, registry_version)
+    path.write_text(json.dumps(snapshot, indent=1, ensure_ascii=False) + "\n")
+    return snapshot
+
+
+def read_snapshot(
+    sources: Dict[str, str], registry_version: str, path: Path = SNAPSHOT_PATH
+) -> Optional[Dict[str, NodeSpecSummary]]:
+    """Summaries from the snapshot, or None if it is missing, unreadable or stale."""
+    try:
+        snapshot = json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Node spec snapshot unavailable ({e}); importing spec modules instead")
+        return None
+    if (
+        snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION
+        or snapshot.get("registry_version") != registry_version
+        or snapshot.get("source_fingerprint") != source_fingerprint(sources)
+    ):
+        logger.warning(
+            "⚠️ Node spec snapshot is stale; importing spec modules instead "
+            "(regenerate with scripts/build_node_spec_snapshot.py)"
+        )
+        return None
+    return {
+        key: NodeSpecSummary(**entry)
+        for key, entry in snapshot.get("specs", {}).items()
+        if key in sources
+    }
+
+
+class LazySpecRegistry(Mapping):
+    """Read-only ``{"TYPE.SUBTYPE": spec}`` mapping that imports spec modules on access.
+
+    Keys and summaries come from the snapshot when it is current. Without it,
+    every source is a candidate key and specs whose module fails to import are
+    dropped on first access (as optional specs always were).
+    """
+
+    def __init__(
+        self, sources: Dict[str, str], registry_version: str, snapshot_path: Path = SNAPSHOT_PATH
+    ):
+        self._sources = dict(sources)
+        self._registry_version = registry_version
+        self._snapshot_path = snapshot_path
+        self._specs: Dict[str, Any] = {}
+        self._failed: set = set()
+        self._summaries: Optional[Dict[str, NodeSpecSummary]] = None
+        self._snapshot_checked = False
+        self._lock = threading.Lock()
+
+    def _snapshot(self) -> Optional[Dict[str, NodeSpecSummary]]:
+        if not self._snapshot_checked:
+            with self._lock:
+                if not self._snapshot_checked:
+                    self._summaries = read_snapshot(
+                        self._sources, self._registry_version, self._snapshot_path
+                    )
+                    self._snapshot_checked = True
+        return self._summaries
+
+    def _keys(self) -> List[str]:
+        snapshot = self._snapshot()
+        keys = self._sources if snapshot is None else snapshot
+        return [key for key in keys if key not in self._failed]
+
+    def _load(self, key: str) -> Any:
+        spec = self._specs.get(key)
+        if spec is not None:
+            return spec
+        if key not in self._sources or key in self._failed:
+            raise KeyError(key)
+        try:
+            spec = load_spec_attribute(key, self._sources[key])
+        except Exception as e:
+            logger.warning(f"⚠️ Node spec {key} unavailable: {type(e).__name__}: {e}")
+            spec = None
+        if spec is None:
+            self._failed.add(key)
+            raise KeyError(key)
+        self._specs[key] = spec
+        return spec
+
+    def __getitem__(self, key: str) -> Any:
+        return self._load(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        # Without a snapshot, only an import tells whether an optional spec exists
+        if self._snapshot() is None:
+            return len(self.values())
+        return len(self._keys())
+
+    def values(self) -> List[Any]:  # type: ignore[override]
+        specs = []
+        for key in list(self._keys()):
+            try:
+                specs.append(self._load(key))
+            except KeyError:
+                continue
+        return specs
+
+    def items(self) -> List[Tuple[str, Any]]:  # type: ignore[override]
+        self.values()
+        return [(key, self._specs[key]) for key in self._keys()]
+
+    def loaded_keys(self) -> List[str]:
+        """Keys whose spec module has been imported."""
+        return list(self._specs)
+
+    def summary(self, key: str) -> Optional[NodeSpecSummary]:
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            return snapshot.get(key)
+        try:
+            spec = self._load(key)
+        except KeyError:
+            return None
+        return NodeSpecSummary.from_spec(spec, self._sources[key])
+
+    def summaries(self) -> List[NodeSpecSummary]:
+        """Summaries of all specs; imports spec modules only if the snapshot is stale."""
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            return [snapshot[key] for key in self._keys()]
+        return [summary for summary in map(self.summary, self._keys()) if summary is not None]
+
+
+__all__ = [
+    "LazySpecRegistry",
+    "NodeSpecSummary",
+    "SNAPSHOT_PATH",
+    "build_snapshot",
+    "lazy_exports",
+    "read_snapshot",
+    "source_fingerprint",
+    "write_snapshot",
+]
@@ -11,6 +11,8 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+from .transport import get_transport
+
 
 class SDKError(Exception):
     """Base exception for SDK-related errors."""
@@ -85,8 +87,9 @@ class BaseSDK(ABC):
 
     def __init__(self, **kwargs):
         self.logger = logging.getLogger(self.__class__.__name__)
-        self._http_client = httpx.AsyncClient(timeout=30.0)
         self.provider_name = self.__class__.__name__.replace("SDK", "").lower()
+        # OAuth2 variants share the provider's pooled clients and rate limits
+        self._transport = get_transport(self.provider_name.replace("oauth2", ""))
 
     @property
     @abstractmethod
@@ -131,9 +134,9 @@ class BaseSDK(ABC):
         start_time = time.time()
 
         try:
-            response = await self._http_client.request(
-                method=method,
-                url=url,
+            response = await self._transport.request(
+                method,
+                url,
                 headers=headers,
                 json=json_data,
                 data=data,
@@ -237,9 +240,7 @@ class BaseSDK(ABC):
             raise ValidationError(f"Invalid datetime format: {type(dt_input)}")
 
     async def close(self):
-        """Close the HTTP client."""
-        if self._http_client:
-            await self._http_client.aclose()
+        """Release the SDK; pooled connections stay open for other callers."""
 
     async def __aenter__(self):
         return self
@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+from ..transport import get_transport
 from .auth import GitHubAuth
 from .exceptions import (
     GitHubAuthError,
@@ -36,17 +37,14 @@ class GitHubSDK(PullRequestMixin, IssueMixin):
         self.app_id = app_id
         self.base_url = base_url
         self.auth = GitHubAuth(app_id, private_key)
-        self._client = httpx.AsyncClient(
-            timeout=30.0,
-            headers={
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "AI-Workflow-Teams-SDK/1.0.0",
-            },
-        )
+        self._transport = get_transport("github")
+        self._headers = {
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "AI-Workflow-Teams-SDK/1.0.0",
+        }
 
     async def close(self):
-        """Close the HTTP client."""
-        await self._client.aclose()
+        """Release the SDK; pooled connections stay open for other clients."""
 
     async def __aenter__(self):
         return self
@@ -90,9 +88,12 @@ class GitHubSDK(PullRequestMixin, IssueMixin):
         # Generate new token
         jwt_token = self.auth.generate_jwt_token()
 
-        response = await self._client.post(
+        response = await self._transport.request(
+            "POST",
             f"{self.base_url}/app/installations/{installation_id}/access_tokens",
-            headers={"Authorization": f"Bearer {jwt_token}"},
+            headers={**self._headers, "Authorization": f"Bearer {jwt_token}"},
+            # Every JWT is new, so pace token exchanges per app instead
+            rate_limit_key=f"app:{self.app_id}",
         )
 
         if response.status_code != 201:
@@ -115,11 +116,13 @@ class GitHubSDK(PullRequestMixin, IssueMixin):
         """Make an authenticated request using installation token."""
         token = await self.get_installation_token(installation_id)
 
-        headers = kwargs.get("headers", {})
-        headers["Authorization"] = f"token {token}"
-        kwargs["headers"] = headers
+        kwargs["headers"] = {
+            **self._headers,
+            **kwargs.get("headers", {}),
+            "Authorization": f"token {token}",
+        }
 
-        response = await self._client.request(method, url, **kwargs)
+        response = await self._transport.request(method, url, **kwargs)
         return response
 
     # Repository operations
@@ -5,7 +5,6 @@ Provides a comprehensive client for interacting with the Notion API,
 including pages, databases, blocks, and search operations.
 """
 
-import asyncio
 import json
 import time
 from typing import Any, Dict, List, Optional, Union
@@ -13,6 +12,7 @@ from urllib.parse import urljoin
 
 import httpx
 
+from ..transport import ProviderTransport, get_transport
 from .exceptions import (
     NotionAPIError,
     NotionAuthError,
@@ -51,6 +51,8 @@ class NotionClient:
         timeout: int = 30,
         rate_limit_retry: bool = True,
         max_retries: int = 3,
+        rate_limiter: Optional[Any] = None,
+        transport: Optional[ProviderTransport] = None,
     ):
         """
         Initialize Notion API client.
@@ -60,21 +62,24 @@ class NotionClient:
             timeout: Request timeout in seconds
             rate_limit_retry: Whether to automatically retry on rate limit
             max_retries: Maximum number of retries for failed requests
+            rate_limiter: Optional shared limiter for this integration; its
+                ``acquire()`` is awaited before every request and
+                ``penalize(seconds)`` is called when Notion answers 429.
+                Defaults to the transport's per-integration limiter
+            transport: Shared transport; defaults to the pooled "notion" one
         """
         self.auth_token = auth_token
         self.timeout = timeout
         self.rate_limit_retry = rate_limit_retry
         self.max_retries = max_retries
+        self.rate_limiter = rate_limiter
 
-        self.client = httpx.AsyncClient(
-            base_url=self.BASE_URL,
-            timeout=self.timeout,
-            headers={
-                "Authorization": f"Bearer {auth_token}",
-                "Notion-Version": self.API_VERSION,
-                "Content-Type": "application/json",
-            },
-        )
+        self.transport = transport or get_transport("notion")
+        self.headers = {
+            "Authorization": f"Bearer {auth_token}",
+            "Notion-Version": self.API_VERSION,
+            "Content-Type": "application/json",
+        }
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -82,7 +87,7 @@ class NotionClient:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        await self.client.aclose()
+        await self.close()
 
     async def _make_request(
         self,
@@ -109,39 +114,37 @@ class NotionClient:
             NotionRateLimitError: For rate limit errors
         """
         url = urljoin(self.BASE_URL, endpoint)
+        body = {"json": data} if method.upper() in ["POST", "PATCH"] else {"params": params}
+
+        try:
+            # The transport paces requests per integration, honours Retry-After
+            # and retries throttled and transient failures with jitter
+            response = await self.transport.request(
+                method,
+                url,
+                headers=self.headers,
+                timeout=self.timeout,
+                limiter=self.rate_limiter,
+                max_retries=self.max_retries,
+                retry_rate_limited=self.rate_limit_retry,
+                **body,
+            )
+        except httpx.RequestError as e:
+            raise NotionAPIError(f"Request failed: {str(e)}")
+
+        if response.status_code == 429:
+            retry_after = int(response.headers.get("Retry-After", 60))
+            raise NotionRateLimitError(
+                f"Rate limit exceeded. Retry after {retry_after} seconds",
+                retry_after=retry_after,
+                status_code=429,
+            )
+
+        # Handle other HTTP errors
+        if not response.is_success:
+            self._handle_http_error(response)
 
-        for attempt in range(self.max_retries + 1):
-            try:
-                if method.upper() in ["POST", "PATCH"]:
-                    response = await self.client.request(method, url, json=data)
-                else:
-                    response = await self.client.request(method, url, params=params)
-
-                # Handle rate limiting at HTTP level
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", 60))
-                    if self.rate_limit_retry and attempt < self.max_retries:
-                        await asyncio.sleep(retry_after)
-                        continue
-                    raise NotionRateLimitError(
-                        f"Rate limit exceeded. Retry after {retry_after} seconds",
-                        retry_after=retry_after,
-                        status_code=429,
-                    )
-
-                # Handle other HTTP errors
-                if not response.is_success:
-                    self._handle_http_error(response)
-
-                response_data = response.json()
-                return response_data
-
-            except httpx.RequestError as e:
-                if attempt == self.max_retries:
-                    raise NotionAPIError(f"Request failed: {str(e)}")
-                await asyncio.sleep(2**attempt)  # Exponential backoff
-
-        raise NotionAPIError("Max retries exceeded")
+        return response.json()
 
     def _handle_http_error(self, response: httpx.Response) -> None:
         """Handle HTTP error responses."""
@@ -658,5 +661,4 @@ class NotionClient:
         return NotionUser.from_dict(response)
 
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Release the client; pooled connections stay open for other clients."""
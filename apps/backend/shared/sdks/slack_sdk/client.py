@@ -6,12 +6,12 @@ including message sending, user lookups, and channel operations.
 """
 
 import json
-import time
 from typing import Any, Dict, List, Optional, Union
 from urllib.parse import urljoin
 
 import httpx
 
+from ..transport import get_transport
 from .exceptions import (
     SlackAPIError,
     SlackAuthError,
@@ -52,11 +52,8 @@ class SlackWebClient:
         self.rate_limit_retry = rate_limit_retry
         self.max_retries = max_retries
 
-        self.client = httpx.Client(
-            base_url=self.BASE_URL,
-            timeout=self.timeout,
-            headers={"Authorization": f"Bearer {token}"},
-        )
+        self.transport = get_transport("slack")
+        self.headers = {"Authorization": f"Bearer {token}"}
 
     def __enter__(self):
         """Context manager entry."""
@@ -64,7 +61,7 @@ class SlackWebClient:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self.client.close()
+        self.close()
 
     def _make_request(
         self,
@@ -91,74 +88,67 @@ class SlackWebClient:
             SlackRateLimitError: For rate limit errors
         """
         url = urljoin(self.BASE_URL, endpoint)
-
-        for attempt in range(self.max_retries + 1):
-            try:
-                if method.upper() == "POST":
-                    if files:
-                        response = self.client.post(url, data=data, files=files)
-                    else:
-                        response = self.client.post(url, json=data)
-                else:
-                    response = self.client.request(method, url, params=data)
-
-                response.raise_for_status()
-                response_data = response.json()
-
-                # Handle Slack API errors
-                if not response_data.get("ok", False):
-                    error_code = response_data.get("error", "unknown_error")
-                    error_message = response_data.get("error", "Unknown error occurred")
-
-                    # Handle specific error types
-                    if error_code in ["invalid_auth", "account_inactive", "token_revoked"]:
-                        raise SlackAuthError(
-                            f"Authentication failed: {error_message}", error_code, response_data
-                        )
-                    elif error_code == "rate_limited":
-                        retry_after = int(response.headers.get("Retry-After", 60))
-                        if self.rate_limit_retry and attempt < self.max_retries:
-                            time.sleep(retry_after)
-                            continue
-                        raise SlackRateLimitError(
-                            f"Rate limit exceeded. Retry after {retry_after} seconds",
-                            retry_after=retry_after,
-                            error_code=error_code,
-                            response_data=response_data,
-                        )
-                    elif error_code == "channel_not_found":
-                        raise SlackChannelNotFoundError(
-                            f"Channel not found: {error_message}", error_code, response_data
-                        )
-                    elif error_code in ["user_not_found", "users_not_found"]:
-                        raise SlackUserNotFoundError(
-                            f"User not found: {error_message}", error_code, response_data
-                        )
-                    else:
-                        raise SlackAPIError(
-                            f"Slack API error: {error_message}", error_code, response_data
-                        )
-
-                return response_data
-
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 429:  # Rate limited
-                    retry_after = int(e.response.headers.get("Retry-After", 60))
-                    if self.rate_limit_retry and attempt < self.max_retries:
-                        time.sleep(retry_after)
-                        continue
-                    raise SlackRateLimitError(
-                        f"Rate limit exceeded. Retry after {retry_after} seconds",
-                        retry_after=retry_after,
-                    )
-                elif attempt == self.max_retries:
-                    raise SlackAPIError(f"HTTP error: {e.response.status_code} - {e.response.text}")
-            except httpx.RequestError as e:
-                if attempt == self.max_retries:
-                    raise SlackAPIError(f"Request failed: {str(e)}")
-                time.sleep(2**attempt)  # Exponential backoff
-
-        raise SlackAPIError("Max retries exceeded")
+        if method.upper() == "POST":
+            body = {"data": data, "files": files} if files else {"json": data}
+        else:
+            body = {"params": data}
+
+        try:
+            # The transport honours Retry-After and retries throttled and
+            # transient failures with jitter
+            response = self.transport.request_sync(
+                method,
+                url,
+                headers=self.headers,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                retry_rate_limited=self.rate_limit_retry,
+                **body,
+            )
+        except httpx.RequestError as e:
+            raise SlackAPIError(f"Request failed: {str(e)}")
+
+        if response.status_code == 429:
+            retry_after = int(response.headers.get("Retry-After", 60))
+            raise SlackRateLimitError(
+                f"Rate limit exceeded. Retry after {retry_after} seconds",
+                retry_after=retry_after,
+            )
+        if response.is_error:
+            raise SlackAPIError(f"HTTP error: {response.status_code} - {response.text}")
+
+        response_data = response.json()
+
+        # Handle Slack API errors
+        if not response_data.get("ok", False):
+            error_code = response_data.get("error", "unknown_error")
+            error_message = response_data.get("error", "Unknown error occurred")
+
+            # Handle specific error types
+            if error_code in ["invalid_auth", "account_inactive", "token_revoked"]:
+                raise SlackAuthError(
+                    f"Authentication failed: {error_message}", error_code, response_data
+                )
+            elif error_code == "rate_limited":
+                retry_after = int(response.headers.get("Retry-After", 60))
+                raise SlackRateLimitError(
+                    f"Rate limit exceeded. Retry after {retry_after} seconds",
+                    retry_after=retry_after,
+                    error_code=error_code,
+                    response_data=response_data,
+                )
+            elif error_code == "channel_not_found":
+                raise SlackChannelNotFoundError(
+                    f"Channel not found: {error_message}", error_code, response_data
+                )
+            elif error_code in ["user_not_found", "users_not_found"]:
+                raise SlackUserNotFoundError(
+                    f"User not found: {error_message}", error_code, response_data
+                )
+            else:
+                raise SlackAPIError(f"Slack API error: {error_message}", error_code, response_data)
+
+        return response_data
 
     def send_message(
         self,
@@ -392,5 +382,4 @@ class SlackWebClient:
         }
 
     def close(self):
-        """Close the HTTP client."""
-        self.client.close()
+        """Release the client; pooled connections stay open for other clients."""
@@ -14,6 +14,7 @@ from urllib.parse import parse_qs, urlencode, urlparse
 
 import httpx
 
+from ..transport import get_transport
 from .exceptions import SlackAPIError, SlackAuthError
 
 
@@ -55,7 +56,7 @@ class SlackInstallationManager:
         self.scopes = scopes
         self.user_scopes = user_scopes or []
 
-        self.http_client = httpx.Client(timeout=30)
+        self.transport = get_transport("slack")
 
     def generate_install_url(
         self,
@@ -126,7 +127,9 @@ class SlackInstallationManager:
         }
 
         try:
-            response = self.http_client.post(self.OAUTH_ACCESS_URL, data=data)
+            response = self.transport.request_sync(
+                "POST", self.OAUTH_ACCESS_URL, data=data, timeout=30
+            )
             response.raise_for_status()
             result = response.json()
 
@@ -214,7 +217,8 @@ class SlackInstallationManager:
             True if successful, False otherwise
         """
         try:
-            response = self.http_client.post(
+            response = self.transport.request_sync(
+                "POST",
                 "https://slack.com/api/auth.revoke",
                 headers={"Authorization": f"Bearer {token}"},
                 data={"token": token},
@@ -228,8 +232,7 @@ class SlackInstallationManager:
             return False
 
     def close(self):
-        """Close HTTP client."""
-        self.http_client.close()
+        """Release the manager; pooled connections stay open for other clients."""
 
     def __enter__(self):
         """Context manager entry."""
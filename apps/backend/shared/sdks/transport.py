@@ -0,0 +1,522 @@
+"""
+Shared HTTP transport for the external API SDKs.
+
+Every SDK used to build its own ``httpx`` client, mostly per call, and to
+hand-roll its own 429 handling. ProviderTransport centralises that:
+
+- One pooled client per provider and event loop (plus one thread-safe sync
+  client for the blocking Slack SDK), negotiating HTTP/2 when ``h2`` is
+  installed, so keep-alive connections are reused across calls
+- An adaptive limiter per credential: an optional fixed request rate (Notion
+  allows ~3 requests/second per integration) and pauses derived from
+  ``Retry-After``, ``X-RateLimit-Remaining``/``X-RateLimit-Reset`` and
+  ``X-RateLimit-Reset-After``
+- One retry policy with full-jitter exponential backoff. Throttled responses
+  and connection failures are retried for every method; 5xx responses and
+  read errors only for idempotent methods
+- Latency, retry and throttle metrics per provider
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Mapping, Optional, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+# The request never reached the server, so retrying is safe for any method
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dataclass
+class RetryPolicy:
+    """Retry budget and full-jitter backoff shared by every provider."""
+
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    # Longer server-requested waits are returned to the caller instead of slept
+    max_retry_after: float = 60.0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class AdaptiveRateLimiter:
+    """
+    Rate limiter for one credential, usable from async code and threads.
+
+    With a rate it behaves as a token bucket (GCRA): a burst of ``burst``
+    requests, then one every ``1 / rate`` seconds. Independently of the rate,
+    ``penalize`` holds back every request until the provider's window resets.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._interval = 1.0 / rate if rate else 0.0
+        self._tolerance = (self.burst - 1) * self._interval
+        self._tat = 0.0  # theoretical arrival time of the next request
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next slot and return how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            if self.rate:
+                start = max(start, self._tat - self._tolerance)
+                self._tat = max(self._tat, now) + self._interval
+            return start - now
+
+    def _pause_remaining(self) -> float:
+        return self._paused_until - time.monotonic()
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the time spent waiting."""
+        started = time.monotonic()
+        delay = self.reserve()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            # A pause may have started while this request was waiting
+            delay = self._pause_remaining()
+        return time.monotonic() - started
+
+    def acquire_sync(self) -> float:
+        started = time.monotonic()
+        delay = self.reserve()
+        while delay > 0:
+            time.sleep(delay)
+            delay = self._pause_remaining()
+        return time.monotonic() - started
+
+    def penalize(self, seconds: float) -> None:
+        """Hold back every request for ``seconds`` and drop any saved-up burst."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tat = max(self._tat, self._paused_until + self._tolerance)
+
+    @property
+    def paused(self) -> bool:
+        return self._pause_remaining() > 0
+
+
+class TransportMetrics:
+    """Counters and a latency sample for one provider."""
+
+    def __init__(self, sample_size: int = 1024):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttled = 0
+        self.throttle_wait = 0.0
+        self.status_counts: Dict[int, int] = {}
+        self._latencies: Deque[float] = deque(maxlen=sample_size)
+
+    def record_response(self, status_code: int, latency: float) -> None:
+        self.requests += 1
+        self.status_counts[status_code] = self.status_counts.get(status_code, 0) + 1
+        self._latencies.append(latency)
+
+    def record_error(self, latency: float) -> None:
+        self.requests += 1
+        self.errors += 1
+        self._latencies.append(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "throttle_wait_seconds": round(self.throttle_wait, 3),
+            "status_counts": dict(self.status_counts),
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            },
+        }
+
+
+def _header_seconds(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def throttle_delay(response: httpx.Response) -> Optional[float]:
+    """
+    Seconds the provider asked us to back off, or None if it did not.
+
+    Understands ``Retry-After`` (Slack, Notion, Google), GitHub's
+    ``X-RateLimit-Remaining: 0`` with an epoch ``X-RateLimit-Reset`` and
+    Discord's ``X-RateLimit-Reset-After``.
+    """
+    headers = response.headers
+    retry_after = _header_seconds(headers.get("Retry-After"))
+    if retry_after is not None:
+        return retry_after
+
+    if headers.get("X-RateLimit-Remaining") == "0":
+        reset_after = _header_seconds(headers.get("X-RateLimit-Reset-After"))
+        if reset_after is not None:
+            return reset_after
+        reset = _header_seconds(headers.get("X-RateLimit-Reset"))
+        if reset is not None:
+            # Epoch timestamps (GitHub, Discord) vs. seconds-until-reset
+            return max(0.0, reset - time.time()) if reset > 1e9 else reset
+        if response.status_code in (403, 429):
+            return 1.0
+
+    if response.status_code == 429:
+        return 1.0  # throttled without a hint; the retry backoff adds jitter
+    return None
+
+
+class ProviderTransport:
+    """Pooled HTTP clients, per-credential rate limiting and retries for one provider."""
+
+    def __init__(
+        self,
+        provider: str,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        retry: Optional[RetryPolicy] = None,
+        timeout: float = 30.0,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_limiters: int = 10000,
+        http_transport: Optional[Any] = None,
+    ):
+        self.provider = provider
+        self.rate = rate
+        self.burst = burst
+        self.retry = retry or RetryPolicy()
+        self.timeout = timeout
+        self.http2 = http2 and HTTP2_AVAILABLE and http_transport is None
+        self.limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections // 2
+        )
+        self.max_limiters = max_limiters
+        self.metrics = TransportMetrics()
+        self._http_transport = http_transport
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sync_client: Optional[httpx.Client] = None
+        self._limiters: "OrderedDict[str, AdaptiveRateLimiter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Clients -----------------------------------------------------------------
+
+    def async_client(self) -> httpx.AsyncClient:
+        """The pooled AsyncClient for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self._http_transport,
+            )
+            self._async_clients[loop] = client
+        return client
+
+    def sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._sync_client is None or self._sync_client.is_closed:
+                self._sync_client = httpx.Client(
+                    timeout=self.timeout,
+                    limits=self.limits,
+                    http2=self.http2,
+                    transport=self._http_transport,
+                )
+            return self._sync_client
+
+    async def aclose(self) -> None:
+        """Close the clients owned by the running loop and the sync client."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        client = self._async_clients.pop(loop, None) if loop is not None else None
+        if client is not None:
+            await client.aclose()
+        self.close_sync()
+
+    def close_sync(self) -> None:
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+    # Rate limiting -----------------------------------------------------------
+
+    def limiter(self, key: Optional[str]) -> AdaptiveRateLimiter:
+        """The limiter for one credential (or the provider-wide one for key None)."""
+        key = key or ""
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = AdaptiveRateLimiter(self.rate, self.burst)
+                self._limiters[key] = limiter
+                while len(self._limiters) > self.max_limiters:
+                    self._limiters.popitem(last=False)
+            else:
+                self._limiters.move_to_end(key)
+            return limiter
+
+    @staticmethod
+    def credential_key(headers: Optional[Mapping[str, str]]) -> Optional[str]:
+        """Rate limits are per credential; key them by a hash of the Authorization header."""
+        if not headers:
+            return None
+        for name, value in headers.items():
+            if name.lower() == "authorization" and value:
+                return hashlib.sha256(value.encode()).hexdigest()[:32]
+        return None
+
+    # Retry decisions -----------------------------------------------------------
+
+    def _retry_after_response(
+        self,
+        method: str,
+        response: httpx.Response,
+        attempt: int,
+        max_retries: int,
+        retry_rate_limited: bool,
+        limiter: Any,
+    ) -> Optional[float]:
+        """Delay before retrying this response, or None to hand it back to the caller."""
+        delay = throttle_delay(response)
+        throttled = delay is not None and response.status_code in (403, 429)
+        if delay is not None and (
+            throttled or response.headers.get("X-RateLimit-Remaining") == "0"
+        ):
+            # Hold back every request sharing this credential, not just this one
+            limiter.penalize(min(delay, self.retry.max_retry_after))
+
+        if throttled:
+            self.metrics.throttled += 1
+            if (
+                not retry_rate_limited
+                or attempt >= max_retries
+                or delay > self.retry.max_retry_after
+            ):
+                return None
+            # The limiter already waits out the pause; add jitter so waiters spread out
+            return self.retry.backoff(0)
+
+        if (
+            response.status_code in RETRYABLE_STATUSES
+            and method in IDEMPOTENT_METHODS
+            and attempt < max_retries
+        ):
+            return self.retry.backoff(attempt)
+        return None
+
+    def _retry_after_error(
+        self, method: str, error: Exception, attempt: int, max_retries: int
+    ) -> Optional[float]:
+        if attempt >= max_retries:
+            return None
+        if isinstance(error, _UNSENT_ERRORS) or (
+            isinstance(error, httpx.TransportError) and method in IDEMPOTENT_METHODS
+        ):
+            return self.retry.backoff(attempt)
+        return None
+
+    def _prepare(
+        self,
+        method: str,
+        headers: Optional[Mapping[str, str]],
+        rate_limit_key: Optional[str],
+        max_retries: Optional[int],
+    ) -> Tuple[str, str, int]:
+        method = method.upper()
+        key = rate_limit_key if rate_limit_key is not None else self.credential_key(headers)
+        retries = self.retry.max_retries if max_retries is None else max_retries
+        return method, key, retries
+
+    # Requests ----------------------------------------------------------------
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        rate_limit_key: Optional[str] = None,
+        limiter: Optional[Any] = None,
+        max_retries: Optional[int] = None,
+        retry_rate_limited: bool = True,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request through the pooled client, with rate limiting and retries.
+
+        ``kwargs`` are passed to ``httpx.AsyncClient.request``. ``limiter``
+        overrides the per-credential limiter with any object offering
+        ``async acquire()`` and ``penalize(seconds)``. Returns the final
+        response (which may still be an error); raises the last transport
+        error once retries are exhausted.
+        """
+        method, key, retries = self._prepare(
+            method, kwargs.get("headers"), rate_limit_key, max_retries
+        )
+        limiter = limiter if limiter is not None else self.limiter(key)
+        client = self.async_client()
+
+        attempt = 0
+        while True:
+            waited = await limiter.acquire()
+            if waited:
+                self.metrics.throttle_wait += waited
+            started = time.monotonic()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.HTTPError as e:
+                self.metrics.record_error(time.monotonic() - started)
+                delay = self._retry_after_error(method, e, attempt, retries)
+                if delay is None:
+                    raise
+                logger.debug(f"{self.provider} {method} {url} failed ({e!r}), retrying")
+            else:
+                self.metrics.record_response(response.status_code, time.monotonic() - started)
+                delay = self._retry_after_response(
+                    method, response, attempt, retries, retry_rate_limited, limiter
+                )
+                if delay is None:
+                    return response
+                logger.debug(f"{self.provider} {method} {url} -> {response.status_code}, retrying")
+                await response.aclose()
+
+            attempt += 1
+            self.metrics.retries += 1
+            await asyncio.sleep(delay)
+
+    def request_sync(
+        self,
+        method: str,
+        url: str,
+        *,
+        rate_limit_key: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        retry_rate_limited: bool = True,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Blocking counterpart of ``request`` for synchronous SDKs."""
+        method, key, retries = self._prepare(
+            method, kwargs.get("headers"), rate_limit_key, max_retries
+        )
+        limiter = self.limiter(key)
+        client = self.sync_client()
+
+        attempt = 0
+        while True:
+            waited = limiter.acquire_sync()
+            if waited:
+                self.metrics.throttle_wait += waited
+            started = time.monotonic()
+            try:
+                response = client.request(method, url, **kwargs)
+            except httpx.HTTPError as e:
+                self.metrics.record_error(time.monotonic() - started)
+                delay = self._retry_after_error(method, e, attempt, retries)
+                if delay is None:
+                    raise
+                logger.debug(f"{self.provider} {method} {url} failed ({e!r}), retrying")
+            else:
+                self.metrics.record_response(response.status_code, time.monotonic() - started)
+                delay = self._retry_after_response(
+                    method, response, attempt, retries, retry_rate_limited, limiter
+                )
+                if delay is None:
+                    return response
+                logger.debug(f"{self.provider} {method} {url} -> {response.status_code}, retrying")
+                response.close()
+
+            attempt += 1
+            self.metrics.retries += 1
+            time.sleep(delay)
+
+
+# Per-provider defaults; anything not listed gets ProviderTransport's defaults
+PROVIDER_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    # Notion allows an average of 3 requests/second per integration
+    "notion": {"rate": 3.0, "burst": 3},
+    # Arbitrary user-configured HTTP calls: never replay them implicitly
+    "apicall": {"retry": RetryPolicy(max_retries=0)},
+}
+
+_transports: Dict[str, ProviderTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(provider: str) -> ProviderTransport:
+    """The process-wide transport for a provider."""
+    transport = _transports.get(provider)
+    if transport is None:
+        with _transports_lock:
+            transport = _transports.get(provider)
+            if transport is None:
+                transport = ProviderTransport(provider, **PROVIDER_DEFAULTS.get(provider, {}))
+                _transports[provider] = transport
+    return transport
+
+
+def get_transport_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics snapshot for every provider that has sent a request."""
+    return {name: transport.metrics.snapshot() for name, transport in _transports.items()}
+
+
+async def close_transports() -> None:
+    """Close pooled clients, e.g. on application shutdown."""
+    for transport in list(_transports.values()):
+        try:
+            await transport.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close {transport.provider} transport: {e}")
+
+
+__all__ = [
+    "AdaptiveRateLimiter",
+    "HTTP2_AVAILABLE",
+    "ProviderTransport",
+    "RetryPolicy",
+    "TransportMetrics",
+    "close_transports",
+    "get_transport",
+    "get_transport_metrics",
+    "throttle_delay",
+]
@@ -10,7 +10,7 @@ import time
 import uuid
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, HTTPException
 
 from shared.models.execution_new import ExecutionStatus, TriggerInfo
 from shared.models.node_enums import TriggerSubtype
@@ -25,6 +25,11 @@ from workflow_engine_v2.api.models import (
     LogMilestoneResponse,
 )
 from workflow_engine_v2.core.engine import ExecutionEngine
+from workflow_engine_v2.services.execution_dispatcher import (
+    DispatcherSaturated,
+    ExecutionPriority,
+    get_execution_dispatcher,
+)
 from workflow_engine_v2.services.supabase_repository_v2 import SupabaseExecutionRepository
 from workflow_engine_v2.services.workflow import WorkflowServiceV2
 from workflow_engine_v2.services.workflow_status_manager import WorkflowStatusManagerV2
@@ -43,18 +48,30 @@ except Exception as repo_error:  # pragma: no cover - runtime safeguard
         repo_error,
     )
 
+# Admission control: executions are queued in the dispatcher, which never runs more
+# at once than the engine has workers
+dispatcher = get_execution_dispatcher()
 engine = ExecutionEngine(
     repository=execution_repository,
+    max_workers=dispatcher.max_concurrency,
     enable_user_friendly_logging=True,
 )
 workflow_service = WorkflowServiceV2()
 
 
+def _saturated(error: DispatcherSaturated) -> HTTPException:
+    logger.warning(f"🚦 [v2] {error}")
+    return HTTPException(
+        status_code=429,
+        detail={"error": "execution_queue_saturated", "reason": error.reason},
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
 @router.post("/workflows/{workflow_id}/execute", response_model=ExecuteWorkflowResponse)
 async def execute_workflow_by_id(
     workflow_id: str,
     request: dict,
-    background_tasks: BackgroundTasks,
 ):
     """Execute a workflow by ID with comprehensive logging"""
     try:
@@ -109,33 +126,22 @@ async def execute_workflow_by_id(
             timestamp=int(time.time() * 1000),
         )
 
+        priority = ExecutionPriority.for_trigger(incoming_type)
+
         logger.info(
-            f"🎯 [v2] Executing workflow: {workflow.metadata.name} (async: {async_execution})"
+            f"🎯 [v2] Executing workflow: {workflow.metadata.name} "
+            f"(async: {async_execution}, priority: {priority.name})"
         )
 
         if async_execution:
             # Return immediately for async execution
             execution_id = str(uuid.uuid4())
-            logger.info(f"⚡ [v2] ASYNC: Starting background execution for {execution_id}")
-
-            # CRITICAL: Create initial execution status BEFORE background task starts
-            # This prevents race condition where /logs/stream checks status before it exists
-            try:
-                status_manager = WorkflowStatusManagerV2()
-                current_time = int(time.time() * 1000)
-                await status_manager.create_initial_execution_status(
-                    execution_id=execution_id,
-                    workflow_id=workflow_id,
-                    status=ExecutionStatus.RUNNING,
-                    start_time=current_time,
-                )
-                logger.info(f"✅ [v2] Created initial execution status for {execution_id}")
-            except Exception as status_error:
-                logger.warning(
-                    f"⚠️ [v2] Failed to create initial status (non-fatal): {status_error}"
-                )
+            logger.info(f"⚡ [v2] ASYNC: Queueing background execution for {execution_id}")
+            status_ready = asyncio.Event()
 
             async def execute_in_background():
+                # Don't let the run overtake its initial status record
+                await status_ready.wait()
                 try:
                     logger.info(f"🚀 [v2] Background execution started for {execution_id}")
                     execution = await engine.execute_workflow(
@@ -156,7 +162,33 @@ async def execute_workflow_by_id(
 
                     logger.error(f"❌ [v2] Full traceback: {traceback.format_exc()}")
 
-            background_tasks.add_task(execute_in_background)
+            # Admit before writing anything so a saturated queue rejects cleanly
+            dispatcher.submit(
+                execute_in_background,
+                user_id=user_id,
+                workflow_id=workflow_id,
+                priority=priority,
+                execution_id=execution_id,
+            )
+
+            # CRITICAL: Create initial execution status BEFORE background task starts
+            # This prevents race condition where /logs/stream checks status before it exists
+            try:
+                status_manager = WorkflowStatusManagerV2()
+                current_time = int(time.time() * 1000)
+                await status_manager.create_initial_execution_status(
+                    execution_id=execution_id,
+                    workflow_id=workflow_id,
+                    status=ExecutionStatus.RUNNING,
+                    start_time=current_time,
+                )
+                logger.info(f"✅ [v2] Created initial execution status for {execution_id}")
+            except Exception as status_error:
+                logger.warning(
+                    f"⚠️ [v2] Failed to create initial status (non-fatal): {status_error}"
+                )
+            finally:
+                status_ready.set()
 
             return ExecuteWorkflowResponse(
                 success=True,
@@ -171,14 +203,19 @@ async def execute_workflow_by_id(
                 },
             )
         else:
-            # Execute synchronously
-            execution = await engine.execute_workflow(
-                workflow=workflow,
-                trigger=trigger,
-                trace_id=trace_id,
-                start_from_node=start_from_node,
-                skip_trigger_validation=skip_trigger_validation,
-                workflow_id=workflow_id,  # Pass database table ID
+            # Execute synchronously, still subject to admission and quotas
+            execution = await dispatcher.submit(
+                lambda: engine.execute_workflow(
+                    workflow=workflow,
+                    trigger=trigger,
+                    trace_id=trace_id,
+                    start_from_node=start_from_node,
+                    skip_trigger_validation=skip_trigger_validation,
+                    workflow_id=workflow_id,  # Pass database table ID
+                ),
+                user_id=user_id,
+                workflow_id=workflow_id,
+                priority=priority,
             )
 
             logger.info(
@@ -198,6 +235,8 @@ async def execute_workflow_by_id(
                 },
             )
 
+    except DispatcherSaturated as e:
+        raise _saturated(e)
     except Exception as e:
         logger.error(f"❌ [v2] Workflow execution failed: {str(e)}")
         import traceback
@@ -207,7 +246,7 @@ async def execute_workflow_by_id(
 
 
 @router.post("/execute", response_model=ExecuteWorkflowResponse)
-async def execute_workflow(request: ExecuteWorkflowRequest, background_tasks: BackgroundTasks):
+async def execute_workflow(request: ExecuteWorkflowRequest):
     """Execute a workflow with comprehensive logging (original endpoint)"""
     try:
         logger.info(f"📝 [v2] Received workflow execution request (original endpoint)")
@@ -254,11 +293,16 @@ async def execute_workflow(request: ExecuteWorkflowRequest, background_tasks: Ba
         )
 
         # Execute workflow
-        execution = await engine.execute_workflow(
-            workflow=workflow,
-            trigger=trigger,
-            trace_id=request.trace_id,
-            workflow_id=workflow.metadata.id,  # Pass workflow ID from metadata
+        execution = await dispatcher.submit(
+            lambda: engine.execute_workflow(
+                workflow=workflow,
+                trigger=trigger,
+                trace_id=request.trace_id,
+                workflow_id=workflow.metadata.id,  # Pass workflow ID from metadata
+            ),
+            user_id=trigger.user_id,
+            workflow_id=workflow.metadata.id,
+            priority=ExecutionPriority.for_trigger(trigger.trigger_type),
         )
 
         logger.info(
@@ -278,6 +322,8 @@ async def execute_workflow(request: ExecuteWorkflowRequest, background_tasks: Ba
             },
         )
 
+    except DispatcherSaturated as e:
+        raise _saturated(e)
     except Exception as e:
         logger.error(f"❌ [v2] Workflow execution failed: {str(e)}")
         import traceback
@@ -286,6 +332,12 @@ async def execute_workflow(request: ExecuteWorkflowRequest, background_tasks: Ba
         return ExecuteWorkflowResponse(success=False, execution_id="", error=str(e))
 
 
+@router.get("/dispatcher/stats")
+async def get_dispatcher_stats():
+    """Execution queue depth, queue wait times and admission counters"""
+    return dispatcher.get_stats()
+
+
 @router.get("/executions/{execution_id}", response_model=ExecutionStatusResponse)
 async def get_execution_status(execution_id: str):
     """Get execution status"""
@@ -400,6 +452,16 @@ async def cancel_execution(execution_id: str):
     try:
         logger.info(f"🛑 [v2] Cancel request for execution {execution_id}")
 
+        # A run still waiting in the dispatcher queue is dropped before it starts
+        if dispatcher.cancel(execution_id):
+            logger.info(f"🛑 [v2] Removed queued execution {execution_id} from the dispatcher")
+
+        # Interrupt in-flight node work if the run is hosted by this process
+        try:
+            engine.cancel(execution_id, reason="Execution cancelled by user request")
+        except KeyError:
+            pass
+
         # Use workflow status manager to cancel real execution
         status_manager = WorkflowStatusManagerV2()
 
@@ -0,0 +1,166 @@
+"""Cooperative cancellation for v2 engine executions.
+
+Every ``ExecutionContext`` carries a ``CancellationToken``. ``ExecutionEngine.cancel``
+trips it and runners reach it through ``inputs["_ctx"]``:
+
+- loops (LLM tool-use iterations, LOOP/FOR_EACH bodies, retry backoff) call
+  ``raise_if_cancelled()`` or ``sleep()`` between steps;
+- blocking I/O goes through ``call()``, which runs it on an I/O worker and stops
+  waiting as soon as the token trips. Closing a socket from another thread does
+  not interrupt a blocked read, so the abandoned call is left to finish (or
+  time out) on its worker while the runner and its execution host move on;
+- coroutines go through ``run_async()``, which cancels the task outright.
+
+Tokens that nobody can cancel (runners used outside the engine) run everything
+inline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+from workflow_engine_v2.core.exceptions import ExecutionCancelled
+
+
+class CancellationToken:
+    """Thread-safe, one-shot cancellation signal for one execution."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+        self.cancelled_at: Optional[float] = None  # time.monotonic()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "Execution cancelled") -> bool:
+        """Trip the token; returns False if it was already cancelled."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self.cancelled_at = time.monotonic()
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+        return True
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` when cancelled (now, if already). Returns an unregister function."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                def unregister() -> None:
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+
+                return unregister
+        callback()
+        return lambda: None
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise ExecutionCancelled(self.reason or "Execution cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block up to ``timeout`` seconds; True if cancelled meanwhile."""
+        return self._event.wait(timeout)
+
+    def sleep(self, seconds: float) -> None:
+        """Interruptible ``time.sleep``."""
+        if seconds > 0 and self._event.wait(seconds):
+            self.raise_if_cancelled()
+        self.raise_if_cancelled()
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run blocking ``fn`` and stop waiting for it if the token trips."""
+        self.raise_if_cancelled()
+        pool = _io_workers()
+        future = pool.submit(lambda: fn(*args, **kwargs))
+        finished = threading.Event()
+        future.add_done_callback(lambda _: finished.set())
+        unregister = self.on_cancel(finished.set)
+        try:
+            finished.wait()
+        finally:
+            unregister()
+        if not future.done():
+            pool.abandon(future)
+            self.raise_if_cancelled()
+        return future.result()
+
+    def run_async(self, coro: Awaitable[Any]) -> Any:
+        """``asyncio.run`` that cancels the coroutine if the token trips."""
+        self.raise_if_cancelled()
+
+        async def _guarded() -> Any:
+            loop = asyncio.get_running_loop()
+            task = asyncio.ensure_future(coro)
+            unregister = self.on_cancel(lambda: loop.call_soon_threadsafe(task.cancel))
+            try:
+                return await task
+            except asyncio.CancelledError:
+                self.raise_if_cancelled()
+                raise
+            finally:
+                unregister()
+
+        return asyncio.run(_guarded())
+
+
+class _UncancellableToken(CancellationToken):
+    """Token for runners used outside an engine execution: never trips."""
+
+    def cancel(self, reason: str = "Execution cancelled") -> bool:
+        return False
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return fn(*args, **kwargs)
+
+    def run_async(self, coro: Awaitable[Any]) -> Any:
+        return asyncio.run(coro)
+
+
+NEVER_CANCELLED: CancellationToken = _UncancellableToken()
+
+
+def cancel_token_for(source: Any) -> CancellationToken:
+    """Token of the execution behind ``source`` (runner inputs or the engine ``_ctx``)."""
+    ctx = source.get("_ctx") if isinstance(source, dict) else source
+    token = getattr(ctx, "cancel_token", None)
+    return token if isinstance(token, CancellationToken) else NEVER_CANCELLED
+
+
+_io_pool = None
+_io_pool_lock = threading.Lock()
+
+
+def _io_workers():
+    global _io_pool
+    with _io_pool_lock:
+        if _io_pool is None:
+            from workflow_engine_v2.core.supervisor import NodeWorkerPool
+
+            # Separate from node workers: runners already on a node worker wait here
+            _io_pool = NodeWorkerPool(max_workers=64, name="cancellable-io")
+        return _io_pool
+
+
+__all__ = [
+    "CancellationToken",
+    "ExecutionCancelled",
+    "NEVER_CANCELLED",
+    "cancel_token_for",
+]
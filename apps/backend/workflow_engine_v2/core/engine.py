@@ -24,14 +24,18 @@ import random
 import sys
 import time
 import uuid
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 from supabase import create_client
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on a single retry backoff so misconfigured nodes can't stall a run
+MAX_RETRY_BACKOFF_SECONDS = 5.0
+
 # Add backend directory to path for absolute imports
 backend_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(backend_dir))
@@ -55,8 +59,10 @@ from shared.models.workflow import Workflow
 from shared.node_specs.base import execute_conversion_function
 from workflow_engine_v2.core.exceptions import EngineError, ExecutionFailure
 from workflow_engine_v2.core.graph import WorkflowGraph
+from workflow_engine_v2.core.plan import ExecutionPlanCache
 from workflow_engine_v2.core.spec import get_spec
 from workflow_engine_v2.core.state import ExecutionContext, ExecutionStore
+from workflow_engine_v2.core.supervisor import get_node_supervisor
 from workflow_engine_v2.core.validation import validate_workflow
 from workflow_engine_v2.runners.factory import default_runner_for
 from workflow_engine_v2.services.events_publisher import get_event_publisher
@@ -190,7 +196,12 @@ class ExecutionEngine:
         self._repo = repository or InMemoryExecutionRepository()
         self._hil = get_hil_classifier()
         self._events = get_event_publisher()
+        # Hosts whole executions (run_async); node attempts use the supervisor's workers
         self._pool = _fut.ThreadPoolExecutor(max_workers=max_workers)
+        self._supervisor = get_node_supervisor()
+        self._cancel_latencies: Deque[float] = deque(maxlen=1024)
+        # Validated graphs, specs and node settings per (workflow_id, version)
+        self._plans = ExecutionPlanCache()
         self._enable_user_friendly_logging = enable_user_friendly_logging
         self._user_friendly_logger = None
         if enable_user_friendly_logging:
@@ -257,7 +268,8 @@ class ExecutionEngine:
         logger.info(
             f"🟢 ENTERED run() method for execution_id={execution_id}, workflow_id={workflow_id}"
         )
-        self.validate_against_specs(workflow)
+        # Validation, graph building and spec resolution happen once per workflow version
+        plan = self._plans.get(workflow, workflow_id)
         logger.info(f"🟢 Validation complete for {execution_id}")
 
         exec_id = execution_id or str(uuid.uuid4())
@@ -304,8 +316,7 @@ class ExecutionEngine:
             latest_execution_id=workflow_execution.execution_id,
         )
 
-        graph = WorkflowGraph(workflow)
-        _ = graph.topo_order()  # Raises on cycle
+        graph = plan.graph
 
         # Track data flow per node input ports
         pending_inputs: Dict[str, Dict[str, Any]] = {node_id: {} for node_id in graph.nodes.keys()}
@@ -354,6 +365,9 @@ class ExecutionEngine:
                 for node_id in self._get_initial_ready_nodes(graph)
             ]
         while queue:
+            # Cooperative cancellation: also checked after every node attempt
+            if execution_context.cancel_token.cancelled:
+                return self._finish_cancelled(execution_context, workflow_id)
             task = queue.pop(0)
             current_node_id = task["node_id"]
             override = task.get("override")
@@ -369,7 +383,8 @@ class ExecutionEngine:
             if not is_fanout_run and current_node_id in executed_main:
                 logger.info(f"⏭️ QUEUE: Skipping {current_node_id} - already in executed_main")
                 continue
-            node = graph.nodes[current_node_id]
+            node_plan = plan.nodes[current_node_id]
+            node = node_plan.node
 
             node_execution = workflow_execution.node_executions[current_node_id]
             # Assign activation and lineage
@@ -413,92 +428,83 @@ class ExecutionEngine:
 
             self._events.node_started(workflow_execution, current_node_id, node_execution)
 
-            # Simple retry loop
-            # Helper to extract value from config (may be schema dict or direct value)
-            def _get_config_value(key: str, default):
-                val = node.configurations.get(key, default)
-                if isinstance(val, dict) and "default" in val:
-                    return val.get("default", default)
-                return val if val is not None else default
-
-            max_retries = int(_get_config_value("retry_attempts", 0) or 0)
+            # Retry and timeout settings are precomputed in the execution plan
+            max_retries = node_plan.max_retries
             attempt = 0
             last_exc: Exception | None = None
             start_exec = _now_ms()
-            backoff = float(_get_config_value("retry_backoff_seconds", 0) or 0)
-            backoff_factor = float(_get_config_value("retry_backoff_factor", 1.0) or 1.0)
 
             logger.info(
                 f"🔄 RETRY LOOP: Starting retry loop for {current_node_id}, max_retries={max_retries}"
             )
 
-            while attempt <= max_retries:
-                logger.info(f"🔄 RETRY LOOP: Attempt {attempt}/{max_retries} for {current_node_id}")
-                try:
-                    runner = default_runner_for(node)
-                    logger.info(
-                        f"🔄 RETRY LOOP: Got runner {type(runner).__name__} for {current_node_id}"
-                    )
+            exec_timeout = node_plan.exec_timeout_seconds
 
-                    # Timeout handling
-                    exec_timeout = None
-                    try:
-                        timeout_val = _get_config_value("timeout_seconds", None)
-                        if timeout_val is None:
-                            timeout_val = _get_config_value("timeout", None)
-                        if timeout_val is not None:
-                            exec_timeout = float(timeout_val)
-                    except Exception:
-                        exec_timeout = None
+            def _attempt(_node=node, _inputs=inputs) -> Dict[str, Any]:
+                runner = default_runner_for(_node)
+                logger.info(f"🔄 RETRY LOOP: Got runner {type(runner).__name__} for {_node.id}")
+                return runner.run(_node, _inputs, trigger)
 
-                    if exec_timeout and exec_timeout > 0:
-                        logger.info(
-                            f"⏱️ RETRY LOOP: About to call runner.run() via ThreadPool (timeout={exec_timeout}s) for {current_node_id}"
-                        )
-                        future = self._pool.submit(runner.run, node, inputs, trigger)
-                        outputs = future.result(timeout=max(0.001, exec_timeout))
-                    else:
-                        logger.info(
-                            f"🎯 RETRY LOOP: About to call runner.run() directly (no timeout) for {current_node_id}"
-                        )
-                        outputs = runner.run(node, inputs, trigger)
+            if (not exec_timeout or exec_timeout <= 0) and max_retries <= 0:
+                # Single untimed attempt: run inline on the execution host thread
+                try:
+                    outputs = _attempt()
+                except Exception as e:
+                    last_exc = e
+                    attempt = 1
+            else:
+                # Attempts run on node workers; timeouts and backoff are supervisor
+                # timers, so the host only waits on the final outcome
+                def _backoff(retry: int, _plan=node_plan) -> float:
+                    delay = (
+                        _plan.retry_backoff_seconds
+                        * (_plan.retry_backoff_factor ** max(0, retry - 1))
+                        if _plan.retry_backoff_seconds > 0
+                        else 0
+                    )
+                    if _plan.retry_jitter_seconds > 0:
+                        delay += random.uniform(0, _plan.retry_jitter_seconds)
+                    return min(delay, MAX_RETRY_BACKOFF_SECONDS)
 
+                def _on_retry(retry: int, exc: BaseException, _ne=node_execution) -> None:
+                    _ne.status = NodeExecutionStatus.RETRYING
                     logger.info(
-                        f"✅ RETRY LOOP: runner.run() completed successfully for {current_node_id}"
+                        f"🔄 RETRY LOOP: Attempt {retry - 1}/{max_retries} failed for "
+                        f"{current_node_id}: {exc}"
                     )
-                    last_exc = None
-                    break
+
+                logger.info(
+                    f"⏱️ RETRY LOOP: Supervising runner.run() (timeout={exec_timeout}s, "
+                    f"max_retries={max_retries}) for {current_node_id}"
+                )
+                attempts = self._supervisor.run(
+                    _attempt,
+                    timeout=exec_timeout if exec_timeout and exec_timeout > 0 else None,
+                    max_retries=max_retries,
+                    backoff=_backoff,
+                    on_retry=_on_retry,
+                )
+                # Cancelling the execution releases the host (and abandons the worker) at once
+                unregister_cancel = execution_context.cancel_token.on_cancel(attempts.cancel)
+                try:
+                    outputs = attempts.result()
                 except Exception as e:
                     last_exc = e
-                    attempt += 1
-                    node_execution.status = (
-                        NodeExecutionStatus.RETRYING
-                        if attempt <= max_retries
-                        else NodeExecutionStatus.FAILED
-                    )
-                    if attempt > max_retries:
-                        break
-                    # Backoff sleep (blocking; for more sophistication use async)
-                    try:
-                        delay = (
-                            backoff * (backoff_factor ** max(0, attempt - 1)) if backoff > 0 else 0
-                        )
-                        jitter = float(node.configurations.get("retry_jitter_seconds", 0) or 0)
-                        if jitter > 0:
-                            delay += random.uniform(0, jitter)
-                        if delay > 0:
-                            time.sleep(min(delay, 5))  # cap small to avoid test stalls
-                    except Exception:
-                        pass
+                    attempt = max_retries + 1
+                finally:
+                    unregister_cancel()
+
+            if last_exc is None:
+                logger.info(
+                    f"✅ RETRY LOOP: runner.run() completed successfully for {current_node_id}"
+                )
+            if execution_context.cancel_token.cancelled:
+                return self._finish_cancelled(execution_context, workflow_id, current_node_id)
 
             duration = _now_ms() - start_exec
-            timeout_sec = node.configurations.get("timeout")
-            if timeout_sec is not None:
-                try:
-                    if duration > float(timeout_sec) * 1000:
-                        last_exc = last_exc or Exception("Node execution timed out")
-                except Exception:
-                    pass
+            timeout_sec = node_plan.duration_timeout_seconds
+            if timeout_sec is not None and duration > timeout_sec * 1000:
+                last_exc = last_exc or Exception("Node execution timed out")
 
             if last_exc is not None:
                 node_execution.end_time = _now_ms()
@@ -723,33 +729,9 @@ class ExecutionEngine:
             )
 
             # Enforce that each port payload exactly matches node spec output_params keys
-            def _shape_payload(payload: Any) -> Dict[str, Any]:
-                # Get output_params from node spec registry, not from node definition
-                try:
-                    spec = get_spec(node.type, node.subtype)
-                    allowed_defaults = getattr(spec, "output_params", {}) or {}
-                except Exception:
-                    # Fallback to node.output_params if spec not available
-                    allowed_defaults = node.output_params or {}
-
-                if not isinstance(allowed_defaults, dict):
-                    return payload if isinstance(payload, dict) else {}
-                shaped: Dict[str, Any] = {}
-                if isinstance(payload, dict):
-                    for k, default_val in allowed_defaults.items():
-                        shaped[k] = payload.get(k, default_val)
-                else:
-                    # Place primitive payload into 'data' if defined, otherwise use defaults
-                    if "data" in allowed_defaults:
-                        shaped = {
-                            k: (payload if k == "data" else v) for k, v in allowed_defaults.items()
-                        }
-                    else:
-                        shaped = dict(allowed_defaults)
-                return shaped
-
             shaped_outputs = {
-                port: _shape_payload(payload) for port, payload in sanitized_outputs.items()
+                port: node_plan.shape_payload(payload)
+                for port, payload in sanitized_outputs.items()
             }
             # Keep raw outputs for conversion functions
             raw_outputs = sanitized_outputs
@@ -986,7 +968,7 @@ class ExecutionEngine:
                 logger.info(f"🚦 Starting successor propagation for node {current_node_id}")
                 # Propagate, including fan-out
                 # BFS: Only propagate if the required output_key exists in the node's outputs
-                successors_list = list(graph.successors(current_node_id))
+                successors_list = node_plan.successors
                 logger.info(
                     f"🔗 Found {len(successors_list)} successor(s) for node {current_node_id}: {successors_list}"
                 )
@@ -1945,13 +1927,80 @@ class ExecutionEngine:
         self._events.execution_paused(execution_context.execution)
         return execution_context.execution
 
-    def cancel(self, execution_id: str) -> Execution:
+    def cancel(self, execution_id: str, reason: str = "Execution cancelled") -> Execution:
+        """Cancel an execution, interrupting its in-flight node work.
+
+        Runners observe the execution's cancel token; the run loop records how
+        long it took to actually stop (see ``get_cancellation_stats``).
+        """
         execution_context = self._store.get(execution_id)
         execution_context.execution.status = ExecutionStatus.CANCELED
         execution_context.execution.end_time = _now_ms()
+        execution_context.cancel_token.cancel(reason)
         self._events.execution_failed(execution_context.execution)
         return execution_context.execution
 
+    def _finish_cancelled(
+        self,
+        execution_context: ExecutionContext,
+        workflow_id: str,
+        node_id: Optional[str] = None,
+    ) -> Execution:
+        """Stop a run whose cancel token tripped and record the cancel latency."""
+        token = execution_context.cancel_token
+        workflow_execution = execution_context.execution
+        now = _now_ms()
+        if node_id is not None:
+            node_execution = workflow_execution.node_executions[node_id]
+            node_execution.status = NodeExecutionStatus.FAILED
+            node_execution.end_time = now
+            if node_execution.start_time:
+                node_execution.duration_ms = now - node_execution.start_time
+            node_execution.error = NodeError(
+                error_code="EXECUTION_CANCELLED",
+                error_message=token.reason or "Execution cancelled",
+                error_details={"node_id": node_id},
+                is_retryable=False,
+                timestamp=now,
+            )
+        workflow_execution.status = ExecutionStatus.CANCELED
+        workflow_execution.end_time = workflow_execution.end_time or now
+        workflow_execution.duration_ms = workflow_execution.end_time - (
+            workflow_execution.start_time or workflow_execution.end_time
+        )
+
+        latency = time.monotonic() - token.cancelled_at if token.cancelled_at else 0.0
+        self._cancel_latencies.append(latency)
+        logger.info(
+            f"🛑 Execution {workflow_execution.execution_id} stopped {latency * 1000:.0f}ms "
+            f"after cancellation (node: {node_id})"
+        )
+        self._log.log(
+            workflow_execution,
+            level=LogLevel.WARN,
+            message=f"Execution cancelled: {token.reason or 'cancelled'}",
+            node_id=node_id,
+        )
+        self._persist_execution(workflow_execution)
+        self._update_workflow_execution_fields(
+            workflow_id=workflow_id,
+            latest_execution_status=ExecutionStatus.CANCELED.value,
+            latest_execution_id=workflow_execution.execution_id,
+        )
+        return self._snapshot_execution(workflow_execution)
+
+    def get_cancellation_stats(self) -> Dict[str, Any]:
+        """Seconds between ``cancel`` and the run loop actually stopping."""
+        latencies = sorted(self._cancel_latencies)
+        if not latencies:
+            return {"count": 0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        return {
+            "count": len(latencies),
+            "p50": round(latencies[len(latencies) // 2], 4),
+            "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 4),
+            "max": round(latencies[-1], 4),
+        }
+
     def retry_node(self, execution_id: str, node_id: str) -> Execution:
         execution_context = self._store.get(execution_id)
         workflow_execution = execution_context.execution
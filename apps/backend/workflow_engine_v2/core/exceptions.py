@@ -23,10 +23,15 @@ class ExecutionFailure(EngineError):
     pass
 
 
+class ExecutionCancelled(EngineError):
+    pass
+
+
 __all__ = [
     "EngineError",
     "SpecNotFoundError",
     "GraphError",
     "CycleError",
     "ExecutionFailure",
+    "ExecutionCancelled",
 ]
@@ -0,0 +1,211 @@
+"""Per-workflow execution plans for the v2 engine.
+
+Everything the engine hot loop needs that depends only on the workflow
+definition (resolved specs, output shaping defaults, retry/timeout settings,
+successor edges, the validated graph) is computed once when a workflow is
+first run and cached by workflow id + version. Each run then only performs
+dict lookups against the plan.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from shared.models.workflow import Node, Workflow
+from workflow_engine_v2.core.graph import WorkflowGraph
+from workflow_engine_v2.core.spec import get_spec
+from workflow_engine_v2.core.validation import validate_workflow
+
+
+def _config_value(configurations: Dict[str, Any], key: str, default: Any) -> Any:
+    # Configuration entries may be schema dicts ({"default": ...}) or direct values
+    val = configurations.get(key, default)
+    if isinstance(val, dict) and "default" in val:
+        return val.get("default", default)
+    return val if val is not None else default
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class NodePlan:
+    """Precomputed, definition-only data for one node."""
+
+    node: Node
+    spec: Any
+    # None means "no shaping": keep dict payloads as-is
+    output_defaults: Optional[Dict[str, Any]]
+    successors: List[Tuple[str, str, Optional[str]]]
+    max_retries: int = 0
+    retry_backoff_seconds: float = 0.0
+    retry_backoff_factor: float = 1.0
+    retry_jitter_seconds: float = 0.0
+    exec_timeout_seconds: Optional[float] = None
+    # Raw "timeout" config, checked against the measured duration after the run
+    duration_timeout_seconds: Optional[float] = None
+
+    def shape_payload(self, payload: Any) -> Dict[str, Any]:
+        """Shape a port payload to exactly the spec's output_params keys."""
+        allowed_defaults = self.output_defaults
+        if allowed_defaults is None:
+            return payload if isinstance(payload, dict) else {}
+        if isinstance(payload, dict):
+            return {k: payload.get(k, default_val) for k, default_val in allowed_defaults.items()}
+        # Place primitive payload into 'data' if defined, otherwise use defaults
+        if "data" in allowed_defaults:
+            return {k: (payload if k == "data" else v) for k, v in allowed_defaults.items()}
+        return dict(allowed_defaults)
+
+
+@dataclass
+class ExecutionPlan:
+    workflow_id: str
+    version: str
+    fingerprint: str
+    graph: WorkflowGraph
+    nodes: Dict[str, NodePlan] = field(default_factory=dict)
+    # Last Workflow object matched against this plan (see ExecutionPlanCache.get)
+    source: Optional[Workflow] = field(default=None, repr=False, compare=False)
+
+
+def workflow_fingerprint(workflow: Workflow) -> str:
+    """Digest of the parts of a workflow that affect its execution plan."""
+    payload = workflow.model_dump_json(include={"nodes", "connections", "triggers"})
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _plan_node(node: Node, graph: WorkflowGraph) -> NodePlan:
+    try:
+        spec = get_spec(node.type, node.subtype)
+        allowed_defaults = getattr(spec, "output_params", {}) or {}
+    except Exception:
+        # Fallback to node.output_params if spec not available
+        spec = None
+        allowed_defaults = node.output_params or {}
+
+    configurations = node.configurations or {}
+    exec_timeout = _optional_float(_config_value(configurations, "timeout_seconds", None))
+    if exec_timeout is None:
+        exec_timeout = _optional_float(_config_value(configurations, "timeout", None))
+
+    return NodePlan(
+        node=node,
+        spec=spec,
+        output_defaults=dict(allowed_defaults) if isinstance(allowed_defaults, dict) else None,
+        successors=list(graph.successors(node.id)),
+        max_retries=int(_config_value(configurations, "retry_attempts", 0) or 0),
+        retry_backoff_seconds=float(_config_value(configurations, "retry_backoff_seconds", 0) or 0),
+        retry_backoff_factor=float(
+            _config_value(configurations, "retry_backoff_factor", 1.0) or 1.0
+        ),
+        retry_jitter_seconds=_optional_float(configurations.get("retry_jitter_seconds")) or 0.0,
+        exec_timeout_seconds=exec_timeout,
+        duration_timeout_seconds=_optional_float(configurations.get("timeout")),
+    )
+
+
+def build_execution_plan(
+    workflow: Workflow, workflow_id: str, fingerprint: Optional[str] = None
+) -> ExecutionPlan:
+    """Validate a workflow against the spec registry and precompute its plan.
+
+    Raises the same errors as ExecutionEngine.validate_against_specs plus
+    CycleError for cyclic graphs.
+    """
+    for n in workflow.nodes:
+        _ = get_spec(n.type, n.subtype)
+    validate_workflow(workflow)
+
+    graph = WorkflowGraph(workflow)
+    _ = graph.topo_order()  # Raises on cycle
+
+    plan = ExecutionPlan(
+        workflow_id=workflow_id,
+        version=workflow.metadata.version,
+        fingerprint=fingerprint or workflow_fingerprint(workflow),
+        graph=graph,
+    )
+    for node_id, node in graph.nodes.items():
+        plan.nodes[node_id] = _plan_node(node, graph)
+    return plan
+
+
+class ExecutionPlanCache:
+    """Bounded LRU of execution plans keyed by (workflow_id, version).
+
+    The stored fingerprint guards against a definition edited without a
+    version bump; a mismatch simply rebuilds the plan. Passing the same Workflow
+    object again (as WorkflowServiceV2 does for an unchanged cached definition)
+    skips the fingerprint too, so such objects must not be edited in place.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._plans: "OrderedDict[Tuple[str, str], ExecutionPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, workflow: Workflow, workflow_id: str) -> ExecutionPlan:
+        key = (workflow_id, workflow.metadata.version)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None and plan.source is workflow:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+
+        fingerprint = workflow_fingerprint(workflow)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None and plan.fingerprint == fingerprint:
+                plan.source = workflow
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+
+        plan = build_execution_plan(workflow, workflow_id, fingerprint)
+        plan.source = workflow
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def invalidate(self, workflow_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._plans if k[0] == workflow_id]:
+                del self._plans[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+__all__ = [
+    "ExecutionPlan",
+    "ExecutionPlanCache",
+    "NodePlan",
+    "build_execution_plan",
+    "workflow_fingerprint",
+]
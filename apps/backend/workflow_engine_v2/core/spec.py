@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, Tuple
 
 from pydantic import BaseModel
 
@@ -13,17 +15,32 @@ class SpecNotFoundError(KeyError):
     pass
 
 
+_registry: Optional[Tuple[Any, Any]] = None
+_registry_lock = threading.Lock()
+
+
 def _import_spec_registry():
-    """Import shared spec registry if available; returns callables or (None, None)."""
+    """Import shared spec registry if available; returns callables or (None, None).
+
+    A successful import is kept for the life of the process; failures are not
+    cached so a registry that becomes importable later is still picked up.
+    """
+    global _registry
+    if _registry is not None:
+        return _registry
+
     import logging
 
     logger = logging.getLogger(__name__)
 
     try:
-        from shared.node_specs import get_node_spec, list_available_specs  # type: ignore
+        with _registry_lock:
+            if _registry is None:
+                from shared.node_specs import get_node_spec, list_available_specs  # type: ignore
 
-        logger.info("✅ Successfully loaded node spec registry from shared.node_specs")
-        return get_node_spec, list_available_specs
+                _registry = (get_node_spec, list_available_specs)
+                logger.info("✅ Successfully loaded node spec registry from shared.node_specs")
+        return _registry
     except Exception as e:
         logger.error(f"❌ Failed to import node spec registry: {type(e).__name__}: {str(e)}")
         import traceback
@@ -37,19 +54,37 @@ def _to_str(x: Any) -> str:
 
 
 def get_spec(node_type: Any, node_subtype: Any) -> BaseModel:
+    node_type, node_subtype = _to_str(node_type), _to_str(node_subtype)
+    try:
+        return _resolve_spec(node_type, node_subtype)
+    except SpecNotFoundError:
+        pass
+    # Fallback to minimal stub spec if registry missing or invalid (never memoized,
+    # so a spec registered later is picked up)
+    fallback_spec = _fallback_spec(node_type, node_subtype)
+    if fallback_spec is not None:
+        return fallback_spec
+    raise SpecNotFoundError(f"No spec found for {node_type}.{node_subtype}")
+
+
+@lru_cache(maxsize=1024)
+def _resolve_spec(node_type: str, node_subtype: str) -> BaseModel:
+    # Specs are immutable templates, so a registry hit for (type, subtype) is
+    # memoized; SpecNotFoundError is raised (and therefore not cached) otherwise.
     get_node_spec, _ = _import_spec_registry()
     if get_node_spec is not None:
         try:
-            spec = get_node_spec(_to_str(node_type), _to_str(node_subtype))
+            spec = get_node_spec(node_type, node_subtype)
         except Exception:
             spec = None
         if spec is not None:
             return spec
-    # Fallback to minimal stub spec if registry missing or invalid
-    fallback_spec = _fallback_spec(_to_str(node_type), _to_str(node_subtype))
-    if fallback_spec is not None:
-        return fallback_spec
-    raise SpecNotFoundError(f"No spec found for {_to_str(node_type)}.{_to_str(node_subtype)}")
+    raise SpecNotFoundError(f"No spec found for {node_type}.{node_subtype}")
+
+
+def clear_spec_cache() -> None:
+    """Forget memoized spec lookups (e.g. after registering specs at runtime)."""
+    _resolve_spec.cache_clear()
 
 
 def list_specs() -> list[str]:
@@ -171,4 +206,4 @@ def _fallback_spec(node_type: str, subtype: str) -> BaseModel | None:
     return None
 
 
-__all__ = ["get_spec", "list_specs", "coerce_node_to_v2", "SpecNotFoundError"]
+__all__ = ["get_spec", "list_specs", "clear_spec_cache", "coerce_node_to_v2", "SpecNotFoundError"]
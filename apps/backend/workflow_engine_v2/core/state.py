@@ -14,6 +14,7 @@ sys.path.insert(0, str(backend_dir))
 # Use absolute imports
 from shared.models import Execution
 from shared.models.workflow import Workflow
+from workflow_engine_v2.core.cancellation import CancellationToken
 from workflow_engine_v2.core.graph import WorkflowGraph
 
 
@@ -26,6 +27,8 @@ class ExecutionContext:
     memory_store: Dict[str, Any] = field(default_factory=dict)
     node_outputs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     node_outputs_by_name: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Tripped by ExecutionEngine.cancel; runners see it via inputs["_ctx"]
+    cancel_token: CancellationToken = field(default_factory=CancellationToken)
 
 
 class ExecutionStore:
@@ -0,0 +1,322 @@
+"""Node attempt supervision for the v2 engine.
+
+Executions are hosted on the engine's own thread pool; node calls that need a
+timeout or retries are handed to a separate ``NodeWorkerPool`` so a host
+waiting on a node never competes with the node for a worker.
+
+``NodeSupervisor`` drives the attempts of one node call:
+
+- each attempt runs on a node worker; its timeout is a timer on the
+  supervisor's clock thread rather than a blocked ``future.result(timeout)``;
+- a timed-out worker is abandoned: the pool stops counting it and starts a
+  replacement, and the stray thread exits as soon as the runner returns
+  (threads cannot be killed), so hung runners do not shrink capacity;
+- retry backoff is a scheduled wake-up on the same timer, so no thread sleeps
+  between attempts and the waiting host can be released early by cancelling
+  the returned future.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import heapq
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class NodeTimeoutError(TimeoutError):
+    """A node attempt exceeded its execution timeout."""
+
+
+class NodeWorkerPool:
+    """Daemon worker threads for node calls, with timeout abandonment."""
+
+    def __init__(self, max_workers: int = 32, max_abandoned: int = 64, name: str = "node-worker"):
+        self.max_workers = max_workers
+        self.max_abandoned = max_abandoned
+        self.name = name
+        self._queue: "queue.SimpleQueue[Optional[tuple]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._active = 0  # threads counted against max_workers
+        self._idle = 0
+        self._abandoned = 0  # threads still finishing a timed-out call
+        self._pending = 0
+        self._running: Dict[concurrent.futures.Future, threading.Thread] = {}
+        self._abandoned_threads: set = set()
+        self._counter = itertools.count()
+        self.stats = {"submitted": 0, "abandoned": 0, "replacement_refused": 0}
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> concurrent.futures.Future:
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._lock:
+            self.stats["submitted"] += 1
+            self._pending += 1
+            self._queue.put((future, fn, args))
+            self._maybe_spawn()
+        return future
+
+    def abandon(self, future: concurrent.futures.Future) -> bool:
+        """Stop waiting for the worker running ``future`` and replace it.
+
+        Returns False if the call already finished or never started (a queued
+        call is simply cancelled).
+        """
+        if future.cancel():
+            return False
+        with self._lock:
+            thread = self._running.pop(future, None)
+            if thread is None:
+                return False
+            self._abandoned_threads.add(thread)
+            self._active -= 1
+            self._abandoned += 1
+            self.stats["abandoned"] += 1
+            self._maybe_spawn()
+            return True
+
+    def _maybe_spawn(self) -> None:
+        # Caller holds the lock
+        if self._idle >= self._pending or self._active >= self.max_workers:
+            return
+        if self._abandoned >= self.max_abandoned:
+            # Too many runners ignoring their timeout; don't grow without bound
+            self.stats["replacement_refused"] += 1
+            logger.error(
+                f"❌ {self.name}: {self._abandoned} abandoned node calls still running, "
+                "not starting more workers"
+            )
+            return
+        self._active += 1
+        thread = threading.Thread(
+            target=self._worker, name=f"{self.name}-{next(self._counter)}", daemon=True
+        )
+        thread.start()
+
+    def _worker(self) -> None:
+        me = threading.current_thread()
+        while True:
+            with self._lock:
+                self._idle += 1
+            item = self._queue.get()
+            with self._lock:
+                self._idle -= 1
+                self._pending -= 1
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._lock:
+                self._running[future] = me
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            with self._lock:
+                self._running.pop(future, None)
+                if me in self._abandoned_threads:
+                    self._abandoned_threads.discard(me)
+                    self._abandoned -= 1
+                    return
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "active": self._active,
+                "idle": self._idle,
+                "pending": self._pending,
+                "abandoned_running": self._abandoned,
+            }
+
+
+class _TimerHandle:
+    __slots__ = ("cancelled", "_owner")
+
+    def __init__(self, owner: "NodeSupervisor"):
+        self.cancelled = False
+        self._owner = owner
+
+    def cancel(self) -> None:
+        if not self.cancelled:
+            self.cancelled = True
+            self._owner._cancel_timer()
+
+
+def _resolve(future: concurrent.futures.Future, value: Any = None, exc: Any = None) -> None:
+    try:
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(value)
+    except concurrent.futures.InvalidStateError:
+        pass  # cancelled by the caller meanwhile
+
+
+class NodeSupervisor:
+    """Runs node attempts on a worker pool with timer-driven timeouts and backoff."""
+
+    def __init__(self, workers: NodeWorkerPool):
+        self.workers = workers
+        self._timers: List[Tuple[float, int, Callable[[], None], _TimerHandle]] = []
+        self._cancelled = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"attempts": 0, "retries": 0, "timeouts": 0}
+
+    # -------- Timer thread --------
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> _TimerHandle:
+        handle = _TimerHandle(self)
+        with self._cond:
+            heapq.heappush(
+                self._timers, (time.monotonic() + delay, next(self._seq), callback, handle)
+            )
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._timer_loop, name="node-supervisor", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return handle
+
+    def _cancel_timer(self) -> None:
+        with self._cond:
+            self._cancelled += 1
+            # Most node timeouts never fire; drop them in bulk instead of one by one
+            if self._cancelled > 64 and self._cancelled * 2 > len(self._timers):
+                self._timers = [t for t in self._timers if not t[3].cancelled]
+                heapq.heapify(self._timers)
+                self._cancelled = 0
+
+    def _timer_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._timers or self._timers[0][0] > time.monotonic():
+                    timeout = self._timers[0][0] - time.monotonic() if self._timers else None
+                    self._cond.wait(timeout)
+                _, _, callback, handle = heapq.heappop(self._timers)
+                if handle.cancelled:
+                    self._cancelled = max(0, self._cancelled - 1)
+                    continue
+            try:
+                callback()
+            except Exception as e:  # pragma: no cover - defensive logging only
+                logger.error(f"❌ Node supervisor timer callback failed: {e}")
+
+    # -------- Attempts --------
+
+    def run(
+        self,
+        call: Callable[[], Any],
+        *,
+        timeout: Optional[float] = None,
+        max_retries: int = 0,
+        backoff: Callable[[int], float] = lambda attempt: 0.0,
+        on_retry: Optional[Callable[[int, BaseException], None]] = None,
+    ) -> concurrent.futures.Future:
+        """Run ``call`` until it succeeds or ``max_retries`` retries have failed.
+
+        ``backoff(attempt)`` gives the delay before retry ``attempt`` (1-based);
+        ``on_retry`` is told about each failure that will be retried. The
+        returned future holds the first successful result or the last error.
+        Cancelling it stops further attempts.
+        """
+        result: concurrent.futures.Future = concurrent.futures.Future()
+        attempt = 0
+        current: Optional[concurrent.futures.Future] = None
+
+        def start() -> None:
+            nonlocal current
+            if result.done():
+                return
+            self.stats["attempts"] += 1
+            future = current = self.workers.submit(call)
+            settled = threading.Lock()
+            timer: Optional[_TimerHandle] = None
+
+            def settle(exc: Optional[BaseException], value: Any = None) -> None:
+                if not settled.acquire(blocking=False):
+                    return
+                if timer is not None:
+                    timer.cancel()
+                if exc is None:
+                    _resolve(result, value)
+                else:
+                    failed(exc)
+
+            def on_done(f: concurrent.futures.Future) -> None:
+                if f.cancelled():
+                    return
+                error = f.exception()
+                settle(error, None if error is not None else f.result())
+
+            def on_timeout() -> None:
+                if future.done():
+                    return
+                self.stats["timeouts"] += 1
+                self.workers.abandon(future)
+                settle(NodeTimeoutError(f"Node execution exceeded {timeout}s timeout"))
+
+            if timeout is not None and timeout > 0:
+                timer = self.call_later(timeout, on_timeout)
+            future.add_done_callback(on_done)
+
+        def failed(exc: BaseException) -> None:
+            nonlocal attempt
+            attempt += 1
+            if attempt > max_retries or result.done():
+                _resolve(result, exc=exc)
+                return
+            self.stats["retries"] += 1
+            if on_retry is not None:
+                try:
+                    on_retry(attempt, exc)
+                except Exception:
+                    pass
+            delay = backoff(attempt)
+            if delay > 0:
+                self.call_later(delay, start)
+            else:
+                start()
+
+        def on_result(f: concurrent.futures.Future) -> None:
+            # Cancelled by the caller: release the worker of the attempt in progress
+            if f.cancelled() and current is not None and not current.done():
+                self.workers.abandon(current)
+
+        result.add_done_callback(on_result)
+        start()
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            scheduled = len(self._timers)
+        return {**self.stats, "scheduled_timers": scheduled, "workers": self.workers.get_stats()}
+
+
+_supervisor: Optional[NodeSupervisor] = None
+_supervisor_lock = threading.Lock()
+
+
+def get_node_supervisor() -> NodeSupervisor:
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = NodeSupervisor(
+                NodeWorkerPool(max_workers=int(os.getenv("ENGINE_NODE_WORKERS", "32")))
+            )
+        return _supervisor
+
+
+__all__ = ["NodeSupervisor", "NodeTimeoutError", "NodeWorkerPool", "get_node_supervisor"]
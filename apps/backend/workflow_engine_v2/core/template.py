@@ -1,156 +1,342 @@
 """Template rendering utilities for v2 engine.
 
 Supports simple {{ path.to.value }} substitution against a context dict.
-Integrates with dot-path get_path() from core.expr.
+Dot-path lookups follow get_path() semantics from core.expr.
+
+Expressions, boolean conditions and templates are compiled once into closure
+trees and cached by their source text, so hot paths (FILTER predicates, LOOP
+conditions, repeated template rendering) only pay for evaluation.
 """
 
 from __future__ import annotations
 
+import operator as op_module
 import re
 import time
-from typing import Any, Dict
-
-from workflow_engine_v2.core.expr import get_path
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 TEMPLATE_RE = re.compile(r"\{\{\s*([^}]+)\s*\}\}")
 
+_INPUT_RE = re.compile(r"\$input(?:\.([a-zA-Z0-9_]+))?(?:\.(.+))?")
+_CONFIG_RE = re.compile(r"\$config(?:\.(.+))?")
+_TRIGGER_RE = re.compile(r"\$trigger(?:\.(.+))?")
+_NODE_RE = re.compile(r"\$node\[\"([^\"]+)\"\](?:\.([a-zA-Z0-9_]+))?(?:\.(.+))?")
+_CALL_RE = re.compile(r"^([a-zA-Z_][a-zA-Z0-9_]*)\((.*)\)$")
 
-def _eval_expression(expr: str, ctx: Dict[str, Any]) -> Any:
+# Longest operators first so "===" is not read as "==" followed by "="
+_COMPARISON_OPS = ("===", "==", "!==", "!=", ">=", "<=", ">", "<")
+
+_CACHE_SIZE = 2048
+
+Evaluator = Callable[[Dict[str, Any]], Any]
+
+
+def _compile_path(path: str) -> Callable[[Any], Any]:
+    """Compile a dot-path into a getter equivalent to get_path(data, path)."""
+    if not path:
+        return lambda data: data
+
+    parts: List[Tuple[str, str, Optional[int]]] = [
+        (part, part.lower(), int(part) if part.isdigit() else None) for part in path.split(".")
+    ]
+
+    def getter(data: Any) -> Any:
+        cur = data
+        for part, lowered_part, index in parts:
+            if isinstance(cur, dict):
+                if part in cur:
+                    cur = cur[part]
+                else:
+                    for key in cur.keys():
+                        if key.lower() == lowered_part:
+                            cur = cur[key]
+                            break
+                    else:
+                        return None
+            elif isinstance(cur, list):
+                if index is None or index >= len(cur):
+                    return None
+                cur = cur[index]
+            else:
+                return None
+        return cur
+
+    return getter
+
+
+def _build_expression(expr: str) -> Evaluator:
     expr = expr.strip()
     # $json and $json.path -> current main input
     if expr == "$json":
-        return ctx.get("input")
+        return lambda ctx: ctx.get("input")
     if expr.startswith("$json."):
-        base = ctx.get("input")
-        return get_path(base, expr[len("$json.") :])
+        getter = _compile_path(expr[len("$json.") :])
+        return lambda ctx: getter(ctx.get("input"))
     # $input.port or $input.port.path -> full inputs dict by port
     if expr.startswith("$input"):
-        match = re.match(r"\$input(?:\.([a-zA-Z0-9_]+))?(?:\.(.+))?", expr)
-        if match:
-            port = match.group(1) or "main"
-            tail = match.group(2)
-            inputs = ctx.get("inputs") or {}
-            base = inputs.get(port)
-            if tail:
-                return get_path(base, tail)
-            return base
-        return None
+        match = _INPUT_RE.match(expr)
+        port = match.group(1) or "main"
+        getter = _compile_path(match.group(2) or "")
+        return lambda ctx: getter((ctx.get("inputs") or {}).get(port))
     # $config.path -> node configuration
     if expr.startswith("$config"):
-        match = re.match(r"\$config(?:\.(.+))?", expr)
-        if match:
-            tail = match.group(1)
-            base = ctx.get("config") or {}
-            if tail:
-                return get_path(base, tail)
-            return base
-        return None
+        getter = _compile_path(_CONFIG_RE.match(expr).group(1) or "")
+        return lambda ctx: getter(ctx.get("config") or {})
     # $trigger.path -> trigger details
     if expr.startswith("$trigger"):
-        match = re.match(r"\$trigger(?:\.(.+))?", expr)
-        if match:
-            tail = match.group(1)
+        tail = _TRIGGER_RE.match(expr).group(1)
+        getter = _compile_path(tail or "")
+
+        def trigger_value(ctx: Dict[str, Any]) -> Any:
             base = ctx.get("trigger") or {}
             if tail and isinstance(base, dict):
-                return get_path(base, tail)
+                return getter(base)
             return base
-        return None
+
+        return trigger_value
     # Support $node["id"].port.path
     if expr.startswith("$node["):
-        match = re.match(r"\$node\[\"([^\"]+)\"\](?:\.([a-zA-Z0-9_]+))?(?:\.(.+))?", expr)
-        if match:
-            node_id = match.group(1)
-            port = match.group(2) or "main"
-            tail = match.group(3)
+        match = _NODE_RE.match(expr)
+        if not match:
+            return lambda ctx: None
+        node_id = match.group(1)
+        port = match.group(2) or "main"
+        getter = _compile_path(match.group(3) or "")
+
+        def node_value(ctx: Dict[str, Any]) -> Any:
             nodes_by_id = ctx.get("nodes_id") or ctx.get("nodes") or {}
             nodes_by_name = ctx.get("nodes_name") or {}
             node_out = nodes_by_id.get(node_id) or nodes_by_name.get(node_id) or {}
-            base = node_out.get(port)
-            if tail:
-                return get_path(base, tail)
-            return base
-        return None
+            return getter(node_out.get(port))
+
+        return node_value
     # Fallback to dot-path on the full ctx
-    return get_path(ctx, expr)
+    return _compile_path(expr)
 
 
 def _strip_parens(string_value: str) -> str:
+    """Strip redundant outer parentheses, e.g. "((a == b))" -> "a == b"."""
     string_value = string_value.strip()
     while string_value.startswith("(") and string_value.endswith(")"):
+        if _matching_paren(string_value, 0) != len(string_value) - 1:
+            break
         string_value = string_value[1:-1].strip()
     return string_value
 
 
-def _parse_literal(token: str, ctx: Dict[str, Any]) -> Any:
+def _matching_paren(text: str, open_index: int) -> int:
+    depth = 0
+    quote = None
+    for index in range(open_index, len(text)):
+        char = text[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return index
+    return -1
+
+
+def _top_level_positions(text: str):
+    """Yield indexes of characters outside quotes and parentheses."""
+    depth = 0
+    quote = None
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+            continue
+        if char in ('"', "'"):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            yield index
+
+
+def _split_top_level(text: str, separator: str) -> List[str]:
+    parts = []
+    start = 0
+    skip_until = -1
+    for index in _top_level_positions(text):
+        if index < skip_until:
+            continue
+        if text.startswith(separator, index):
+            parts.append(text[start:index])
+            start = index + len(separator)
+            skip_until = start
+    parts.append(text[start:])
+    return parts
+
+
+def _find_comparison(text: str) -> Optional[Tuple[int, str]]:
+    for index in _top_level_positions(text):
+        if text[index] not in "=!<>":
+            continue
+        for operator in _COMPARISON_OPS:
+            if text.startswith(operator, index):
+                return index, operator
+    return None
+
+
+def _build_literal(token: str) -> Evaluator:
     trimmed_token = token.strip()
     # function call: name(arg1, arg2, ...)
-    match = re.match(r"^([a-zA-Z_][a-zA-Z0-9_]*)\((.*)\)$", trimmed_token)
+    match = _CALL_RE.match(trimmed_token)
     if match:
         function_name = match.group(1)
-        args_string = match.group(2)
-        args = _split_args(args_string)
-        args_eval = [_parse_literal(argument, ctx) for argument in args]
-        return _call_func(function_name, args_eval)
+        arg_evaluators = [_build_literal(argument) for argument in _split_args(match.group(2))]
+        return lambda ctx: _call_func(function_name, [arg(ctx) for arg in arg_evaluators])
     # quoted string
     if (trimmed_token.startswith('"') and trimmed_token.endswith('"')) or (
         trimmed_token.startswith("'") and trimmed_token.endswith("'")
     ):
-        return trimmed_token[1:-1]
+        value = trimmed_token[1:-1]
+        return lambda ctx: value
     # booleans/null
-    if trimmed_token.lower() == "true":
-        return True
-    if trimmed_token.lower() == "false":
-        return False
-    if trimmed_token.lower() in ("null", "none"):
-        return None
+    lowered = trimmed_token.lower()
+    if lowered in ("true", "false", "null", "none"):
+        constant = {"true": True, "false": False}.get(lowered)
+        return lambda ctx: constant
     # number
     try:
-        if "." in trimmed_token:
-            return float(trimmed_token)
-        return int(trimmed_token)
+        number = float(trimmed_token) if "." in trimmed_token else int(trimmed_token)
+        return lambda ctx: number
     except Exception:
         pass
     # expression/path
-    return _eval_expression(trimmed_token, ctx)
+    return compile_expression(trimmed_token)
 
 
-def eval_boolean(expr: str, ctx: Dict[str, Any]) -> bool:
-    """Evaluate a boolean expression with simple ||, &&, and comparison ops.
+def _compare(operator: str, left: Evaluator, right: Evaluator) -> Callable[[Dict[str, Any]], bool]:
+    if operator in ("==", "==="):
+        return lambda ctx: left(ctx) == right(ctx)
+    if operator in ("!=", "!=="):
+        return lambda ctx: left(ctx) != right(ctx)
 
-    Supported ops: ==, ===, !=, !==, >=, <=, >, < with minimal precedence
-    and grouping by parentheses. This is a pragmatic parser for workflow
-    conditions, not a full language.
-    """
+    compare = {
+        ">=": op_module.ge,
+        "<=": op_module.le,
+        ">": op_module.gt,
+        "<": op_module.lt,
+    }[operator]
+
+    def ordered(ctx: Dict[str, Any]) -> bool:
+        left_value = left(ctx)
+        if left_value is None:
+            return False
+        right_value = right(ctx)
+        return right_value is not None and compare(left_value, right_value)
+
+    return ordered
+
+
+def _build_boolean(expr: str) -> Callable[[Dict[str, Any]], bool]:
     stripped_expr = _strip_parens(expr)
     # Or split
-    parts = stripped_expr.split("||")
+    parts = _split_top_level(stripped_expr, "||")
     if len(parts) > 1:
-        return any(eval_boolean(part, ctx) for part in parts)
+        any_of = [_build_boolean(part) for part in parts]
+        return lambda ctx: any(branch(ctx) for branch in any_of)
     # And split
-    parts = stripped_expr.split("&&")
+    parts = _split_top_level(stripped_expr, "&&")
     if len(parts) > 1:
-        return all(eval_boolean(part, ctx) for part in parts)
+        all_of = [_build_boolean(part) for part in parts]
+        return lambda ctx: all(branch(ctx) for branch in all_of)
     # Comparison
-    match = re.match(r"^(.*?)(===|==|!==|!=|>=|<=|>|<)(.*)$", stripped_expr)
-    if match:
-        left = _parse_literal(match.group(1), ctx)
-        operator = match.group(2)
-        right = _parse_literal(match.group(3), ctx)
-        if operator in ("==", "==="):
-            return left == right
-        if operator in ("!=", "!=="):
-            return left != right
-        if operator == ">=":
-            return left is not None and right is not None and left >= right
-        if operator == "<=":
-            return left is not None and right is not None and left <= right
-        if operator == ">":
-            return left is not None and right is not None and left > right
-        if operator == "<":
-            return left is not None and right is not None and left < right
+    found = _find_comparison(stripped_expr)
+    if found:
+        index, operator = found
+        left = _build_literal(stripped_expr[:index])
+        right = _build_literal(stripped_expr[index + len(operator) :])
+        return _compare(operator, left, right)
+    # Negation: !expr
+    if stripped_expr.startswith("!"):
+        negated = _build_boolean(stripped_expr[1:])
+        return lambda ctx: not negated(ctx)
     # Fallback: treat non-empty evaluation as truthy
-    value = _parse_literal(stripped_expr, ctx)
-    return bool(value)
+    value = _build_literal(stripped_expr)
+    return lambda ctx: bool(value(ctx))
+
+
+def _build_template(text: str) -> Callable[[Dict[str, Any]], str]:
+    segments: List[Any] = []
+    last = 0
+    for match in TEMPLATE_RE.finditer(text):
+        if match.start() > last:
+            segments.append(text[last : match.start()])
+        segments.append(compile_expression(match.group(1).strip()))
+        last = match.end()
+    if last < len(text):
+        segments.append(text[last:])
+
+    if len(segments) == 1 and isinstance(segments[0], str):
+        constant = segments[0]
+        return lambda ctx: constant
+
+    def render(ctx: Dict[str, Any]) -> str:
+        out = []
+        for segment in segments:
+            if isinstance(segment, str):
+                out.append(segment)
+            else:
+                val = segment(ctx)
+                if val is not None:
+                    out.append(str(val))
+        return "".join(out)
+
+    return render
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def compile_expression(expr: str) -> Evaluator:
+    """Compile a value expression ($json.x, $node["id"].port.path, dot-path)."""
+    return _build_expression(expr)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def compile_literal(token: str) -> Evaluator:
+    """Compile an operand: literal, function call or value expression."""
+    return _build_literal(token)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def compile_boolean(expr: str) -> Callable[[Dict[str, Any]], bool]:
+    """Compile a condition with ||, &&, !, and comparison ops."""
+    return _build_boolean(expr)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def compile_template(text: str) -> Callable[[Dict[str, Any]], str]:
+    """Compile a string containing {{ expression }} placeholders."""
+    return _build_template(text)
+
+
+def _eval_expression(expr: str, ctx: Dict[str, Any]) -> Any:
+    return compile_expression(expr)(ctx)
+
+
+def _parse_literal(token: str, ctx: Dict[str, Any]) -> Any:
+    return compile_literal(token)(ctx)
+
+
+def eval_boolean(expr: str, ctx: Dict[str, Any]) -> bool:
+    """Evaluate a boolean expression with simple ||, &&, !, and comparison ops.
+
+    Supported ops: ==, ===, !=, !==, >=, <=, >, < with minimal precedence
+    and grouping by parentheses. This is a pragmatic parser for workflow
+    conditions, not a full language.
+    """
+    return compile_boolean(expr)(ctx)
 
 
 def _split_args(args_string: str) -> list[str]:
@@ -281,14 +467,7 @@ def _call_func(name: str, args: list) -> Any:
 
 
 def render_template(text: str, ctx: Dict[str, Any]) -> str:
-    def repl(m):
-        raw = m.group(1).strip()
-        val = _eval_expression(raw, ctx)
-        if val is None:
-            return ""
-        return str(val)
-
-    return TEMPLATE_RE.sub(repl, text)
+    return compile_template(text)(ctx)
 
 
 def render_structure(data: Any, ctx: Dict[str, Any]) -> Any:
@@ -301,4 +480,11 @@ def render_structure(data: Any, ctx: Dict[str, Any]) -> Any:
     return data
 
 
-__all__ = ["render_template", "render_structure"]
+__all__ = [
+    "render_template",
+    "render_structure",
+    "eval_boolean",
+    "compile_expression",
+    "compile_boolean",
+    "compile_template",
+]
@@ -15,6 +15,7 @@ import re
 # Use absolute imports
 from shared.models import TriggerInfo
 from shared.models.workflow import Node
+from workflow_engine_v2.core.cancellation import ExecutionCancelled, cancel_token_for
 from workflow_engine_v2.core.expr import get_path
 from workflow_engine_v2.core.template import render_structure
 from workflow_engine_v2.runners.base import NodeRunner
@@ -83,7 +84,10 @@ class HttpRequestRunner(NodeRunner):
             json_body = dyn.get("body") or cfg.get("body")
 
         client = HTTPClient(
-            timeout=timeout, follow_redirects=follow_redirects, verify_ssl=verify_ssl
+            timeout=timeout,
+            follow_redirects=follow_redirects,
+            verify_ssl=verify_ssl,
+            cancel_token=cancel_token_for(inputs),
         )
         try:
             auth = None
@@ -120,6 +124,8 @@ class HttpRequestRunner(NodeRunner):
                     "response_headers": resp.headers,
                 },
             }
+        except ExecutionCancelled:
+            raise
         except Exception as e:
             return {"error": {"message": str(e), "url": url, "method": method}}
         finally:
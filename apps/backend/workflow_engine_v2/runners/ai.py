@@ -16,6 +16,11 @@ sys.path.insert(0, str(backend_dir))
 from shared.models import TriggerInfo
 from shared.models.node_enums import MemorySubtype, NodeType
 from shared.models.workflow import Node
+from workflow_engine_v2.core.cancellation import (
+    NEVER_CANCELLED,
+    ExecutionCancelled,
+    cancel_token_for,
+)
 from workflow_engine_v2.runners.base import NodeRunner
 from workflow_engine_v2.runners.memory import MemoryRunner
 from workflow_engine_v2.runners.tool import ToolRunner
@@ -30,10 +35,13 @@ class AIAgentRunner(NodeRunner):
     def __init__(self) -> None:
         self._memory_runner = MemoryRunner()
         self._tool_runner = ToolRunner()
+        self._cancel = NEVER_CANCELLED
 
     def run(self, node: Node, inputs: Dict[str, Any], trigger: TriggerInfo) -> Dict[str, Any]:
         """Execute AI agent with memory-aware conversation and tool integration."""
         ctx = inputs.get("_ctx")
+        # Runners are created per attempt; the token aborts the provider call
+        self._cancel = cancel_token_for(inputs)
 
         # Extract user message from inputs, then fallback to trigger data if needed
         main_input = inputs.get("result", {})
@@ -123,7 +131,9 @@ class AIAgentRunner(NodeRunner):
                     generation_params["available_functions"] = available_tools
 
                 # Generate AI response
-                gen_result = provider.generate(enhanced_prompt, generation_params)
+                gen_result = self._cancel.call(
+                    provider.generate, enhanced_prompt, generation_params
+                )
                 ai_response = gen_result.get("response", "")
 
                 # Update output with generation details
@@ -133,6 +143,8 @@ class AIAgentRunner(NodeRunner):
 
                 logger.info(f"✅ AI response generated: {len(ai_response)} characters")
 
+            except ExecutionCancelled:
+                raise
             except Exception as e:
                 logger.error(f"❌ AI generation failed: {str(e)}")
                 output["provider_error"] = str(e)
@@ -18,6 +18,11 @@ import httpx
 from shared.models import TriggerInfo
 from shared.models.node_enums import MemorySubtype, NodeType
 from shared.models.workflow import Node
+from workflow_engine_v2.core.cancellation import (
+    NEVER_CANCELLED,
+    ExecutionCancelled,
+    cancel_token_for,
+)
 
 from .base import NodeRunner
 from .mcp_tool_discovery import (
@@ -37,11 +42,14 @@ class AnthropicClaudeRunner(NodeRunner):
     def __init__(self) -> None:
         self._memory_runner = MemoryRunner()
         self._tool_runner = ToolRunner()
+        self._cancel = NEVER_CANCELLED
         self._api_key = os.getenv("ANTHROPIC_API_KEY")
 
     def run(self, node: Node, inputs: Dict[str, Any], trigger: TriggerInfo) -> Dict[str, Any]:
         """Execute Claude AI agent with Anthropic-specific configuration."""
         ctx = inputs.get("_ctx")
+        # Runners are created per attempt; the token aborts LLM calls and tool loops
+        self._cancel = cancel_token_for(inputs)
 
         # Extract user_prompt from main input port
         main_input = inputs.get("result", {})
@@ -220,8 +228,8 @@ class AnthropicClaudeRunner(NodeRunner):
 
         try:
             with httpx.Client(timeout=timeout_seconds) as client:
-                resp = client.post(
-                    "https://api.anthropic.com/v1/messages", headers=headers, json=body
+                resp = self._cancel.call(
+                    client.post, "https://api.anthropic.com/v1/messages", headers=headers, json=body
                 )
                 resp.raise_for_status()
                 data = resp.json()
@@ -277,6 +285,8 @@ class AnthropicClaudeRunner(NodeRunner):
                     "function_calls": tool_calls,
                 }
 
+        except ExecutionCancelled:
+            raise
         except httpx.HTTPStatusError as e:
             error_text = e.response.text
             logger.error(f"❌ Anthropic API error: {e.response.status_code} - {error_text}")
@@ -348,6 +358,7 @@ class AnthropicClaudeRunner(NodeRunner):
             tool_source_map = {}
 
         while iteration < max_iterations:
+            self._cancel.raise_if_cancelled()
             iteration += 1
             logger.info(f"🔄 Claude conversation turn {iteration}/{max_iterations}")
 
@@ -372,7 +383,8 @@ class AnthropicClaudeRunner(NodeRunner):
             # Call Anthropic API
             try:
                 with httpx.Client(timeout=timeout_seconds) as client:
-                    resp = client.post(
+                    resp = self._cancel.call(
+                        client.post,
                         "https://api.anthropic.com/v1/messages",
                         headers=headers,
                         json=body,
@@ -536,6 +548,8 @@ class AnthropicClaudeRunner(NodeRunner):
                     }
                 )
 
+            except ExecutionCancelled:
+                raise
             except httpx.HTTPStatusError as e:
                 error_text = e.response.text
                 logger.error(f"❌ Anthropic API error: {e.response.status_code} - {error_text}")
@@ -20,6 +20,11 @@ import httpx
 from shared.models import TriggerInfo
 from shared.models.node_enums import MemorySubtype, NodeType
 from shared.models.workflow import Node
+from workflow_engine_v2.core.cancellation import (
+    NEVER_CANCELLED,
+    ExecutionCancelled,
+    cancel_token_for,
+)
 
 from .base import NodeRunner
 from .mcp_tool_discovery import (
@@ -39,11 +44,14 @@ class GoogleGeminiRunner(NodeRunner):
     def __init__(self) -> None:
         self._memory_runner = MemoryRunner()
         self._tool_runner = ToolRunner()
+        self._cancel = NEVER_CANCELLED
         self._api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
 
     def run(self, node: Node, inputs: Dict[str, Any], trigger: TriggerInfo) -> Dict[str, Any]:
         """Execute Gemini AI agent with Google-specific configuration."""
         ctx = inputs.get("_ctx")
+        # Runners are created per attempt; the token aborts LLM calls and tool loops
+        self._cancel = cancel_token_for(inputs)
 
         # Extract user_prompt from main input port
         main_input = inputs.get("result", {})
@@ -264,7 +272,7 @@ class GoogleGeminiRunner(NodeRunner):
         try:
             with httpx.Client(timeout=timeout_seconds) as client:
                 url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
-                resp = client.post(url, json=body)
+                resp = self._cancel.call(client.post, url, json=body)
                 resp.raise_for_status()
                 data = resp.json()
 
@@ -323,6 +331,8 @@ class GoogleGeminiRunner(NodeRunner):
                     "function_calls": tool_calls,
                 }
 
+        except ExecutionCancelled:
+            raise
         except httpx.HTTPStatusError as e:
             error_text = e.response.text
             try:
@@ -20,6 +20,11 @@ import httpx
 from shared.models import TriggerInfo
 from shared.models.node_enums import MemorySubtype, NodeType
 from shared.models.workflow import Node
+from workflow_engine_v2.core.cancellation import (
+    NEVER_CANCELLED,
+    ExecutionCancelled,
+    cancel_token_for,
+)
 
 from .base import NodeRunner
 from .mcp_tool_discovery import (
@@ -39,11 +44,14 @@ class OpenAIChatGPTRunner(NodeRunner):
     def __init__(self) -> None:
         self._memory_runner = MemoryRunner()
         self._tool_runner = ToolRunner()
+        self._cancel = NEVER_CANCELLED
         self._api_key = os.getenv("OPENAI_API_KEY")
 
     def run(self, node: Node, inputs: Dict[str, Any], trigger: TriggerInfo) -> Dict[str, Any]:
         """Execute ChatGPT AI agent with OpenAI-specific configuration."""
         ctx = inputs.get("_ctx")
+        # Runners are created per attempt; the token aborts LLM calls and tool loops
+        self._cancel = cancel_token_for(inputs)
 
         # Extract user_prompt from main input port
         main_input = inputs.get("result", {})
@@ -296,12 +304,16 @@ class OpenAIChatGPTRunner(NodeRunner):
         try:
             with httpx.Client(timeout=timeout_seconds) as client:
                 while iteration < max_iterations:
+                    self._cancel.raise_if_cancelled()
                     iteration += 1
                     logger.info(f"🔄 OpenAI API call iteration {iteration}/{max_iterations}")
 
                     # Make API request
-                    resp = client.post(
-                        "https://api.openai.com/v1/chat/completions", headers=headers, json=body
+                    resp = self._cancel.call(
+                        client.post,
+                        "https://api.openai.com/v1/chat/completions",
+                        headers=headers,
+                        json=body,
                     )
                     resp.raise_for_status()
                     data = resp.json()
@@ -482,6 +494,8 @@ class OpenAIChatGPTRunner(NodeRunner):
                     "function_calls": all_tool_calls,
                 }
 
+        except ExecutionCancelled:
+            raise
         except httpx.HTTPStatusError as e:
             error_text = e.response.text
             logger.error(f"❌ OpenAI API error: {e.response.status_code} - {error_text}")
@@ -14,8 +14,10 @@ sys.path.insert(0, str(backend_dir))
 # Use absolute imports
 from shared.models import TriggerInfo
 from shared.models.workflow import Node
+from workflow_engine_v2.core import columnar
+from workflow_engine_v2.core.cancellation import cancel_token_for
 from workflow_engine_v2.core.expr import get_path
-from workflow_engine_v2.core.template import _eval_expression, eval_boolean
+from workflow_engine_v2.core.template import _eval_expression, compile_boolean, eval_boolean
 from workflow_engine_v2.runners.base import NodeRunner
 from workflow_engine_v2.services.timers import get_timer_service
 
@@ -79,6 +81,8 @@ class MergeRunner(NodeRunner):
 
         merged_list = []
         source_mapping = []
+        # One encoder for the whole merge; json.dumps(**kwargs) builds a new one per call
+        fingerprint = json.JSONEncoder(sort_keys=True, default=str).encode
         if strategy == "concatenate":
             idx = 0
             for port_name, val in ((k, v) for k, v in inputs.items() if not k.startswith("_")):
@@ -93,7 +97,7 @@ class MergeRunner(NodeRunner):
             def _key(item):
                 if merge_key and isinstance(item, dict):
                     return item.get(merge_key)
-                return json.dumps(item, sort_keys=True, default=str)
+                return fingerprint(item)
 
             for port_name, val in ((k, v) for k, v in inputs.items() if not k.startswith("_")):
                 arr = val if isinstance(val, list) else [val]
@@ -147,11 +151,20 @@ class FilterRunner(NodeRunner):
 
         passed, excluded = [], []
         if expr:
-            for it in items:
-                local_ctx = dict(ctx)
-                local_ctx["item"] = it
-                keep = bool(_eval_expression(str(expr), local_ctx))
-                (passed if keep else excluded).append(it)
+            split = (
+                columnar.partition(items, str(expr), ctx)
+                if columnar.should_use_columnar(items)
+                else None
+            )
+            if split is not None:
+                passed, excluded = split
+            else:
+                # Compile once; only the "item" binding changes between evaluations
+                predicate = compile_boolean(str(expr))
+                item_ctx = dict(ctx)
+                for it in items:
+                    item_ctx["item"] = it
+                    (passed if predicate(item_ctx) else excluded).append(it)
         else:
             passed = items
 
@@ -197,12 +210,20 @@ class SortRunner(NodeRunner):
                 return it
             return get_path(it if isinstance(it, (dict, list)) else {"value": it}, str(sort_field))
 
-        try:
-            sorted_items = sorted(items, key=_key, reverse=reverse)
-        except Exception:
-            sorted_items = items
+        order = None
+        if sort_field and columnar.should_use_columnar(items):
+            order = columnar.stable_argsort(items, str(sort_field), reverse)
+        if order is None:
+            # Stable argsort so duplicates keep distinct original indices
+            keys = [_key(it) for it in items]
+            order = list(range(len(items)))
+            try:
+                order.sort(key=keys.__getitem__, reverse=reverse)
+            except Exception:
+                order = list(range(len(items)))
 
-        original_indices = [items.index(x) for x in sorted_items]
+        sorted_items = [items[i] for i in order]
+        original_indices = order
         out = {
             "sorted_data": sorted_items,
             "sort_stats": {
@@ -381,6 +402,9 @@ class LoopRunner(NodeRunner):
         loop_type = cfg.get("loop_type", "for_range")
         max_iter = int(cfg.get("max_iterations", 100))
         iter_var = cfg.get("iteration_variable", "index")
+        # Iterations fan out as separate engine tasks (checked there); this only
+        # guards the loop bookkeeping itself
+        cancel_token = cancel_token_for(inputs)
 
         if loop_type == "for_each":
             arr_path = str(cfg.get("array_path", ""))
@@ -395,14 +419,17 @@ class LoopRunner(NodeRunner):
                 results.append({iter_var: item})
         elif loop_type == "while":
             cond = cfg.get("loop_condition") or cfg.get("condition") or ""
+            condition = compile_boolean(str(cond)) if cond else None
+            ctx = {"input": data, "config": cfg}
+            engine_ctx = inputs.get("_ctx") if isinstance(inputs, dict) else None
+            if engine_ctx:
+                ctx["nodes_id"] = getattr(engine_ctx, "node_outputs", {})
+                ctx["nodes_name"] = getattr(engine_ctx, "node_outputs_by_name", {})
             i = 0
             while i < max_iter:
-                ctx = {"input": data, "config": cfg, "iteration": i}
-                engine_ctx = inputs.get("_ctx") if isinstance(inputs, dict) else None
-                if engine_ctx:
-                    ctx["nodes_id"] = getattr(engine_ctx, "node_outputs", {})
-                    ctx["nodes_name"] = getattr(engine_ctx, "node_outputs_by_name", {})
-                if cond and not eval_boolean(str(cond), ctx):
+                cancel_token.raise_if_cancelled()
+                ctx["iteration"] = i
+                if condition and not condition(ctx):
                     break
                 results.append({iter_var: i})
                 i += 1
@@ -414,6 +441,7 @@ class LoopRunner(NodeRunner):
             i = start
             cmp = (lambda x: x <= end) if step >= 0 else (lambda x: x >= end)
             while cmp(i) and count < max_iter:
+                cancel_token.raise_if_cancelled()
                 results.append({iter_var: i})
                 i += step
                 count += 1
@@ -2,21 +2,70 @@
 Persistent Conversation Buffer Memory implementation for workflow_engine_v2.
 
 Uses Supabase conversation_buffers table for persistent message storage.
+
+Message order is allocated in the database by ``append_conversation_message``,
+which also trims the buffer, so a store is one round trip. The newest messages
+of each buffer are kept in a process-wide window cache that writers append to,
+so retrieve/get_context read the database only on a cold (or expired) window.
+The cache is shared by all instances because runners are created per node
+attempt.
 """
 
 from __future__ import annotations
 
+import os
 import sys
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 # Add backend directory to path for absolute imports
 backend_dir = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
+from shared.models.supabase import is_missing_function_error
+
 from .persistent_base import PersistentMemoryBase
 
+_SELECT_COLUMNS = "message_order,role,content,metadata,created_at"
+
+
+class _ConversationWindow:
+    """Newest messages of one buffer and its counters, kept in step with writes."""
+
+    def __init__(self, messages: List[Dict[str, Any]], next_order: int, total: int):
+        self.lock = threading.Lock()
+        self.messages: Deque[Dict[str, Any]] = deque(messages)
+        self.next_order = next_order
+        self.total = total  # rows in the database buffer
+        self.loaded_at = time.monotonic()
+
+    @property
+    def complete(self) -> bool:
+        return len(self.messages) >= self.total
+
+
+_windows: "OrderedDict[Tuple[str, str], _ConversationWindow]" = OrderedDict()
+_windows_lock = threading.Lock()
+_MAX_WINDOWS = int(os.getenv("CONVERSATION_WINDOW_CACHE_SIZE", "1024"))
+_append_rpc_available = True
+
+
+def _format_message(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Database row -> message in the in-memory buffer format."""
+    metadata = row.get("metadata") or {}
+    return {
+        "role": row["role"],
+        "message": row["content"],
+        "timestamp": row["created_at"],
+        "message_order": row["message_order"],
+        "metadata": metadata,
+        "token_count": metadata.get("token_count", 0) if isinstance(metadata, dict) else 0,
+    }
+
 
 class PersistentConversationBufferMemory(PersistentMemoryBase):
     """Persistent conversation buffer memory using Supabase conversation_buffers table."""
@@ -26,11 +75,14 @@ class PersistentConversationBufferMemory(PersistentMemoryBase):
         self.max_messages = config.get("max_messages", 100)
         self.max_tokens = config.get("max_tokens", 4000)
         self.conversation_id = config.get("conversation_id", "default")
+        # Messages cached for unbounded buffers (bounded ones cache the whole buffer)
+        self.window_size = config.get("window_size", 200)
+        self.window_ttl_seconds = config.get("window_ttl_seconds", 300)
 
     async def _setup_persistent_storage(self) -> None:
         """Setup the persistent conversation buffer storage."""
-        # Clean up any expired messages on initialization
-        await self._cleanup_old_messages()
+        # Loads the window (cold start only) and trims the buffer to its limits
+        await self._get_window()
 
         self.logger.info(
             f"Persistent Conversation Buffer initialized: max_messages={self.max_messages}, "
@@ -47,77 +99,56 @@ class PersistentConversationBufferMemory(PersistentMemoryBase):
             if not message:
                 return {"success": False, "error": "Missing 'message' in data"}
 
-            # Get next message order
-            next_order = await self._get_next_message_order()
-
-            # Prepare message data for storage
-            message_data = self._prepare_storage_data(
-                {
-                    "message_order": next_order,
-                    "role": role,
-                    "content": message,
-                    "metadata": {
-                        "conversation_id": self.conversation_id,
-                        "token_count": len(message.split()) * 1.3,  # Rough token estimate
-                        **data.get("metadata", {}),
-                    },
-                }
-            )
-
-            # Store message in database
-            result = await self._execute_query(
-                table="conversation_buffers", operation="insert", data=message_data
-            )
-
-            if result["success"]:
-                # Maintain message and token limits
-                await self._cleanup_old_messages()
+            window = await self._get_window()
+            metadata = {
+                "conversation_id": self.conversation_id,
+                "token_count": len(message.split()) * 1.3,  # Rough token estimate
+                **data.get("metadata", {}),
+            }
 
-                self.logger.debug(f"Stored message ({role}): {message[:50]}...")
+            row = await self._append_message(role, message, metadata)
+            if "error" in row:
+                return {"success": False, "error": row["error"]}
 
-                # Get current message count
-                stats = await self._get_buffer_statistics()
+            self._add_to_window(window, row)
+            self.logger.debug(f"Stored message ({role}): {message[:50]}...")
 
-                return {
-                    "success": True,
-                    "message_order": next_order,
-                    "messages_count": stats.get("message_count", 0),
-                    "timestamp": timestamp,
-                    "storage": "persistent_database",
-                }
-            else:
-                return {"success": False, "error": result["error"]}
+            return {
+                "success": True,
+                "message_order": row["message_order"],
+                "messages_count": window.total,
+                "timestamp": timestamp,
+                "storage": "persistent_database",
+            }
 
         except Exception as e:
             self.logger.error(f"Error storing conversation message: {e}")
             return {"success": False, "error": str(e)}
 
     async def retrieve(self, query: Dict[str, Any]) -> Dict[str, Any]:
-        """Retrieve conversation messages from the database."""
+        """Retrieve conversation messages (from the window cache when it covers the query)."""
         try:
             limit = query.get("limit", self.max_messages)
             role_filter = query.get("role")
             since_timestamp = query.get("since_timestamp")
 
-            # Build base filters
-            filters = self._build_base_filters()
-
-            # Add role filter if specified
-            if role_filter:
-                filters["role"] = role_filter
-
-            # Execute query with ordering
-            result = await self._execute_query(
-                table="conversation_buffers",
-                operation="select",
-                filters=filters,
-                select_columns="message_order,role,content,metadata,created_at",
-            )
-
-            if not result["success"]:
-                return {"success": False, "error": result["error"], "messages": []}
-
-            messages = result["data"]
+            window = await self._get_window()
+            with window.lock:
+                cached = list(window.messages)
+                covered = window.complete
+                total_count = window.total
+            # An incomplete window still serves unfiltered reads of its newest messages
+            if not covered and not role_filter and not since_timestamp and limit:
+                covered = limit <= len(cached)
+
+            if covered:
+                messages = cached
+                if role_filter:
+                    messages = [msg for msg in messages if msg["role"] == role_filter]
+            else:
+                messages = await self._fetch_messages(role_filter, limit)
+                if messages is None:
+                    return {"success": False, "error": "Failed to load messages", "messages": []}
 
             # Apply timestamp filter if provided
             if since_timestamp:
@@ -126,37 +157,19 @@ class PersistentConversationBufferMemory(PersistentMemoryBase):
                     messages = [
                         msg
                         for msg in messages
-                        if datetime.fromisoformat(msg["created_at"].replace("Z", "+00:00"))
+                        if datetime.fromisoformat(msg["timestamp"].replace("Z", "+00:00"))
                         >= since_time
                     ]
                 except ValueError:
                     self.logger.warning(f"Invalid timestamp format: {since_timestamp}")
 
-            # Sort by message order and apply limit
-            messages = sorted(messages, key=lambda x: x["message_order"])
             if limit:
                 messages = messages[-limit:]  # Get most recent messages
 
-            # Format messages for compatibility with in-memory format
-            formatted_messages = []
-            for msg in messages:
-                formatted_msg = {
-                    "role": msg["role"],
-                    "message": msg["content"],
-                    "timestamp": msg["created_at"],
-                    "message_order": msg["message_order"],
-                    "metadata": msg.get("metadata", {}),
-                    "token_count": msg.get("metadata", {}).get("token_count", 0),
-                }
-                formatted_messages.append(formatted_msg)
-
-            # Get total count for statistics
-            total_count = await self._get_total_message_count()
-
             return {
                 "success": True,
-                "messages": formatted_messages,
-                "count": len(formatted_messages),
+                "messages": [dict(msg) for msg in messages],
+                "count": len(messages),
                 "total_in_buffer": total_count,
                 "storage": "persistent_database",
             }
@@ -284,6 +297,7 @@ class PersistentConversationBufferMemory(PersistentMemoryBase):
             )
 
             if result["success"]:
+                self._set_window(_ConversationWindow([], next_order=0, total=0))
                 self.logger.info(
                     f"Cleared conversation buffer: {total_count} messages removed from database"
                 )
@@ -319,95 +333,209 @@ class PersistentConversationBufferMemory(PersistentMemoryBase):
             self.logger.error(f"Error getting statistics: {e}")
             return {"success": False, "error": str(e)}
 
-    async def _get_next_message_order(self) -> int:
-        """Get the next message order number."""
-        try:
-            # Fetch all message_order values and find max in Python
-            result = await self._execute_query(
-                table="conversation_buffers",
-                operation="select",
-                filters=self._build_base_filters(),
-                select_columns="message_order",
+    # -------- Window cache --------
+
+    def _window_key(self) -> Tuple[str, str]:
+        return (str(self.user_id), str(self.memory_node_id))
+
+    def _window_capacity(self) -> int:
+        return self.max_messages if self.max_messages > 0 else self.window_size
+
+    def _set_window(self, window: Optional[_ConversationWindow]) -> None:
+        key = self._window_key()
+        with _windows_lock:
+            if window is None:
+                _windows.pop(key, None)
+                return
+            _windows[key] = window
+            _windows.move_to_end(key)
+            while len(_windows) > _MAX_WINDOWS:
+                _windows.popitem(last=False)
+
+    async def _get_window(self) -> _ConversationWindow:
+        """Cached window for this buffer, loading it from the database when cold."""
+        key = self._window_key()
+        with _windows_lock:
+            window = _windows.get(key)
+            if window is not None:
+                _windows.move_to_end(key)
+        if window is not None and time.monotonic() - window.loaded_at < self.window_ttl_seconds:
+            return window
+        window = await self._load_window()
+        self._set_window(window)
+        return window
+
+    async def _load_window(self) -> _ConversationWindow:
+        """Read the newest messages once and trim the buffer to ``max_messages``."""
+        if not self.supabase:
+            await self._setup()
+
+        query = self.supabase.table("conversation_buffers").select(_SELECT_COLUMNS, count="exact")
+        for key, value in self._build_base_filters().items():
+            query = query.eq(key, value)
+        result = query.order("message_order", desc=True).limit(self._window_capacity()).execute()
+
+        rows = list(reversed(result.data or []))
+        total = result.count if result.count is not None else len(rows)
+        next_order = rows[-1]["message_order"] + 1 if rows else 0
+
+        if self.max_messages > 0 and total > len(rows):
+            # Older rows are past the limit (e.g. the limit was lowered): one ranged delete
+            await self._trim_before(rows[0]["message_order"])
+            total = len(rows)
+
+        self.logger.debug(
+            f"Loaded conversation window: {len(rows)}/{total} messages, next order {next_order}"
+        )
+        return _ConversationWindow([_format_message(r) for r in rows], next_order, total)
+
+    def _add_to_window(self, window: _ConversationWindow, row: Dict[str, Any]) -> None:
+        with window.lock:
+            if row["message_order"] != window.next_order:
+                # Another process wrote to this buffer; reload on next access
+                self._set_window(None)
+                return
+            window.messages.append(_format_message(row))
+            window.next_order = row["message_order"] + 1
+            window.total += 1
+            if self.max_messages > 0:
+                # Mirrors the trim done by the database on append
+                oldest_kept = row["message_order"] - self.max_messages + 1
+                while window.messages and window.messages[0]["message_order"] < oldest_kept:
+                    window.messages.popleft()
+                    window.total -= 1
+            else:
+                while len(window.messages) > self.window_size:
+                    window.messages.popleft()
+
+    # -------- Database --------
+
+    async def _append_message(
+        self, role: str, content: str, metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Insert a message with a database-assigned order; returns the stored row."""
+        global _append_rpc_available
+        if _append_rpc_available:
+            result = await self._execute_rpc(
+                "append_conversation_message",
+                {
+                    "p_user_id": self.user_id,
+                    "p_memory_node_id": self.memory_node_id,
+                    "p_role": role,
+                    "p_content": content,
+                    "p_metadata": metadata,
+                    "p_max_messages": max(self.max_messages, 0),
+                },
+            )
+            if result["success"]:
+                stored = result["data"][0] if isinstance(result["data"], list) else result["data"]
+                return {
+                    "message_order": stored["message_order"],
+                    "role": role,
+                    "content": content,
+                    "metadata": metadata,
+                    "created_at": stored["created_at"],
+                }
+            if not is_missing_function_error(result["error"]):
+                return {"error": result["error"]}
+            # Function not deployed: use the window's order and trim with a ranged delete
+            _append_rpc_available = False
+            self.logger.warning(
+                "append_conversation_message unavailable, assigning message order in-process"
             )
 
-            if result["success"] and result["data"]:
-                # Find the maximum message_order
-                max_order = max([msg["message_order"] for msg in result["data"]], default=-1)
-                return max_order + 1
-            return 0
+        next_order = await self._get_next_message_order()
+        message_data = self._prepare_storage_data(
+            {"message_order": next_order, "role": role, "content": content, "metadata": metadata}
+        )
+        result = await self._execute_query(
+            table="conversation_buffers", operation="insert", data=message_data
+        )
+        if not result["success"]:
+            # Most likely a concurrent writer took this order; reload before retrying
+            self._set_window(None)
+            return {"error": result["error"]}
+        if self.max_messages > 0 and next_order >= self.max_messages:
+            await self._trim_before(next_order - self.max_messages + 1)
+        return message_data
+
+    async def _trim_before(self, message_order: int) -> None:
+        await self._execute_query(
+            table="conversation_buffers",
+            operation="delete",
+            filters={**self._build_base_filters(), "message_order": f"lt.{message_order}"},
+        )
 
+    async def _fetch_messages(
+        self, role_filter: Optional[str], limit: Optional[int]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Newest messages straight from the database, for reads the window cannot serve."""
+        try:
+            query = self.supabase.table("conversation_buffers").select(_SELECT_COLUMNS)
+            for key, value in self._build_base_filters().items():
+                query = query.eq(key, value)
+            if role_filter:
+                query = query.eq("role", role_filter)
+            query = query.order("message_order", desc=True)
+            if limit:
+                query = query.limit(limit)
+            rows = query.execute().data or []
+            return [_format_message(r) for r in reversed(rows)]
         except Exception as e:
-            self.logger.warning(f"Error getting next message order: {e}")
-            return 0
+            self.logger.error(f"Error fetching conversation messages: {e}")
+            return None
+
+    async def _get_next_message_order(self) -> int:
+        """Next message order, from the cached window."""
+        return (await self._get_window()).next_order
 
     async def _get_total_message_count(self) -> int:
         """Get total message count for this buffer."""
-        try:
-            # Fetch all messages and count in Python
-            result = await self._execute_query(
-                table="conversation_buffers",
-                operation="select",
-                filters=self._build_base_filters(),
-                select_columns="id",
-            )
-
-            if result["success"] and result["data"]:
-                return len(result["data"])
-            return 0
-
-        except Exception as e:
-            self.logger.warning(f"Error getting message count: {e}")
-            return 0
+        return (await self._get_window()).total
 
     async def _get_buffer_statistics(self) -> Dict[str, Any]:
-        """Get detailed buffer statistics from database."""
+        """Buffer statistics, computed from the window when it holds the whole buffer."""
         try:
-            # Fetch all messages and compute statistics in Python
-            result = await self._execute_query(
-                table="conversation_buffers",
-                operation="select",
-                filters=self._build_base_filters(),
-                select_columns="role,created_at,metadata",
-            )
-
-            if not result["success"] or not result["data"]:
-                return {
-                    "message_count": 0,
-                    "total_tokens": 0,
-                    "by_role": {},
-                    "oldest_message": None,
-                    "newest_message": None,
-                }
-
-            messages = result["data"]
-            message_count = len(messages)
-
-            # Calculate role counts
-            by_role = {}
+            window = await self._get_window()
+            with window.lock:
+                messages = list(window.messages)
+                complete = window.complete
+                total = window.total
+
+            if not complete:
+                # Unbounded buffer larger than the window: aggregate the stored rows
+                result = await self._execute_query(
+                    table="conversation_buffers",
+                    operation="select",
+                    filters=self._build_base_filters(),
+                    select_columns="role,created_at,metadata",
+                )
+                if not result["success"]:
+                    raise RuntimeError(result["error"])
+                messages = [
+                    {"role": r.get("role"), "timestamp": r.get("created_at"), **r}
+                    for r in result["data"] or []
+                ]
+                total = len(messages)
+
+            by_role: Dict[str, int] = {}
+            total_tokens = 0
             for msg in messages:
                 role = msg.get("role", "unknown")
                 by_role[role] = by_role.get(role, 0) + 1
-
-            # Find oldest and newest messages
-            timestamps = [msg["created_at"] for msg in messages if msg.get("created_at")]
-            oldest_message = min(timestamps) if timestamps else None
-            newest_message = max(timestamps) if timestamps else None
-
-            # Calculate total tokens (approximate - from metadata if available)
-            total_tokens = 0
-            for msg in messages:
                 metadata = msg.get("metadata", {})
                 if isinstance(metadata, dict):
                     total_tokens += metadata.get("token_count", 10)
                 else:
                     total_tokens += 10  # Default estimate
 
+            timestamps = [msg["timestamp"] for msg in messages if msg.get("timestamp")]
             return {
-                "message_count": message_count,
+                "message_count": total,
                 "total_tokens": total_tokens,
                 "by_role": by_role,
-                "oldest_message": oldest_message,
-                "newest_message": newest_message,
+                "oldest_message": min(timestamps) if timestamps else None,
+                "newest_message": max(timestamps) if timestamps else None,
             }
 
         except Exception as e:
@@ -420,48 +548,5 @@ class PersistentConversationBufferMemory(PersistentMemoryBase):
                 "newest_message": None,
             }
 
-    async def _cleanup_old_messages(self) -> None:
-        """Remove old messages to maintain limits."""
-        try:
-            # First, enforce message count limit
-            if self.max_messages > 0:
-                # Get messages ordered by message_order (oldest first)
-                result = await self._execute_query(
-                    table="conversation_buffers",
-                    operation="select",
-                    filters=self._build_base_filters(),
-                    select_columns="message_order",
-                )
-
-                if result["success"] and result["data"]:
-                    total_messages = len(result["data"])
-
-                    if total_messages > self.max_messages:
-                        # Calculate how many messages to remove
-                        messages_to_remove = total_messages - self.max_messages
-
-                        # Get the message_order values of oldest messages
-                        oldest_orders = sorted([msg["message_order"] for msg in result["data"]])[
-                            :messages_to_remove
-                        ]
-
-                        # Delete oldest messages
-                        for order in oldest_orders:
-                            await self._execute_query(
-                                table="conversation_buffers",
-                                operation="delete",
-                                filters={**self._build_base_filters(), "message_order": order},
-                            )
-
-                        self.logger.debug(
-                            f"Removed {messages_to_remove} old messages due to count limit"
-                        )
-
-            # TODO: Implement token-based cleanup if needed
-            # This would require calculating actual tokens from message content
-
-        except Exception as e:
-            self.logger.warning(f"Error during message cleanup: {e}")
-
 
 __all__ = ["PersistentConversationBufferMemory"]
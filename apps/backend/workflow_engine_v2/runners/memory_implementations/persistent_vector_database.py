@@ -6,7 +6,6 @@ Uses Supabase embeddings table with pgvector for persistent vector storage and s
 
 from __future__ import annotations
 
-import hashlib
 import os
 import sys
 from datetime import datetime
@@ -17,6 +16,8 @@ from typing import Any, Dict, List, Optional, Union
 backend_dir = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
+from workflow_engine_v2.services.embedding_service import content_hash, get_embedding_service
+
 from .persistent_base import PersistentMemoryBase
 
 
@@ -36,6 +37,8 @@ class PersistentVectorDatabaseMemory(PersistentMemoryBase):
             self.logger.warning(
                 "OPENAI_API_KEY not found - vector operations will require pre-computed embeddings"
             )
+        # Shared per model: batches requests, caches vectors and dedupes in-flight texts
+        self._embeddings = get_embedding_service(self.embedding_model, self._openai_api_key)
 
     async def _setup_persistent_storage(self) -> None:
         """Setup the persistent vector database storage."""
@@ -55,6 +58,8 @@ class PersistentVectorDatabaseMemory(PersistentMemoryBase):
 
     async def store(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Store text with vector embeddings in the database."""
+        if isinstance(data.get("documents"), list):
+            return await self.store_many(data["documents"])
         try:
             content = data.get("content") or data.get("text", "")
             if not content:
@@ -72,21 +77,11 @@ class PersistentVectorDatabaseMemory(PersistentMemoryBase):
                 embedding = embedding_result["embedding"]
 
             # Create content hash for deduplication
-            content_hash = hashlib.sha256(content.encode()).hexdigest()
+            digest = content_hash(content)
 
             # Prepare embedding data for storage
-            embedding_data = self._prepare_storage_data(
-                {
-                    "content": content,
-                    "embedding": embedding,
-                    "content_hash": content_hash,
-                    "metadata": {
-                        "document_type": document_type,
-                        "namespace": self.namespace,
-                        "embedding_model": self.embedding_model,
-                        **metadata,
-                    },
-                }
+            embedding_data = self._embedding_row(
+                content, embedding, digest, document_type, metadata
             )
 
             # Use upsert to handle duplicates
@@ -99,7 +94,7 @@ class PersistentVectorDatabaseMemory(PersistentMemoryBase):
 
                 return {
                     "success": True,
-                    "content_hash": content_hash,
+                    "content_hash": digest,
                     "embedding_dimensions": len(embedding) if embedding else 0,
                     "document_type": document_type,
                     "storage": "persistent_database",
@@ -111,6 +106,82 @@ class PersistentVectorDatabaseMemory(PersistentMemoryBase):
             self.logger.error(f"Error storing vector embedding: {e}")
             return {"success": False, "error": str(e)}
 
+    def _embedding_row(
+        self,
+        content: str,
+        embedding: List[float],
+        digest: str,
+        document_type: str,
+        metadata: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        return self._prepare_storage_data(
+            {
+                "content": content,
+                "embedding": embedding,
+                "content_hash": digest,
+                "metadata": {
+                    "document_type": document_type,
+                    "namespace": self.namespace,
+                    "embedding_model": self.embedding_model,
+                    **metadata,
+                },
+            }
+        )
+
+    async def store_many(self, documents: List[Union[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Store many documents with batched embedding calls and a single upsert."""
+        try:
+            docs = [d if isinstance(d, dict) else {"content": str(d)} for d in documents]
+            contents = [d.get("content") or d.get("text", "") for d in docs]
+            if not all(contents):
+                return {"success": False, "error": "Content or text is required for vector storage"}
+
+            # One row per content hash (last one wins, as with repeated store() calls):
+            # Postgres rejects an upsert that would update the same row twice
+            unique: Dict[str, int] = {}
+            for i, content in enumerate(contents):
+                unique[content_hash(content)] = i
+            docs = [docs[i] for i in unique.values()]
+            contents = [contents[i] for i in unique.values()]
+
+            # Embed only documents without a pre-computed embedding, in provider-sized batches
+            pending = [i for i, d in enumerate(docs) if not d.get("embedding")]
+            if pending:
+                if not self._embeddings.available:
+                    return {
+                        "success": False,
+                        "error": "OpenAI API key not configured - cannot generate embeddings",
+                    }
+                vectors = await self._embeddings.embed([contents[i] for i in pending])
+                for i, vector in zip(pending, vectors):
+                    docs[i] = {**docs[i], "embedding": vector}
+
+            rows = [
+                self._embedding_row(
+                    content,
+                    doc["embedding"],
+                    digest,
+                    doc.get("document_type", "text"),
+                    doc.get("metadata", {}),
+                )
+                for digest, content, doc in zip(unique, contents, docs)
+            ]
+            result = await self._execute_query(table="embeddings", operation="upsert", data=rows)
+            if not result["success"]:
+                return {"success": False, "error": result["error"]}
+
+            return {
+                "success": True,
+                "stored_count": len(rows),
+                "content_hashes": [row["content_hash"] for row in rows],
+                "embedded_count": len(pending),
+                "storage": "persistent_database",
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error storing vector embeddings: {e}")
+            return {"success": False, "error": str(e)}
+
     async def retrieve(self, query: Dict[str, Any]) -> Dict[str, Any]:
         """Perform semantic search using vector similarity."""
         try:
@@ -289,31 +360,23 @@ class PersistentVectorDatabaseMemory(PersistentMemoryBase):
         return "".join(lines)
 
     async def _generate_embedding(self, text: str) -> Dict[str, Any]:
-        """Generate embedding using OpenAI API."""
-        if not self._openai_api_key:
+        """Generate embedding using OpenAI API (cached and de-duplicated)."""
+        cached = self._embeddings.cached(text)
+        if cached is None and not self._embeddings.available:
             return {
                 "success": False,
                 "error": "OpenAI API key not configured - cannot generate embeddings",
             }
 
         try:
-            # Lazy import to avoid dependency issues if not needed
-            import openai
-
-            # Use the updated OpenAI client
-            client = openai.OpenAI(api_key=self._openai_api_key)
-
-            response = client.embeddings.create(
-                model=self.embedding_model, input=text.replace("\n", " ")  # Clean up text
-            )
-
-            embedding = response.data[0].embedding
+            embedding = cached or await self._embeddings.embed_one(text)
 
             return {
                 "success": True,
                 "embedding": embedding,
                 "model": self.embedding_model,
                 "dimensions": len(embedding),
+                "cached": cached is not None,
             }
 
         except ImportError:
@@ -436,69 +499,71 @@ class PersistentVectorDatabaseMemory(PersistentMemoryBase):
             return {"success": False, "error": str(e)}
 
     async def get_statistics(self) -> Dict[str, Any]:
-        """Get vector database statistics."""
+        """Get vector database statistics (aggregated in the database)."""
         try:
-            # Fetch all embeddings and compute statistics in Python
-            result = await self._execute_query(
-                table="embeddings",
-                operation="select",
-                filters=self._build_base_filters(),
-                select_columns="metadata,created_at",
-            )
-
-            if result["success"]:
-                stats = {
-                    "total_vectors": 0,
-                    "by_namespace": {},
-                    "by_document_type": {},
-                    "oldest_vector": None,
-                    "newest_vector": None,
-                    "embedding_model": self.embedding_model,
-                    "default_similarity_threshold": self.similarity_threshold,
-                }
-
-                vectors = result["data"]
-                stats["total_vectors"] = len(vectors)
-
-                # Compute statistics from fetched data
-                for row in vectors:
-                    metadata = row.get("metadata", {})
-
-                    # Handle both dict and JSON string metadata
-                    if isinstance(metadata, str):
-                        import json
+            stats = {
+                "total_vectors": 0,
+                "by_namespace": {},
+                "by_document_type": {},
+                "oldest_vector": None,
+                "newest_vector": None,
+                "embedding_model": self.embedding_model,
+                "default_similarity_threshold": self.similarity_threshold,
+                "embedding_cache": self._embeddings.get_stats(),
+            }
 
-                        try:
-                            metadata = json.loads(metadata)
-                        except:
-                            metadata = {}
+            result = await self._execute_rpc(
+                "get_embedding_statistics",
+                {"p_user_id": self.user_id, "p_memory_node_id": self.memory_node_id},
+            )
+            if result["success"] and isinstance(result["data"], dict):
+                aggregates = result["data"]
+                stats.update(
+                    {
+                        "total_vectors": aggregates.get("total_vectors") or 0,
+                        "by_namespace": aggregates.get("by_namespace") or {},
+                        "by_document_type": aggregates.get("by_document_type") or {},
+                        "oldest_vector": aggregates.get("oldest_vector"),
+                        "newest_vector": aggregates.get("newest_vector"),
+                    }
+                )
+            else:
+                # Function not deployed: exact counts and min/max via head/limit-1 queries
+                stats.update(await self._count_statistics())
 
-                    namespace = metadata.get("namespace", "default")
-                    doc_type = metadata.get("document_type", "text")
+            return {"success": True, "statistics": stats, "storage": "persistent_database"}
 
-                    # Count by namespace
-                    stats["by_namespace"][namespace] = stats["by_namespace"].get(namespace, 0) + 1
+        except Exception as e:
+            self.logger.error(f"Error getting vector statistics: {e}")
+            return {"success": False, "error": str(e)}
 
-                    # Count by document type
-                    stats["by_document_type"][doc_type] = (
-                        stats["by_document_type"].get(doc_type, 0) + 1
-                    )
+    async def _count_statistics(self) -> Dict[str, Any]:
+        """
+        Totals without downloading rows, for databases without get_embedding_statistics.
 
-                    # Track oldest and newest vectors
-                    created_at = row.get("created_at")
-                    if created_at:
-                        if not stats["oldest_vector"] or created_at < stats["oldest_vector"]:
-                            stats["oldest_vector"] = created_at
-                        if not stats["newest_vector"] or created_at > stats["newest_vector"]:
-                            stats["newest_vector"] = created_at
+        PostgREST cannot group, so only the current namespace is counted and the
+        per-document-type breakdown is left empty (same keys as the RPC result).
+        """
 
-                return {"success": True, "statistics": stats, "storage": "persistent_database"}
-            else:
-                return {"success": False, "error": result["error"]}
+        def base():
+            query = self.supabase.table("embeddings").select("created_at", count="exact")
+            for key, value in self._build_base_filters().items():
+                query = query.eq(key, value)
+            return query
 
-        except Exception as e:
-            self.logger.error(f"Error getting vector statistics: {e}")
-            return {"success": False, "error": str(e)}
+        total = base().limit(1).execute()
+        in_namespace = (
+            base().filter("metadata->>namespace", "eq", self.namespace).limit(1).execute()
+        )
+        oldest = base().order("created_at").limit(1).execute()
+        newest = base().order("created_at", desc=True).limit(1).execute()
+        return {
+            "total_vectors": total.count or 0,
+            "by_namespace": {self.namespace: in_namespace.count or 0},
+            "by_document_type": {},
+            "oldest_vector": oldest.data[0]["created_at"] if oldest.data else None,
+            "newest_vector": newest.data[0]["created_at"] if newest.data else None,
+        }
 
 
 __all__ = ["PersistentVectorDatabaseMemory"]
@@ -2,11 +2,23 @@
 Vector Database Memory implementation for workflow_engine_v2.
 
 Provides semantic search capabilities using vector embeddings.
+
+Entries are indexed in a process-local ANN index (``services.vector_index``),
+one per collection, so top-k queries are answered in memory instead of with a
+database round trip per query. When Supabase is available the collection is
+loaded into the index on first use and rows written by other processes are
+pulled in incrementally (newer than the last loaded ``created_at``) once the
+load is older than ``warm_ttl_seconds``.
 """
 
 from __future__ import annotations
 
+import hashlib
+import os
 import sys
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -16,9 +28,30 @@ backend_dir = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
 from shared.models.supabase import create_supabase_client
+from workflow_engine_v2.services.memory import embed_text
+from workflow_engine_v2.services.vector_index import get_vector_index
 
 from .base import MemoryBase
 
+EMBEDDING_DIM = 64
+WARM_PAGE_SIZE = 1000
+WARM_TTL_SECONDS = 60.0
+
+
+@dataclass
+class _WarmState:
+    """How far a collection's index has been loaded from the vector_memories table."""
+
+    synced_at: float = 0.0
+    high_water: Optional[str] = None  # newest created_at loaded
+    rows: int = 0
+    loading: bool = False
+
+
+# Per collection index; shared by the instances of that collection in this process
+_warm_states: Dict[str, _WarmState] = {}
+_warm_lock = threading.Lock()
+
 
 class VectorDatabaseMemory(MemoryBase):
     """Vector database memory implementation with semantic search."""
@@ -30,6 +63,17 @@ class VectorDatabaseMemory(MemoryBase):
         self.similarity_threshold = config.get("similarity_threshold", 0.7)
         # Fallback in-memory store for when Supabase is not available
         self.memory_store = []
+        # Optional directory the local index is loaded from and saved to
+        self.index_path = config.get("index_path")
+        self.max_warm_rows = int(config.get("max_warm_rows", 200_000))
+        self.warm_ttl = float(config.get("warm_ttl_seconds", WARM_TTL_SECONDS))
+        # Each collection gets its own index (in its own subdirectory of index_path)
+        self.collection_path: Optional[str] = None
+        if self.index_path:
+            stem = hashlib.sha1(self.collection_name.encode("utf-8")).hexdigest()[:16]
+            self.collection_path = os.path.join(self.index_path, stem)
+        self._index_key = self.collection_path or f"vector_memories:{self.collection_name}"
+        self.index = get_vector_index(self._index_key, EMBEDDING_DIM, path=self.collection_path)
 
     async def _setup(self) -> None:
         """Setup vector database connection."""
@@ -61,8 +105,7 @@ class VectorDatabaseMemory(MemoryBase):
             }
 
             if self.supabase:
-                # In a real implementation, you would generate embeddings here
-                # For now, we'll store without embeddings
+                # Embeddings live in the local index; the table keeps the source rows
                 try:
                     record = {
                         "collection": self.collection_name,
@@ -87,12 +130,84 @@ class VectorDatabaseMemory(MemoryBase):
                 # In-memory storage
                 self.memory_store.append(entry)
 
+            try:
+                self._warm_index()
+            except Exception as e:
+                self.logger.warning(f"Vector Database: loading stored memories failed: {e}")
+            self._index_entries([entry])
             return {"success": True, "id": entry["id"], "timestamp": entry["timestamp"]}
 
         except Exception as e:
             self.logger.error(f"Error storing vector data: {e}")
             return {"success": False, "error": str(e)}
 
+    def _index_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """Embed entries and add them to the collection's partition of the local index."""
+        ids = [str(entry["id"]) for entry in entries]
+        vectors = [embed_text(entry["content"], EMBEDDING_DIM) for entry in entries]
+        self.index.add(self.collection_name, ids, vectors, payloads=entries)
+
+    def _warm_index(self) -> None:
+        """Load rows stored since the last load into the local index, at most every warm_ttl."""
+        if not self.supabase:
+            return
+        with _warm_lock:
+            state = _warm_states.setdefault(self._index_key, _WarmState())
+            now = time.monotonic()
+            if state.loading or (state.synced_at and now - state.synced_at < self.warm_ttl):
+                return
+            # Claimed so concurrent callers do not load the same rows
+            state.loading = True
+            high_water = state.high_water
+        try:
+            loaded = self._load_rows(state, high_water)
+        finally:
+            state.loading = False
+        # Only a completed load counts as synced; a failed one is retried on the next call
+        state.synced_at = now
+        if loaded:
+            self.logger.info(f"Vector Database: indexed {loaded} stored memories")
+
+    def _load_rows(self, state: _WarmState, high_water: Optional[str]) -> int:
+        """Page rows at or after ``high_water`` into the index, advancing ``state`` as it goes."""
+        loaded = 0
+        while state.rows < self.max_warm_rows:
+            query = (
+                self.supabase.table("vector_memories")
+                .select("id, content, metadata, created_at")
+                .eq("collection", self.collection_name)
+            )
+            if high_water is not None:
+                # gte: rows sharing the last timestamp are re-added, which is idempotent
+                query = query.gte("created_at", high_water)
+            result = query.order("created_at").range(loaded, loaded + WARM_PAGE_SIZE - 1).execute()
+            rows = result.data or []
+            self._index_entries(
+                [
+                    {
+                        "id": row["id"],
+                        "content": row.get("content") or "",
+                        "metadata": row.get("metadata") or {},
+                        "timestamp": row.get("created_at"),
+                    }
+                    for row in rows
+                ]
+            )
+            loaded += len(rows)
+            state.rows += len(rows)
+            if rows and rows[-1].get("created_at") is not None:
+                state.high_water = rows[-1]["created_at"]
+            if len(rows) < WARM_PAGE_SIZE:
+                break
+        return loaded
+
+    def save_index(self) -> bool:
+        """Persist the collection's local index under ``index_path`` (if configured)."""
+        if not self.collection_path:
+            return False
+        self.index.save(self.collection_path)
+        return True
+
     async def retrieve(self, query: Dict[str, Any]) -> Dict[str, Any]:
         """Retrieve similar content using vector search."""
         try:
@@ -102,11 +217,29 @@ class VectorDatabaseMemory(MemoryBase):
             if not search_query:
                 return {"success": False, "error": "Missing 'query' parameter"}
 
-            results = []
+            try:
+                self._warm_index()
+            except Exception as e:
+                self.logger.warning(f"Vector Database: loading stored memories failed: {e}")
+
+            hits = self.index.search(
+                self.collection_name, embed_text(search_query, EMBEDDING_DIM), top_k=limit
+            )
+            results = [
+                {
+                    "id": entry["id"],
+                    "content": entry["content"],
+                    "metadata": entry.get("metadata", {}),
+                    "timestamp": entry.get("timestamp"),
+                    "similarity": round(score, 4),
+                }
+                for _, score, entry in hits
+                if entry is not None and score >= self.similarity_threshold
+            ]
 
-            if self.supabase:
+            if not results and self.supabase:
                 try:
-                    # Simple text search (in production, would use vector similarity)
+                    # Nothing similar enough locally: fall back to a text match
                     result = (
                         self.supabase.table("vector_memories")
                         .select("*")
@@ -123,32 +256,19 @@ class VectorDatabaseMemory(MemoryBase):
                                 "content": record["content"],
                                 "metadata": record.get("metadata", {}),
                                 "timestamp": record["created_at"],
-                                "similarity": 0.8,  # Mock similarity score
+                                "similarity": 0.0,  # text match, not scored
                             }
                         )
 
                 except Exception as e:
-                    self.logger.warning(f"Supabase query failed, using in-memory: {e}")
+                    self.logger.warning(f"Supabase query failed: {e}")
 
-            # Fallback to in-memory search
-            if not results:
-                search_lower = search_query.lower()
-                for entry in self.memory_store:
-                    if search_lower in entry["content"].lower():
-                        results.append(
-                            {
-                                "id": entry["id"],
-                                "content": entry["content"],
-                                "metadata": entry["metadata"],
-                                "timestamp": entry["timestamp"],
-                                "similarity": 0.7,  # Mock similarity
-                            }
-                        )
-
-                        if len(results) >= limit:
-                            break
-
-            return {"success": True, "results": results, "count": len(results)}
+            return {
+                "success": True,
+                "results": results,
+                "scores": [r["similarity"] for r in results],
+                "count": len(results),
+            }
 
         except Exception as e:
             self.logger.error(f"Error retrieving vector data: {e}")
@@ -18,6 +18,7 @@ sys.path.insert(0, str(backend_dir))
 # Use absolute imports
 from shared.models import TriggerInfo
 from shared.models.workflow import Node
+from workflow_engine_v2.core.cancellation import ExecutionCancelled, cancel_token_for
 from workflow_engine_v2.core.template import render_structure
 from workflow_engine_v2.runners.base import NodeRunner
 from workflow_engine_v2.services.oauth2_service import OAuth2ServiceV2
@@ -201,7 +202,9 @@ class ToolRunner(NodeRunner):
 
         # Call MCP tool via API Gateway
         try:
-            result = asyncio.run(_call_mcp_tool_async(tool_name, tool_args, user_id))
+            result = cancel_token_for(inputs).run_async(
+                _call_mcp_tool_async(tool_name, tool_args, user_id)
+            )
 
             # Extract content from MCP response
             if result.get("isError"):
@@ -243,6 +246,8 @@ class ToolRunner(NodeRunner):
                     }
                 }
 
+        except ExecutionCancelled:
+            raise
         except Exception as e:
             logger.error(f"❌ MCP tool execution failed: {str(e)}")
             return {
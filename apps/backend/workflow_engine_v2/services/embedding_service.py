@@ -0,0 +1,293 @@
+"""Embedding service for v2 engine memory.
+
+Wraps the OpenAI embeddings API with:
+
+- batching: all texts a caller needs are sent in as few requests as the
+  provider limits allow (inputs per request and an approximate token budget);
+- caching: vectors are kept by (model, content hash) in a bounded LRU, with an
+  optional SQLite file (``EMBEDDING_CACHE_PATH``) so re-ingesting the same
+  content or repeating a query survives restarts;
+- in-flight de-duplication: concurrent callers asking for the same text share
+  one request. Futures are thread-safe because memory nodes may run their
+  coroutines on short-lived event loops in worker threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# OpenAI accepts up to 2048 inputs and ~300k tokens per embeddings request
+MAX_INPUTS_PER_REQUEST = 2048
+MAX_TOKENS_PER_REQUEST = 250_000
+
+EmbedFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+_Key = Tuple[str, str]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _approx_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class _SQLiteVectorCache:
+    """Persistent (model, hash) -> float32 vector store, pruned to ``max_rows``."""
+
+    def __init__(self, path: str, max_rows: int = 200_000):
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            " model TEXT NOT NULL, hash TEXT NOT NULL, vector BLOB NOT NULL,"
+            " used_at REAL NOT NULL, PRIMARY KEY (model, hash))"
+        )
+        self._conn.commit()
+        self._writes = 0
+
+    def get_many(self, keys: List[_Key]) -> Dict[_Key, np.ndarray]:
+        found: Dict[_Key, np.ndarray] = {}
+        with self._lock:
+            for model, digest in keys:
+                row = self._conn.execute(
+                    "SELECT vector FROM embedding_cache WHERE model = ? AND hash = ?",
+                    (model, digest),
+                ).fetchone()
+                if row is not None:
+                    found[(model, digest)] = np.frombuffer(row[0], dtype=np.float32)
+            if found:
+                # Reads refresh used_at so pruning evicts the least recently used rows
+                self._conn.executemany(
+                    "UPDATE embedding_cache SET used_at = ? WHERE model = ? AND hash = ?",
+                    [(time.time(), m, h) for m, h in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, items: Dict[_Key, np.ndarray]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache VALUES (?, ?, ?, ?)",
+                [(m, h, v.tobytes(), now) for (m, h), v in items.items()],
+            )
+            self._writes += len(items)
+            if self._writes >= 1000:
+                self._writes = 0
+                self._conn.execute(
+                    "DELETE FROM embedding_cache WHERE rowid IN (SELECT rowid FROM"
+                    " embedding_cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingService:
+    """Batched, cached, de-duplicated text embeddings for one model."""
+
+    def __init__(
+        self,
+        model: str = "text-embedding-ada-002",
+        *,
+        api_key: Optional[str] = None,
+        embed_fn: Optional[EmbedFn] = None,
+        cache_size: int = 10_000,
+        cache_path: Optional[str] = None,
+        max_inputs_per_request: int = MAX_INPUTS_PER_REQUEST,
+        max_tokens_per_request: int = MAX_TOKENS_PER_REQUEST,
+    ):
+        self.model = model
+        self._api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self._embed_fn = embed_fn
+        self._client = None
+        self.cache_size = cache_size
+        self.max_inputs_per_request = max_inputs_per_request
+        self.max_tokens_per_request = max_tokens_per_request
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[_Key, np.ndarray]" = OrderedDict()
+        self._inflight: Dict[_Key, concurrent.futures.Future] = {}
+        cache_path = cache_path or os.getenv("EMBEDDING_CACHE_PATH")
+        self._persistent = _SQLiteVectorCache(cache_path) if cache_path else None
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "deduplicated": 0,
+            "requests": 0,
+            "texts_embedded": 0,
+        }
+
+    @property
+    def available(self) -> bool:
+        """True if uncached texts can be embedded."""
+        return bool(self._embed_fn or self._api_key)
+
+    @staticmethod
+    def _clean(text: str) -> str:
+        return text.replace("\n", " ")
+
+    def _key(self, text: str) -> _Key:
+        return (self.model, content_hash(text))
+
+    def _remember(self, key: _Key, vector: np.ndarray) -> None:
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def cached(self, text: str) -> Optional[List[float]]:
+        """Cached vector for ``text`` without calling the provider."""
+        key = self._key(self._clean(text))
+        with self._lock:
+            vector = self._cache.get(key)
+        return vector.tolist() if vector is not None else None
+
+    async def embed_one(self, text: str) -> List[float]:
+        return (await self.embed([text]))[0]
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, in order, reusing cached and in-flight results."""
+        cleaned = [self._clean(text) for text in texts]
+        keys = [self._key(text) for text in cleaned]
+
+        waits: Dict[_Key, concurrent.futures.Future] = {}
+        owned: Dict[_Key, str] = {}
+        vectors: Dict[_Key, np.ndarray] = {}
+        with self._lock:
+            for key, text in zip(keys, cleaned):
+                if key in vectors or key in waits:
+                    continue
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    vectors[key] = vector
+                    self.stats["hits"] += 1
+                elif key in self._inflight:
+                    waits[key] = self._inflight[key]
+                    self.stats["deduplicated"] += 1
+                else:
+                    future: concurrent.futures.Future = concurrent.futures.Future()
+                    self._inflight[key] = waits[key] = future
+                    owned[key] = text
+
+        if owned:
+            await self._fetch(owned)
+        for key, future in waits.items():
+            vectors[key] = await asyncio.wrap_future(future)
+        return [vectors[key].tolist() for key in keys]
+
+    async def _fetch(self, owned: Dict[_Key, str]) -> None:
+        """Resolve the futures this caller registered, from disk or the provider."""
+        found: Dict[_Key, np.ndarray] = {}
+        try:
+            if self._persistent is not None:
+                found = await asyncio.to_thread(self._persistent.get_many, list(owned))
+            missing = [(key, text) for key, text in owned.items() if key not in found]
+            if missing and not self.available:
+                raise RuntimeError("OpenAI API key not configured - cannot generate embeddings")
+
+            fetched: Dict[_Key, np.ndarray] = {}
+            for batch in self._batches(missing):
+                response = await self._call_provider([text for _, text in batch])
+                if len(response) != len(batch):
+                    raise ValueError(
+                        f"Embedding provider returned {len(response)} vectors for {len(batch)} inputs"
+                    )
+                for (key, _), vector in zip(batch, response):
+                    fetched[key] = np.asarray(vector, dtype=np.float32)
+            if fetched and self._persistent is not None:
+                await asyncio.to_thread(self._persistent.put_many, fetched)
+            found.update(fetched)
+        except BaseException as e:
+            with self._lock:
+                for key in owned:
+                    future = self._inflight.pop(key)
+                    if not future.done():
+                        future.set_exception(e)
+            raise
+
+        with self._lock:
+            self.stats["misses"] += len(owned)
+            for key in owned:
+                self._remember(key, found[key])
+                self._inflight.pop(key).set_result(found[key])
+
+    def _batches(self, items: List[Tuple[_Key, str]]) -> List[List[Tuple[_Key, str]]]:
+        batches: List[List[Tuple[_Key, str]]] = []
+        current: List[Tuple[_Key, str]] = []
+        tokens = 0
+        for item in items:
+            cost = _approx_tokens(item[1])
+            if current and (
+                len(current) >= self.max_inputs_per_request
+                or tokens + cost > self.max_tokens_per_request
+            ):
+                batches.append(current)
+                current, tokens = [], 0
+            current.append(item)
+            tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _call_provider(self, texts: List[str]) -> List[List[float]]:
+        self.stats["requests"] += 1
+        self.stats["texts_embedded"] += len(texts)
+        if self._embed_fn is not None:
+            return await self._embed_fn(texts)
+
+        if self._client is None:
+            # Lazy import to avoid dependency issues if not needed
+            import openai
+
+            self._client = openai.OpenAI(api_key=self._api_key)
+        response = await asyncio.to_thread(
+            self._client.embeddings.create, model=self.model, input=texts
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "model": self.model,
+                "cached_vectors": len(self._cache),
+                "in_flight": len(self._inflight),
+                "persistent": self._persistent is not None,
+            }
+
+
+_services: Dict[str, EmbeddingService] = {}
+_services_lock = threading.Lock()
+
+
+def get_embedding_service(model: str, api_key: Optional[str] = None) -> EmbeddingService:
+    """Process-wide embedding service per (model, API key)."""
+    key = f"{model}:{content_hash(api_key or os.getenv('OPENAI_API_KEY') or '')[:12]}"
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = EmbeddingService(model, api_key=api_key)
+        return service
+
+
+__all__ = ["EmbeddingService", "content_hash", "get_embedding_service"]
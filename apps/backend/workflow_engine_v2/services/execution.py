@@ -18,14 +18,22 @@ from shared.models.execution_new import Execution
 from shared.models.workflow import Workflow
 from workflow_engine_v2.core.engine import ExecutionEngine
 from workflow_engine_v2.services.file_repository import FileExecutionRepository
+from workflow_engine_v2.services.sqlite_repository import SqliteExecutionRepository
 from workflow_engine_v2.services.supabase_repository_v2 import SupabaseExecutionRepository
 
 
 class ExecutionServiceV2:
-    def __init__(self, use_file_repo: bool = False, use_supabase_repo: bool = False) -> None:
+    def __init__(
+        self,
+        use_file_repo: bool = False,
+        use_supabase_repo: bool = False,
+        use_sqlite_repo: bool = False,
+    ) -> None:
         repo = None
         if use_supabase_repo:
             repo = SupabaseExecutionRepository()
+        elif use_sqlite_repo:
+            repo = SqliteExecutionRepository()
         elif use_file_repo:
             repo = FileExecutionRepository()
         self._engine = ExecutionEngine(repository=repo)
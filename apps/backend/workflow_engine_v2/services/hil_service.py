@@ -78,6 +78,11 @@ class HILWorkflowServiceV2:
         Returns:
             bool: Success status of response handling
         """
+        # The interaction is answered: its warning and timeout must not fire anymore
+        from workflow_engine_v2.services.hil_timeout_manager import cancel_hil_interaction
+
+        cancel_hil_interaction(hil_interaction_id)
+
         try:
             # Determine human response type from response data
             human_response_type = self._determine_response_type(human_response_data)
@@ -479,6 +484,11 @@ class HILWorkflowServiceV2:
         with self._memory_lock:
             self._in_memory_store[record["id"]] = dict(record)
 
+        # Arm the warning/timeout deadlines now instead of waiting for the next resync
+        from workflow_engine_v2.services.hil_timeout_manager import schedule_hil_interaction
+
+        schedule_hil_interaction(dict(record))
+
     async def send_initial_interaction_request(
         self,
         interaction_id: str,
@@ -604,7 +614,10 @@ class HILWorkflowServiceV2:
         self, interaction_id: str, response_data: Dict[str, Any], resolved_by: str
     ) -> bool:
         """Resolve an HIL interaction with response data."""
+        from workflow_engine_v2.services.hil_timeout_manager import cancel_hil_interaction
+
         try:
+            cancel_hil_interaction(interaction_id)
             # This would typically update the database record
             logger.info(f"Resolved HIL interaction {interaction_id} by {resolved_by}")
             return True
@@ -1,18 +1,31 @@
 """HIL Timeout Management Service for workflow_engine_v2.
 
-Provides background monitoring and automatic timeout processing for HIL interactions,
-including warning notifications and workflow resume management.
+Provides background timeout processing for HIL interactions, including warning
+notifications and workflow resume management.
+
+Every pending interaction gets two precise deadlines when it is created: a warning
+``warning_threshold_minutes`` before ``timeout_at`` and the timeout itself. Deadlines
+wait in a priority queue and the background task sleeps until the earliest one, so
+timeouts fire on time and nothing is scanned while nothing is due. Pending
+interactions are recovered from the database on start (and re-read every
+``resync_interval_minutes`` for interactions created by other processes), and due
+interactions are processed concurrently with bounded parallelism. A deadline whose
+processing fails is re-queued with exponential backoff (``retry_backoff_seconds``,
+doubling up to ``MAX_RETRY_BACKOFF_SECONDS``), and answered interactions drop their
+deadlines via ``cancel_hil_interaction``.
 """
 
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 import os
 import sys
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Add backend directory to path for absolute imports
 backend_dir = Path(__file__).parent.parent.parent
@@ -25,27 +38,63 @@ from .hil_service import HILWorkflowServiceV2
 
 logger = logging.getLogger(__name__)
 
+WARNING = "warning"
+TIMEOUT = "timeout"
+MAX_RETRY_BACKOFF_SECONDS = 300.0
+MAX_RETRIES = 8  # then left to the next resync
+
+
+def _parse_timestamp(value: Any) -> Optional[float]:
+    """timeout_at column -> epoch seconds (naive timestamps are UTC)"""
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _iso(epoch_seconds: float) -> str:
+    # Same naive-UTC format HILWorkflowServiceV2 writes
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
 
 class HILTimeoutManager:
-    """Background service for monitoring and processing HIL interaction timeouts."""
+    """Background service that fires HIL interaction warnings and timeouts at their deadlines."""
 
     def __init__(
         self,
-        check_interval_minutes: int = 1,
         warning_threshold_minutes: int = 15,
         enable_background_monitoring: bool = True,
+        resync_interval_minutes: int = 30,
+        max_concurrency: int = 10,
+        retry_backoff_seconds: float = 5.0,
+        clock: Callable[[], float] = time.time,
     ):
         """
         Initialize HIL timeout manager.
 
         Args:
-            check_interval_minutes: How often to check for timeouts (default: 1 minute)
             warning_threshold_minutes: Send warning N minutes before timeout (default: 15 minutes)
-            enable_background_monitoring: Whether to start background monitoring loop
+            enable_background_monitoring: Whether to start the background timer task
+            resync_interval_minutes: How often pending interactions created elsewhere are
+                re-read from the database; deadlines themselves fire on time (default: 30)
+            max_concurrency: Due interactions processed in parallel (default: 10)
+            retry_backoff_seconds: First delay before a failed warning or timeout is
+                retried; doubles per attempt up to MAX_RETRY_BACKOFF_SECONDS (default: 5)
+            clock: Source of the current time in epoch seconds
         """
-        self.check_interval_minutes = check_interval_minutes
         self.warning_threshold_minutes = warning_threshold_minutes
         self.enable_background_monitoring = enable_background_monitoring
+        self.resync_interval_minutes = resync_interval_minutes
+        self.max_concurrency = max_concurrency
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._clock = clock
 
         # Initialize services
         self.hil_service = HILWorkflowServiceV2()
@@ -53,11 +102,28 @@ class HILTimeoutManager:
         # Initialize Supabase client
         self._init_database_connection()
 
+        # (due_at, interaction_id, kind); stale entries are skipped via _scheduled
+        self._queue: List[Tuple[float, str, str]] = []
+        self._scheduled: Dict[Tuple[str, str], float] = {}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._attempts: Dict[Tuple[str, str], int] = {}
+        self._wakeup = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats: Dict[str, Any] = {
+            "timeouts": 0,
+            "warnings": 0,
+            "retries": 0,
+            "max_lag_seconds": 0.0,
+        }
+
         # Background monitoring state
         self._monitoring_task: Optional[asyncio.Task] = None
         self._is_running = False
 
-        logger.info(f"HIL Timeout Manager initialized with {check_interval_minutes}min intervals")
+        logger.info(
+            f"HIL Timeout Manager initialized (warning {warning_threshold_minutes}min before "
+            f"timeout, concurrency {max_concurrency})"
+        )
 
     def _init_database_connection(self) -> None:
         """Initialize Supabase database connection."""
@@ -80,8 +146,12 @@ class HILTimeoutManager:
             self._supabase = None
             logger.error(f"HIL Timeout Manager: Failed to connect to database: {str(e)}")
 
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+
     async def start_monitoring(self) -> None:
-        """Start background timeout monitoring if enabled."""
+        """Start the background timer task if enabled."""
         if not self.enable_background_monitoring or not self._supabase:
             return
 
@@ -90,11 +160,13 @@ class HILTimeoutManager:
             return
 
         self._is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
         self._monitoring_task = asyncio.create_task(self._timeout_monitoring_loop())
         logger.info("HIL timeout background monitoring started")
 
     async def stop_monitoring(self) -> None:
-        """Stop background timeout monitoring."""
+        """Stop the background timer task."""
         self._is_running = False
 
         if self._monitoring_task and not self._monitoring_task.done():
@@ -104,20 +176,149 @@ class HILTimeoutManager:
             except asyncio.CancelledError:
                 pass
 
+        self._loop = None
         logger.info("HIL timeout background monitoring stopped")
 
+    # Scheduling -----------------------------------------------------------------
+
+    def _in_loop(self, callback: Callable[..., None], *args: Any) -> None:
+        """Run ``callback`` on the monitoring loop (interactions are created from worker threads)."""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is not loop:
+                loop.call_soon_threadsafe(callback, *args)
+                return
+        callback(*args)
+
+    def schedule_interaction(self, interaction: Dict[str, Any]) -> None:
+        """Schedule the warning and timeout deadlines of a pending interaction row."""
+        self._in_loop(self._schedule_record, interaction)
+
+    def cancel_interaction(self, interaction_id: str) -> None:
+        """Drop the deadlines of an interaction that was answered."""
+        self._in_loop(self._cancel_record, interaction_id)
+
+    def _push(self, interaction_id: str, kind: str, due_at: float) -> None:
+        if self._scheduled.get((interaction_id, kind)) == due_at:
+            return
+        self._scheduled[(interaction_id, kind)] = due_at
+        heapq.heappush(self._queue, (due_at, interaction_id, kind))
+
+    def _schedule_record(self, interaction: Dict[str, Any]) -> None:
+        interaction_id = str(interaction["id"])
+        timeout_at = _parse_timestamp(interaction.get("timeout_at"))
+        if interaction.get("status", "pending") != "pending" or timeout_at is None:
+            self._cancel_record(interaction_id)
+            return
+
+        self._records[interaction_id] = interaction
+        self._push(interaction_id, TIMEOUT, timeout_at)
+        warn_at = timeout_at - self.warning_threshold_minutes * 60
+        now = self._clock()
+        if not interaction.get("warning_sent") and timeout_at > now:
+            self._push(interaction_id, WARNING, max(warn_at, now))
+        else:
+            self._scheduled.pop((interaction_id, WARNING), None)
+        self._wakeup.set()
+
+    def _cancel_record(self, interaction_id: str) -> None:
+        self._records.pop(interaction_id, None)
+        self._scheduled.pop((interaction_id, WARNING), None)
+        self._scheduled.pop((interaction_id, TIMEOUT), None)
+        self._attempts.pop((interaction_id, WARNING), None)
+        self._attempts.pop((interaction_id, TIMEOUT), None)
+
+    def _retry_later(self, kind: str, interaction: Dict[str, Any]) -> None:
+        """Re-queue a warning or timeout whose processing failed, with exponential backoff."""
+        interaction_id = str(interaction["id"])
+        if kind == WARNING and (interaction_id, TIMEOUT) not in self._scheduled:
+            return  # answered, or its timeout already fired
+        attempts = self._attempts.get((interaction_id, kind), 0)
+        if attempts >= MAX_RETRIES:
+            logger.error(f"Giving up on {kind} for HIL interaction {interaction_id} until resync")
+            self._attempts.pop((interaction_id, kind), None)
+            return
+        self._attempts[(interaction_id, kind)] = attempts + 1
+        delay = min(self.retry_backoff_seconds * 2**attempts, MAX_RETRY_BACKOFF_SECONDS)
+        self._records[interaction_id] = interaction
+        self._push(interaction_id, kind, self._clock() + delay)
+        self.stats["retries"] += 1
+        self._wakeup.set()
+
+    def _pop_due(self, now: float) -> List[Tuple[str, Dict[str, Any], float]]:
+        due: Dict[str, Tuple[str, float]] = {}
+        while self._queue and self._queue[0][0] <= now:
+            due_at, interaction_id, kind = heapq.heappop(self._queue)
+            if self._scheduled.get((interaction_id, kind)) != due_at:
+                continue  # superseded or cancelled
+            del self._scheduled[(interaction_id, kind)]
+            # A timeout that is already due makes its warning pointless
+            if kind == TIMEOUT or interaction_id not in due:
+                due[interaction_id] = (kind, due_at)
+        batch = []
+        for interaction_id, (kind, due_at) in due.items():
+            record = self._records.get(interaction_id)
+            if record is None:
+                continue
+            if kind == TIMEOUT:
+                # Keeps _attempts: a failed timeout is re-queued by _retry_later
+                self._records.pop(interaction_id, None)
+                self._scheduled.pop((interaction_id, WARNING), None)
+            batch.append((kind, record, due_at))
+        return batch
+
+    def _next_deadline(self) -> Optional[float]:
+        while self._queue:
+            due_at, interaction_id, kind = self._queue[0]
+            if self._scheduled.get((interaction_id, kind)) == due_at:
+                return due_at
+            heapq.heappop(self._queue)
+        return None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Queue depth, next deadline and processing lag."""
+        next_deadline = self._next_deadline()
+        return {
+            "running": self._is_running,
+            "scheduled_interactions": len(self._records),
+            "pending_deadlines": len(self._scheduled),
+            "next_deadline": _iso(next_deadline) if next_deadline is not None else None,
+            **self.stats,
+        }
+
+    # Background task ------------------------------------------------------------
+
     async def _timeout_monitoring_loop(self) -> None:
-        """Main background monitoring loop."""
+        """Recover pending interactions, then sleep until the next deadline and process it."""
+        resync_seconds = self.resync_interval_minutes * 60
+        next_sync = 0.0
         while self._is_running:
             try:
-                # Check for expired interactions
-                await self.process_expired_interactions()
+                now = self._clock()
+                if now >= next_sync:
+                    await self.recover_pending_interactions(
+                        horizon_seconds=resync_seconds + self.warning_threshold_minutes * 60
+                    )
+                    next_sync = now + resync_seconds
 
-                # Send timeout warnings
-                await self.send_timeout_warnings()
+                due = self._pop_due(now)
+                if due:
+                    await self._process_due(due)
+                    continue
 
-                # Wait for next check interval
-                await asyncio.sleep(self.check_interval_minutes * 60)
+                next_deadline = self._next_deadline()
+                wake_at = next_sync if next_deadline is None else min(next_sync, next_deadline)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=max(0.0, wake_at - self._clock())
+                    )
+                except asyncio.TimeoutError:
+                    pass
 
             except asyncio.CancelledError:
                 break
@@ -125,6 +326,82 @@ class HILTimeoutManager:
                 logger.error(f"Error in HIL timeout monitoring loop: {str(e)}")
                 await asyncio.sleep(60)  # Wait 1 minute before retrying
 
+    async def recover_pending_interactions(self, horizon_seconds: Optional[float] = None) -> int:
+        """Schedule pending interactions from the database that are due within the horizon."""
+        if not self._supabase:
+            return 0
+
+        horizon = _iso(self._clock() + horizon_seconds) if horizon_seconds is not None else None
+
+        def query() -> List[Dict[str, Any]]:
+            rows: List[Dict[str, Any]] = []
+            page_size = 1000
+            while True:
+                request = (
+                    self._supabase.table("hil_interactions").select("*").eq("status", "pending")
+                )
+                if horizon is not None:
+                    request = request.lte("timeout_at", horizon)
+                page = (
+                    request.order("timeout_at")
+                    .range(len(rows), len(rows) + page_size - 1)
+                    .execute()
+                ).data or []
+                rows.extend(page)
+                if len(page) < page_size:
+                    return rows
+
+        try:
+            interactions = await asyncio.to_thread(query)
+        except Exception as e:
+            logger.error(f"Failed to recover pending HIL interactions: {str(e)}")
+            return 0
+
+        for interaction in interactions:
+            self._schedule_record(interaction)
+        if interactions:
+            logger.info(
+                f"⏰ Scheduled {len(interactions)} pending HIL interactions "
+                f"({len(self._scheduled)} deadlines queued)"
+            )
+        return len(interactions)
+
+    async def _process_due(self, due: List[Tuple[str, Dict[str, Any], float]]) -> List[str]:
+        """Process due warnings and timeouts concurrently, at most ``max_concurrency`` at once."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(kind: str, interaction: Dict[str, Any], due_at: float) -> Optional[str]:
+            async with semaphore:
+                lag = max(0.0, self._clock() - due_at)
+                self.stats["max_lag_seconds"] = max(self.stats["max_lag_seconds"], round(lag, 3))
+                try:
+                    if kind == TIMEOUT:
+                        success = await self._process_interaction_timeout(interaction)
+                    else:
+                        success = await self._send_timeout_warning(interaction)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to process {kind} for interaction {interaction.get('id')}: {str(e)}"
+                    )
+                    self._retry_later(kind, interaction)
+                    return None
+                self._attempts.pop((str(interaction["id"]), kind), None)
+                if not success:
+                    return None
+                if kind == TIMEOUT:
+                    self.stats["timeouts"] += 1
+                    logger.info(f"Processed timeout for HIL interaction {interaction['id']}")
+                else:
+                    self.stats["warnings"] += 1
+                    interaction["warning_sent"] = True
+                    logger.info(f"Sent timeout warning for HIL interaction {interaction['id']}")
+                return interaction["id"]
+
+        results = await asyncio.gather(*(run(*entry) for entry in due))
+        return [interaction_id for interaction_id in results if interaction_id]
+
+    # On-demand processing -------------------------------------------------------
+
     async def process_expired_interactions(self) -> List[str]:
         """
         Find and process expired HIL interactions.
@@ -136,22 +413,13 @@ class HILTimeoutManager:
             return []
 
         try:
-            # Get expired interactions from database
+            now = self._clock()
             expired_interactions = await self._get_expired_interactions()
-
-            processed_ids = []
             for interaction in expired_interactions:
-                try:
-                    # Process timeout for this interaction
-                    success = await self._process_interaction_timeout(interaction)
-                    if success:
-                        processed_ids.append(interaction["id"])
-                        logger.info(f"Processed timeout for HIL interaction {interaction['id']}")
-
-                except Exception as e:
-                    logger.error(
-                        f"Failed to process timeout for interaction {interaction.get('id')}: {str(e)}"
-                    )
+                self._cancel_record(str(interaction["id"]))
+            processed_ids = await self._process_due(
+                [(TIMEOUT, interaction, now) for interaction in expired_interactions]
+            )
 
             if processed_ids:
                 logger.info(f"Processed {len(processed_ids)} expired HIL interactions")
@@ -173,22 +441,13 @@ class HILTimeoutManager:
             return []
 
         try:
-            # Get interactions approaching timeout
+            now = self._clock()
             warning_interactions = await self._get_warning_interactions()
-
-            warned_ids = []
             for interaction in warning_interactions:
-                try:
-                    # Send warning notification
-                    success = await self._send_timeout_warning(interaction)
-                    if success:
-                        warned_ids.append(interaction["id"])
-                        logger.info(f"Sent timeout warning for HIL interaction {interaction['id']}")
-
-                except Exception as e:
-                    logger.error(
-                        f"Failed to send warning for interaction {interaction.get('id')}: {str(e)}"
-                    )
+                self._scheduled.pop((str(interaction["id"]), WARNING), None)
+            warned_ids = await self._process_due(
+                [(WARNING, interaction, now) for interaction in warning_interactions]
+            )
 
             if warned_ids:
                 logger.info(f"Sent timeout warnings for {len(warned_ids)} HIL interactions")
@@ -202,14 +461,14 @@ class HILTimeoutManager:
     async def _get_expired_interactions(self) -> List[Dict[str, Any]]:
         """Get HIL interactions that have exceeded their timeout."""
         try:
-            current_time = datetime.utcnow()
+            current_time = _iso(self._clock())
 
-            result = (
+            result = await asyncio.to_thread(
                 self._supabase.table("hil_interactions")
                 .select("*")
                 .eq("status", "pending")
-                .lte("timeout_at", current_time.isoformat())
-                .execute()
+                .lte("timeout_at", current_time)
+                .execute
             )
 
             return result.data or []
@@ -221,17 +480,18 @@ class HILTimeoutManager:
     async def _get_warning_interactions(self) -> List[Dict[str, Any]]:
         """Get HIL interactions approaching timeout that haven't been warned."""
         try:
-            current_time = datetime.utcnow()
-            warning_time = current_time + timedelta(minutes=self.warning_threshold_minutes)
+            now = self._clock()
+            current_time = _iso(now)
+            warning_time = _iso(now + self.warning_threshold_minutes * 60)
 
-            result = (
+            result = await asyncio.to_thread(
                 self._supabase.table("hil_interactions")
                 .select("*")
                 .eq("status", "pending")
                 .eq("warning_sent", False)
-                .lte("timeout_at", warning_time.isoformat())
-                .gte("timeout_at", current_time.isoformat())
-                .execute()
+                .lte("timeout_at", warning_time)
+                .gte("timeout_at", current_time)
+                .execute
             )
 
             return result.data or []
@@ -241,50 +501,64 @@ class HILTimeoutManager:
             return []
 
     async def _process_interaction_timeout(self, interaction: Dict[str, Any]) -> bool:
-        """Process timeout for a specific HIL interaction."""
-        try:
-            interaction_id = interaction["id"]
-            timeout_action = interaction.get("request_data", {}).get("timeout_action", "fail")
-
-            # Update interaction status to timeout
-            self._supabase.table("hil_interactions").update(
+        """Process timeout for a specific HIL interaction; database errors propagate for retry."""
+        interaction_id = interaction["id"]
+        timeout_action = interaction.get("request_data", {}).get("timeout_action", "fail")
+
+        # Update interaction status to timeout, unless it was answered (or timed out
+        # by another worker) since it was scheduled
+        now = _iso(self._clock())
+        result = await asyncio.to_thread(
+            self._supabase.table("hil_interactions")
+            .update(
                 {
                     "status": "timeout",
-                    "updated_at": datetime.utcnow().isoformat(),
+                    "updated_at": now,
                     "response_data": {
                         "timeout": True,
                         "timeout_action": timeout_action,
-                        "timeout_at": datetime.utcnow().isoformat(),
+                        "timeout_at": now,
                     },
                 }
-            ).eq("id", interaction_id).execute()
+            )
+            .eq("id", interaction_id)
+            .eq("status", "pending")
+            .execute
+        )
+        if not result.data:
+            logger.info(f"HIL interaction {interaction_id} is no longer pending; no timeout")
+            return False
 
-            # Send timeout notification
-            await self._send_timeout_notification(interaction)
+        # Send timeout notification
+        await self._send_timeout_notification(interaction)
 
-            # Resume workflow based on timeout action
-            await self._resume_workflow_after_timeout(interaction, timeout_action)
+        # Resume workflow based on timeout action
+        await self._resume_workflow_after_timeout(interaction, timeout_action)
 
-            return True
+        return True
 
-        except Exception as e:
-            logger.error(f"Failed to process interaction timeout: {str(e)}")
+    async def _send_timeout_warning(self, interaction: Dict[str, Any]) -> bool:
+        """Send timeout warning notification for an interaction (database errors propagate)."""
+        interaction_id = interaction["id"]
+
+        # Mark warning as sent (skipped if answered or already warned meanwhile)
+        result = await asyncio.to_thread(
+            self._supabase.table("hil_interactions")
+            .update({"warning_sent": True, "updated_at": _iso(self._clock())})
+            .eq("id", interaction_id)
+            .eq("status", "pending")
+            .eq("warning_sent", False)
+            .execute
+        )
+        if not result.data:
             return False
 
-    async def _send_timeout_warning(self, interaction: Dict[str, Any]) -> bool:
-        """Send timeout warning notification for an interaction."""
         try:
-            interaction_id = interaction["id"]
-
-            # Mark warning as sent
-            self._supabase.table("hil_interactions").update(
-                {"warning_sent": True, "updated_at": datetime.utcnow().isoformat()}
-            ).eq("id", interaction_id).execute()
-
             # Send warning via HIL service
             channel_type = interaction.get("channel_type", "slack")
-            timeout_at = datetime.fromisoformat(interaction["timeout_at"].replace("Z", "+00:00"))
-            minutes_remaining = max(0, int((timeout_at - datetime.utcnow()).total_seconds() / 60))
+            timeout_epoch = _parse_timestamp(interaction["timeout_at"])
+            timeout_at = datetime.fromtimestamp(timeout_epoch, tz=timezone.utc)
+            minutes_remaining = max(0, int((timeout_epoch - self._clock()) / 60))
 
             warning_data = {
                 "interaction_id": interaction_id,
@@ -353,19 +627,22 @@ class HILTimeoutManager:
                 return False
 
             # Update workflow pause record
-            self._supabase.table("workflow_execution_pauses").update(
-                {
-                    "status": "resumed",
-                    "resume_reason": "timeout_reached",
-                    "resume_data": {
-                        "timeout_action": timeout_action,
-                        "timeout_at": datetime.utcnow().isoformat(),
-                    },
-                    "resumed_at": datetime.utcnow().isoformat(),
-                }
-            ).eq("execution_id", execution_id).eq("node_id", node_id).eq(
-                "status", "active"
-            ).execute()
+            now = _iso(self._clock())
+            await asyncio.to_thread(
+                self._supabase.table("workflow_execution_pauses")
+                .update(
+                    {
+                        "status": "resumed",
+                        "resume_reason": "timeout_reached",
+                        "resume_data": {"timeout_action": timeout_action, "timeout_at": now},
+                        "resumed_at": now,
+                    }
+                )
+                .eq("execution_id", execution_id)
+                .eq("node_id", node_id)
+                .eq("status", "active")
+                .execute
+            )
 
             # Resume workflow execution through engine
             # TODO: Integrate with ExecutionEngine resume mechanism
@@ -391,7 +668,7 @@ class HILTimeoutManager:
         )
 
     async def manual_timeout_check(self) -> Dict[str, int]:
-        """Manually trigger timeout check (useful for testing or on-demand processing)."""
+        """Query and process due interactions now (useful for testing or on-demand processing)."""
         logger.info("Manual HIL timeout check triggered")
 
         expired_count = len(await self.process_expired_interactions())
@@ -418,6 +695,18 @@ def get_hil_timeout_manager() -> HILTimeoutManager:
     return _timeout_manager
 
 
+def schedule_hil_interaction(interaction: Dict[str, Any]) -> None:
+    """Schedule a newly created interaction on the running timeout manager, if any."""
+    if _timeout_manager is not None and _timeout_manager.is_running:
+        _timeout_manager.schedule_interaction(interaction)
+
+
+def cancel_hil_interaction(interaction_id: str) -> None:
+    """Drop the deadlines of an answered interaction on the running timeout manager, if any."""
+    if _timeout_manager is not None and _timeout_manager.is_running:
+        _timeout_manager.cancel_interaction(str(interaction_id))
+
+
 async def start_hil_timeout_monitoring() -> None:
     """Start the global HIL timeout monitoring service."""
     manager = get_hil_timeout_manager()
@@ -434,7 +723,9 @@ async def stop_hil_timeout_monitoring() -> None:
 
 __all__ = [
     "HILTimeoutManager",
+    "cancel_hil_interaction",
     "get_hil_timeout_manager",
+    "schedule_hil_interaction",
     "start_hil_timeout_monitoring",
     "stop_hil_timeout_monitoring",
 ]
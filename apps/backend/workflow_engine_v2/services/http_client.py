@@ -6,11 +6,16 @@ Provides a small sync API on top of httpx with sensible defaults.
 from __future__ import annotations
 
 import base64
-import time
 from typing import Any, Dict, Optional
 
 import httpx
 
+from workflow_engine_v2.core.cancellation import (
+    NEVER_CANCELLED,
+    CancellationToken,
+    ExecutionCancelled,
+)
+
 
 class HTTPResponse:
     def __init__(self, status_code: int, headers: Dict[str, str], json: Any, text: str):
@@ -22,11 +27,17 @@ class HTTPResponse:
 
 class HTTPClient:
     def __init__(
-        self, timeout: float = 30.0, follow_redirects: bool = True, verify_ssl: bool = True
+        self,
+        timeout: float = 30.0,
+        follow_redirects: bool = True,
+        verify_ssl: bool = True,
+        cancel_token: Optional[CancellationToken] = None,
     ):
         self._client = httpx.Client(
             timeout=timeout, follow_redirects=follow_redirects, verify=verify_ssl
         )
+        # Cancelling the execution abandons the in-flight request and any backoff
+        self._cancel = cancel_token or NEVER_CANCELLED
 
     def request(
         self,
@@ -55,21 +66,29 @@ class HTTPClient:
         exc: Optional[Exception] = None
         while attempt <= int(retry_attempts or 0):
             try:
-                r = self._client.request(
-                    method.upper(), url, headers=h, params=params, json=json_body, data=data_body
+                r = self._cancel.call(
+                    self._client.request,
+                    method.upper(),
+                    url,
+                    headers=h,
+                    params=params,
+                    json=json_body,
+                    data=data_body,
                 )
                 try:
                     j = r.json()
                 except Exception:
                     j = None
                 return HTTPResponse(r.status_code, dict(r.headers), j, r.text)
+            except ExecutionCancelled:
+                raise
             except Exception as e:
                 exc = e
                 attempt += 1
                 if attempt > int(retry_attempts or 0):
                     break
                 if backoff_seconds and backoff_seconds > 0:
-                    time.sleep(backoff_seconds)
+                    self._cancel.sleep(backoff_seconds)
         # If we reach here, final exception was raised
         raise exc or Exception("HTTP request failed")
 
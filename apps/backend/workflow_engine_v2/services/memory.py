@@ -1,13 +1,15 @@
 """Memory service for v2 engine.
 
-Provides per-execution key-value store and an in-memory vector store.
-This is a pure-Python implementation suitable for local dev and tests.
+Provides per-execution key-value store and an in-memory vector store backed by
+the local ANN index in ``vector_index``.
 """
 
 from __future__ import annotations
 
 import math
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List
+
+from .vector_index import NamespacedVectorIndex
 
 
 class KeyValueMemory:
@@ -30,35 +32,39 @@ class KeyValueMemory:
         return cur
 
 
+def embed_text(text: str, dim: int = 64) -> List[float]:
+    """Simple character-hash embedding (deterministic), L2-normalised."""
+    vec = [0.0] * dim
+    for i, ch in enumerate(text):
+        vec[i % dim] += (ord(ch) % 32) / 31.0
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
 class InMemoryVectorStore:
-    def __init__(self):
-        self._data: Dict[str, List[Tuple[List[float], Any]]] = {}
+    """Per-namespace vector store searched through a local IVF-flat index."""
+
+    def __init__(self, dim: int = 64):
+        self._dim = dim
+        self._index = NamespacedVectorIndex(dim)
+        self._next_id = 0
 
     def _embed(self, text: str) -> List[float]:
-        # Simple character-hash embedding (deterministic)
-        vec = [0.0] * 64
-        for i, ch in enumerate(text):
-            vec[i % 64] += (ord(ch) % 32) / 31.0
-        # Normalize
-        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
-        return [v / norm for v in vec]
+        return embed_text(text, self._dim)
 
     def upsert(self, namespace: str, items: List[Dict[str, Any]]):
-        arr = self._data.setdefault(namespace, [])
+        if not items:
+            return
+        ids = []
         for it in items:
-            content = str(it.get("content", ""))
-            embed = self._embed(content)
-            arr.append((embed, it))
+            ids.append(str(it.get("id") or f"item_{self._next_id}"))
+            self._next_id += 1
+        vectors = [self._embed(str(it.get("content", ""))) for it in items]
+        self._index.add(namespace, ids, vectors, payloads=items)
 
     def query(self, namespace: str, query_text: str, top_k: int = 3) -> List[Dict[str, Any]]:
-        q = self._embed(query_text)
-        arr = self._data.get(namespace, [])
-        scored = []
-        for emb, item in arr:
-            score = sum(a * b for a, b in zip(q, emb))
-            scored.append((score, item))
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [it for _, it in scored[:top_k]]
+        hits = self._index.search(namespace, self._embed(query_text), top_k=top_k)
+        return [item for _, _, item in hits]
 
 
-__all__ = ["KeyValueMemory", "InMemoryVectorStore"]
+__all__ = ["KeyValueMemory", "InMemoryVectorStore", "embed_text"]
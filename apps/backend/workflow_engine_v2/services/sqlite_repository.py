@@ -0,0 +1,286 @@
+"""SQLite-backed execution repository for workflow_engine_v2.
+
+A local, no-network store for development and tests. Unlike
+FileExecutionRepository, which globs and parses every JSON file to return one
+page, executions are kept in one table with indexed workflow_id, status,
+user_id and start_time columns next to a compact JSON payload. Pages, searches
+and statistics are answered by SQL (indexes and aggregates), and only the rows
+of the requested page are parsed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# Use absolute imports
+from shared.models import Execution, ExecutionStatus
+
+from .repository import ExecutionRepository
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    execution_id TEXT PRIMARY KEY,
+    workflow_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    user_id TEXT,
+    start_time INTEGER,
+    end_time INTEGER,
+    duration_ms INTEGER,
+    updated_at INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_executions_start ON executions (start_time DESC, execution_id DESC);
+CREATE INDEX IF NOT EXISTS idx_executions_workflow ON executions (workflow_id, start_time DESC);
+CREATE INDEX IF NOT EXISTS idx_executions_status ON executions (status, start_time DESC);
+CREATE INDEX IF NOT EXISTS idx_executions_user ON executions (user_id, start_time DESC);
+"""
+
+_UPSERT = """
+INSERT INTO executions (
+    execution_id, workflow_id, status, user_id, start_time, end_time, duration_ms, updated_at, payload
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (execution_id) DO UPDATE SET
+    workflow_id = excluded.workflow_id,
+    status = excluded.status,
+    user_id = excluded.user_id,
+    start_time = excluded.start_time,
+    end_time = excluded.end_time,
+    duration_ms = excluded.duration_ms,
+    updated_at = excluded.updated_at,
+    payload = excluded.payload
+"""
+
+# Same order as InMemoryExecutionRepository (newest first, ties by id)
+_ORDER = "ORDER BY start_time DESC, execution_id DESC"
+
+
+def _status_value(status: Any) -> str:
+    return status.value if hasattr(status, "value") else str(status)
+
+
+def _to_ms(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+class SqliteExecutionRepository(ExecutionRepository):
+    """Execution repository in a single SQLite file (or ``":memory:"``)."""
+
+    def __init__(self, path: str = "apps/backend/workflow_engine_v2/data/executions.db") -> None:
+        self.logger = logging.getLogger(__name__)
+        self._path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by engine threads; sqlite3 calls are serialised by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _row(self, execution: Execution) -> Tuple[Any, ...]:
+        trigger_info = getattr(execution, "trigger_info", None)
+        user_id = execution.triggered_by or getattr(trigger_info, "user_id", None)
+        return (
+            execution.execution_id,
+            execution.workflow_id,
+            _status_value(execution.status),
+            user_id,
+            execution.start_time,
+            execution.end_time,
+            execution.duration_ms,
+            _to_ms(datetime.now()),
+            execution.model_dump_json(exclude_none=True),
+        )
+
+    def save(self, execution: Execution) -> None:
+        row = self._row(execution)
+        with self._lock:
+            self._conn.execute(_UPSERT, row)
+
+    def save_many(self, executions: List[Execution]) -> None:
+        """Save several executions in one transaction."""
+        rows = [self._row(execution) for execution in executions]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(_UPSERT, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _fetch(self, where: str, params: List[Any], limit: int, offset: int) -> List[Execution]:
+        sql = f"SELECT payload FROM executions {where} {_ORDER} LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._conn.execute(sql, [*params, limit, offset]).fetchall()
+        executions = []
+        for (payload,) in rows:
+            try:
+                executions.append(Execution.model_validate_json(payload))
+            except Exception as e:
+                self.logger.warning(f"Failed to deserialize execution: {e}")
+        return executions
+
+    def get(self, execution_id: str) -> Optional[Execution]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM executions WHERE execution_id = ?", (execution_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return Execution.model_validate_json(row[0])
+        except Exception as e:
+            self.logger.error(f"Failed to deserialize execution {execution_id}: {e}")
+            return None
+
+    def list(self, limit: int = 50, offset: int = 0) -> List[Execution]:
+        return self._fetch("", [], limit, offset)
+
+    def list_by_workflow(
+        self, workflow_id: str, limit: int = 50, offset: int = 0
+    ) -> List[Execution]:
+        return self.search(workflow_id=workflow_id, limit=limit, offset=offset)
+
+    def list_by_status(
+        self, status: ExecutionStatus, limit: int = 50, offset: int = 0
+    ) -> List[Execution]:
+        return self.search(status=status, limit=limit, offset=offset)
+
+    def list_by_user(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Execution]:
+        return self.search(user_id=user_id, limit=limit, offset=offset)
+
+    @staticmethod
+    def _where(
+        workflow_id: Optional[str] = None,
+        status: Optional[ExecutionStatus] = None,
+        user_id: Optional[str] = None,
+        start_time_after: Optional[datetime] = None,
+        start_time_before: Optional[datetime] = None,
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if workflow_id:
+            clauses.append("workflow_id = ?")
+            params.append(workflow_id)
+        if status:
+            clauses.append("status = ?")
+            params.append(_status_value(status))
+        if user_id:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if start_time_after:
+            clauses.append("start_time >= ?")
+            params.append(_to_ms(start_time_after))
+        if start_time_before:
+            clauses.append("start_time <= ?")
+            params.append(_to_ms(start_time_before))
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def search(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[ExecutionStatus] = None,
+        user_id: Optional[str] = None,
+        start_time_after: Optional[datetime] = None,
+        start_time_before: Optional[datetime] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Execution]:
+        """Search executions with multiple filters."""
+        where, params = self._where(
+            workflow_id, status, user_id, start_time_after, start_time_before
+        )
+        return self._fetch(where, params, limit, offset)
+
+    def count(self, **filters: Any) -> int:
+        """Number of executions matching the ``search`` filters."""
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM executions {where}", params
+            ).fetchone()[0]
+
+    def delete(self, execution_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM executions WHERE execution_id = ?", (execution_id,)
+            )
+        return cursor.rowcount > 0
+
+    def delete_old_executions(self, older_than_days: int = 30) -> int:
+        cutoff = _to_ms(datetime.now() - timedelta(days=older_than_days))
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM executions WHERE start_time < ?", (cutoff,))
+        self.logger.info(
+            f"Deleted {cursor.rowcount} old executions (older than {older_than_days} days)"
+        )
+        return cursor.rowcount
+
+    def get_execution_statistics(self) -> Dict[str, Any]:
+        """Execution statistics computed with SQL aggregates."""
+        since = _to_ms(datetime.now() - timedelta(hours=24))
+        with self._lock:
+            total, last_24h, avg_duration = self._conn.execute(
+                "SELECT COUNT(*), COUNT(CASE WHEN start_time >= ? THEN 1 END), AVG(duration_ms)"
+                " FROM executions",
+                (since,),
+            ).fetchone()
+            by_status = self._conn.execute(
+                "SELECT status, COUNT(*) FROM executions GROUP BY status"
+            ).fetchall()
+        return {
+            "total_executions": total,
+            "status_distribution": dict(by_status),
+            "executions_last_24h": last_24h,
+            "average_duration_ms": avg_duration,
+        }
+
+    def import_file_repository(self, base_dir: str) -> int:
+        """Copy executions stored by FileExecutionRepository (``*.json``) into this store."""
+        executions = []
+        for path in Path(base_dir).glob("*.json"):
+            try:
+                executions.append(Execution(**json.loads(path.read_text(encoding="utf-8"))))
+            except Exception as e:
+                self.logger.warning(f"Skipping unreadable execution file {path.name}: {e}")
+        self.save_many(executions)
+        return len(executions)
+
+    def health_check(self) -> Dict[str, Any]:
+        try:
+            with self._lock:
+                self._conn.execute("SELECT 1 FROM executions LIMIT 1").fetchall()
+            return {
+                "status": "healthy",
+                "database": self._path,
+                "timestamp": datetime.utcnow().isoformat(),
+                "test_query_success": True,
+            }
+        except Exception as e:
+            return {
+                "status": "unhealthy",
+                "error": str(e),
+                "timestamp": datetime.utcnow().isoformat(),
+                "test_query_success": False,
+            }
+
+
+__all__ = ["SqliteExecutionRepository"]
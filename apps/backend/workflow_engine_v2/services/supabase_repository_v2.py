@@ -8,9 +8,9 @@ from __future__ import annotations
 
 import logging
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Add backend directory to path for absolute imports
 backend_dir = Path(__file__).parent.parent.parent
@@ -18,11 +18,24 @@ sys.path.insert(0, str(backend_dir))
 
 # Use absolute imports
 from shared.models import Execution, ExecutionStatus
-from shared.models.supabase import create_supabase_client
+from shared.models.supabase import create_supabase_client, is_missing_function_error
 from workflow_engine_v2.utils.run_data import build_run_data_snapshot
 
 from .repository import ExecutionRepository
 
+DEFAULT_RETENTION_BATCH_SIZE = 5000
+
+# Cleared once the SQL functions are known to be missing (migration not applied)
+_statistics_rpc_available = True
+_retention_rpc_available = True
+
+
+def _epoch_ms(value: datetime) -> int:
+    # start_time is stored as epoch milliseconds; naive datetimes are UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
 
 class SupabaseExecutionRepositoryV2(ExecutionRepository):
     """Enhanced Supabase-backed execution repository."""
@@ -329,9 +342,9 @@ class SupabaseExecutionRepositoryV2(ExecutionRepository):
             if user_id:
                 query = query.eq("user_id", user_id)
             if start_time_after:
-                query = query.gte("start_time", start_time_after.isoformat())
+                query = query.gte("start_time", _epoch_ms(start_time_after))
             if start_time_before:
-                query = query.lte("start_time", start_time_before.isoformat())
+                query = query.lte("start_time", _epoch_ms(start_time_before))
 
             result = (
                 query.range(offset, offset + limit - 1).order("start_time", desc=True).execute()
@@ -374,70 +387,159 @@ class SupabaseExecutionRepositoryV2(ExecutionRepository):
             self.logger.error(f"Failed to delete execution {execution_id}: {e}")
             return False
 
-    def delete_old_executions(self, older_than_days: int = 30) -> int:
-        """Delete executions older than specified days."""
+    def delete_old_executions(
+        self,
+        older_than_days: int = 30,
+        batch_size: int = DEFAULT_RETENTION_BATCH_SIZE,
+        max_batches: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> int:
+        """Delete executions that started more than ``older_than_days`` ago.
+
+        Runs as a series of bounded server-side deletes (``delete_old_executions_batch``),
+        each its own short transaction, so millions of rows never sit in one statement.
+        After every chunk ``progress_callback`` (if given) receives ``deleted``, ``total``
+        (rows expired when retention started, or None), ``batches`` and ``done``.
+        Returns the number of executions deleted.
+        """
         if not self._client:
             return 0
 
-        try:
-            cutoff_date = datetime.utcnow() - timedelta(days=older_than_days)
+        cutoff_ms = _epoch_ms(datetime.utcnow() - timedelta(days=older_than_days))
+        total = self._count_started_before(cutoff_ms)
+        deleted = 0
+        batches = 0
 
-            result = (
-                self._client.table(self._table)
-                .delete()
-                .lt("start_time", cutoff_date.isoformat())
-                .execute()
-            )
-
-            deleted_count = len(result.data) if result.data else 0
+        while True:
+            try:
+                chunk, has_more = self._delete_batch(cutoff_ms, batch_size)
+            except Exception as e:
+                self.logger.error(f"Retention stopped after deleting {deleted} executions: {e}")
+                break
+            deleted += chunk
+            batches += 1
+            done = not has_more or chunk == 0
+            progress = {"deleted": deleted, "total": total, "batches": batches, "done": done}
             self.logger.info(
-                f"Deleted {deleted_count} old executions (older than {older_than_days} days)"
+                f"🧹 Retention: deleted {deleted}"
+                f"{f'/{total}' if total is not None else ''} executions "
+                f"(batch {batches}, older than {older_than_days} days)"
             )
+            if progress_callback:
+                progress_callback(progress)
+            if done or (max_batches is not None and batches >= max_batches):
+                break
 
-            return deleted_count
+        return deleted
 
+    def _count_started_before(self, cutoff_ms: int) -> Optional[int]:
+        try:
+            result = (
+                self._client.table(self._table)
+                .select("id", count="exact")
+                .lt("start_time", cutoff_ms)
+                .limit(1)
+                .execute()
+            )
+            return getattr(result, "count", None)
         except Exception as e:
-            self.logger.error(f"Failed to delete old executions: {e}")
-            return 0
+            self.logger.debug(f"Could not count expired executions: {e}")
+            return None
+
+    def _delete_batch(self, cutoff_ms: int, batch_size: int) -> Tuple[int, bool]:
+        """Delete one chunk of expired executions; returns (deleted, has_more)."""
+        global _retention_rpc_available
+        if _retention_rpc_available:
+            try:
+                result = self._client.rpc(
+                    "delete_old_executions_batch",
+                    {"p_cutoff_ms": cutoff_ms, "p_batch_size": batch_size},
+                ).execute()
+                data = result.data[0] if isinstance(result.data, list) else result.data
+                return int(data["deleted"]), bool(data["has_more"])
+            except Exception as e:
+                if not is_missing_function_error(e):
+                    raise
+                # Function not deployed: delete the same chunk by id through the table API
+                _retention_rpc_available = False
+                self.logger.warning(
+                    f"delete_old_executions_batch unavailable ({e}), using id chunks"
+                )
 
-    def get_execution_statistics(self) -> Dict[str, Any]:
-        """Get execution statistics."""
+        expired = (
+            self._client.table(self._table)
+            .select("id")
+            .lt("start_time", cutoff_ms)
+            .order("start_time")
+            .limit(batch_size)
+            .execute()
+        )
+        ids = [row["id"] for row in expired.data or []]
+        if not ids:
+            return 0, False
+        self._client.table(self._table).delete().in_("id", ids).execute()
+        return len(ids), len(ids) == batch_size
+
+    def get_execution_statistics(
+        self, workflow_id: Optional[str] = None, days: int = 30
+    ) -> Dict[str, Any]:
+        """Execution statistics, optionally for one workflow.
+
+        Served by the ``get_execution_statistics`` SQL function over the incrementally
+        maintained per-workflow, per-day rollup: ``total_executions``,
+        ``status_distribution``, ``average_duration_ms``, ``executions_last_24h`` and a
+        ``daily`` series for the last ``days`` days. Without the function, totals and the
+        status distribution fall back to count-only queries.
+        """
         if not self._client:
             return {"error": "Supabase client not available"}
 
-        try:
-            stats = {}
-
-            # Total count
-            result = self._client.table(self._table).select("*", count="exact").execute()
-
-            stats["total_executions"] = getattr(result, "count", 0)
-
-            # Status distribution (would need a custom RPC function in production)
+        global _statistics_rpc_available
+        if _statistics_rpc_available:
             try:
-                status_result = self._client.rpc("get_execution_status_distribution").execute()
-                if status_result.data:
-                    stats["status_distribution"] = status_result.data
-            except Exception:
-                # Fallback: get recent executions and calculate distribution
-                recent = self.list(limit=1000)
-                status_counts = {}
-                for execution in recent:
-                    status = execution.status.value if hasattr(execution, "status") else "unknown"
-                    status_counts[status] = status_counts.get(status, 0) + 1
-                stats["status_distribution"] = status_counts
-
-            # Recent activity (last 24 hours)
-            twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-            recent_executions = self.search(start_time_after=twenty_four_hours_ago, limit=1000)
-            stats["executions_last_24h"] = len(recent_executions)
-
-            return stats
+                result = self._client.rpc(
+                    "get_execution_statistics", {"p_workflow_id": workflow_id, "p_days": days}
+                ).execute()
+                data = result.data[0] if isinstance(result.data, list) else result.data
+                if data is not None:
+                    return data
+            except Exception as e:
+                if not is_missing_function_error(e):
+                    self.logger.error(f"Failed to get execution statistics: {e}")
+                    return {"error": str(e)}
+                _statistics_rpc_available = False
+                self.logger.warning(f"get_execution_statistics unavailable ({e}), using counts")
+
+        try:
+            since_ms = _epoch_ms(datetime.utcnow() - timedelta(hours=24))
+            status_distribution = {}
+            for status in ExecutionStatus:
+                n = self._count(workflow_id, lambda q, s=status: q.eq("status", s.value))
+                if n:
+                    status_distribution[status.value] = n
+            return {
+                "total_executions": self._count(workflow_id),
+                "status_distribution": status_distribution,
+                "average_duration_ms": None,
+                "executions_last_24h": self._count(
+                    workflow_id, lambda q: q.gte("start_time", since_ms)
+                ),
+                "daily": [],
+            }
 
         except Exception as e:
             self.logger.error(f"Failed to get execution statistics: {e}")
             return {"error": str(e)}
 
+    def _count(self, workflow_id: Optional[str], where: Optional[Callable] = None) -> int:
+        """Exact row count without transferring rows."""
+        query = self._client.table(self._table).select("id", count="exact")
+        if workflow_id:
+            query = query.eq("workflow_id", workflow_id)
+        if where:
+            query = where(query)
+        return getattr(query.limit(1).execute(), "count", None) or 0
+
     def _deserialize_execution(self, data: Dict[str, Any]) -> Optional[Execution]:
         """Convert database row to Execution object."""
         try:
@@ -0,0 +1,484 @@
+"""Local approximate-nearest-neighbor index for v2 engine vector memory.
+
+An IVF-flat index in numpy: vectors are L2-normalised (cosine similarity) and
+partitioned into ``nlist`` inverted lists by spherical k-means; a query scans
+only the ``nprobe`` lists whose centroids are closest to it. Until a namespace
+holds ``train_threshold`` vectors it is searched exhaustively, which is both
+exact and fast at that size.
+
+Inserts are assigned to the nearest existing centroid and the quantiser is
+retrained once the index has grown ``retrain_growth`` times past its last
+training size. Deletes are tombstones, compacted once they make up a quarter
+of the rows. ``NamespacedVectorIndex`` partitions indexes per namespace, keeps
+an optional payload per vector and persists everything to a directory.
+
+Run ``python -m workflow_engine_v2.services.vector_index`` for a recall and
+latency benchmark against brute force.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+class IVFFlatIndex:
+    """Inverted-file index over normalised float32 vectors with string ids."""
+
+    def __init__(
+        self,
+        dim: int,
+        *,
+        nlist: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        train_threshold: int = 2048,
+        retrain_growth: float = 4.0,
+        seed: int = 0,
+    ) -> None:
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.retrain_growth = retrain_growth
+        self._rng = np.random.default_rng(seed)
+
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._size = 0  # rows in use, including tombstones
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.empty(0, dtype=np.int32)
+        self._lists: List[List[int]] = []
+        self._list_cache: Dict[int, np.ndarray] = {}
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    # Mutation ---------------------------------------------------------------
+
+    def add(self, ids: Sequence[str], vectors: Any) -> None:
+        """Insert or replace vectors; ids already present are overwritten."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+        ids = list(ids)
+        if len(set(ids)) != len(ids):
+            # Keep the last vector given for a repeated id
+            last = {item_id: pos for pos, item_id in enumerate(ids)}
+            keep = sorted(last.values())
+            ids, vectors = [ids[pos] for pos in keep], vectors[keep]
+        self.delete([i for i in ids if i in self._rows])
+        vectors = _normalize(vectors)
+
+        n = len(vectors)
+        self._reserve(self._size + n)
+        start = self._size
+        self._vectors[start : start + n] = vectors
+        for offset, item_id in enumerate(ids):
+            self._ids.append(item_id)
+            self._rows[item_id] = start + offset
+        self._size += n
+
+        if self._centroids is None:
+            self._assign[start : start + n] = -1
+            if len(self._rows) >= self.train_threshold:
+                self.train()
+        elif len(self._rows) >= self._trained_size * self.retrain_growth:
+            self.train()
+        else:
+            self._assign_rows(np.arange(start, start + n))
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Remove vectors by id; unknown ids are ignored."""
+        removed = 0
+        for item_id in ids:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                continue
+            self._ids[row] = None
+            self._list_cache.pop(int(self._assign[row]), None)
+            removed += 1
+        dead = self._size - len(self._rows)
+        if dead and dead >= max(1024, self._size // 4):
+            self._compact()
+        return removed
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= len(self._vectors):
+            return
+        new_capacity = max(capacity, 2 * len(self._vectors), 1024)
+        vectors = np.empty((new_capacity, self.dim), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        assign = np.full(new_capacity, -1, dtype=np.int32)
+        assign[: self._size] = self._assign[: self._size]
+        self._vectors, self._assign = vectors, assign
+
+    def _compact(self) -> None:
+        live = np.array([row for row, i in enumerate(self._ids) if i is not None], dtype=np.int64)
+        self._vectors = self._vectors[live].copy() if len(live) else self._vectors[:0].copy()
+        self._assign = self._assign[live].copy() if len(live) else self._assign[:0].copy()
+        self._ids = [self._ids[row] for row in live]
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._size = len(self._ids)
+        self._rebuild_lists()
+
+    # Quantiser --------------------------------------------------------------
+
+    def _target_nlist(self, n: int) -> int:
+        if self.nlist:
+            return self.nlist
+        return int(min(4096, max(16, np.sqrt(n))))
+
+    def train(self, iterations: int = 10) -> None:
+        """(Re)build the coarse quantiser with spherical k-means on a sample."""
+        live = np.array([row for row, i in enumerate(self._ids) if i is not None], dtype=np.int64)
+        nlist = min(self._target_nlist(len(live)), len(live))
+        if nlist == 0:
+            return
+        sample_rows = live
+        if len(live) > nlist * 64:
+            sample_rows = self._rng.choice(live, nlist * 64, replace=False)
+        sample = self._vectors[sample_rows]
+
+        centroids = sample[self._rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty clusters from random sample points
+                sums[empty] = sample[self._rng.choice(len(sample), int(empty.sum()))]
+            centroids = _normalize(sums)
+
+        self._centroids = centroids.astype(np.float32)
+        self._trained_size = len(live)
+        self._assign[: self._size] = -1
+        self._assign_rows(live, rebuild=True)
+
+    def _assign_rows(self, rows: np.ndarray, rebuild: bool = False) -> None:
+        for start in range(0, len(rows), 65536):
+            chunk = rows[start : start + 65536]
+            self._assign[chunk] = np.argmax(self._vectors[chunk] @ self._centroids.T, axis=1)
+        if rebuild:
+            self._rebuild_lists()
+            return
+        for row in rows.tolist():
+            label = int(self._assign[row])
+            self._lists[label].append(row)
+            self._list_cache.pop(label, None)
+
+    def _rebuild_lists(self) -> None:
+        self._list_cache = {}
+        if self._centroids is None:
+            self._lists = []
+            return
+        nlist = len(self._centroids)
+        assign = self._assign[: self._size]
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+        self._lists = [
+            [row for row in order[bounds[c] : bounds[c + 1]].tolist() if self._ids[row] is not None]
+            for c in range(nlist)
+        ]
+
+    def _list_rows(self, label: int) -> np.ndarray:
+        rows = self._list_cache.get(label)
+        if rows is None:
+            rows = np.fromiter(
+                (row for row in self._lists[label] if self._ids[row] is not None),
+                dtype=np.int64,
+            )
+            self._lists[label] = rows.tolist()
+            self._list_cache[label] = rows
+        return rows
+
+    # Search -----------------------------------------------------------------
+
+    def _prepare_query(self, vector: Any) -> np.ndarray:
+        q = np.asarray(vector, dtype=np.float32).reshape(1, self.dim)
+        return _normalize(q)[0]
+
+    def _score_rows(self, rows: np.ndarray, q: np.ndarray, top_k: int) -> List[Tuple[str, float]]:
+        if len(rows) == 0:
+            return []
+        scores = self._vectors[rows] @ q
+        best = _top_k(scores, top_k)
+        return [(self._ids[rows[i]], float(scores[i])) for i in best]
+
+    def brute_force_search(self, vector: Any, top_k: int = 10) -> List[Tuple[str, float]]:
+        """Exact top-k by cosine similarity over every live vector."""
+        q = self._prepare_query(vector)
+        if len(self._rows) == self._size:
+            # No tombstones: score the contiguous block without a gather
+            scores = self._vectors[: self._size] @ q
+            return [(self._ids[i], float(scores[i])) for i in _top_k(scores, top_k)]
+        live = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+        return self._score_rows(live, q, top_k)
+
+    def search(
+        self, vector: Any, top_k: int = 10, nprobe: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Approximate top-k ``(id, cosine similarity)`` pairs, best first."""
+        if top_k <= 0 or not self._rows:
+            return []
+        if self._centroids is None:
+            return self.brute_force_search(vector, top_k)
+
+        q = self._prepare_query(vector)
+        nlist = len(self._centroids)
+        nprobe = nprobe or self.nprobe or max(8, nlist // 10)
+        probe_order = np.argsort(-(self._centroids @ q))
+
+        candidates: List[np.ndarray] = []
+        found = 0
+        for i, label in enumerate(probe_order.tolist()):
+            if i >= nprobe and found >= top_k:
+                break
+            rows = self._list_rows(label)
+            candidates.append(rows)
+            found += len(rows)
+        return self._score_rows(np.concatenate(candidates), q, top_k)
+
+    # Persistence ------------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Write live vectors, ids and centroids to an ``.npz`` file."""
+        live = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+        arrays = {
+            "vectors": self._vectors[live],
+            "ids": np.array([self._ids[row] for row in live], dtype=str),
+            "params": np.array([self.dim, self.nlist or 0, self.nprobe or 0, self.train_threshold]),
+        }
+        if self._centroids is not None:
+            arrays["centroids"] = self._centroids
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> "IVFFlatIndex":
+        with np.load(path, allow_pickle=False) as data:
+            dim, nlist, nprobe, train_threshold = (int(v) for v in data["params"])
+            # Saved parameters, overridden by the ones the caller builds indexes with
+            params: Dict[str, Any] = {
+                "nlist": nlist or None,
+                "nprobe": nprobe or None,
+                "train_threshold": train_threshold,
+                **kwargs,
+            }
+            index = cls(dim, **params)
+            ids = data["ids"].tolist()
+            vectors = data["vectors"]
+            centroids = data["centroids"] if "centroids" in data.files else None
+
+        index._reserve(len(ids))
+        index._vectors[: len(ids)] = vectors
+        index._ids = list(ids)
+        index._rows = {item_id: row for row, item_id in enumerate(ids)}
+        index._size = len(ids)
+        if centroids is not None:
+            index._centroids = centroids.astype(np.float32)
+            index._trained_size = len(ids)
+            index._assign_rows(np.arange(len(ids)), rebuild=True)
+        return index
+
+
+class NamespacedVectorIndex:
+    """Thread-safe collection of per-namespace IVF-flat indexes with payloads."""
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, dim: int, **index_kwargs: Any) -> None:
+        self.dim = dim
+        self._index_kwargs = index_kwargs
+        self._indexes: Dict[str, IVFFlatIndex] = {}
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def namespaces(self) -> List[str]:
+        return list(self._indexes)
+
+    def size(self, namespace: str) -> int:
+        index = self._indexes.get(namespace)
+        return len(index) if index is not None else 0
+
+    def _index(self, namespace: str) -> IVFFlatIndex:
+        index = self._indexes.get(namespace)
+        if index is None:
+            index = self._indexes[namespace] = IVFFlatIndex(self.dim, **self._index_kwargs)
+            self._payloads[namespace] = {}
+        return index
+
+    def add(
+        self,
+        namespace: str,
+        ids: Sequence[str],
+        vectors: Any,
+        payloads: Optional[Sequence[Any]] = None,
+    ) -> None:
+        with self._lock:
+            self._index(namespace).add(ids, vectors)
+            if payloads is not None:
+                self._payloads[namespace].update(zip(ids, payloads))
+
+    def delete(self, namespace: str, ids: Iterable[str]) -> int:
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                return 0
+            ids = list(ids)
+            for item_id in ids:
+                self._payloads[namespace].pop(item_id, None)
+            return index.delete(ids)
+
+    def drop(self, namespace: str) -> None:
+        with self._lock:
+            self._indexes.pop(namespace, None)
+            self._payloads.pop(namespace, None)
+
+    def search(
+        self, namespace: str, vector: Any, top_k: int = 10, nprobe: Optional[int] = None
+    ) -> List[Tuple[str, float, Any]]:
+        """Top-k ``(id, similarity, payload)`` within one namespace."""
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                return []
+            payloads = self._payloads[namespace]
+            return [
+                (item_id, score, payloads.get(item_id))
+                for item_id, score in index.search(vector, top_k, nprobe=nprobe)
+            ]
+
+    def save(self, directory: str) -> None:
+        """Persist every namespace (vectors as .npz, payloads as JSON) plus a manifest."""
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            manifest = {"dim": self.dim, "namespaces": {}}
+            for namespace, index in self._indexes.items():
+                stem = hashlib.sha1(namespace.encode("utf-8")).hexdigest()[:16]
+                index.save(os.path.join(directory, f"{stem}.npz"))
+                with open(os.path.join(directory, f"{stem}.json"), "w", encoding="utf-8") as f:
+                    json.dump(self._payloads[namespace], f, default=str, ensure_ascii=False)
+                manifest["namespaces"][namespace] = stem
+            tmp = os.path.join(directory, f"{self.MANIFEST}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(tmp, os.path.join(directory, self.MANIFEST))
+
+    @classmethod
+    def load(cls, directory: str, **index_kwargs: Any) -> "NamespacedVectorIndex":
+        with open(os.path.join(directory, cls.MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        store = cls(manifest["dim"], **index_kwargs)
+        for namespace, stem in manifest["namespaces"].items():
+            store._indexes[namespace] = IVFFlatIndex.load(
+                os.path.join(directory, f"{stem}.npz"), **index_kwargs
+            )
+            with open(os.path.join(directory, f"{stem}.json"), encoding="utf-8") as f:
+                store._payloads[namespace] = json.load(f)
+        return store
+
+
+def benchmark(
+    index: IVFFlatIndex, queries: Any, top_k: int = 10, nprobe: Optional[int] = None
+) -> Dict[str, float]:
+    """Recall@k and per-query latency of ``index.search`` against brute force."""
+    queries = np.asarray(queries, dtype=np.float32).reshape(-1, index.dim)
+    ann_ms: List[float] = []
+    exact_ms: List[float] = []
+    hits = 0
+    for q in queries:
+        t0 = time.perf_counter()
+        approx = index.search(q, top_k, nprobe=nprobe)
+        t1 = time.perf_counter()
+        exact = index.brute_force_search(q, top_k)
+        t2 = time.perf_counter()
+        ann_ms.append((t1 - t0) * 1000)
+        exact_ms.append((t2 - t1) * 1000)
+        hits += len({i for i, _ in approx} & {i for i, _ in exact})
+    return {
+        "vectors": len(index),
+        "queries": len(queries),
+        "recall_at_k": hits / max(1, len(queries) * min(top_k, len(index))),
+        "ann_ms_p50": float(np.percentile(ann_ms, 50)),
+        "ann_ms_p95": float(np.percentile(ann_ms, 95)),
+        "brute_force_ms_p50": float(np.percentile(exact_ms, 50)),
+    }
+
+
+_indexes: Dict[str, NamespacedVectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(
+    name: str, dim: int, path: Optional[str] = None, **index_kwargs: Any
+) -> NamespacedVectorIndex:
+    """
+    Process-wide named index, created on first use.
+
+    With ``path``, the index is loaded from that directory if it was saved
+    there before (and is keyed by the path rather than the name).
+    """
+    key = f"path:{os.path.abspath(path)}" if path else name
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            if path and os.path.exists(os.path.join(path, NamespacedVectorIndex.MANIFEST)):
+                index = NamespacedVectorIndex.load(path, **index_kwargs)
+            else:
+                index = NamespacedVectorIndex(dim, **index_kwargs)
+            _indexes[key] = index
+        return index
+
+
+__all__ = [
+    "IVFFlatIndex",
+    "NamespacedVectorIndex",
+    "benchmark",
+    "get_vector_index",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    rng = np.random.default_rng(42)
+    n, dim = 100_000, 256
+    centers = rng.normal(size=(1000, dim)).astype(np.float32)
+    data = centers[rng.integers(0, 1000, n)] + 0.5 * rng.normal(size=(n, dim)).astype(np.float32)
+    idx = IVFFlatIndex(dim)
+    t = time.perf_counter()
+    idx.add([str(i) for i in range(n)], data)
+    print(f"built {n} x {dim} in {time.perf_counter() - t:.1f}s")
+    queries = centers[rng.integers(0, 1000, 200)] + 0.5 * rng.normal(size=(200, dim))
+    print(json.dumps(benchmark(idx, queries), indent=2))
@@ -8,7 +8,9 @@ from __future__ import annotations
 import json
 import logging
 import sys
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -24,10 +26,75 @@ from shared.models.workflow import Workflow, WorkflowDeploymentStatus, WorkflowM
 from workflow_engine_v2.core.spec import coerce_node_to_v2, get_spec
 from workflow_engine_v2.core.validation import validate_workflow
 
+# Row columns that decide whether a cached workflow is still current (no workflow_data)
+_STAMP_COLUMNS = (
+    "definition_version",
+    "updated_at",
+    "version",
+    "deployment_status",
+    "name",
+    "description",
+    "user_id",
+)
+
+# Cleared once workflows.definition_version is known to be missing (migration not applied)
+_definition_version_available = True
+
+
+def _stamp_columns() -> Tuple[str, ...]:
+    if _definition_version_available:
+        return _STAMP_COLUMNS
+    return tuple(c for c in _STAMP_COLUMNS if c != "definition_version")
+
+
+def _row_stamp(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(row.get(column) for column in _STAMP_COLUMNS)
+
+
+class WorkflowDefinitionCache:
+    """Bounded LRU of parsed workflows keyed by workflow id.
+
+    Each entry keeps the stamp of the row it was parsed from; a caller revalidates
+    by fetching only the stamp columns and comparing.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Tuple[Any, ...], Workflow, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, workflow_id: str) -> Optional[Tuple[Tuple[Any, ...], Workflow, str]]:
+        with self._lock:
+            entry = self._entries.get(workflow_id)
+            if entry is not None:
+                self._entries.move_to_end(workflow_id)
+            return entry
+
+    def put(self, workflow_id: str, stamp: Tuple[Any, ...], workflow: Workflow, user_id: str):
+        with self._lock:
+            self._entries[workflow_id] = (stamp, workflow, user_id)
+            self._entries.move_to_end(workflow_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, workflow_id: str) -> None:
+        with self._lock:
+            self._entries.pop(workflow_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class WorkflowServiceV2:
     def __init__(self) -> None:
         self.logger = logging.getLogger(__name__)
+        self._definitions = WorkflowDefinitionCache()
         # Initialize Supabase client for database persistence
         try:
             self.supabase = create_supabase_client()
@@ -371,27 +438,65 @@ class WorkflowServiceV2:
             self.logger.error(f"Failed to get workflow {workflow_id}: {e}")
             return None
 
+    def _select_active_workflow(self, workflow_id: str, columns: str) -> List[Dict[str, Any]]:
+        """Select ``columns`` plus the stamp columns of an active workflow row."""
+        global _definition_version_available
+        while True:
+            try:
+                return (
+                    self.supabase.table("workflows")
+                    .select(", ".join((columns, *_stamp_columns())))
+                    .eq("id", workflow_id)
+                    .eq("active", True)
+                    .execute()
+                ).data or []
+            except Exception as e:
+                if not _definition_version_available or "definition_version" not in str(e):
+                    raise
+                _definition_version_available = False
+                self.logger.warning(
+                    "⚠️ workflows.definition_version missing; revalidating cached workflows "
+                    "by updated_at"
+                )
+
     def get_workflow_with_user_id(self, workflow_id: str) -> Optional[Tuple[Workflow, str]]:
-        """Get workflow from database by ID along with user_id."""
+        """Get workflow from database by ID along with user_id.
+
+        Parsed workflows are cached. A repeat call only fetches the row's stamp
+        (definition_version and the top-level columns merged into the metadata, not
+        workflow_data) and returns the same Workflow object while it is unchanged,
+        which also lets the engine reuse its execution plan without re-checking the
+        definition. Callers must not mutate the returned workflow.
+        """
         if not self.supabase:
             self.logger.error("Supabase client not available")
             return None
 
+        cached = self._definitions.get(workflow_id)
+        if cached is not None:
+            try:
+                rows = self._select_active_workflow(workflow_id, "id")
+                if not rows:
+                    self._definitions.invalidate(workflow_id)
+                    return None
+                if _row_stamp(rows[0]) == cached[0]:
+                    self._definitions.hits += 1
+                    return cached[1], cached[2]
+            except Exception as e:
+                self.logger.warning(f"⚠️ Could not revalidate cached workflow {workflow_id}: {e}")
+            self._definitions.invalidate(workflow_id)
+        self._definitions.misses += 1
+
         try:
-            result = (
-                self.supabase.table("workflows")
-                .select("workflow_data, user_id, deployment_status, name, description")
-                .eq("id", workflow_id)
-                .eq("active", True)
-                .execute()
-            )
-            if result.data:
-                workflow_data = result.data[0].get("workflow_data")
-                user_id = result.data[0].get("user_id")
-                deployment_status = result.data[0].get("deployment_status")
+            rows = self._select_active_workflow(workflow_id, "workflow_data")
+            if rows:
+                row = rows[0]
+                workflow_data = row.get("workflow_data")
+                user_id = row.get("user_id")
+                deployment_status = row.get("deployment_status")
                 # Fetch top-level name and description for sync
-                db_name = result.data[0].get("name")
-                db_description = result.data[0].get("description")
+                db_name = row.get("name")
+                db_description = row.get("description")
 
                 if workflow_data and user_id:
                     # Fix missing fields in workflow_data for Pydantic validation
@@ -446,7 +551,9 @@ class WorkflowServiceV2:
                             metadata["version"] = str(metadata["version"])
                         workflow_data["metadata"] = metadata
 
-                    return (Workflow(**workflow_data), user_id)
+                    workflow = Workflow(**workflow_data)
+                    self._definitions.put(workflow_id, _row_stamp(row), workflow, user_id)
+                    return (workflow, user_id)
             return None
         except Exception as e:
             self.logger.error(f"Failed to get workflow {workflow_id} with user_id: {e}")
@@ -577,6 +684,7 @@ class WorkflowServiceV2:
                 .eq("id", workflow.metadata.id)
                 .execute()
             )
+            self._definitions.invalidate(workflow.metadata.id)
             self.logger.info(f"✅ Workflow {workflow.metadata.id} updated in database")
             return workflow
         except Exception as e:
@@ -647,6 +755,7 @@ class WorkflowServiceV2:
 
             # Perform hard delete - CASCADE constraints will clean up related tables automatically
             result = self.supabase.table("workflows").delete().eq("id", workflow_id).execute()
+            self._definitions.invalidate(workflow_id)
 
             if result.data:
                 self.logger.info(
@@ -267,6 +267,29 @@ def performance_timer():
     return Timer()
 
 
+# Database fixtures
+@pytest.fixture(scope="session")
+def postgres_dsn(tmp_path_factory):
+    """DSN of a throwaway PostgreSQL database for SQL migration tests.
+
+    Uses TEST_POSTGRES_DSN when set, otherwise starts a local server with pgserver;
+    tests are skipped when neither is available.
+    """
+    pytest.importorskip("psycopg2")
+    dsn = os.getenv("TEST_POSTGRES_DSN")
+    if dsn:
+        yield dsn
+        return
+
+    pgserver = pytest.importorskip("pgserver")
+    try:
+        server = pgserver.get_server(tmp_path_factory.mktemp("pgdata"), cleanup_mode="stop")
+    except Exception as e:
+        pytest.skip(f"Local PostgreSQL unavailable: {e}")
+    yield server.get_uri()
+    server.cleanup()
+
+
 # Cleanup fixtures
 @pytest.fixture(scope="function", autouse=True)
 def cleanup_test_data():
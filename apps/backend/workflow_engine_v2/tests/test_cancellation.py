@@ -0,0 +1,150 @@
+"""
+Tests for cooperative cancellation: the cancel token primitives and an engine
+run whose runaway node must give its execution host back promptly.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from shared.models import ExecutionStatus, TriggerInfo
+from shared.models.node_enums import ActionSubtype, NodeType, TriggerSubtype
+from shared.models.workflow import Connection, Workflow, WorkflowMetadata, WorkflowStatistics
+from workflow_engine_v2 import ExecutionEngine
+from workflow_engine_v2.core import engine as engine_module
+from workflow_engine_v2.core.cancellation import (
+    NEVER_CANCELLED,
+    CancellationToken,
+    ExecutionCancelled,
+    cancel_token_for,
+)
+from workflow_engine_v2.core.spec import coerce_node_to_v2, get_spec
+
+
+def _cancel_after(token, delay):
+    timer = threading.Timer(delay, token.cancel, args=("stop",))
+    timer.start()
+    return timer
+
+
+def test_call_stops_waiting_on_blocked_io_when_cancelled():
+    token = CancellationToken()
+    release = threading.Event()
+    _cancel_after(token, 0.05)
+
+    started = time.monotonic()
+    with pytest.raises(ExecutionCancelled, match="stop"):
+        token.call(release.wait, 10)
+    assert time.monotonic() - started < 1
+    assert token.cancel() is False  # one-shot
+    release.set()
+
+    assert CancellationToken().call(lambda a, b=0: a + b, 1, b=2) == 3
+
+
+def test_sleep_and_run_async_are_interruptible():
+    token = CancellationToken()
+    _cancel_after(token, 0.05)
+    started = time.monotonic()
+    with pytest.raises(ExecutionCancelled):
+        token.sleep(10)
+    assert time.monotonic() - started < 1
+
+    token = CancellationToken()
+    _cancel_after(token, 0.05)
+    with pytest.raises(ExecutionCancelled):
+        token.run_async(asyncio.sleep(10))
+
+    assert NEVER_CANCELLED.cancel() is False
+    assert cancel_token_for({"result": {}}) is NEVER_CANCELLED
+
+
+def _workflow(timeout_seconds=None) -> Workflow:
+    trig_spec = get_spec(NodeType.TRIGGER.value, TriggerSubtype.MANUAL.value)
+    act_spec = get_spec(NodeType.ACTION.value, ActionSubtype.HTTP_REQUEST.value)
+    n1 = coerce_node_to_v2(trig_spec.create_node_instance("trigger_1"))
+    n2 = coerce_node_to_v2(act_spec.create_node_instance("action_1"))
+    n3 = coerce_node_to_v2(act_spec.create_node_instance("action_2"))
+    if timeout_seconds is not None:
+        n2.configurations.update({"timeout_seconds": timeout_seconds})
+    return Workflow(
+        metadata=WorkflowMetadata(
+            id="wf_cancel",
+            name="Cancel",
+            version="1.0",
+            created_time=int(time.time() * 1000),
+            created_by="tester",
+            statistics=WorkflowStatistics(),
+        ),
+        nodes=[n1, n2, n3],
+        connections=[
+            Connection(id="c1", from_node=n1.id, to_node=n2.id, output_key="result"),
+            Connection(id="c2", from_node=n2.id, to_node=n3.id, output_key="result"),
+        ],
+        triggers=[n1.id],
+    )
+
+
+@pytest.mark.parametrize(
+    "cooperative, timeout_seconds",
+    [(True, None), (False, 30)],
+    ids=["runner-uses-token", "runner-ignores-token"],
+)
+def test_cancel_frees_host_of_runaway_node(monkeypatch, cooperative, timeout_seconds):
+    """A node stuck in I/O (or ignoring the token) must not keep the execution host."""
+    release = threading.Event()
+    downstream = []
+    real_runner_for = engine_module.default_runner_for
+
+    class RunawayAction:
+        def run(self, node, inputs, trigger):
+            if node.id == "action_2":
+                downstream.append(node.id)
+            elif cooperative:
+                cancel_token_for(inputs).call(release.wait, 30)
+            else:
+                release.wait(30)
+            return {"result": {}}
+
+    def runner_for(node):
+        if str(node.type) in (NodeType.ACTION.value, str(NodeType.ACTION)):
+            return RunawayAction()
+        return real_runner_for(node)
+
+    monkeypatch.setattr(engine_module, "default_runner_for", runner_for)
+    monkeypatch.delenv("SUPABASE_URL")  # keep run bookkeeping local
+    engine = ExecutionEngine(max_workers=1)
+    trigger = TriggerInfo(trigger_type="MANUAL", trigger_data={}, timestamp=int(time.time() * 1000))
+
+    host = engine._pool.submit(
+        engine.run, _workflow(timeout_seconds), trigger, "wf_cancel", execution_id="exec_cancel"
+    )
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            if engine._store.get("exec_cancel").execution.node_executions.get("action_1"):
+                break
+        except KeyError:
+            pass
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+    engine.cancel("exec_cancel", reason="user stop")
+    execution = host.result(timeout=1)
+    release.set()
+
+    assert execution.status == ExecutionStatus.CANCELED
+    assert execution.node_executions["action_1"].error.error_code == "EXECUTION_CANCELLED"
+    assert downstream == []
+    stats = engine.get_cancellation_stats()
+    assert stats["count"] == 1 and stats["max"] < 1
+    # The single host is free for the next execution
+    assert engine._pool.submit(lambda: "free").result(timeout=1) == "free"
@@ -0,0 +1,180 @@
+"""
+Tests and benchmarks for the columnar FILTER/SORT mode on large record lists.
+
+The row-by-row path is the reference: columnar results must be identical.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from shared.models import TriggerInfo
+from shared.models.node_enums import FlowSubtype, NodeType
+from shared.models.workflow import Node
+from workflow_engine_v2.core import columnar
+from workflow_engine_v2.runners.flow import FilterRunner, MergeRunner, SortRunner
+
+
+def _node(subtype: str, **configurations) -> Node:
+    return Node(
+        id=f"{subtype.lower()}_1",
+        name=subtype.title(),
+        description="test node",
+        type=NodeType.FLOW.value,
+        subtype=subtype,
+        configurations=configurations,
+    )
+
+
+def _trigger() -> TriggerInfo:
+    return TriggerInfo(trigger_type="MANUAL", timestamp=int(time.time() * 1000))
+
+
+def _issues(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    states = ["open", "closed", "draft"]
+    return [
+        {
+            "number": i,
+            "state": rng.choice(states),
+            "comments": rng.randint(0, 20),
+            "score": rng.choice([None, rng.random()]),
+            "title": f"Issue {rng.randint(0, count)}",
+            "meta": {"priority": rng.randint(1, 5)},
+        }
+        for i in range(count)
+    ]
+
+
+def _run_both(runner, node, items, monkeypatch):
+    monkeypatch.setattr(columnar, "COLUMNAR_MIN_ROWS", 10**9)
+    row = runner.run(node, {"result": items}, _trigger())
+    monkeypatch.setattr(columnar, "COLUMNAR_MIN_ROWS", 1)
+    col = runner.run(node, {"result": items}, _trigger())
+    return row, col
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "item.state == 'open'",
+        "item.comments >= 10 && item.state != 'closed'",
+        "item.meta.priority > 3 || item.score == null",
+        "!(item.score > 0.5) && $config.min_comments <= item.comments",
+        "item.score",
+        "item.title < 'Issue 5'",
+        "item.state == 3",
+        "contains(item.title, '1')",
+    ],
+)
+def test_filter_columnar_matches_row_mode(expr, monkeypatch):
+    items = _issues(2000)
+    node = _node(FlowSubtype.FILTER.value, predicate_expression=expr, min_comments=5)
+
+    row, col = _run_both(FilterRunner(), node, items, monkeypatch)
+
+    assert col == row
+
+
+def test_filter_predicate_plan_falls_back_for_item_functions():
+    assert columnar.compile_vector_predicate("contains(item.title, '1')") is None
+    assert columnar.compile_vector_predicate("item.state == 'item'") is not None
+
+
+@pytest.mark.parametrize(
+    "field,order",
+    [("comments", "asc"), ("comments", "desc"), ("state", "desc"), ("score", "asc")],
+)
+def test_sort_columnar_matches_row_mode(field, order, monkeypatch):
+    items = _issues(2000)
+    node = _node(FlowSubtype.SORT.value, sort_field=field, order=order)
+
+    row, col = _run_both(SortRunner(), node, items, monkeypatch)
+
+    assert col == row
+
+
+def test_long_strings_stay_references_and_memory_errors_fall_back(monkeypatch):
+    items = [{"body": "x" * 1_000_000}] + [{"body": f"short {i}"} for i in range(1999)]
+
+    column = columnar.ColumnarBatch(items).column("body")
+    # One pointer per row, not 2000 fixed-width slots of the longest string
+    assert column.kind == "str" and column.array.nbytes < 100_000
+
+    node = _node(FlowSubtype.FILTER.value, predicate_expression="item.body != 'short 1'")
+    row, col = _run_both(FilterRunner(), node, items, monkeypatch)
+    assert col == row
+
+    def out_of_memory(self, values):
+        raise MemoryError()
+
+    monkeypatch.setattr(columnar.Column, "__init__", out_of_memory)
+    assert columnar.partition(items, "item.body == 'short 1'", {}) is None
+    assert columnar.stable_argsort(items, "body", False) is None
+    sort = _node(FlowSubtype.SORT.value, sort_field="body", order="asc")
+    out = SortRunner().run(sort, {"result": items}, _trigger())["result"]
+    assert out["sorted_data"][-1] == items[0]
+
+
+def test_sort_original_indices_with_duplicates():
+    items = [{"v": 2}, {"v": 1}, {"v": 2}, {"v": 1}]
+    node = _node(FlowSubtype.SORT.value, sort_field="v", order="desc")
+
+    out = SortRunner().run(node, {"result": items}, _trigger())["result"]
+
+    assert out["original_indices"] == [0, 2, 1, 3]
+    assert out["sorted_data"] == [{"v": 2}, {"v": 2}, {"v": 1}, {"v": 1}]
+
+
+def test_merge_union_remove_duplicates():
+    node = _node(
+        FlowSubtype.MERGE.value,
+        merge_strategy="union",
+        handle_duplicates="remove_duplicates",
+    )
+    inputs = {"a": [{"x": 1, "y": [1]}, {"x": 2}], "b": [{"y": [1], "x": 1}, {"x": 3}]}
+
+    out = MergeRunner().run(node, inputs, _trigger())["result"]
+
+    assert out["merged_data"] == [{"x": 1, "y": [1]}, {"x": 2}, {"x": 3}]
+    assert out["merge_stats"]["duplicates_removed"] == 1
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("rows", [1_000, 100_000, 1_000_000])
+def test_benchmark_columnar_vs_row(rows, monkeypatch):
+    items = _issues(rows)
+    runner_cases = [
+        (
+            "FILTER",
+            FilterRunner(),
+            _node(
+                FlowSubtype.FILTER.value,
+                predicate_expression="item.state == 'open' && item.comments >= 10",
+            ),
+        ),
+        ("SORT", SortRunner(), _node(FlowSubtype.SORT.value, sort_field="comments", order="desc")),
+    ]
+
+    for label, runner, node in runner_cases:
+        timings = {}
+        outputs = {}
+        for mode, threshold in (("row", 10**9), ("columnar", 1)):
+            monkeypatch.setattr(columnar, "COLUMNAR_MIN_ROWS", threshold)
+            start = time.perf_counter()
+            outputs[mode] = runner.run(node, {"result": items}, _trigger())
+            timings[mode] = time.perf_counter() - start
+
+        print(
+            f"\n{label} {rows:>9,} rows: row {timings['row'] * 1000:8.1f} ms, "
+            f"columnar {timings['columnar'] * 1000:8.1f} ms "
+            f"({timings['row'] / timings['columnar']:.1f}x)"
+        )
+        assert outputs["row"] == outputs["columnar"]
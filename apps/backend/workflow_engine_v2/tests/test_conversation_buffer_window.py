@@ -0,0 +1,289 @@
+"""
+Tests for the persistent conversation buffer's database-assigned ordering and
+its process-wide window cache, including a 10k-message conversation.
+"""
+
+import time
+
+import pytest
+
+from workflow_engine_v2.runners.memory_implementations import persistent_conversation_buffer as pcb
+
+
+class _Result:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _Query:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = []
+        self.action = None
+        self.payload = None
+        self.count = None
+        self.order_desc = None
+        self.limit_n = None
+
+    def select(self, columns, count=None):
+        self.action, self.count = "select", count
+        return self
+
+    def insert(self, data):
+        self.action, self.payload = "insert", data
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    def eq(self, key, value):
+        self.filters.append((key, "eq", value))
+        return self
+
+    def filter(self, key, op, value):
+        self.filters.append((key, op, value))
+        return self
+
+    def order(self, column, desc=False):
+        self.order_desc = desc
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    def _matches(self, row):
+        for key, op, value in self.filters:
+            if op == "eq" and row.get(key) != value:
+                return False
+            if op == "lt" and not row.get(key) < int(value):
+                return False
+        return True
+
+    def execute(self):
+        if self.table != "conversation_buffers":
+            return _Result([])  # connection check on memory_nodes
+        rows = self.db.rows
+        self.db.calls[self.action] += 1
+        if self.action == "insert":
+            if any(
+                r["memory_node_id"] == self.payload["memory_node_id"]
+                and r["message_order"] == self.payload["message_order"]
+                for r in rows
+            ):
+                raise RuntimeError("duplicate key value violates unique_conversation_order")
+            rows.append(dict(self.payload))
+            return _Result([self.payload])
+        matched = [r for r in rows if self._matches(r)]
+        if self.action == "delete":
+            self.db.rows = [r for r in rows if not self._matches(r)]
+            self.db.last_order.clear()
+            return _Result(matched)
+        matched.sort(key=lambda r: r["message_order"], reverse=bool(self.order_desc))
+        total = len(matched)
+        if self.limit_n is not None:
+            matched = matched[: self.limit_n]
+        self.db.rows_read += len(matched)
+        return _Result([dict(r) for r in matched], total if self.count else None)
+
+
+class FakeSupabase:
+    """Just enough of the Supabase client for conversation_buffers."""
+
+    def __init__(self, with_rpc=True):
+        self.rows = []
+        self.with_rpc = with_rpc
+        self.rpc_error = None
+        self.rows_read = 0
+        self.last_order = {}  # stands in for the index behind MAX(message_order)
+        self.calls = {"select": 0, "insert": 0, "delete": 0, "rpc": 0}
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def rpc(self, name, params):
+        self.calls["rpc"] += 1
+        if name != "append_conversation_message" or not self.with_rpc:
+            raise RuntimeError(
+                f"{{'code': 'PGRST202', 'message': 'Could not find the function public.{name}'}}"
+            )
+        if self.rpc_error is not None:
+            raise self.rpc_error
+        node = params["p_memory_node_id"]
+        if node not in self.last_order:
+            self.last_order[node] = max(
+                (r["message_order"] for r in self.rows if r["memory_node_id"] == node), default=-1
+            )
+        order = self.last_order[node] = self.last_order[node] + 1
+        created_at = f"2026-01-01T00:00:{order % 60:02d}"
+        self.rows.append(
+            {
+                "user_id": params["p_user_id"],
+                "memory_node_id": node,
+                "message_order": order,
+                "role": params["p_role"],
+                "content": params["p_content"],
+                "metadata": params["p_metadata"],
+                "created_at": created_at,
+            }
+        )
+        if params["p_max_messages"] > 0:
+            self.rows = [
+                r
+                for r in self.rows
+                if r["memory_node_id"] != node
+                or r["message_order"] > order - params["p_max_messages"]
+            ]
+        data = {"message_order": order, "created_at": created_at}
+        return type("Rpc", (), {"execute": lambda self: _Result(data)})()
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+    monkeypatch.setenv("SUPABASE_SECRET_KEY", "test_key")
+    monkeypatch.setattr(pcb, "_windows", pcb.OrderedDict())
+    monkeypatch.setattr(pcb, "_append_rpc_available", True)
+    db = FakeSupabase()
+    monkeypatch.setattr(
+        "workflow_engine_v2.runners.memory_implementations.persistent_base.create_client",
+        lambda url, key: db,
+    )
+    return db
+
+
+async def _memory(**config):
+    memory = pcb.PersistentConversationBufferMemory(
+        {"user_id": "u1", "memory_node_id": "mem", **config}
+    )
+    await memory.initialize()
+    return memory
+
+
+@pytest.mark.asyncio
+async def test_store_and_retrieve_serve_from_window_after_cold_start(fake_db):
+    memory = await _memory(max_messages=3)
+    for i in range(5):
+        result = await memory.store({"message": f"m{i}", "role": "user" if i % 2 else "assistant"})
+        assert result["success"] and result["message_order"] == i
+    assert result["messages_count"] == 3
+    assert [r["content"] for r in fake_db.rows] == ["m2", "m3", "m4"]
+
+    reads = fake_db.calls["select"]
+    # A fresh instance (runners are created per attempt) shares the warm window
+    other = await _memory(max_messages=3)
+    retrieved = await other.retrieve({"limit": 2})
+    assert [m["message"] for m in retrieved["messages"]] == ["m3", "m4"]
+    assert retrieved["total_in_buffer"] == 3
+    assert [m["message"] for m in (await other.retrieve({"role": "user"}))["messages"]] == ["m3"]
+    stats = (await other.get_statistics())["statistics"]
+    assert stats["message_count"] == 3 and stats["by_role"] == {"user": 1, "assistant": 2}
+    assert "m4" in (await other.get_context({"max_messages": 5}))["context"]
+    assert fake_db.calls["select"] == reads
+
+
+@pytest.mark.asyncio
+async def test_cold_start_loads_newest_window_and_trims_once(fake_db):
+    fake_db.rows = [
+        {
+            "user_id": "u1",
+            "memory_node_id": "mem",
+            "message_order": i,
+            "role": "user",
+            "content": f"old{i}",
+            "metadata": {},
+            "created_at": "2026-01-01T00:00:00",
+        }
+        for i in range(10)
+    ]
+    memory = await _memory(max_messages=4)
+
+    assert fake_db.calls["select"] == 1 and fake_db.calls["delete"] == 1
+    assert [r["message_order"] for r in fake_db.rows] == [6, 7, 8, 9]
+    assert (await memory.store({"message": "new"}))["message_order"] == 10
+    assert [m["message"] for m in (await memory.retrieve({}))["messages"]] == [
+        "old7",
+        "old8",
+        "old9",
+        "new",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_foreign_write_invalidates_window_and_clear_resets(fake_db):
+    memory = await _memory(max_messages=10)
+    await memory.store({"message": "a"})
+    # Another process appends directly
+    fake_db.rpc(
+        "append_conversation_message",
+        {
+            "p_user_id": "u1",
+            "p_memory_node_id": "mem",
+            "p_role": "user",
+            "p_content": "elsewhere",
+            "p_metadata": {},
+            "p_max_messages": 10,
+        },
+    ).execute()
+    await memory.store({"message": "b"})  # gets order 2, window expected 1 -> dropped
+    assert [m["message"] for m in (await memory.retrieve({}))["messages"]] == [
+        "a",
+        "elsewhere",
+        "b",
+    ]
+
+    assert (await memory.clear())["cleared_messages"] == 3
+    assert (await memory.store({"message": "fresh"}))["message_order"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fallback_without_append_function(fake_db):
+    fake_db.with_rpc = False
+    memory = await _memory(max_messages=2)
+    orders = [(await memory.store({"message": f"m{i}"}))["message_order"] for i in range(4)]
+
+    assert orders == [0, 1, 2, 3]
+    assert [r["content"] for r in fake_db.rows] == ["m2", "m3"]
+    assert fake_db.calls["rpc"] == 1  # not retried once known to be missing
+    assert fake_db.calls["select"] == 1
+
+
+@pytest.mark.asyncio
+async def test_transient_append_errors_fail_the_store_but_keep_the_function(fake_db):
+    memory = await _memory(max_messages=10)
+    await memory.store({"message": "m0"})
+
+    fake_db.rpc_error = TimeoutError("canceling statement due to statement timeout")
+    result = await memory.store({"message": "m1"})
+    assert not result["success"] and "statement timeout" in result["error"]
+    assert pcb._append_rpc_available
+
+    fake_db.rpc_error = None
+    assert (await memory.store({"message": "m2"}))["message_order"] == 1
+    assert fake_db.calls["insert"] == 0
+    assert [r["content"] for r in fake_db.rows] == ["m0", "m2"]
+
+
+@pytest.mark.asyncio
+async def test_ten_thousand_message_conversation_does_not_slow_down(fake_db):
+    """Benchmark: per-turn cost stays flat and no rows are re-read as the buffer grows."""
+    memory = await _memory(max_messages=0, window_size=50)
+
+    timings = []
+    for batch in range(10):
+        started = time.perf_counter()
+        for i in range(1000):
+            await memory.store({"message": f"turn {batch * 1000 + i}", "role": "user"})
+            if i % 10 == 0:
+                await memory.get_context({"max_messages": 20})
+        timings.append(time.perf_counter() - started)
+
+    assert fake_db.calls["select"] == 1 and fake_db.rows_read == 0
+    recent = (await memory.retrieve({"limit": 20}))["messages"]
+    assert recent[-1]["message_order"] == 9999 and len(recent) == 20
+    assert (await memory.retrieve({"limit": 20}))["total_in_buffer"] == 10_000
+    # The last thousand turns cost about the same as the first thousand
+    assert timings[-1] < timings[0] * 3 + 0.05
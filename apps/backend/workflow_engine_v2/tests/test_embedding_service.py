@@ -0,0 +1,174 @@
+"""Tests for the batched, cached embedding service used by persistent vector memory."""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from workflow_engine_v2.runners.memory_implementations.persistent_vector_database import (
+    PersistentVectorDatabaseMemory,
+)
+from workflow_engine_v2.services.embedding_service import EmbeddingService, _SQLiteVectorCache
+
+
+class FakeProvider:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.calls = []
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_batches_to_provider_limits_and_caches():
+    provider = FakeProvider()
+    service = EmbeddingService(
+        "m", embed_fn=provider, max_inputs_per_request=3, max_tokens_per_request=1000
+    )
+
+    texts = [f"doc {i}" for i in range(7)] + ["doc 0"]
+    vectors = await service.embed(texts)
+
+    assert [len(batch) for batch in provider.calls] == [3, 3, 1]
+    assert vectors[0] == vectors[-1] == [5.0, 1.0]
+
+    assert await service.embed(["doc 3", "doc 0"]) == [[5.0, 1.0], [5.0, 1.0]]
+    assert len(provider.calls) == 3
+    assert service.get_stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_token_budget_splits_batches():
+    provider = FakeProvider()
+    service = EmbeddingService("m", embed_fn=provider, max_tokens_per_request=30)
+
+    await service.embed(["x" * 80, "y" * 80, "z"])
+
+    assert [len(batch) for batch in provider.calls] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_in_flight_requests():
+    provider = FakeProvider(delay=0.05)
+    service = EmbeddingService("m", embed_fn=provider)
+
+    results = await asyncio.gather(*(service.embed_one("same query") for _ in range(20)))
+
+    assert len(provider.calls) == 1
+    assert all(r == results[0] for r in results)
+    assert service.get_stats()["deduplicated"] == 19
+
+
+@pytest.mark.asyncio
+async def test_failures_propagate_and_are_not_cached():
+    provider = FakeProvider(delay=0.01, fail=True)
+    service = EmbeddingService("m", embed_fn=provider)
+
+    outcomes = await asyncio.gather(
+        service.embed_one("a"), service.embed_one("a"), return_exceptions=True
+    )
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert service.get_stats()["in_flight"] == 0
+
+    provider.fail = False
+    assert await service.embed_one("a") == [1.0, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_persistent_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    first = FakeProvider()
+    await EmbeddingService("m", embed_fn=first, cache_path=path).embed(["hello", "world"])
+
+    second = FakeProvider()
+    service = EmbeddingService("m", embed_fn=second, cache_path=path)
+    assert await service.embed(["world", "new"]) == [[5.0, 1.0], [3.0, 1.0]]
+    assert second.calls == [["new"]]
+
+    # A different model never reuses another model's vectors
+    other = FakeProvider()
+    await EmbeddingService("other", embed_fn=other, cache_path=path).embed(["hello"])
+    assert other.calls == [["hello"]]
+
+
+def test_persistent_cache_evicts_least_recently_read(tmp_path):
+    cache = _SQLiteVectorCache(str(tmp_path / "embeddings.sqlite"), max_rows=2)
+    vector = np.ones(2, dtype=np.float32)
+    cache.put_many({("m", "old"): vector, ("m", "read"): vector})
+    time.sleep(0.01)
+    assert list(cache.get_many([("m", "read")])) == [("m", "read")]
+
+    cache._writes = 999  # the next write prunes
+    cache.put_many({("m", "new"): vector})
+
+    assert set(cache.get_many([("m", "old"), ("m", "read"), ("m", "new")])) == {
+        ("m", "read"),
+        ("m", "new"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_store_many_upserts_one_row_per_content_hash():
+    memory = PersistentVectorDatabaseMemory({"user_id": "user_1"})
+    provider = FakeProvider()
+    memory._embeddings = EmbeddingService("m", embed_fn=provider)
+    upserts = []
+
+    async def execute_query(table, operation, data=None, **kwargs):
+        upserts.append(data)
+        return {"success": True, "data": data}
+
+    memory._execute_query = execute_query
+    result = await memory.store_many(
+        [
+            "hello",
+            {"content": "world", "metadata": {"v": 1}},
+            {"content": "world", "metadata": {"v": 2}},
+        ]
+    )
+
+    assert result["success"] and result["stored_count"] == 2
+    assert [row["content"] for row in upserts[0]] == ["hello", "world"]
+    assert upserts[0][1]["metadata"]["v"] == 2  # the last duplicate wins
+    assert provider.calls == [["hello", "world"]]
+
+
+@pytest.mark.asyncio
+async def test_statistics_have_the_same_shape_without_the_rpc():
+    memory = PersistentVectorDatabaseMemory({"user_id": "user_1"})
+    memory._embeddings = EmbeddingService("m", embed_fn=FakeProvider())
+    query = Mock()
+    for method in ("select", "eq", "filter", "order", "limit"):
+        getattr(query, method).return_value = query
+    query.execute.return_value = Mock(count=3, data=[{"created_at": "2026-10-18T00:00:00"}])
+    memory.supabase = Mock(table=Mock(return_value=query))
+    rpc_results = [
+        {"success": True, "data": {"total_vectors": 3, "by_document_type": {"text": 3}}},
+        {"success": False, "error": "function get_embedding_statistics does not exist"},
+    ]
+
+    async def execute_rpc(function_name, params=None):
+        return rpc_results.pop(0)
+
+    memory._execute_rpc = execute_rpc
+    with_rpc = (await memory.get_statistics())["statistics"]
+    fallback = (await memory.get_statistics())["statistics"]
+
+    assert set(fallback) == set(with_rpc)
+    assert fallback["total_vectors"] == 3 and fallback["by_document_type"] == {}
+    # The fallback itself returns every aggregate the RPC does
+    assert set(await memory._count_statistics()) == {
+        "total_vectors",
+        "by_namespace",
+        "by_document_type",
+        "oldest_vector",
+        "newest_vector",
+    }
@@ -0,0 +1,234 @@
+"""Tests for execution admission control and the bounded dispatch queue."""
+
+import asyncio
+
+import pytest
+
+from workflow_engine_v2.services.execution_dispatcher import (
+    DispatcherSaturated,
+    ExecutionDispatcher,
+    ExecutionPriority,
+    load_test,
+)
+
+
+def _recorder(order, name, gate=None):
+    async def job():
+        if gate is not None:
+            await gate.wait()
+        order.append(name)
+        return name
+
+    return job
+
+
+@pytest.mark.asyncio
+async def test_dispatches_by_priority_then_round_robin_across_users():
+    dispatcher = ExecutionDispatcher(max_concurrency=1)
+    gate = asyncio.Event()
+    order = []
+    blocker = dispatcher.submit(_recorder(order, "blocker", gate), user_id="x", workflow_id="w0")
+
+    futures = [
+        dispatcher.submit(
+            _recorder(order, f"cron-a{i}"),
+            user_id="a",
+            workflow_id=f"c{i}",
+            priority=ExecutionPriority.CRON,
+        )
+        for i in range(2)
+    ]
+    futures += [
+        dispatcher.submit(_recorder(order, f"manual-{u}{i}"), user_id=u, workflow_id=f"m{u}{i}")
+        for u in ("b", "c")
+        for i in range(2)
+    ]
+    futures.append(
+        dispatcher.submit(
+            _recorder(order, "hook-d"),
+            user_id="d",
+            workflow_id="h",
+            priority=ExecutionPriority.for_trigger("SLACK"),
+        )
+    )
+
+    gate.set()
+    await asyncio.gather(blocker, *futures)
+
+    assert order == [
+        "blocker",
+        "manual-b0",
+        "manual-c0",
+        "manual-b1",
+        "manual-c1",
+        "hook-d",
+        "cron-a0",
+        "cron-a1",
+    ]
+    waits = dispatcher.get_stats()["queue_wait_seconds"]
+    assert waits["manual"]["count"] == 5 and waits["cron"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_per_user_and_per_workflow_quotas():
+    dispatcher = ExecutionDispatcher(
+        max_concurrency=8, per_user_concurrency=3, per_workflow_concurrency=2
+    )
+    gate = asyncio.Event()
+    order = []
+    futures = [
+        dispatcher.submit(_recorder(order, i, gate), user_id="a", workflow_id="same")
+        for i in range(4)
+    ]
+    futures.append(
+        dispatcher.submit(_recorder(order, "a-other", gate), user_id="a", workflow_id="o")
+    )
+    futures.append(dispatcher.submit(_recorder(order, "b", gate), user_id="b", workflow_id="same"))
+
+    # Two runs of "same", one of "o" for user a; b's run of "same" waits on the workflow quota
+    assert dispatcher.running == 3
+    assert dispatcher.queued == 3
+
+    gate.set()
+    await asyncio.gather(*futures)
+    assert dispatcher.running == 0 and dispatcher.queued == 0
+    assert dispatcher.get_stats()["counters"]["completed"] == 6
+
+
+@pytest.mark.asyncio
+async def test_saturation_rejects_low_priority_first_with_retry_after():
+    dispatcher = ExecutionDispatcher(max_concurrency=1, max_queue=4, per_user_queue=100)
+    gate = asyncio.Event()
+    futures = [dispatcher.submit(_recorder([], "run", gate), user_id="x", workflow_id="w")]
+
+    for i in range(2):
+        futures.append(
+            dispatcher.submit(
+                _recorder([], i, gate),
+                user_id="cron-tenant",
+                workflow_id=f"c{i}",
+                priority=ExecutionPriority.CRON,
+            )
+        )
+    with pytest.raises(DispatcherSaturated) as excinfo:
+        dispatcher.submit(
+            _recorder([], "late", gate),
+            user_id="cron-tenant",
+            workflow_id="c9",
+            priority=ExecutionPriority.CRON,
+        )
+    assert excinfo.value.reason == "queue_full"
+    assert excinfo.value.retry_after >= 1
+
+    # Manual runs still have headroom until the whole queue is full
+    for i in range(2):
+        futures.append(dispatcher.submit(_recorder([], i, gate), user_id="u", workflow_id=f"m{i}"))
+    with pytest.raises(DispatcherSaturated):
+        dispatcher.submit(_recorder([], "x", gate), user_id="u", workflow_id="m9")
+
+    gate.set()
+    await asyncio.gather(*futures)
+    counters = dispatcher.get_stats()["counters"]
+    assert counters["rejected_cron"] == 1 and counters["rejected_manual"] == 1
+
+
+@pytest.mark.asyncio
+async def test_per_user_queue_quota_and_failures_propagate():
+    dispatcher = ExecutionDispatcher(max_concurrency=1, per_user_queue=2)
+
+    async def boom():
+        raise RuntimeError("node failed")
+
+    failing = dispatcher.submit(boom, user_id="a", workflow_id="w")
+    queued = [dispatcher.submit(boom, user_id="a", workflow_id="w") for _ in range(2)]
+    with pytest.raises(DispatcherSaturated) as excinfo:
+        dispatcher.submit(boom, user_id="a", workflow_id="w")
+    assert excinfo.value.reason == "user_quota"
+    queued.append(dispatcher.submit(boom, user_id="b", workflow_id="w2"))  # other users unaffected
+
+    with pytest.raises(RuntimeError):
+        await failing
+    await asyncio.gather(*queued, return_exceptions=True)
+    assert dispatcher.running == 0
+    assert dispatcher.get_stats()["counters"]["failed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cron_burst_does_not_starve_manual_runs():
+    dispatcher = ExecutionDispatcher(max_concurrency=4, max_queue=200, per_user_queue=200)
+    submissions = []
+    for i in range(300):
+        submissions.append(
+            {
+                "user_id": "cron-tenant",
+                "workflow_id": f"c{i % 10}",
+                "priority": ExecutionPriority.CRON,
+            }
+        )
+        if i % 15 == 0:
+            submissions.append({"user_id": f"user-{i % 3}", "workflow_id": f"m{i}"})
+
+    result = await load_test(dispatcher, submissions, job_seconds=0.002)
+
+    assert "manual" not in result["rejected"]
+    assert result["rejected"]["cron"] > 0
+    waits = result["queue_wait_seconds"]
+    assert waits["manual"]["count"] == 20
+    assert waits["manual"]["p95"] < waits["cron"]["p95"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_drops_a_queued_job_before_it_starts():
+    dispatcher = ExecutionDispatcher(max_concurrency=1)
+    gate = asyncio.Event()
+    order = []
+    blocker = dispatcher.submit(
+        _recorder(order, "blocker", gate), user_id="a", workflow_id="w0", execution_id="e0"
+    )
+    queued = dispatcher.submit(
+        _recorder(order, "queued"), user_id="a", workflow_id="w1", execution_id="e1"
+    )
+    after = dispatcher.submit(
+        _recorder(order, "after"), user_id="a", workflow_id="w2", execution_id="e2"
+    )
+
+    assert dispatcher.cancel("e1")
+    assert queued.cancelled()
+    assert dispatcher.queued == 1
+    # Running and unknown executions are not the dispatcher's to cancel
+    assert not dispatcher.cancel("e0")
+    assert not dispatcher.cancel("missing")
+
+    gate.set()
+    await asyncio.gather(blocker, after)
+    assert order == ["blocker", "after"]
+    assert dispatcher.queued == 0
+    assert dispatcher.get_stats()["counters"]["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancel_endpoint_removes_the_queued_execution(monkeypatch):
+    from workflow_engine_v2.api.v2 import executions
+
+    dispatcher = ExecutionDispatcher(max_concurrency=1)
+    gate = asyncio.Event()
+    order = []
+    blocker = dispatcher.submit(_recorder(order, "blocker", gate), user_id="a", workflow_id="w0")
+    queued = dispatcher.submit(
+        _recorder(order, "queued"), user_id="a", workflow_id="w1", execution_id="e1"
+    )
+
+    class StatusManager:
+        async def update_execution_status(self, execution_id, status, error_message=None):
+            return True
+
+    monkeypatch.setattr(executions, "dispatcher", dispatcher)
+    monkeypatch.setattr(executions, "WorkflowStatusManagerV2", StatusManager)
+
+    response = await executions.cancel_execution("e1")
+
+    assert response.success
+    assert queued.cancelled() and dispatcher.queued == 0
+    gate.set()
+    await blocker
+    assert order == ["blocker"]
@@ -0,0 +1,116 @@
+"""
+Tests for memoized spec lookups and the per-workflow execution plan cache.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from shared.models import ExecutionStatus, TriggerInfo
+from shared.models.node_enums import ActionSubtype, NodeType, TriggerSubtype
+from shared.models.workflow import Connection, Workflow, WorkflowMetadata, WorkflowStatistics
+from workflow_engine_v2 import ExecutionEngine
+from workflow_engine_v2.core import spec as spec_module
+from workflow_engine_v2.core.plan import ExecutionPlanCache, build_execution_plan
+from workflow_engine_v2.core.spec import coerce_node_to_v2, get_spec
+
+
+def _workflow(version: str = "1.0") -> Workflow:
+    trig_spec = get_spec(NodeType.TRIGGER.value, TriggerSubtype.WEBHOOK.value)
+    act_spec = get_spec(NodeType.ACTION.value, ActionSubtype.HTTP_REQUEST.value)
+    n1 = coerce_node_to_v2(trig_spec.create_node_instance("trigger_1"))
+    n2 = coerce_node_to_v2(act_spec.create_node_instance("action_1"))
+    n2.configurations.update({"retry_attempts": {"default": 2}, "timeout_seconds": "7"})
+
+    return Workflow(
+        metadata=WorkflowMetadata(
+            id="wf_plan",
+            name="Plan",
+            version=version,
+            created_time=int(time.time() * 1000),
+            created_by="tester",
+            statistics=WorkflowStatistics(),
+        ),
+        nodes=[n1, n2],
+        connections=[Connection(id="c1", from_node=n1.id, to_node=n2.id, output_key="result")],
+        triggers=[n1.id],
+    )
+
+
+def _trigger() -> TriggerInfo:
+    return TriggerInfo(
+        trigger_type="WEBHOOK", trigger_data={"msg": "hi"}, timestamp=int(time.time() * 1000)
+    )
+
+
+def test_spec_registry_is_imported_once():
+    first = spec_module._import_spec_registry()
+    assert spec_module._import_spec_registry() is first
+
+    before = spec_module._resolve_spec.cache_info().hits
+    assert get_spec(NodeType.TRIGGER, TriggerSubtype.WEBHOOK) is get_spec(
+        NodeType.TRIGGER.value, TriggerSubtype.WEBHOOK.value
+    )
+    assert spec_module._resolve_spec.cache_info().hits > before
+
+
+def test_fallback_stubs_are_not_memoized(monkeypatch):
+    registered = {}
+    registry = (lambda node_type, subtype: registered.get((node_type, subtype)), lambda: [])
+    monkeypatch.setattr(spec_module, "_import_spec_registry", lambda: registry)
+    spec_module.clear_spec_cache()
+    try:
+        stub = get_spec(NodeType.TRIGGER, TriggerSubtype.MANUAL)
+        assert stub is not None
+
+        # A spec registered after the stub was served is picked up
+        registered[(NodeType.TRIGGER.value, TriggerSubtype.MANUAL.value)] = real = object()
+        assert get_spec(NodeType.TRIGGER, TriggerSubtype.MANUAL) is real
+        assert get_spec(NodeType.TRIGGER, TriggerSubtype.MANUAL) is real
+        assert spec_module._resolve_spec.cache_info().hits == 1
+    finally:
+        spec_module.clear_spec_cache()
+
+
+def test_plan_precomputes_node_settings():
+    plan = build_execution_plan(_workflow(), "wf_plan")
+    action = plan.nodes["action_1"]
+
+    assert action.max_retries == 2
+    assert action.exec_timeout_seconds == 7.0
+    assert plan.nodes["trigger_1"].successors == [("action_1", "result", None)]
+    assert set(action.shape_payload({"unexpected": 1})) == set(action.output_defaults)
+
+
+def test_plan_cache_reuses_and_rebuilds_on_change():
+    cache = ExecutionPlanCache(max_size=2)
+    wf = _workflow()
+
+    plan = cache.get(wf, "wf_plan")
+    assert cache.get(_workflow(), "wf_plan") is plan
+
+    edited = _workflow()
+    edited.nodes[1].configurations["retry_attempts"] = 0
+    rebuilt = cache.get(edited, "wf_plan")
+    assert rebuilt is not plan
+    assert rebuilt.nodes["action_1"].max_retries == 0
+
+    cache.get(_workflow("2.0"), "wf_plan")
+    cache.get(_workflow("3.0"), "wf_plan")
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_engine_runs_reuse_plan():
+    engine = ExecutionEngine()
+    wf = _workflow()
+
+    first = engine.run(wf, _trigger(), workflow_id="wf_plan")
+    second = engine.run(wf, _trigger(), workflow_id="wf_plan")
+
+    assert first.status == second.status == ExecutionStatus.SUCCESS
+    assert (engine._plans.hits, engine._plans.misses) == (1, 1)
@@ -0,0 +1,327 @@
+"""
+Tests for the execution statistics rollup migration against a real PostgreSQL:
+the daily rollup follows inserts, status updates and deletes, get_execution_statistics
+matches direct aggregates, and SupabaseExecutionRepositoryV2 runs retention in
+chunks with progress reporting (also through its table-API fallback).
+"""
+
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+from postgrest.exceptions import APIError
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from workflow_engine_v2.services import supabase_repository_v2
+from workflow_engine_v2.services.supabase_repository_v2 import SupabaseExecutionRepositoryV2
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+pytestmark = pytest.mark.integration
+
+MIGRATION = (
+    backend_dir.parent.parent
+    / "supabase"
+    / "migrations"
+    / "20261018000003_execution_statistics_rollups.sql"
+)
+
+# Columns of workflow_executions used by the migration (initial schema, without the FK)
+TABLE = """
+DROP TABLE IF EXISTS workflow_executions, workflow_execution_daily_stats CASCADE;
+CREATE TABLE workflow_executions (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    execution_id VARCHAR(255) UNIQUE NOT NULL,
+    workflow_id UUID,
+    status VARCHAR(50) NOT NULL DEFAULT 'NEW',
+    start_time BIGINT,
+    end_time BIGINT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+UPSERT = """
+INSERT INTO workflow_executions (execution_id, workflow_id, status, start_time, end_time)
+VALUES %s
+ON CONFLICT (execution_id) DO UPDATE SET
+    status = EXCLUDED.status, start_time = EXCLUDED.start_time, end_time = EXCLUDED.end_time
+"""
+
+DAY_MS = 86400 * 1000
+NOW_MS = int(time.time() * 1000)
+WORKFLOWS = [str(uuid.UUID(int=i + 1)) for i in range(3)]
+
+
+class _Result:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _Query:
+    """The subset of the PostgREST query builder the repository uses, over psycopg2."""
+
+    def __init__(self, client, table):
+        self._client, self._table = client, table
+        self._columns, self._count, self._delete = "*", None, False
+        self._where, self._params, self._suffix = [], [], ""
+
+    def select(self, columns, count=None):
+        self._columns, self._count = columns, count
+        return self
+
+    def delete(self):
+        self._delete = True
+        return self
+
+    def _filter(self, op, column, value):
+        self._where.append(f"{column} {op} %s")
+        self._params.append(value)
+        return self
+
+    def eq(self, column, value):
+        return self._filter("=", column, value)
+
+    def lt(self, column, value):
+        return self._filter("<", column, value)
+
+    def gte(self, column, value):
+        return self._filter(">=", column, value)
+
+    def in_(self, column, values):
+        self._where.append(f"{column} = ANY(%s::uuid[])")
+        self._params.append(list(values))
+        return self
+
+    def order(self, column):
+        self._suffix += f" ORDER BY {column}"
+        return self
+
+    def limit(self, n):
+        self._suffix += f" LIMIT {int(n)}"
+        return self
+
+    def execute(self):
+        where = f" WHERE {' AND '.join(self._where)}" if self._where else ""
+        if self._delete:
+            self._client.sql(f"DELETE FROM {self._table}{where}", self._params)
+            return _Result([])
+        rows = self._client.sql(
+            f"SELECT {self._columns} FROM {self._table}{where}{self._suffix}", self._params
+        )
+        count = None
+        if self._count == "exact":
+            count = self._client.sql(f"SELECT COUNT(*) FROM {self._table}{where}", self._params)
+            count = count[0]["count"]
+        return _Result(rows, count)
+
+
+class _PostgresClient:
+    """Supabase-client stand-in that runs table queries and RPCs on a real database."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rpc_calls = []
+
+    def sql(self, statement, params=()):
+        with self.conn.cursor() as cur:
+            cur.execute(statement, params)
+            if cur.description is None:
+                return []
+            names = [c.name for c in cur.description]
+            return [{k: (str(v) if k == "id" else v) for k, v in zip(names, row)} for row in cur]
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def rpc(self, name, params):
+        self.rpc_calls.append(name)
+        args = ", ".join(f"{key} => %s" for key in params)
+        try:
+            rows = self.sql(f"SELECT {name}({args}) AS result", list(params.values()))
+        except psycopg2.Error as e:
+            # PostgREST reports database errors with their SQLSTATE
+            raise APIError({"code": e.pgcode, "message": e.pgerror})
+        return _Call(_Result(rows[0]["result"]))
+
+
+class _Call:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+@pytest.fixture
+def db(postgres_dsn):
+    conn = psycopg2.connect(postgres_dsn)
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute(TABLE)
+        cur.execute(MIGRATION.read_text())
+    yield _PostgresClient(conn)
+    conn.close()
+
+
+@pytest.fixture
+def repo(db, monkeypatch):
+    monkeypatch.setattr(supabase_repository_v2, "create_supabase_client", lambda: db)
+    monkeypatch.setattr(supabase_repository_v2, "_statistics_rpc_available", True)
+    monkeypatch.setattr(supabase_repository_v2, "_retention_rpc_available", True)
+    return SupabaseExecutionRepositoryV2()
+
+
+def _upsert(db, rows):
+    from psycopg2.extras import execute_values
+
+    with db.conn.cursor() as cur:
+        execute_values(cur, UPSERT, rows)
+
+
+def _rows(n, *, days_ago=0, status="RUNNING", finished=False, prefix="exec"):
+    rows = []
+    for i in range(n):
+        start = NOW_MS - days_ago * DAY_MS - i * 1000
+        rows.append(
+            (
+                f"{prefix}_{days_ago}_{i}",
+                WORKFLOWS[i % 3],
+                status,
+                start,
+                start + 100 + i if finished else None,
+            )
+        )
+    return rows
+
+
+def _assert_rollup_consistent(db):
+    expected = db.sql(
+        """
+        SELECT workflow_id::text, workflow_execution_stats_day(start_time, created_at) AS day,
+               status, COUNT(*) AS n, COUNT(end_time - start_time) AS dn,
+               COALESCE(SUM(end_time - start_time), 0) AS d
+        FROM workflow_executions GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+        """
+    )
+    rollup = db.sql(
+        """
+        SELECT workflow_id::text, day, status, execution_count AS n, duration_count AS dn,
+               total_duration_ms AS d
+        FROM workflow_execution_daily_stats WHERE execution_count <> 0 ORDER BY 1, 2, 3
+        """
+    )
+    assert rollup == expected
+
+
+def test_rollup_tracks_inserts_updates_and_deletes(db):
+    _upsert(db, _rows(30) + _rows(12, days_ago=3, status="SUCCESS", finished=True))
+    _assert_rollup_consistent(db)
+
+    # Executions are re-saved as they progress: RUNNING -> SUCCESS/ERROR with an end_time
+    _upsert(db, _rows(20, status="SUCCESS", finished=True))
+    _upsert(db, _rows(5, status="ERROR", finished=True))
+    db.sql("UPDATE workflow_executions SET start_time = start_time WHERE status = 'SUCCESS'")
+    _assert_rollup_consistent(db)
+
+    db.sql("DELETE FROM workflow_executions WHERE status = 'ERROR'")
+    _assert_rollup_consistent(db)
+
+
+def test_get_execution_statistics(db, repo):
+    _upsert(db, _rows(9, status="SUCCESS", finished=True))
+    _upsert(db, _rows(3, status="ERROR", finished=True, prefix="failed"))
+    _upsert(db, _rows(6, days_ago=2, status="SUCCESS", finished=True))
+    _upsert(db, _rows(3, days_ago=60, status="CANCELED"))
+
+    stats = repo.get_execution_statistics(days=7)
+    assert db.rpc_calls == ["get_execution_statistics"]
+    assert stats["total_executions"] == 21
+    assert stats["status_distribution"] == {"SUCCESS": 15, "ERROR": 3, "CANCELED": 3}
+    assert stats["executions_last_24h"] == 12
+    durations = [100 + i for i in range(9)] + [100 + i for i in range(3)]
+    durations += [100 + i for i in range(6)]
+    assert stats["average_duration_ms"] == pytest.approx(sum(durations) / len(durations))
+    assert [d["executions"] for d in stats["daily"]] == [6, 12]
+    assert sum(d["errors"] for d in stats["daily"]) == 3
+
+    one = repo.get_execution_statistics(workflow_id=WORKFLOWS[0], days=7)
+    assert one["total_executions"] == 3 + 1 + 2 + 1
+    json.dumps(stats)
+
+
+def test_chunked_retention_reports_progress(db, repo):
+    _upsert(db, _rows(25, days_ago=40, status="SUCCESS", finished=True))
+    _upsert(db, _rows(4, status="RUNNING"))
+    progress = []
+
+    deleted = repo.delete_old_executions(
+        older_than_days=30, batch_size=10, progress_callback=progress.append
+    )
+
+    assert deleted == 25
+    assert [p["deleted"] for p in progress] == [10, 20, 25]
+    assert {p["total"] for p in progress} == {25}
+    assert [p["done"] for p in progress] == [False, False, True]
+    assert set(db.rpc_calls) == {"delete_old_executions_batch"}
+    assert db.sql("SELECT COUNT(*) FROM workflow_executions")[0]["count"] == 4
+    assert (
+        db.sql("SELECT COUNT(*) FROM workflow_execution_daily_stats WHERE execution_count = 0")[0][
+            "count"
+        ]
+        == 0
+    )
+    _assert_rollup_consistent(db)
+
+
+def test_retention_and_statistics_fall_back_without_functions(db, repo):
+    _upsert(db, _rows(7, days_ago=40, status="ERROR", finished=True))
+    _upsert(db, _rows(2, status="SUCCESS", finished=True))
+    db.sql("DROP FUNCTION get_execution_statistics(UUID, INTEGER)")
+    db.sql("DROP FUNCTION delete_old_executions_batch(BIGINT, INTEGER)")
+    progress = []
+
+    deleted = repo.delete_old_executions(
+        30, batch_size=3, max_batches=2, progress_callback=progress.append
+    )
+    assert deleted == 6
+    assert [p["deleted"] for p in progress] == [3, 6]
+    assert repo.delete_old_executions(30, batch_size=3) == 1
+    assert not supabase_repository_v2._retention_rpc_available
+
+    stats = repo.get_execution_statistics()
+    assert not supabase_repository_v2._statistics_rpc_available
+    assert stats["total_executions"] == 2
+    assert stats["status_distribution"] == {"SUCCESS": 2}
+    assert stats["executions_last_24h"] == 2
+    _assert_rollup_consistent(db)
+
+
+def test_other_rpc_errors_fail_the_call_without_disabling_the_function(db, repo):
+    _upsert(db, _rows(5, days_ago=40, status="SUCCESS", finished=True))
+    db.sql(
+        """
+        CREATE FUNCTION reject_deletes() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            RAISE EXCEPTION 'canceling statement due to statement timeout' USING ERRCODE = '57014';
+        END $$;
+        CREATE TRIGGER reject_deletes BEFORE DELETE ON workflow_executions
+            FOR EACH ROW EXECUTE FUNCTION reject_deletes();
+        """
+    )
+
+    assert repo.delete_old_executions(30, batch_size=2) == 0
+    assert "error" in repo.get_execution_statistics(days="not a number")
+    assert supabase_repository_v2._retention_rpc_available
+    assert supabase_repository_v2._statistics_rpc_available
+
+    db.sql("DROP TRIGGER reject_deletes ON workflow_executions")
+    assert repo.delete_old_executions(30, batch_size=2) == 5
+    assert repo.get_execution_statistics()["total_executions"] == 0
+    assert set(db.rpc_calls) == {"delete_old_executions_batch", "get_execution_statistics"}
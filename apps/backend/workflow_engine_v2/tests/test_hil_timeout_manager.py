@@ -0,0 +1,256 @@
+"""
+Tests for the HIL timeout manager: deadlines fire at timeout_at (with the warning
+as a separate, earlier entry), pending interactions are recovered on start,
+answered interactions are not timed out, due interactions are processed with
+bounded parallelism, failed ones are retried with backoff, and new interactions are
+armed at creation time and disarmed when answered.
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from workflow_engine_v2.services import hil_timeout_manager
+from workflow_engine_v2.services.hil_timeout_manager import HILTimeoutManager
+
+
+def _iso(epoch_seconds: float) -> str:
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class _Table:
+    """In-memory stand-in for the Supabase query builder (filters, update, paging)."""
+
+    def __init__(self, db, name):
+        self._rows = db.setdefault(name, {})
+        self._db = db
+        self._filters = []
+        self._update = None
+        self._range = None
+
+    def select(self, columns):
+        return self
+
+    def update(self, values):
+        self._update = values
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def lte(self, column, value):
+        self._filters.append(lambda row: row.get(column) <= value)
+        return self
+
+    def gte(self, column, value):
+        self._filters.append(lambda row: row.get(column) >= value)
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end + 1)
+        return self
+
+    def execute(self):
+        self._db["queries"] = self._db.get("queries", 0) + 1
+        rows = [row for row in self._rows.values() if all(f(row) for f in self._filters)]
+        rows.sort(key=lambda row: row.get("timeout_at", ""))
+        if self._update is not None:
+            for row in rows:
+                row.update(self._update)
+        if self._range:
+            rows = rows[self._range[0] : self._range[1]]
+        return type("Result", (), {"data": [dict(row) for row in rows]})()
+
+
+class _Supabase:
+    def __init__(self):
+        self.db = {}
+
+    def table(self, name):
+        return _Table(self.db, name)
+
+    def add(self, interaction_id, timeout_at, **fields):
+        row = {
+            "id": interaction_id,
+            "execution_id": f"exec_{interaction_id}",
+            "node_id": "approval",
+            "status": "pending",
+            "warning_sent": False,
+            "channel_type": "slack",
+            "request_data": {"timeout_action": "fail"},
+            "timeout_at": _iso(timeout_at),
+            **fields,
+        }
+        self.db.setdefault("hil_interactions", {})[interaction_id] = row
+        return dict(row)
+
+    def status(self, interaction_id):
+        return self.db["hil_interactions"][interaction_id]["status"]
+
+
+@pytest.fixture
+def supabase(monkeypatch):
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    return _Supabase()
+
+
+@pytest.fixture
+def manager(supabase):
+    events = []
+    manager = HILTimeoutManager(warning_threshold_minutes=1, max_concurrency=4)
+    manager._supabase = supabase
+    manager.events = events
+
+    async def notify(interaction):
+        events.append(("timeout", interaction["id"], time.time()))
+        return True
+
+    async def warn(**kwargs):
+        events.append(("warning", kwargs["interaction_id"], time.time()))
+
+    manager._send_timeout_notification = notify
+    manager.hil_service._send_response_message = warn
+    yield manager
+    hil_timeout_manager._timeout_manager = None
+
+
+@pytest.mark.asyncio
+async def test_deadlines_fire_on_time_with_separate_warning(manager, supabase):
+    now = time.time()
+    await manager.start_monitoring()
+    manager.schedule_interaction(supabase.add("soon", now + 0.4))
+    manager.schedule_interaction(supabase.add("later", now + 3600))
+
+    await asyncio.sleep(0.2)
+    # The warning window (1 minute) had already begun, so the warning went out at once
+    assert [e[:2] for e in manager.events] == [("warning", "soon")]
+
+    await asyncio.sleep(0.4)
+    kinds = [e[:2] for e in manager.events]
+    assert kinds == [("warning", "soon"), ("timeout", "soon")]
+    assert manager.events[1][2] - (now + 0.4) < 0.15
+    assert supabase.status("soon") == "timeout"
+    assert supabase.status("later") == "pending"
+    assert supabase.db["hil_interactions"]["later"]["warning_sent"] is False
+
+    status = manager.get_status()
+    assert status["scheduled_interactions"] == 1
+    assert status["next_deadline"] == _iso(now + 3600 - 60)
+    await manager.stop_monitoring()
+
+
+@pytest.mark.asyncio
+async def test_recovers_pending_interactions_and_skips_answered_ones(manager, supabase):
+    now = time.time()
+    supabase.add("expired", now - 120, warning_sent=True)
+    supabase.add("answered", now - 120, status="approved")
+    supabase.add("answered_late", now + 0.2, warning_sent=True)
+    supabase.add("far", now + 7 * 86400)
+
+    await manager.start_monitoring()
+    await asyncio.sleep(0.05)
+    assert [e[:2] for e in manager.events] == [("timeout", "expired")]
+    assert manager.get_status()["scheduled_interactions"] == 1  # far is beyond the horizon
+
+    # Answered after it was scheduled: the conditional update leaves it alone
+    supabase.db["hil_interactions"]["answered_late"]["status"] = "approved"
+    queries = supabase.db["queries"]
+    await asyncio.sleep(0.3)
+    assert [e[:2] for e in manager.events] == [("timeout", "expired")]
+    assert supabase.status("answered_late") == "approved"
+    # Sleeping until the deadline issued only the conditional update, no scans
+    assert supabase.db["queries"] - queries == 1
+    await manager.stop_monitoring()
+
+
+@pytest.mark.asyncio
+async def test_due_interactions_are_processed_with_bounded_parallelism(manager, supabase):
+    now = time.time()
+    active = peak = 0
+
+    async def slow_resume(interaction, timeout_action):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return True
+
+    manager._resume_workflow_after_timeout = slow_resume
+    for i in range(20):
+        supabase.add(f"hil_{i}", now - 1, warning_sent=True)
+
+    started = time.perf_counter()
+    processed = await manager.process_expired_interactions()
+    elapsed = time.perf_counter() - started
+
+    assert sorted(processed) == sorted(f"hil_{i}" for i in range(20))
+    assert peak == manager.max_concurrency == 4
+    assert elapsed < 20 * 0.05 / 2
+    assert await manager.process_expired_interactions() == []
+
+
+@pytest.mark.asyncio
+async def test_created_interactions_are_armed_immediately(manager, supabase, monkeypatch):
+    await manager.start_monitoring()
+    hil_timeout_manager._timeout_manager = manager
+    monkeypatch.setattr(manager.hil_service, "_supabase", None)
+
+    interaction_id = await manager.hil_service.create_interaction(
+        workflow_id="wf", execution_id="exec", node_id="approval", user_id="user"
+    )
+    await asyncio.sleep(0.01)
+
+    status = manager.get_status()
+    assert status["scheduled_interactions"] == 1
+    assert manager._scheduled[(interaction_id, hil_timeout_manager.TIMEOUT)] == pytest.approx(
+        time.time() + 3600, abs=5
+    )
+    assert (interaction_id, hil_timeout_manager.WARNING) in manager._scheduled
+
+    # Answering the interaction drops both deadlines
+    assert await manager.hil_service.resolve_interaction(interaction_id, {}, "user")
+    await asyncio.sleep(0.01)
+    assert manager.get_status()["pending_deadlines"] == 0
+    await manager.stop_monitoring()
+
+
+@pytest.mark.asyncio
+async def test_failed_timeouts_are_retried_with_backoff(manager, supabase, monkeypatch):
+    manager.retry_backoff_seconds = 0.1
+    failures = []
+    execute = _Table.execute
+
+    def flaky_execute(table):
+        if table._update is not None and len(failures) < 2:
+            failures.append(table._update)
+            raise ConnectionError("database unavailable")
+        return execute(table)
+
+    monkeypatch.setattr(_Table, "execute", flaky_execute)
+    now = time.time()
+    await manager.start_monitoring()
+    manager.schedule_interaction(supabase.add("flaky", now + 0.05, warning_sent=True))
+
+    await asyncio.sleep(0.2)
+    # First attempt at the deadline, first retry 0.1s later, second retry 0.2s after that
+    assert len(failures) == 2 and supabase.status("flaky") == "pending"
+    assert manager.get_status()["pending_deadlines"] == 1
+
+    await asyncio.sleep(0.25)
+    assert supabase.status("flaky") == "timeout"
+    assert [e[:2] for e in manager.events] == [("timeout", "flaky")]
+    assert manager.stats["retries"] == 2 and not manager._attempts
+    await manager.stop_monitoring()
@@ -0,0 +1,122 @@
+"""
+Tests for the lazy node spec registry: the prebuilt snapshot matches the spec
+sources, spec modules are imported only on lookup, a stale snapshot falls back
+to importing, and an import-time benchmark against loading every spec.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from shared import node_specs
+from shared.node_specs.loader import (
+    SUMMARY_FIELDS,
+    LazySpecRegistry,
+    read_snapshot,
+    source_fingerprint,
+)
+
+
+def _run(code: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=backend_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_snapshot_is_current_and_matches_specs():
+    """Fails when a spec changed without `python scripts/build_node_spec_snapshot.py`."""
+    summaries = read_snapshot(node_specs.SPEC_SOURCES, node_specs.__version__)
+    assert summaries is not None, "registry_snapshot.json is stale; rebuild it"
+
+    for key, spec in node_specs.NODE_SPECS_REGISTRY.items():
+        full = spec.model_dump(mode="json")
+        summary = summaries[key]
+        assert summary.key == key and summary.type == full["type"]
+        for name in SUMMARY_FIELDS:
+            assert getattr(summary, name) == full[name], f"{key}.{name}"
+
+
+def test_lookups_import_only_the_requested_spec_module():
+    result = _run(
+        """
+import json, sys
+from shared.node_specs import NODE_SPECS_REGISTRY, _wrapped_registry, get_node_spec
+
+def loaded():
+    return sorted(m for m in sys.modules if m.count(".") == 3 and m.startswith("shared.node_specs."))
+
+before = loaded()
+types = _wrapped_registry.get_node_types()
+summaries = _wrapped_registry.list_spec_summaries()
+after_listing = loaded()
+spec = get_node_spec("ACTION", "HTTP_REQUEST")
+from shared.node_specs.FLOW import IF_FLOW_SPEC
+print(json.dumps({
+    "before": before, "after_listing": after_listing, "after_lookup": loaded(),
+    "keys": len(NODE_SPECS_REGISTRY), "summaries": len(summaries),
+    "types": sorted(types), "subtype": spec.subtype, "if": IF_FLOW_SPEC.subtype,
+}))
+"""
+    )
+    assert result["before"] == result["after_listing"] == []
+    assert result["after_lookup"] == [
+        "shared.node_specs.ACTION.HTTP_REQUEST",
+        "shared.node_specs.FLOW.IF",
+    ]
+    assert result["keys"] == result["summaries"] == len(node_specs.SPEC_SOURCES)
+    assert "HUMAN_IN_THE_LOOP" in result["types"]
+    assert (result["subtype"], result["if"]) == ("HTTP_REQUEST", "IF")
+
+
+def test_stale_snapshot_falls_back_to_importing(tmp_path):
+    sources = {"FLOW.IF": "IF_FLOW_SPEC", "FLOW.MISSING": "MISSING_FLOW_SPEC"}
+    snapshot_path = tmp_path / "registry_snapshot.json"
+    snapshot_path.write_text(
+        json.dumps(
+            {
+                "format_version": 1,
+                "registry_version": "test",
+                "source_fingerprint": "outdated",
+                "specs": {},
+            }
+        )
+    )
+    registry = LazySpecRegistry(sources, "test", snapshot_path)
+
+    assert registry.get("FLOW.MISSING") is None
+    assert list(registry) == ["FLOW.IF"]
+    assert registry.summary("FLOW.IF").configurations == node_specs.IF_FLOW_SPEC.configurations
+    assert registry["FLOW.IF"] is node_specs.IF_FLOW_SPEC
+    assert source_fingerprint(sources) != "outdated"
+
+
+def test_import_time_benchmark():
+    """Startup cost of the registry versus importing every spec module (the previous import)."""
+    code = """
+import json, time
+import shared.models  # shared by both variants
+started = time.perf_counter()
+import shared.node_specs as node_specs
+node_specs._wrapped_registry.get_node_types()
+node_specs.get_node_spec("TRIGGER", "MANUAL")
+lazy = time.perf_counter() - started
+started = time.perf_counter()
+node_specs._wrapped_registry.list_all_specs()
+print(json.dumps({"lazy": lazy, "eager": lazy + time.perf_counter() - started}))
+"""
+    runs = [_run(code) for _ in range(2)]
+    lazy = min(run["lazy"] for run in runs)
+    eager = min(run["eager"] for run in runs)
+
+    print(f"\nnode spec registry startup: lazy {lazy * 1000:.0f}ms, all specs {eager * 1000:.0f}ms")
+    assert lazy * 3 < eager
@@ -0,0 +1,170 @@
+"""
+Tests for node attempt supervision: worker abandonment on timeout, timer-driven
+retry backoff, and engine behaviour under many concurrent executions.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from shared.models import ExecutionStatus, TriggerInfo
+from shared.models.node_enums import ActionSubtype, NodeType, TriggerSubtype
+from shared.models.workflow import Connection, Workflow, WorkflowMetadata, WorkflowStatistics
+from workflow_engine_v2 import ExecutionEngine
+from workflow_engine_v2.core import engine as engine_module
+from workflow_engine_v2.core.spec import coerce_node_to_v2, get_spec
+from workflow_engine_v2.core.supervisor import NodeSupervisor, NodeTimeoutError, NodeWorkerPool
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_timed_out_worker_is_replaced_and_exits_when_runner_returns():
+    pool = NodeWorkerPool(max_workers=1)
+    supervisor = NodeSupervisor(pool)
+    release = threading.Event()
+
+    hung = supervisor.run(release.wait, timeout=0.05)
+    with pytest.raises(NodeTimeoutError):
+        hung.result(timeout=2)
+
+    # The only worker is stuck, yet the next call still gets a worker
+    assert supervisor.run(lambda: "ok", timeout=1).result(timeout=2) == "ok"
+    assert pool.get_stats()["abandoned_running"] == 1
+
+    release.set()
+    assert _wait_until(lambda: pool.get_stats()["abandoned_running"] == 0)
+    assert pool.get_stats()["active"] == 1
+
+
+def test_retries_are_scheduled_without_holding_a_worker():
+    pool = NodeWorkerPool(max_workers=1)
+    supervisor = NodeSupervisor(pool)
+    calls = []
+    retries = []
+
+    def flaky():
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            raise RuntimeError(f"boom {len(calls)}")
+        return "done"
+
+    result = supervisor.run(
+        flaky,
+        max_retries=3,
+        backoff=lambda attempt: 0.1,
+        on_retry=lambda attempt, exc: retries.append((attempt, str(exc))),
+    )
+    # While the first retry is pending the single worker is free for other work
+    time.sleep(0.03)
+    assert supervisor.run(lambda: 1).result(timeout=1) == 1
+
+    assert result.result(timeout=2) == "done"
+    assert retries == [(1, "boom 1"), (2, "boom 2")]
+    assert calls[1] - calls[0] >= 0.09
+
+
+def test_exhausted_retries_raise_last_error_and_cancel_stops_attempts():
+    supervisor = NodeSupervisor(NodeWorkerPool(max_workers=2))
+
+    def always_fails():
+        raise ValueError("nope")
+
+    with pytest.raises(ValueError):
+        supervisor.run(always_fails, max_retries=2).result(timeout=2)
+    assert supervisor.stats["attempts"] == 3
+
+    calls = []
+    pending = supervisor.run(
+        lambda: calls.append(1) or always_fails(), max_retries=5, backoff=lambda attempt: 0.2
+    )
+    assert _wait_until(lambda: len(calls) == 1)
+    pending.cancel()
+    time.sleep(0.3)
+    assert calls == [1]
+
+
+def _workflow() -> Workflow:
+    trig_spec = get_spec(NodeType.TRIGGER.value, TriggerSubtype.MANUAL.value)
+    act_spec = get_spec(NodeType.ACTION.value, ActionSubtype.HTTP_REQUEST.value)
+    n1 = coerce_node_to_v2(trig_spec.create_node_instance("trigger_1"))
+    n2 = coerce_node_to_v2(act_spec.create_node_instance("action_1"))
+    n2.configurations.update(
+        {"retry_attempts": 2, "retry_backoff_seconds": 0.02, "timeout_seconds": 0.2}
+    )
+    return Workflow(
+        metadata=WorkflowMetadata(
+            id="wf_stress",
+            name="Stress",
+            version="1.0",
+            created_time=int(time.time() * 1000),
+            created_by="tester",
+            statistics=WorkflowStatistics(),
+        ),
+        nodes=[n1, n2],
+        connections=[Connection(id="c1", from_node=n1.id, to_node=n2.id, output_key="result")],
+        triggers=[n1.id],
+    )
+
+
+@pytest.mark.asyncio
+async def test_hundred_concurrent_executions_with_timeouts_and_retries(monkeypatch):
+    """Eight hosts, every run hits a timeout or failure first; none may starve."""
+    attempts = {}
+    lock = threading.Lock()
+    real_runner_for = engine_module.default_runner_for
+
+    class SyntheticAction:
+        def run(self, node, inputs, trigger):
+            key = trigger.trigger_data["n"]
+            with lock:
+                attempts[key] = attempts.get(key, 0) + 1
+                first = attempts[key] == 1
+            if first and key % 2:
+                time.sleep(0.5)  # exceeds the 0.2s node timeout
+            elif first:
+                raise RuntimeError("transient")
+            time.sleep(0.01)
+            return {"result": {"n": key}}
+
+    def runner_for(node):
+        if str(node.type) in (NodeType.ACTION.value, str(NodeType.ACTION)):
+            return SyntheticAction()
+        return real_runner_for(node)
+
+    monkeypatch.setattr(engine_module, "default_runner_for", runner_for)
+    monkeypatch.delenv("SUPABASE_URL")  # keep run bookkeeping local
+    engine = ExecutionEngine(max_workers=8)
+    wf = _workflow()
+
+    started = time.monotonic()
+    executions = await asyncio.gather(
+        *(
+            engine.run_async(
+                wf,
+                TriggerInfo(
+                    trigger_type="MANUAL", trigger_data={"n": i}, timestamp=int(time.time() * 1000)
+                ),
+                "wf_stress",
+            )
+            for i in range(100)
+        )
+    )
+    elapsed = time.monotonic() - started
+
+    assert [e.status for e in executions] == [ExecutionStatus.SUCCESS] * 100
+    assert all(attempts[i] == 2 for i in range(100))
+    # 100 runs / 8 hosts, each ~0.2s timeout or ~0.02s backoff plus a short retry
+    assert elapsed < 15
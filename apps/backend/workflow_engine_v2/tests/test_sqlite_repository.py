@@ -0,0 +1,148 @@
+"""
+Tests for the SQLite execution repository: round trips, paging and search over
+the indexed columns, SQL statistics, importing the JSON file store, and a
+listing benchmark against FileExecutionRepository.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from shared.models import Execution, ExecutionStatus, TriggerInfo
+from shared.models.execution_new import NodeExecution
+from workflow_engine_v2.services.file_repository import FileExecutionRepository
+from workflow_engine_v2.services.sqlite_repository import SqliteExecutionRepository
+
+NOW_MS = int(time.time() * 1000)
+
+
+def _execution(i: int, *, workflow_id=None, status=None, start_time=None) -> Execution:
+    return Execution(
+        id=f"id_{i}",
+        execution_id=f"exec_{i:05d}",
+        workflow_id=workflow_id or f"wf_{i % 3}",
+        status=status or (ExecutionStatus.SUCCESS if i % 2 else ExecutionStatus.ERROR),
+        start_time=NOW_MS - i * 1000 if start_time is None else start_time,
+        end_time=NOW_MS - i * 1000 + 250,
+        duration_ms=100 + i,
+        trigger_info=TriggerInfo(
+            trigger_type="MANUAL", trigger_data={"n": i}, user_id=f"user_{i % 2}", timestamp=0
+        ),
+        node_executions={
+            "node_1": NodeExecution(
+                node_id="node_1",
+                node_name="node",
+                node_type="ACTION",
+                node_subtype="HTTP_REQUEST",
+                status="completed",
+                output_data={"result": {"value": i}},
+            )
+        },
+        execution_sequence=["node_1"],
+    )
+
+
+@pytest.fixture
+def repo():
+    repository = SqliteExecutionRepository(":memory:")
+    yield repository
+    repository.close()
+
+
+def test_round_trip_and_upsert(repo):
+    execution = _execution(1)
+    repo.save(execution)
+    assert repo.get("exec_00001") == execution
+
+    execution.status = ExecutionStatus.CANCELED
+    repo.save(execution)
+    assert repo.get("exec_00001").status == ExecutionStatus.CANCELED
+    assert repo.count() == 1
+    assert repo.get("missing") is None
+
+    assert repo.delete("exec_00001") is True
+    assert repo.delete("exec_00001") is False
+
+
+def test_paging_search_and_statistics(repo):
+    repo.save_many([_execution(i) for i in range(30)])
+    repo.save(_execution(99, start_time=NOW_MS - 3 * 86400 * 1000))
+
+    page = repo.list(limit=5, offset=5)
+    assert [e.execution_id for e in page] == [f"exec_{i:05d}" for i in range(5, 10)]
+
+    assert {e.workflow_id for e in repo.list_by_workflow("wf_1", limit=100)} == {"wf_1"}
+    assert len(repo.list_by_workflow("wf_1", limit=100)) == 10
+    assert all(
+        e.status == ExecutionStatus.SUCCESS for e in repo.list_by_status(ExecutionStatus.SUCCESS)
+    )
+    assert len(repo.list_by_user("user_1", limit=100)) == 16  # includes exec_00099
+
+    recent = repo.search(
+        workflow_id="wf_0",
+        status=ExecutionStatus.ERROR,
+        start_time_after=datetime.now() - timedelta(hours=1),
+        limit=100,
+    )
+    assert [e.execution_id for e in recent] == [f"exec_{i:05d}" for i in (0, 6, 12, 18, 24)]
+    assert repo.count(workflow_id="wf_0", status=ExecutionStatus.ERROR) == 5
+
+    stats = repo.get_execution_statistics()
+    assert stats["total_executions"] == 31
+    assert stats["executions_last_24h"] == 30
+    assert stats["status_distribution"] == {"SUCCESS": 16, "ERROR": 15}
+    assert stats["average_duration_ms"] == pytest.approx((sum(range(100, 130)) + 199) / 31)
+
+    assert repo.delete_old_executions(older_than_days=2) == 1
+    assert repo.health_check()["status"] == "healthy"
+
+
+def test_import_file_repository(tmp_path):
+    files = FileExecutionRepository(str(tmp_path / "runs"))
+    for i in range(3):
+        files.save(_execution(i))
+    repo = SqliteExecutionRepository(str(tmp_path / "executions.db"))
+
+    assert repo.import_file_repository(str(tmp_path / "runs")) == 3
+    assert repo.get("exec_00002") == files.get("exec_00002")
+    repo.close()
+
+
+def test_listing_benchmark_against_file_repository(tmp_path):
+    """One page out of many local runs: indexed query versus glob-and-parse."""
+    executions = [_execution(i) for i in range(2000)]
+    files = FileExecutionRepository(str(tmp_path / "runs"))
+    for execution in executions:
+        files.save(execution)
+        # The file store lists by mtime; match it to the start time SQLite orders by
+        os.utime(files._path(execution.execution_id), ns=(0, execution.start_time * 1_000_000))
+    repo = SqliteExecutionRepository(str(tmp_path / "executions.db"))
+    repo.save_many(executions)
+
+    started = time.perf_counter()
+    file_page = files.list(limit=50)
+    file_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(10):
+        sqlite_page = repo.list(limit=50)
+        repo.list_by_workflow("wf_2", limit=50, offset=100)
+        repo.get_execution_statistics()
+    sqlite_seconds = (time.perf_counter() - started) / 10
+
+    print(
+        f"\nlist 50 of {len(executions)} runs: sqlite {sqlite_seconds * 1000:.1f}ms "
+        f"(page + workflow page + stats), file repository {file_seconds * 1000:.0f}ms"
+    )
+    # Timings are informational only; both stores must return the same page
+    assert len(file_page) == 50
+    assert sqlite_page == file_page
+    repo.close()
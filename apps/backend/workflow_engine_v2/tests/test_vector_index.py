@@ -0,0 +1,242 @@
+"""Tests for the local IVF-flat vector index and the memory stores built on it."""
+
+import numpy as np
+import pytest
+
+from workflow_engine_v2.runners.memory_implementations import vector_database
+from workflow_engine_v2.services import vector_index
+from workflow_engine_v2.services.memory import InMemoryVectorStore
+from workflow_engine_v2.services.vector_index import IVFFlatIndex, NamespacedVectorIndex, benchmark
+
+
+def _clustered(n, dim=32, clusters=50, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    data = centers[rng.integers(0, clusters, n)] + 0.3 * rng.normal(size=(n, dim))
+    queries = centers[rng.integers(0, clusters, 50)] + 0.3 * rng.normal(size=(50, dim))
+    return data.astype(np.float32), queries.astype(np.float32)
+
+
+def test_incremental_inserts_keep_recall_against_brute_force():
+    data, queries = _clustered(12_000)
+    index = IVFFlatIndex(32, train_threshold=1000)
+    for start in range(0, len(data), 500):
+        index.add([str(i) for i in range(start, start + 500)], data[start : start + 500])
+
+    assert index.is_trained
+    assert len(index) == 12_000
+    stats = benchmark(index, queries, top_k=10)
+    assert stats["recall_at_k"] >= 0.95
+
+
+def test_small_index_is_exact_and_scores_are_cosine():
+    index = IVFFlatIndex(3)
+    index.add(["x", "y", "z"], [[1, 0, 0], [0, 2, 0], [1, 1, 0]])
+
+    hits = index.search([2, 0, 0], top_k=2)
+
+    assert [i for i, _ in hits] == ["x", "z"]
+    assert hits[0][1] == pytest.approx(1.0)
+    assert hits[1][1] == pytest.approx(2**-0.5)
+
+
+def test_delete_and_replace():
+    data, queries = _clustered(3000)
+    index = IVFFlatIndex(32, train_threshold=1000)
+    index.add([str(i) for i in range(3000)], data)
+
+    target = index.search(queries[0], top_k=1)[0][0]
+    assert index.delete([target, "missing"]) == 1
+    assert target not in {i for i, _ in index.search(queries[0], top_k=50)}
+
+    index.add(["new"], [queries[0]])
+    index.add(["new"], [queries[1]])  # replacing keeps a single row for the id
+    assert index.search(queries[1], top_k=1)[0] == ("new", pytest.approx(1.0, abs=1e-5))
+    assert len(index) == 3000
+
+    index.delete([str(i) for i in range(2000)])  # triggers compaction
+    assert len(index) == 1000
+    assert all(i is not None for i, _ in index.search(queries[2], top_k=20))
+
+
+def test_namespaces_are_partitioned_and_persist(tmp_path):
+    store = NamespacedVectorIndex(4)
+    store.add("a", ["1", "2"], [[1, 0, 0, 0], [0, 1, 0, 0]], payloads=[{"n": 1}, {"n": 2}])
+    store.add("b", ["1"], [[0, 0, 1, 0]], payloads=[{"n": 3}])
+
+    assert store.search("a", [0, 0, 1, 0], top_k=5)[0][2] in ({"n": 1}, {"n": 2})
+    assert [p for _, _, p in store.search("b", [1, 0, 0, 0], top_k=5)] == [{"n": 3}]
+
+    store.save(str(tmp_path))
+    loaded = NamespacedVectorIndex.load(str(tmp_path))
+    assert loaded.search("a", [0, 1, 0, 0], top_k=1)[0][0] == "2"
+    assert loaded.search("b", [0, 0, 1, 0], top_k=1)[0][2] == {"n": 3}
+
+    # Reloaded namespaces keep the parameters the store is built with
+    tuned = NamespacedVectorIndex.load(str(tmp_path), nprobe=3, retrain_growth=2.0)
+    assert (tuned._indexes["a"].nprobe, tuned._indexes["a"].retrain_growth) == (3, 2.0)
+
+
+def test_trained_index_round_trips_through_disk(tmp_path):
+    data, queries = _clustered(3000)
+    index = IVFFlatIndex(32, train_threshold=1000)
+    index.add([str(i) for i in range(3000)], data)
+    path = str(tmp_path / "index.npz")
+
+    index.save(path)
+    loaded = IVFFlatIndex.load(path)
+
+    assert loaded.is_trained
+    assert loaded.search(queries[0], top_k=5) == index.search(queries[0], top_k=5)
+
+
+def test_in_memory_vector_store_queries_by_namespace():
+    store = InMemoryVectorStore()
+    store.upsert("docs", [{"content": "alpha beta"}, {"content": "zzzz zzzz zzzz"}])
+    store.upsert("other", [{"content": "alpha beta"}])
+
+    assert store.query("docs", "zzzz zzzz zzzz", top_k=1) == [{"content": "zzzz zzzz zzzz"}]
+    assert len(store.query("other", "alpha", top_k=5)) == 1
+
+
+@pytest.mark.asyncio
+async def test_vector_database_memory_scores_from_local_index(monkeypatch):
+    monkeypatch.setattr(vector_database, "create_supabase_client", lambda: None)
+    memory = vector_database.VectorDatabaseMemory(
+        {"collection_name": "test_vector_index", "similarity_threshold": 0.0}
+    )
+    await memory.initialize()
+
+    await memory.store({"content": "the quarterly revenue report"})
+    await memory.store({"content": "zzzzzzzzzzzzzzzzzzzzzzzzzzzz"})
+    result = await memory.retrieve({"query": "the quarterly revenue report", "limit": 1})
+
+    assert result["success"]
+    assert result["results"][0]["content"] == "the quarterly revenue report"
+    assert result["scores"] == [pytest.approx(1.0)]
+
+
+class _VectorMemories:
+    """vector_memories table stand-in that records which filters each query used."""
+
+    def __init__(self):
+        self.rows = []
+        self.queries = []
+
+    def table(self, name):
+        assert name == "vector_memories"
+        self._filters, self._used, self._range = [], [], (0, None)
+        return self
+
+    def select(self, columns):
+        return self
+
+    def _filter(self, name, predicate):
+        self._filters.append(predicate)
+        self._used.append(name)
+        return self
+
+    def eq(self, column, value):
+        return self._filter("eq", lambda row: row[column] == value)
+
+    def gte(self, column, value):
+        return self._filter("gte", lambda row: row[column] >= value)
+
+    def ilike(self, column, pattern):
+        return self._filter("ilike", lambda row: pattern.strip("%") in row[column])
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end + 1)
+        return self
+
+    def limit(self, n):
+        self._range = (0, n)
+        return self
+
+    def execute(self):
+        rows = sorted(
+            (r for r in self.rows if all(f(r) for f in self._filters)),
+            key=lambda r: r["created_at"],
+        )
+        self.queries.append(self._used)
+        return type("Result", (), {"data": rows[self._range[0] : self._range[1]]})()
+
+    def add(self, row_id, content, collection="rewarm_docs"):
+        created_at = f"2026-10-18T00:00:{len(self.rows):02d}"
+        self.rows.append(
+            {"id": row_id, "collection": collection, "content": content, "created_at": created_at}
+        )
+
+
+@pytest.mark.asyncio
+async def test_collections_rewarm_incrementally_after_the_ttl(monkeypatch):
+    table = _VectorMemories()
+    table.add("1", "the quarterly revenue report")
+    table.add("x", "another collection", collection="rewarm_other")
+    monkeypatch.setattr(vector_database, "create_supabase_client", lambda: table)
+    monkeypatch.setattr(vector_database, "_warm_states", {})
+    clock = [1000.0]
+    monkeypatch.setattr(vector_database.time, "monotonic", lambda: clock[0])
+
+    memory = vector_database.VectorDatabaseMemory(
+        {"collection_name": "rewarm_docs", "similarity_threshold": 0.9, "warm_ttl_seconds": 30}
+    )
+    other = vector_database.VectorDatabaseMemory({"collection_name": "rewarm_other"})
+    assert memory.index is not other.index
+    await memory.initialize()
+
+    async def ids(query):
+        result = await memory.retrieve({"query": query, "limit": 5})
+        return [r["id"] for r in result["results"]]
+
+    assert await ids("the quarterly revenue report") == ["1"]
+    assert table.queries == [["eq"]]
+
+    # Written by another process: within the TTL only the text-match fallback runs
+    table.add("2", "board meeting minutes")
+    assert await ids("board meeting minutes") == ["2"]
+    assert table.queries[1:] == [["eq", "ilike"]]
+    assert memory.index.size("rewarm_docs") == 1
+
+    # After the TTL only rows from the last loaded created_at on are read
+    clock[0] += 31
+    assert await ids("board meeting minutes") == ["2"]
+    assert table.queries[2:] == [["eq", "gte"]]
+    assert memory.index.size("rewarm_docs") == 2
+
+    # A failed load does not count as synced, so the next call retries it
+    clock[0] += 31
+    table.add("3", "travel policy")
+    execute = table.execute
+
+    def failing_execute():
+        table.execute = execute
+        raise ConnectionError("database unavailable")
+
+    table.execute = failing_execute
+    with pytest.raises(ConnectionError):
+        memory._warm_index()
+    memory._warm_index()
+    assert memory.index.size("rewarm_docs") == 3
+
+
+@pytest.mark.asyncio
+async def test_saved_collection_index_is_reloaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_database, "create_supabase_client", lambda: None)
+    monkeypatch.setattr(vector_index, "_indexes", {})
+    config = {"collection_name": "saved_docs", "index_path": str(tmp_path)}
+
+    memory = vector_database.VectorDatabaseMemory(config)
+    await memory.initialize()
+    await memory.store({"content": "the quarterly revenue report"})
+    assert memory.save_index()
+    assert not (tmp_path / vector_index.NamespacedVectorIndex.MANIFEST).exists()
+
+    # A new process: nothing cached, the index comes from the collection's directory
+    monkeypatch.setattr(vector_index, "_indexes", {})
+    reloaded = vector_database.VectorDatabaseMemory(config)
+    assert reloaded.index is not memory.index
+    assert reloaded.index.size("saved_docs") == 1
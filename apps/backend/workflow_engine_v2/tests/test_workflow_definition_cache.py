@@ -0,0 +1,226 @@
+"""
+Tests for the parsed workflow cache in WorkflowServiceV2: repeat lookups only
+fetch the row stamp and return the same Workflow (which the engine's plan cache
+then matches without fingerprinting), edits by any writer are picked up through
+definition_version, local updates invalidate, and the updated_at fallback when
+the column is missing. The migration's trigger is checked on a real PostgreSQL.
+"""
+
+import copy
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path for absolute imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from shared.models.node_enums import ActionSubtype, NodeType, TriggerSubtype
+from shared.models.workflow import Connection, Workflow, WorkflowMetadata, WorkflowStatistics
+from workflow_engine_v2 import ExecutionEngine
+from workflow_engine_v2.core import plan as plan_module
+from workflow_engine_v2.core.spec import coerce_node_to_v2, get_spec
+from workflow_engine_v2.services import workflow as workflow_module
+from workflow_engine_v2.services.workflow import WorkflowServiceV2
+
+WORKFLOW_ID = "5f0c6a52-0000-4000-8000-000000000001"
+
+MIGRATION = (
+    backend_dir.parent.parent
+    / "supabase"
+    / "migrations"
+    / "20261018000004_workflow_definition_version.sql"
+)
+
+
+def _workflow_data(name: str = "Cached") -> dict:
+    trig_spec = get_spec(NodeType.TRIGGER.value, TriggerSubtype.MANUAL.value)
+    act_spec = get_spec(NodeType.ACTION.value, ActionSubtype.HTTP_REQUEST.value)
+    n1 = coerce_node_to_v2(trig_spec.create_node_instance("trigger_1"))
+    n2 = coerce_node_to_v2(act_spec.create_node_instance("action_1"))
+    workflow = Workflow(
+        metadata=WorkflowMetadata(
+            id=WORKFLOW_ID,
+            name=name,
+            version="1.0",
+            created_time=int(time.time() * 1000),
+            created_by="tester",
+            statistics=WorkflowStatistics(),
+        ),
+        nodes=[n1, n2],
+        connections=[Connection(id="c1", from_node=n1.id, to_node=n2.id, output_key="result")],
+        triggers=[n1.id],
+    )
+    return workflow.model_dump(mode="json")
+
+
+class _Workflows:
+    """Supabase stand-in for the workflows table (select/eq/update)."""
+
+    def __init__(self, row, has_definition_version=True):
+        self.row = row
+        self.has_definition_version = has_definition_version
+        self.selects = []
+
+    def table(self, name):
+        assert name == "workflows"
+        return _Query(self)
+
+
+class _Query:
+    def __init__(self, db):
+        self._db = db
+        self._columns = None
+        self._update = None
+        self._filters = {}
+
+    def select(self, columns):
+        self._columns = [c.strip() for c in columns.split(",")]
+        return self
+
+    def update(self, values):
+        self._update = values
+        return self
+
+    def eq(self, column, value):
+        self._filters[column] = value
+        return self
+
+    def execute(self):
+        row = self._db.row
+        matches = all(row.get(k) == v for k, v in self._filters.items())
+        if self._update is not None:
+            if matches:
+                row.update(copy.deepcopy(self._update))
+            return type("Result", (), {"data": [row] if matches else []})()
+        if "definition_version" in self._columns and not self._db.has_definition_version:
+            raise Exception("column workflows.definition_version does not exist")
+        self._db.selects.append(self._columns)
+        data = [{c: copy.deepcopy(row.get(c)) for c in self._columns}] if matches else []
+        return type("Result", (), {"data": data})()
+
+
+def _row(**fields):
+    return {
+        "id": WORKFLOW_ID,
+        "user_id": "user_1",
+        "active": True,
+        "name": "Cached",
+        "description": "",
+        "version": "1.0",
+        "deployment_status": "DEPLOYED",
+        "definition_version": 1,
+        "updated_at": 1000,
+        "workflow_data": _workflow_data(),
+        **fields,
+    }
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(workflow_module, "_definition_version_available", True)
+    svc = WorkflowServiceV2()
+    svc.supabase = _Workflows(_row())
+    return svc
+
+
+def test_repeat_lookups_revalidate_by_stamp_and_reuse_the_plan(service, monkeypatch):
+    workflow, user_id = service.get_workflow_with_user_id(WORKFLOW_ID)
+    again, _ = service.get_workflow_with_user_id(WORKFLOW_ID)
+
+    assert again is workflow and user_id == "user_1"
+    assert workflow.metadata.deployment_status.value == "DEPLOYED"
+    assert "workflow_data" in service.supabase.selects[0]
+    assert "workflow_data" not in service.supabase.selects[1]
+    assert (service._definitions.hits, service._definitions.misses) == (1, 1)
+
+    fingerprints = []
+    original = plan_module.workflow_fingerprint
+    monkeypatch.setattr(
+        plan_module, "workflow_fingerprint", lambda wf: fingerprints.append(1) or original(wf)
+    )
+    engine = ExecutionEngine()
+    for _ in range(3):
+        wf, _ = service.get_workflow_with_user_id(WORKFLOW_ID)
+        engine._plans.get(wf, WORKFLOW_ID)
+    assert len(fingerprints) == 1
+    assert (engine._plans.hits, engine._plans.misses) == (2, 1)
+
+
+def test_changes_by_any_writer_are_picked_up(service):
+    workflow, _ = service.get_workflow_with_user_id(WORKFLOW_ID)
+
+    # Another service edits the definition; the trigger bumps definition_version
+    service.supabase.row["workflow_data"] = _workflow_data(name="Edited")
+    service.supabase.row["definition_version"] = 2
+    edited, _ = service.get_workflow_with_user_id(WORKFLOW_ID)
+    assert edited is not workflow
+    assert [n.id for n in edited.nodes] == ["trigger_1", "action_1"]
+
+    service.supabase.row["deployment_status"] = "UNDEPLOYED"
+    assert service.get_workflow_with_user_id(WORKFLOW_ID)[0] is not edited
+
+    service.supabase.row["active"] = False
+    assert service.get_workflow_with_user_id(WORKFLOW_ID) is None
+    assert len(service._definitions) == 0
+
+
+def test_update_workflow_invalidates(service):
+    workflow, _ = service.get_workflow_with_user_id(WORKFLOW_ID)
+    assert len(service._definitions) == 1
+
+    service.update_workflow(service.get_workflow(WORKFLOW_ID))
+    assert len(service._definitions) == 0
+
+
+def test_falls_back_to_updated_at_without_definition_version(service):
+    service.supabase.has_definition_version = False
+
+    workflow, _ = service.get_workflow_with_user_id(WORKFLOW_ID)
+    assert service.get_workflow_with_user_id(WORKFLOW_ID)[0] is workflow
+    assert not workflow_module._definition_version_available
+
+    service.supabase.row["updated_at"] = 2000
+    assert service.get_workflow_with_user_id(WORKFLOW_ID)[0] is not workflow
+
+
+@pytest.mark.integration
+def test_definition_version_trigger(postgres_dsn):
+    psycopg2 = pytest.importorskip("psycopg2")
+    conn = psycopg2.connect(postgres_dsn)
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            DROP TABLE IF EXISTS workflows CASCADE;
+            CREATE TABLE workflows (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                user_id UUID,
+                name VARCHAR(255) NOT NULL,
+                description TEXT,
+                active BOOLEAN DEFAULT true,
+                workflow_data JSONB NOT NULL,
+                version VARCHAR(50) DEFAULT '1.0.0',
+                deployment_status TEXT DEFAULT 'DRAFT',
+                latest_execution_status VARCHAR(50) DEFAULT 'DRAFT',
+                updated_at BIGINT NOT NULL DEFAULT 0
+            );
+            INSERT INTO workflows (name, workflow_data) VALUES ('wf', '{"nodes": []}');
+            """
+        )
+        cur.execute(MIGRATION.read_text())
+
+        def version():
+            cur.execute("SELECT definition_version FROM workflows")
+            return cur.fetchone()[0]
+
+        assert version() == 1
+        cur.execute("UPDATE workflows SET latest_execution_status = 'SUCCESS', updated_at = 5")
+        assert version() == 1
+        cur.execute("""UPDATE workflows SET workflow_data = '{"nodes": [1]}'""")
+        assert version() == 2
+        cur.execute("UPDATE workflows SET deployment_status = 'DEPLOYED', name = 'renamed'")
+        assert version() == 3
+    conn.close()
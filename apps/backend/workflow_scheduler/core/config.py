@@ -74,6 +74,9 @@ class Settings(BaseSettings):
     email_user: str = Field(default="", description="Email user")
     email_password: str = Field(default="", description="Email password")
     email_check_interval: int = Field(default=60, description="Email check interval in seconds")
+    email_idle_timeout: int = Field(
+        default=300, description="Seconds before a shared IMAP IDLE is re-issued"
+    )
 
     # SMTP Configuration (for notifications)
     smtp_host: str = Field(default="smtp.migadu.com", description="SMTP host")
@@ -60,6 +60,7 @@ from workflow_scheduler.services.google_calendar_token_manager import (
     cleanup_google_calendar_token_manager,
     initialize_google_calendar_token_manager,
 )
+from workflow_scheduler.services.imap_connection_manager import cleanup_imap_connection_manager
 from workflow_scheduler.services.lock_manager import DistributedLockManager
 from workflow_scheduler.services.trigger_manager import TriggerManager
 from workflow_scheduler.triggers.cron_trigger import CronTrigger
@@ -173,6 +174,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         if trigger_manager:
             await trigger_manager.cleanup()
 
+        # Close shared IMAP sessions left open by email triggers
+        await cleanup_imap_connection_manager()
+
         if lock_manager:
             await lock_manager.cleanup()
 
@@ -3,14 +3,13 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from shared.models.node_enums import IntegrationProvider, NodeType, TriggerSubtype, ValidationResult
 from shared.models.trigger import DeploymentResult, DeploymentStatus, TriggerSpec
 
 # Note: DeploymentStatus is actually WorkflowDeploymentStatus imported from shared.models.workflow
 # Valid values: UNDEPLOYED, DEPLOYING, DEPLOYED, DEPLOYMENT_FAILED
 from workflow_scheduler.services.direct_db_service import DirectDBService
+from workflow_scheduler.services.slack_channel_directory import get_slack_channel_directory
 from workflow_scheduler.services.trigger_index_manager import TriggerIndexManager
 
 logger = logging.getLogger(__name__)
@@ -938,7 +937,7 @@ class DeploymentService:
 
             # Resolve channel name(s) to ID(s)
             resolved_channel_ids = await self._resolve_channel_names_to_ids(
-                channel_filter, slack_token
+                channel_filter, slack_token, workspace_id
             )
 
             if resolved_channel_ids:
@@ -1066,42 +1065,40 @@ class DeploymentService:
             return None
 
     async def _resolve_channel_names_to_ids(
-        self, channel_filter: str, slack_token: str
+        self, channel_filter: str, slack_token: str, workspace_id: Optional[str] = None
     ) -> Optional[str]:
         """
-        Resolve channel names to channel IDs using Slack API
+        Resolve channel names to channel IDs using the shared Slack channel directory
+
+        The directory lists the workspace's channels once (following pagination)
+        and is reused across triggers and deployments, so redeploying many
+        workflows does not re-list channels for every channel name.
 
         Args:
             channel_filter: Channel names (single or comma-separated)
             slack_token: Slack OAuth token
+            workspace_id: Slack workspace (team) ID used as the cache key
 
         Returns:
             str: Resolved channel IDs (single or comma-separated), or None if failed
         """
-        import httpx
-
         try:
-            # Handle comma-separated channel names
-            if "," in channel_filter:
-                channel_names = [name.strip() for name in channel_filter.split(",")]
-            else:
-                channel_names = [channel_filter.strip()]
+            channel_names = [name.strip() for name in channel_filter.split(",")]
+            to_resolve = [name for name in channel_names if not name.startswith("C")]
 
-            resolved_ids = []
+            directory = get_slack_channel_directory()
+            resolved = await directory.resolve_names(workspace_id, slack_token, to_resolve)
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                for channel_name in channel_names:
-                    # Try to find the channel by name
-                    channel_id = await self._find_channel_id_by_name(
-                        client, slack_token, channel_name
-                    )
-                    if channel_id:
-                        resolved_ids.append(channel_id)
-                        logger.debug(f"Resolved channel '{channel_name}' to ID '{channel_id}'")
-                    else:
-                        logger.warning(f"Could not find channel ID for '{channel_name}'")
-                        # Keep the original name if we can't resolve it
-                        resolved_ids.append(channel_name)
+            resolved_ids = []
+            for channel_name in channel_names:
+                channel_id = resolved.get(channel_name, channel_name)
+                if channel_id:
+                    resolved_ids.append(channel_id)
+                    logger.debug(f"Resolved channel '{channel_name}' to ID '{channel_id}'")
+                else:
+                    logger.warning(f"Could not find channel ID for '{channel_name}'")
+                    # Keep the original name if we can't resolve it
+                    resolved_ids.append(channel_name)
 
             if resolved_ids:
                 return ",".join(resolved_ids)
@@ -1112,53 +1109,6 @@ class DeploymentService:
             logger.error(f"Error resolving channel names to IDs: {e}", exc_info=True)
             return None
 
-    async def _find_channel_id_by_name(
-        self, client: httpx.AsyncClient, slack_token: str, channel_name: str
-    ) -> Optional[str]:
-        """
-        Find a single channel ID by name using Slack API
-
-        Args:
-            client: HTTP client
-            slack_token: Slack OAuth token
-            channel_name: Channel name to look up
-
-        Returns:
-            str: Channel ID, or None if not found
-        """
-        try:
-            # Use conversations.list to find the channel
-            response = await client.get(
-                "https://slack.com/api/conversations.list",
-                headers={"Authorization": f"Bearer {slack_token}"},
-                params={
-                    "types": "public_channel,private_channel",
-                    "limit": 1000,  # Slack's max limit
-                },
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("ok"):
-                    channels = data.get("channels", [])
-                    for channel in channels:
-                        if channel.get("name") == channel_name:
-                            return channel.get("id")
-                    logger.debug(f"Channel '{channel_name}' not found in {len(channels)} channels")
-                else:
-                    error_msg = data.get("error", "unknown")
-                    logger.warning(
-                        f"Slack API error looking up channel '{channel_name}': {error_msg}"
-                    )
-            else:
-                logger.warning(f"HTTP error getting channel list: {response.status_code}")
-
-            return None
-
-        except Exception as e:
-            logger.warning(f"Failed to find channel ID for '{channel_name}': {e}")
-            return None
-
     async def _handle_deployment_failure(
         self, workflow_id: str, deployment_id: str, error_msg: str
     ):
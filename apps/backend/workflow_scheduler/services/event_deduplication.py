@@ -3,11 +3,17 @@ Event Deduplication Service
 
 Redis-based distributed event deduplication to prevent duplicate processing
 across multiple workflow scheduler instances.
+
+A process-local, time-bounded LRU sits in front of Redis so repeats that this
+instance has already seen (e.g. Slack retries) are rejected without a round
+trip, and concurrent checks are coalesced into a single pipelined request.
 """
 
+import asyncio
 import logging
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import redis.asyncio as redis
 
@@ -15,13 +21,79 @@ from workflow_scheduler.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+DEDUP_KEY_PREFIX = "dedup:"
+DEDUP_STATS_KEY = "dedup_stats"
+DEFAULT_TTL_SECONDS = 300  # 5 minutes
+SCAN_BATCH_SIZE = 500
+STATS_SCAN_LIMIT = 10000  # active keys get_stats counts before it stops scanning
+
+
+class LocalSeenFilter:
+    """Bounded LRU of recently seen dedup keys with per-key expiry"""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def contains(self, key: str, now: Optional[float] = None) -> bool:
+        now = now if now is not None else time.monotonic()
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= now:
+            del self._entries[key]
+            return False
+        return True
+
+    def add(self, key: str, now: Optional[float] = None) -> None:
+        now = now if now is not None else time.monotonic()
+        self._entries[key] = now + self.ttl_seconds
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop expired entries; entries share one TTL so they expire in insertion order"""
+        now = now if now is not None else time.monotonic()
+        removed = 0
+        while self._entries:
+            key, expires_at = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[key]
+            removed += 1
+        return removed
+
 
 class EventDeduplicationService:
     """Redis-based event deduplication service for distributed systems"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        local_cache_size: int = 10000,
+    ):
         self._redis: Optional[redis.Redis] = None
         self._pool: Optional[redis.ConnectionPool] = None
+        self._ttl_seconds = ttl_seconds
+        self._local = LocalSeenFilter(max_size=local_cache_size, ttl_seconds=ttl_seconds)
+
+        # Checks issued in the same event loop tick are flushed as one pipeline
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self._counters = {
+            "local_hits": 0,
+            "redis_round_trips": 0,
+            "redis_checks": 0,
+            "new_events": 0,
+            "duplicates": 0,
+            "errors": 0,
+        }
 
     async def initialize(self) -> None:
         """Initialize Redis connection"""
@@ -40,6 +112,8 @@ class EventDeduplicationService:
     async def cleanup(self) -> None:
         """Cleanup Redis connections"""
         try:
+            if self._flush_task and not self._flush_task.done():
+                await self._flush_task
             if self._redis:
                 await self._redis.aclose()
             if self._pool:
@@ -48,6 +122,10 @@ class EventDeduplicationService:
         except Exception as e:
             logger.error(f"Error cleaning up event deduplication service: {e}")
 
+    @staticmethod
+    def _redis_key(event_id: str, event_source: str) -> str:
+        return f"{DEDUP_KEY_PREFIX}{event_source}:{event_id}"
+
     async def is_duplicate_event(self, event_id: str, event_source: str = "slack") -> bool:
         """
         Check if an event has already been processed
@@ -63,81 +141,222 @@ class EventDeduplicationService:
             logger.warning("Redis not available or event_id empty, allowing processing")
             return False
 
-        try:
-            # Use Redis key format: dedup:{source}:{event_id}
-            redis_key = f"dedup:{event_source}:{event_id}"
+        redis_key = self._redis_key(event_id, event_source)
+        if self._local.contains(redis_key):
+            self._counters["local_hits"] += 1
+            self._counters["duplicates"] += 1
+            logger.info(
+                f"🔄 Duplicate {event_source} event detected locally: {event_id}, skipping processing"
+            )
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((redis_key, event_source, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_pending())
+
+        is_duplicate = await future
+        if is_duplicate:
+            logger.info(
+                f"🔄 Duplicate {event_source} event detected: {event_id}, skipping processing"
+            )
+        else:
+            logger.info(f"✅ New {event_source} event {event_id} marked for processing")
+        return is_duplicate
+
+    async def check_duplicate_events(
+        self, event_ids: Iterable[str], event_source: str = "slack"
+    ) -> Dict[str, bool]:
+        """
+        Check a burst of events in a single pipelined round trip
 
-            # Check if key exists (SET with NX only sets if key doesn't exist)
-            # Use EX for expiration in seconds (300 = 5 minutes)
-            was_set = await self._redis.set(redis_key, int(time.time()), nx=True, ex=300)
+        Returns:
+            Mapping of event_id to True if it is a duplicate, False if it's new
+        """
+        event_ids = [event_id for event_id in event_ids if event_id]
+        if not self._redis:
+            logger.warning("Redis not available, allowing processing")
+            return {event_id: False for event_id in event_ids}
+
+        entries = [
+            (self._redis_key(event_id, event_source), event_source) for event_id in event_ids
+        ]
+        claimed = await self._claim_keys(entries)
+
+        results: Dict[str, bool] = {}
+        for event_id, is_duplicate in zip(event_ids, claimed):
+            # A repeated id in the burst keeps the verdict of its first occurrence
+            results.setdefault(event_id, is_duplicate)
+        return results
+
+    async def _flush_pending(self) -> None:
+        # Yield once so every check issued in this tick joins the batch
+        await asyncio.sleep(0)
+        # Checks that arrive while a pipeline is in flight form the next batch
+        while self._pending:
+            batch, self._pending = self._pending, []
+
+            try:
+                results = await self._claim_keys([(key, source) for key, source, _ in batch])
+            except Exception:
+                results = [False] * len(batch)
+
+            for (_, _, future), is_duplicate in zip(batch, results):
+                if not future.done():
+                    future.set_result(is_duplicate)
+
+    async def _claim_keys(self, entries: List[Tuple[str, str]]) -> List[bool]:
+        """
+        SET NX EX every key not already known locally, in one pipeline
 
-            if was_set:
-                logger.info(f"✅ New {event_source} event {event_id} marked for processing")
-                return False  # Not a duplicate
+        Returns:
+            One flag per entry, True if that key was already claimed (duplicate)
+        """
+        now = time.monotonic()
+        results: List[bool] = [False] * len(entries)
+        to_check: List[Tuple[int, str, str]] = []
+        batch_keys = set()
+
+        for index, (key, source) in enumerate(entries):
+            if key in batch_keys or self._local.contains(key, now):
+                # Seen locally or repeated within the same batch
+                self._counters["local_hits"] += 1
+                results[index] = True
             else:
-                logger.info(
-                    f"🔄 Duplicate {event_source} event detected: {event_id}, skipping processing"
-                )
-                return True  # Is a duplicate
-
-        except Exception as e:
-            logger.error(f"Error checking duplicate event {event_id}: {e}")
-            # On error, allow processing to avoid blocking legitimate events
-            return False
+                batch_keys.add(key)
+                to_check.append((index, key, source))
+
+        if to_check:
+            try:
+                timestamp = int(time.time())
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for _, key, _ in to_check:
+                        pipe.set(key, timestamp, nx=True, ex=self._ttl_seconds)
+                    replies = await pipe.execute()
+                self._counters["redis_round_trips"] += 1
+                self._counters["redis_checks"] += len(to_check)
+
+                outcome_counts: Dict[str, int] = {}
+                for (index, key, source), was_set in zip(to_check, replies):
+                    results[index] = not was_set
+                    self._local.add(key, now)
+                    field = f"{source}:{'new' if was_set else 'duplicate'}"
+                    outcome_counts[field] = outcome_counts.get(field, 0) + 1
+
+                # Counters replace KEYS-based stats; a lost increment is harmless
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for field, count in outcome_counts.items():
+                        pipe.hincrby(DEDUP_STATS_KEY, field, count)
+                    await pipe.execute()
+
+            except Exception as e:
+                self._counters["errors"] += 1
+                logger.error(f"Error checking duplicate events: {e}")
+                # On error, allow processing to avoid blocking legitimate events
+                for index, _, _ in to_check:
+                    results[index] = False
+
+        duplicates = sum(results)
+        self._counters["duplicates"] += duplicates
+        self._counters["new_events"] += len(results) - duplicates
+        return results
+
+    async def _scan_dedup_keys(self):
+        async for key in self._redis.scan_iter(match=f"{DEDUP_KEY_PREFIX}*", count=SCAN_BATCH_SIZE):
+            yield key
 
     async def cleanup_expired_events(self) -> int:
         """
-        Clean up expired event records (optional, Redis TTL handles this automatically)
+        Clean up expired event records (Redis TTL handles expiry automatically)
+
+        Walks keys with SCAN instead of KEYS, checks TTLs in pipelined batches and
+        re-applies an expiry to any key that lost it.
 
         Returns:
             Number of keys cleaned up
         """
+        pruned_local = self._local.prune()
         if not self._redis:
-            return 0
+            return pruned_local
 
         try:
-            # Get all deduplication keys
-            keys = await self._redis.keys("dedup:*")
-
-            # Check TTL for each key and count expired ones
-            expired_count = 0
-            for key in keys:
-                ttl = await self._redis.ttl(key)
-                if ttl == -2:  # Key doesn't exist (expired)
-                    expired_count += 1
-
-            if expired_count > 0:
-                logger.info(f"Redis TTL cleaned up {expired_count} expired event records")
-
-            return expired_count
+            cleaned = 0
+            batch: List = []
+
+            async def process(keys: List) -> int:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.ttl(key)
+                    ttls = await pipe.execute()
+
+                repaired = [key for key, ttl in zip(keys, ttls) if ttl == -1]
+                if repaired:
+                    async with self._redis.pipeline(transaction=False) as pipe:
+                        for key in repaired:
+                            pipe.expire(key, self._ttl_seconds)
+                        await pipe.execute()
+                return len(repaired) + sum(1 for ttl in ttls if ttl == -2)
+
+            async for key in self._scan_dedup_keys():
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    cleaned += await process(batch)
+                    batch = []
+            if batch:
+                cleaned += await process(batch)
+
+            if cleaned > 0:
+                logger.info(f"Redis TTL cleaned up {cleaned} expired event records")
+
+            return cleaned
 
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
             return 0
 
-    async def get_stats(self) -> dict:
-        """Get deduplication statistics"""
+    async def get_stats(self, max_scan_keys: int = STATS_SCAN_LIMIT) -> dict:
+        """
+        Get deduplication statistics
+
+        Outcomes come from the dedup_stats counters; active keys are counted with a
+        SCAN that stops after ``max_scan_keys``, in which case ``total_active_events``
+        and ``by_source`` are a lower bound and ``active_events_complete`` is False.
+        """
+        local_stats = {
+            "local_cache_size": len(self._local),
+            **self._counters,
+        }
         if not self._redis:
-            return {"error": "Redis not available"}
+            return {"error": "Redis not available", **local_stats}
 
         try:
-            keys = await self._redis.keys("dedup:*")
-
-            # Group by source
-            stats = {}
-            for key in keys:
+            # Group active keys by source with a non-blocking, capped SCAN
+            stats: Dict[str, int] = {}
+            total = 0
+            complete = True
+            async for key in self._scan_dedup_keys():
+                if total >= max_scan_keys:
+                    complete = False
+                    break
                 key_str = key.decode() if isinstance(key, bytes) else str(key)
                 parts = key_str.split(":")
                 if len(parts) >= 2:
-                    source = parts[1]
-                    if source not in stats:
-                        stats[source] = 0
-                    stats[source] += 1
+                    stats[parts[1]] = stats.get(parts[1], 0) + 1
+                total += 1
+
+            raw_counters = await self._redis.hgetall(DEDUP_STATS_KEY)
+            counters = {
+                (k.decode() if isinstance(k, bytes) else str(k)): int(v)
+                for k, v in (raw_counters or {}).items()
+            }
 
             return {
-                "total_active_events": len(keys),
+                "total_active_events": total,
                 "by_source": stats,
+                "active_events_complete": complete,
+                "lifetime_counters": counters,
                 "redis_connected": True,
+                **local_stats,
             }
 
         except Exception as e:
@@ -3,42 +3,153 @@ Google Calendar Token Refresh Manager
 
 This service handles background token refresh for Google Calendar OAuth tokens
 to ensure persistent access to Google Calendar APIs.
+
+Instead of scanning every token on a fixed interval and refreshing them one by
+one, each token gets its own refresh deadline (expiry minus a lead time minus
+jitter, so tokens issued together do not all refresh at once) and waits in a
+priority queue. Due tokens are refreshed with bounded concurrency over one
+pooled HTTP client, the resulting rows are written back in a single batched
+upsert, and a token whose grant Google rejected (``invalid_grant``) backs off
+exponentially instead of failing on every pass.
 """
 
 import asyncio
 import datetime
+import heapq
 import logging
-from typing import Dict, List, Optional, Tuple
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 import httpx
 
+from shared.sdks.transport import get_transport
 from workflow_scheduler.core.config import settings
 from workflow_scheduler.core.supabase_client import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_COLUMNS = "id,user_id,provider,refresh_token,expires_at,credential_data"
+
+
+def _parse_expiry(value: Any) -> Optional[float]:
+    """expires_at column -> epoch seconds"""
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+
+@dataclass
+class _Backoff:
+    retry_at: float
+    failures: int
+    refresh_token: Optional[str]
+
+
+class RefreshMetrics:
+    """Refresh lag and expiry margin, to show that no token expires while in use."""
+
+    def __init__(self, sample_size: int = 1000):
+        self.refreshed = 0
+        self.failed = 0
+        self.invalid_grant = 0
+        self.expired_before_refresh = 0
+        self.min_margin: Optional[float] = None
+        # Seconds between a token's scheduled refresh time and the refresh finishing
+        self._lag: Deque[float] = deque(maxlen=sample_size)
+        # Seconds of validity the old access token still had when it was replaced
+        self._margin: Deque[float] = deque(maxlen=sample_size)
+
+    def record_success(self, scheduled_at: float, expires_at: Optional[float], now: float):
+        self.refreshed += 1
+        self._lag.append(max(0.0, now - scheduled_at))
+        if expires_at is not None:
+            margin = expires_at - now
+            self._margin.append(margin)
+            if margin < 0:
+                self.expired_before_refresh += 1
+            if self.min_margin is None or margin < self.min_margin:
+                self.min_margin = margin
+
+    @staticmethod
+    def _summary(samples: Deque[float]) -> Dict[str, float]:
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+        return {
+            "p50": round(ordered[len(ordered) // 2], 3),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            "max": round(ordered[-1], 3),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "invalid_grant": self.invalid_grant,
+            "expired_before_refresh": self.expired_before_refresh,
+            "refresh_lag_seconds": self._summary(self._lag),
+            "expiry_margin_seconds": {
+                **self._summary(self._margin),
+                "min": round(self.min_margin, 3) if self.min_margin is not None else None,
+            },
+        }
+
 
 class GoogleCalendarTokenManager:
     """
     Manages Google Calendar OAuth token refresh operations.
 
     Features:
-    - Monitors token expiry times (< 30 minutes remaining)
-    - Refreshes tokens using refresh_token
-    - Updates oauth_tokens table with new tokens
-    - Handles token refresh failures gracefully
-    - Runs as background task every 20 minutes
+    - Schedules each token's refresh from its own expiry (priority queue)
+    - Refreshes due tokens concurrently (bounded) with jittered deadlines
+    - Writes refreshed tokens back to oauth_tokens in batches
+    - Backs off per user when Google rejects the refresh token
+    - Re-reads tokens that may come due every few minutes
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        concurrency: int = 16,
+        sync_interval: float = 5 * 60,
+        refresh_lead: float = 10 * 60,
+        refresh_jitter: float = 5 * 60,
+        clock: Callable[[], float] = time.time,
+    ):
         self.is_running = False
-        self._refresh_interval = 20 * 60  # Check every 20 minutes
-        self._expiry_threshold = 30 * 60  # Refresh if < 30 minutes remaining
         self._task: Optional[asyncio.Task] = None
+        self._concurrency = concurrency
+        # How often tokens that may come due are re-read from the database
+        self._refresh_interval = sync_interval
+        # Refresh this long (plus up to refresh_jitter) before a token expires
+        self._refresh_lead = refresh_lead
+        self._refresh_jitter = refresh_jitter
+        self._expiry_threshold = refresh_lead + refresh_jitter
+        self._clock = clock
+
+        # (refresh_at, token_id); stale entries are skipped via _scheduled
+        self._queue: List[Tuple[float, str]] = []
+        self._scheduled: Dict[str, float] = {}
+        self._records: Dict[str, Dict] = {}
+        self._in_flight: set = set()
+        self._backoff: Dict[str, _Backoff] = {}
+        self._wakeup = asyncio.Event()
+        self.metrics = RefreshMetrics()
 
         # Google OAuth configuration
         self._token_url = "https://oauth2.googleapis.com/token"
         self._userinfo_url = "https://www.googleapis.com/oauth2/v1/userinfo"
+        self._transport = get_transport("google_oauth")
 
     async def start(self):
         """Start the background token refresh task."""
@@ -47,6 +158,7 @@ class GoogleCalendarTokenManager:
             return
 
         self.is_running = True
+        self._wakeup = asyncio.Event()
         self._task = asyncio.create_task(self._refresh_loop())
         logger.info("🔄 Started Google Calendar token refresh manager")
 
@@ -63,18 +175,88 @@ class GoogleCalendarTokenManager:
 
         logger.info("⏹️ Stopped Google Calendar token refresh manager")
 
+    # Scheduling -----------------------------------------------------------------
+
+    def _refresh_deadline(self, expires_at: Optional[float]) -> float:
+        if expires_at is None:
+            return self._clock()
+        return expires_at - self._refresh_lead - random.uniform(0, self._refresh_jitter)
+
+    def _schedule(self, token_id: str, refresh_at: float) -> None:
+        self._scheduled[token_id] = refresh_at
+        heapq.heappush(self._queue, (refresh_at, token_id))
+
+    def schedule_token(self, record: Dict) -> None:
+        """Add or reschedule a token from its oauth_tokens row."""
+        token_id = str(record["id"])
+        if token_id in self._in_flight:
+            return
+        previous = self._records.get(token_id)
+        self._records[token_id] = record
+        if (
+            token_id in self._scheduled
+            and previous is not None
+            and previous.get("expires_at") == record.get("expires_at")
+            and previous.get("refresh_token") == record.get("refresh_token")
+        ):
+            return  # unchanged; keep its jittered deadline
+        refresh_at = self._refresh_deadline(_parse_expiry(record.get("expires_at")))
+
+        backoff = self._backoff.get(token_id)
+        if backoff is not None:
+            if backoff.refresh_token != record.get("refresh_token"):
+                # The user reconnected; the new grant gets a fresh start
+                del self._backoff[token_id]
+            else:
+                refresh_at = max(refresh_at, backoff.retry_at)
+
+        if self._scheduled.get(token_id) != refresh_at:
+            self._schedule(token_id, refresh_at)
+
+    def _pop_due(self, now: float) -> List[Tuple[Dict, float]]:
+        due = []
+        while self._queue and self._queue[0][0] <= now:
+            refresh_at, token_id = heapq.heappop(self._queue)
+            if self._scheduled.get(token_id) != refresh_at:
+                continue  # superseded by a later schedule_token call
+            del self._scheduled[token_id]
+            due.append((self._records.pop(token_id), refresh_at))
+        return due
+
+    def _next_deadline(self) -> Optional[float]:
+        while self._queue and self._scheduled.get(self._queue[0][1]) != self._queue[0][0]:
+            heapq.heappop(self._queue)
+        return self._queue[0][0] if self._queue else None
+
     async def _refresh_loop(self):
-        """Main background loop for token refresh."""
+        """Main background loop: sync deadlines, then refresh tokens as they come due."""
         logger.info(
-            f"🔄 Google Calendar token refresh loop started (interval: {self._refresh_interval}s)"
+            f"🔄 Google Calendar token refresh loop started "
+            f"(sync interval: {self._refresh_interval}s, concurrency: {self._concurrency})"
         )
 
+        next_sync = 0.0
         while self.is_running:
             try:
-                await self._check_and_refresh_tokens()
-
-                # Wait for next check interval
-                await asyncio.sleep(self._refresh_interval)
+                now = self._clock()
+                if now >= next_sync:
+                    await self._sync_tokens()
+                    next_sync = now + self._refresh_interval
+
+                due = self._pop_due(now)
+                if due:
+                    await self._refresh_due_tokens(due)
+                    continue
+
+                next_deadline = self._next_deadline()
+                wake_at = next_sync if next_deadline is None else min(next_sync, next_deadline)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=max(0.0, wake_at - self._clock())
+                    )
+                except asyncio.TimeoutError:
+                    pass
 
             except asyncio.CancelledError:
                 break
@@ -83,42 +265,22 @@ class GoogleCalendarTokenManager:
                 # Wait a bit before retrying on error
                 await asyncio.sleep(60)  # 1 minute retry delay
 
-    async def _check_and_refresh_tokens(self):
-        """Check all Google Calendar tokens and refresh those that are expiring."""
-        try:
-            # Get all Google Calendar tokens that need refresh
-            tokens_to_refresh = await self._get_tokens_needing_refresh()
-
-            if not tokens_to_refresh:
-                logger.debug("✅ No Google Calendar tokens need refresh")
-                return
-
-            logger.info(f"🔄 Found {len(tokens_to_refresh)} Google Calendar tokens needing refresh")
-
-            # Process each token
-            refresh_results = []
-            for token_record in tokens_to_refresh:
-                try:
-                    result = await self._refresh_single_token(token_record)
-                    refresh_results.append(result)
-                except Exception as e:
-                    logger.error(
-                        f"❌ Failed to refresh token for user {token_record.get('user_id')}: {e}",
-                        exc_info=True,
-                    )
-
-            # Log summary
-            successful_refreshes = sum(1 for r in refresh_results if r)
+    async def _sync_tokens(self):
+        """Load every token that may come due before the next sync and schedule it."""
+        tokens = await self._get_tokens_needing_refresh(
+            horizon=self._refresh_interval + self._expiry_threshold
+        )
+        for record in tokens:
+            self.schedule_token(record)
+        if tokens:
             logger.info(
-                f"✅ Token refresh completed: {successful_refreshes}/{len(tokens_to_refresh)} successful"
+                f"🔍 Scheduled {len(tokens)} Google Calendar tokens "
+                f"(queue depth: {len(self._scheduled)})"
             )
 
-        except Exception as e:
-            logger.error(f"❌ Error checking Google Calendar tokens: {e}", exc_info=True)
-
-    async def _get_tokens_needing_refresh(self) -> List[Dict]:
+    async def _get_tokens_needing_refresh(self, horizon: Optional[float] = None) -> List[Dict]:
         """
-        Get all Google Calendar tokens that are expired or expiring soon.
+        Get all Google Calendar tokens that expire within ``horizon`` seconds.
 
         Returns:
             List of oauth_tokens records that need refresh
@@ -129,59 +291,112 @@ class GoogleCalendarTokenManager:
                 logger.error("❌ Supabase client not available")
                 return []
 
-            # Calculate threshold time (current time + threshold seconds)
-            now = datetime.datetime.now(datetime.timezone.utc)
-            threshold_time = now + datetime.timedelta(seconds=self._expiry_threshold)
-
-            # Query for Google Calendar tokens that are expired or expiring soon
-            result = (
-                supabase.table("oauth_tokens")
-                .select("*")
-                .eq("provider", "google")
-                .eq("is_active", True)
-                .not_.is_("refresh_token", "null")  # Must have refresh token
-                .or_(
-                    f"expires_at.lt.{threshold_time.isoformat()},"  # Expiring soon
-                    f"expires_at.lt.{now.isoformat()}"  # Already expired
-                )
-                .execute()
+            horizon = self._expiry_threshold if horizon is None else horizon
+            threshold_time = datetime.datetime.fromtimestamp(
+                self._clock() + horizon, tz=datetime.timezone.utc
             )
 
-            tokens = result.data or []
-
-            if tokens:
-                logger.info(f"🔍 Found {len(tokens)} Google Calendar tokens needing refresh:")
-                for token in tokens:
-                    user_email = token.get("credential_data", {}).get("user_email", "unknown")
-                    expires_at = token.get("expires_at")
-                    logger.info(f"   - User: {user_email}, Expires: {expires_at}")
+            def query() -> List[Dict]:
+                rows: List[Dict] = []
+                page_size = 1000
+                while True:
+                    result = (
+                        supabase.table("oauth_tokens")
+                        .select(_TOKEN_COLUMNS)
+                        .eq("provider", "google")
+                        .eq("is_active", True)
+                        .not_.is_("refresh_token", "null")  # Must have refresh token
+                        .lt("expires_at", threshold_time.isoformat())
+                        .order("expires_at")
+                        .range(len(rows), len(rows) + page_size - 1)
+                        .execute()
+                    )
+                    page = result.data or []
+                    rows.extend(page)
+                    if len(page) < page_size:
+                        return rows
 
-            return tokens
+            return await asyncio.to_thread(query)
 
         except Exception as e:
             logger.error(f"❌ Error querying tokens needing refresh: {e}", exc_info=True)
             return []
 
-    async def _refresh_single_token(self, token_record: Dict) -> bool:
-        """
-        Refresh a single Google Calendar OAuth token.
+    # Refreshing -----------------------------------------------------------------
 
-        Args:
-            token_record: oauth_tokens table record
+    async def _refresh_due_tokens(self, due: List[Tuple[Dict, float]]) -> int:
+        """Refresh due tokens concurrently and write the results back in one batch."""
+        semaphore = asyncio.Semaphore(self._concurrency)
+        for record, _ in due:
+            self._in_flight.add(str(record["id"]))
+
+        async def refresh(record: Dict) -> Tuple[Optional[Dict], bool]:
+            async with semaphore:
+                return await self._request_refresh(record)
+
+        try:
+            results = await asyncio.gather(*(refresh(record) for record, _ in due))
+        finally:
+            for record, _ in due:
+                self._in_flight.discard(str(record["id"]))
+
+        rows = [row for row, _ in results if row is not None]
+        if rows and not await self._write_refreshed_tokens(rows):
+            # The database still holds the old access token; retry after a short backoff
+            rows = []
+
+        written = {row["id"] for row in rows}
+        now = self._clock()
+        for (record, scheduled_at), (_, invalid_grant) in zip(due, results):
+            if record["id"] in written:
+                self.metrics.record_success(
+                    scheduled_at, _parse_expiry(record.get("expires_at")), now
+                )
+            else:
+                self._fail(record, invalid_grant=invalid_grant)
+        for row in rows:
+            self._backoff.pop(str(row["id"]), None)
+            # Schedule the next refresh from the new expiry without another DB read
+            self.schedule_token(row)
+
+        logger.info(f"✅ Token refresh completed: {len(rows)}/{len(due)} successful")
+        return len(rows)
+
+    def _fail(self, record: Dict, invalid_grant: bool = False) -> None:
+        """Back off this token; a rejected grant waits much longer than a transient error."""
+        token_id = str(record["id"])
+        previous = self._backoff.get(token_id)
+        failures = (previous.failures if previous else 0) + 1
+        if invalid_grant:
+            delay = min(24 * 3600, 15 * 60 * 2 ** (failures - 1))
+        else:
+            delay = min(10 * 60, 30 * 2 ** (failures - 1))
+        delay *= random.uniform(0.8, 1.2)
+        self._backoff[token_id] = _Backoff(
+            self._clock() + delay, failures, record.get("refresh_token")
+        )
+        self.metrics.failed += 1
+        self.schedule_token(record)
+
+    async def _request_refresh(self, token_record: Dict) -> Tuple[Optional[Dict], bool]:
+        """
+        Exchange a refresh token with Google.
 
         Returns:
-            bool: True if refresh successful, False otherwise
+            Tuple[Optional[Dict], bool]: (updated oauth_tokens row or None if the
+            refresh failed, whether Google rejected the grant)
         """
         user_id = token_record.get("user_id")
-        user_email = token_record.get("credential_data", {}).get("user_email", "unknown")
+        credential_data = dict(token_record.get("credential_data") or {})
+        user_email = credential_data.get("user_email", "unknown")
         refresh_token = token_record.get("refresh_token")
 
         if not refresh_token:
             logger.warning(f"⚠️ No refresh token available for user {user_email} ({user_id})")
-            return False
+            return None, False
 
         try:
-            logger.info(f"🔄 Refreshing Google Calendar token for user {user_email}")
+            logger.debug(f"🔄 Refreshing Google Calendar token for user {user_email}")
 
             # Prepare token refresh request
             refresh_data = {
@@ -196,77 +411,81 @@ class GoogleCalendarTokenManager:
                 "Accept": "application/json",
             }
 
-            # Make token refresh request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self._token_url, data=refresh_data, headers=headers, timeout=30.0
-                )
+            response = await self._transport.request(
+                "POST",
+                self._token_url,
+                data=refresh_data,
+                headers=headers,
+                timeout=30.0,
+            )
 
-                if response.status_code != 200:
-                    logger.error(
-                        f"❌ Google token refresh failed for {user_email}: "
-                        f"{response.status_code} - {response.text}"
+            if response.status_code != 200:
+                error = ""
+                try:
+                    error = response.json().get("error", "")
+                except ValueError:
+                    pass
+                if error == "invalid_grant":
+                    # Revoked or expired grant: retrying soon cannot succeed
+                    self.metrics.invalid_grant += 1
+                    logger.warning(
+                        f"⚠️ Google rejected the refresh token for {user_email} (invalid_grant)"
                     )
-                    return False
-
-                token_result = response.json()
-                new_access_token = token_result.get("access_token")
-                new_refresh_token = token_result.get("refresh_token")  # May be None
-                expires_in = token_result.get("expires_in", 3600)
-
-                if not new_access_token:
-                    logger.error(f"❌ No access token in refresh response for {user_email}")
-                    return False
-
-                # Update the token in database
-                success = await self._update_token_in_database(
-                    token_record,
-                    new_access_token,
-                    new_refresh_token
-                    or refresh_token,  # Keep old refresh token if new one not provided
-                    expires_in,
+                    return None, True
+                logger.error(
+                    f"❌ Google token refresh failed for {user_email}: "
+                    f"{response.status_code} - {response.text}"
                 )
+                return None, False
 
-                if success:
-                    logger.info(f"✅ Successfully refreshed Google Calendar token for {user_email}")
-                    return True
-                else:
-                    logger.error(
-                        f"❌ Failed to update database after token refresh for {user_email}"
-                    )
-                    return False
+            token_result = response.json()
+            new_access_token = token_result.get("access_token")
+            new_refresh_token = token_result.get("refresh_token")  # May be None
+            expires_in = token_result.get("expires_in", 3600)
+
+            if not new_access_token:
+                logger.error(f"❌ No access token in refresh response for {user_email}")
+                return None, False
+
+            now = datetime.datetime.fromtimestamp(self._clock(), tz=datetime.timezone.utc)
+            credential_data.update(
+                {
+                    "expires_in": expires_in,
+                    "last_refreshed": now.isoformat(),
+                    "refresh_count": credential_data.get("refresh_count", 0) + 1,
+                }
+            )
+            return {
+                "id": token_record["id"],
+                "user_id": user_id,
+                "provider": token_record.get("provider", "google"),
+                "access_token": new_access_token,
+                # Keep old refresh token if new one not provided
+                "refresh_token": new_refresh_token or refresh_token,
+                "expires_at": (now + datetime.timedelta(seconds=expires_in)).isoformat(),
+                "credential_data": credential_data,
+                "updated_at": now.isoformat(),
+            }, False
 
         except httpx.TimeoutException:
             logger.error(f"⏰ Timeout refreshing Google Calendar token for {user_email}")
-            return False
+            return None, False
         except httpx.RequestError as e:
             logger.error(f"🌐 Network error refreshing token for {user_email}: {e}")
-            return False
+            return None, False
         except Exception as e:
             logger.error(
                 f"❌ Unexpected error refreshing token for {user_email}: {e}",
                 exc_info=True,
             )
-            return False
+            return None, False
 
-    async def _update_token_in_database(
-        self,
-        original_record: Dict,
-        new_access_token: str,
-        new_refresh_token: str,
-        expires_in: int,
-    ) -> bool:
+    async def _write_refreshed_tokens(self, rows: List[Dict]) -> bool:
         """
-        Update the oauth_tokens table with refreshed token data.
-
-        Args:
-            original_record: Original oauth_tokens record
-            new_access_token: New access token from Google
-            new_refresh_token: New or existing refresh token
-            expires_in: Token expiration time in seconds
+        Write refreshed tokens back to oauth_tokens in batched upserts.
 
-        Returns:
-            bool: True if update successful, False otherwise
+        Only the refreshed columns are sent, so on conflict the other columns
+        (is_active, integration_id, ...) keep their current values.
         """
         try:
             supabase = get_supabase_client()
@@ -274,51 +493,50 @@ class GoogleCalendarTokenManager:
                 logger.error("❌ Supabase client not available for token update")
                 return False
 
-            # Calculate new expiry time
-            now = datetime.datetime.now(datetime.timezone.utc)
-            new_expires_at = now + datetime.timedelta(seconds=expires_in)
+            def upsert() -> int:
+                written = 0
+                for start in range(0, len(rows), 500):
+                    result = (
+                        supabase.table("oauth_tokens")
+                        .upsert(rows[start : start + 500], on_conflict="id")
+                        .execute()
+                    )
+                    written += len(result.data or [])
+                return written
 
-            # Update credential data with new expiry info
-            credential_data = original_record.get("credential_data", {})
-            credential_data.update(
-                {
-                    "expires_in": expires_in,
-                    "last_refreshed": now.isoformat(),
-                    "refresh_count": credential_data.get("refresh_count", 0) + 1,
-                }
-            )
+            written = await asyncio.to_thread(upsert)
+            if written != len(rows):
+                logger.warning(f"⚠️ Updated {written}/{len(rows)} refreshed tokens")
+            return written > 0
 
-            # Prepare update data
-            update_data = {
-                "access_token": new_access_token,
-                "refresh_token": new_refresh_token,
-                "expires_at": new_expires_at.isoformat(),
-                "credential_data": credential_data,
-                "updated_at": now.isoformat(),
-            }
+        except Exception as e:
+            logger.error(f"❌ Database update error: {e}", exc_info=True)
+            return False
 
-            # Update the record
-            result = (
-                supabase.table("oauth_tokens")
-                .update(update_data)
-                .eq("id", original_record["id"])
-                .execute()
-            )
+    async def _refresh_single_token(self, token_record: Dict) -> bool:
+        """
+        Refresh a single Google Calendar OAuth token immediately.
 
-            if result.data:
-                user_email = credential_data.get("user_email", "unknown")
-                logger.info(
-                    f"✅ Database updated with refreshed token for {user_email} - "
-                    f"expires: {new_expires_at.isoformat()}"
-                )
-                return True
-            else:
-                logger.error("❌ No rows updated in oauth_tokens table")
-                return False
+        Args:
+            token_record: oauth_tokens table record
 
-        except Exception as e:
-            logger.error(f"❌ Database update error: {e}", exc_info=True)
+        Returns:
+            bool: True if refresh successful, False otherwise
+        """
+        row, invalid_grant = await self._request_refresh(token_record)
+        if row is None:
+            self._fail(token_record, invalid_grant=invalid_grant)
             return False
+        if not await self._write_refreshed_tokens([row]):
+            logger.error(f"❌ Failed to update database after token refresh for {row['id']}")
+            return False
+
+        self._backoff.pop(str(row["id"]), None)
+        self.metrics.refreshed += 1
+        if self.is_running:
+            self.schedule_token(row)
+            self._wakeup.set()
+        return True
 
     async def force_refresh_user_token(self, user_id: str) -> Tuple[bool, str]:
         """
@@ -372,6 +590,19 @@ class GoogleCalendarTokenManager:
         Returns:
             Dict: Status information
         """
+        next_deadline = self._next_deadline()
+        scheduler = {
+            "queue_depth": len(self._scheduled),
+            "in_flight": len(self._in_flight),
+            "backing_off": len(self._backoff),
+            "next_refresh_in": (
+                round(max(0.0, next_deadline - self._clock()), 1)
+                if next_deadline is not None
+                else None
+            ),
+            "concurrency": self._concurrency,
+            "metrics": self.metrics.snapshot(),
+        }
         try:
             supabase = get_supabase_client()
             if not supabase:
@@ -379,6 +610,7 @@ class GoogleCalendarTokenManager:
                     "status": "error",
                     "message": "Supabase client not available",
                     "is_running": self.is_running,
+                    "scheduler": scheduler,
                 }
 
             # Get counts of Google Calendar tokens
@@ -423,6 +655,7 @@ class GoogleCalendarTokenManager:
                     "tokens_with_refresh_capability": active_result.count or 0,
                     "tokens_needing_refresh": expiring_result.count or 0,
                 },
+                "scheduler": scheduler,
                 "next_check": "continuous" if self.is_running else "not scheduled",
             }
 
@@ -432,6 +665,7 @@ class GoogleCalendarTokenManager:
                 "status": "error",
                 "message": str(e),
                 "is_running": self.is_running,
+                "scheduler": scheduler,
             }
 
 
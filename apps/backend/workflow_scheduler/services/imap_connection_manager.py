@@ -0,0 +1,376 @@
+"""
+IMAP Connection Manager
+
+Keeps one authenticated IMAP session per (server, user, folder) and fans new
+messages out to every EmailTrigger subscribed to that mailbox. Sessions use
+IMAP IDLE when the server advertises it and fall back to interval polling
+otherwise, so N workflows watching the same inbox cost a single connection.
+"""
+
+import asyncio
+import email
+import logging
+import re
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+import aioimaplib
+
+from workflow_scheduler.core.config import settings
+
+if TYPE_CHECKING:
+    from workflow_scheduler.triggers.email_trigger import EmailTrigger
+
+logger = logging.getLogger(__name__)
+
+MailboxKey = Tuple[str, str, str]
+ClientFactory = Callable[[str, int], Any]
+
+_UIDVALIDITY_RE = re.compile(rb"UIDVALIDITY (\d+)")
+
+
+def _default_client_factory(host: str, port: int) -> aioimaplib.IMAP4_SSL:
+    return aioimaplib.IMAP4_SSL(host=host, port=port)
+
+
+class MailboxSession:
+    """A single authenticated IMAP session shared by all triggers on one mailbox"""
+
+    def __init__(
+        self,
+        key: MailboxKey,
+        password: str,
+        client_factory: ClientFactory,
+        port: int = 993,
+        idle_timeout: float = 300.0,
+        max_backoff: float = 300.0,
+    ):
+        self.key = key
+        self.server, self.user, self.folder = key
+        self._password = password
+        self._client_factory = client_factory
+        self._port = port
+        self._idle_timeout = idle_timeout
+        self._max_backoff = max_backoff
+
+        self._client: Optional[Any] = None
+        self._idle_supported = False
+        self._idling = False
+        self._uidvalidity: Optional[bytes] = None
+        self._last_uid = 0  # Highest UID already fanned out to every subscriber
+
+        self._subscribers: Dict[int, "EmailTrigger"] = {}
+        self._catchup: Set[int] = set()  # Subscribers that still need existing UNSEEN mail
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._closed = False
+
+        self.stats = {
+            "connects": 0,
+            "idle_pushes": 0,
+            "polls": 0,
+            "messages_fetched": 0,
+            "deliveries": 0,
+            "errors": 0,
+        }
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def poll_interval(self) -> float:
+        intervals = [t.check_interval for t in self._subscribers.values() if t.check_interval]
+        return float(min(intervals)) if intervals else float(settings.email_check_interval)
+
+    async def start(self) -> bool:
+        """Connect and authenticate, then start the background watch loop"""
+        try:
+            await self._connect()
+        except Exception as e:
+            logger.error(f"IMAP session {self.user}@{self.server}/{self.folder} failed: {e}")
+            await self._disconnect()
+            return False
+
+        self._closed = False
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def close(self) -> None:
+        """Stop the watch loop and log out"""
+        self._closed = True
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self._disconnect()
+
+    def add_subscriber(self, trigger: "EmailTrigger") -> None:
+        self._subscribers[id(trigger)] = trigger
+        self._catchup.add(id(trigger))
+        self._wake()
+
+    def remove_subscriber(self, trigger: "EmailTrigger") -> None:
+        self._subscribers.pop(id(trigger), None)
+        self._catchup.discard(id(trigger))
+
+    def _wake(self) -> None:
+        """Interrupt a pending IDLE or poll sleep so the loop re-checks the mailbox"""
+        self._wakeup.set()
+        if self._idling and self._client is not None:
+            asyncio.ensure_future(self._client.stop_wait_server_push())
+
+    async def _connect(self) -> None:
+        client = self._client_factory(self.server, self._port)
+        await client.wait_hello_from_server()
+
+        login_result = await client.login(self.user, self._password)
+        if login_result.result != "OK":
+            raise ConnectionError(f"IMAP login failed: {login_result}")
+
+        select_result = await client.select(self.folder)
+        if select_result.result != "OK":
+            raise ConnectionError(f"Failed to select folder {self.folder}: {select_result}")
+
+        uidvalidity = None
+        for line in select_result.lines or []:
+            match = _UIDVALIDITY_RE.search(line if isinstance(line, bytes) else str(line).encode())
+            if match:
+                uidvalidity = match.group(1)
+                break
+        if uidvalidity != self._uidvalidity:
+            # UIDs from a previous mailbox generation are meaningless
+            self._uidvalidity = uidvalidity
+            self._last_uid = 0
+
+        self._client = client
+        self._idle_supported = client.has_capability("IDLE")
+        self.stats["connects"] += 1
+        logger.info(
+            f"IMAP session connected: {self.user}@{self.server}/{self.folder} "
+            f"(idle={'yes' if self._idle_supported else 'no'})"
+        )
+
+    async def _disconnect(self) -> None:
+        client, self._client = self._client, None
+        self._idling = False
+        if client is None:
+            return
+        try:
+            await client.logout()
+        except Exception:
+            pass
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while not self._closed:
+            try:
+                if self._client is None:
+                    await self._connect()
+
+                await self._drain_unseen()
+
+                if self._idle_supported:
+                    await self._wait_for_push()
+                else:
+                    self.stats["polls"] += 1
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+
+                backoff = 1.0
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(
+                    f"IMAP session error for {self.user}@{self.server}/{self.folder}: {e}",
+                    exc_info=True,
+                )
+                await self._disconnect()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self._max_backoff)
+
+    async def _wait_for_push(self) -> None:
+        if self._wakeup.is_set():
+            return
+        idle = await self._client.idle_start(timeout=self._idle_timeout)
+        self._idling = True
+        try:
+            push = await self._client.wait_server_push(timeout=self._idle_timeout + 30)
+            if push != aioimaplib.STOP_WAIT_SERVER_PUSH:
+                self.stats["idle_pushes"] += 1
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._idling = False
+            if self._client is not None:
+                self._client.idle_done()
+                await asyncio.wait_for(idle, timeout=30)
+
+    async def _drain_unseen(self) -> None:
+        self._wakeup.clear()
+        if not self._subscribers:
+            return
+
+        search_result = await self._client.uid_search("UNSEEN")
+        if search_result.result != "OK":
+            return
+
+        raw = search_result.lines[0] if search_result.lines else b""
+        raw = raw.decode() if isinstance(raw, bytes) else str(raw)
+        uids = sorted(int(uid) for uid in raw.split() if uid.isdigit())
+
+        catchup = set(self._catchup)
+        self._catchup.clear()
+
+        for uid in uids:
+            if uid > self._last_uid:
+                targets = list(self._subscribers.values())
+            else:
+                # Already delivered to existing subscribers; only late joiners need it
+                targets = [t for key, t in self._subscribers.items() if key in catchup]
+            if targets:
+                await self._deliver(str(uid), targets)
+            self._last_uid = max(self._last_uid, uid)
+
+    async def _deliver(self, uid: str, targets: List["EmailTrigger"]) -> None:
+        fetch_result = await self._client.uid("fetch", uid, "(RFC822)")
+        if fetch_result.result != "OK" or len(fetch_result.lines) < 2:
+            logger.error(f"Failed to fetch email {uid}: {fetch_result}")
+            return
+
+        self.stats["messages_fetched"] += 1
+        email_message = email.message_from_bytes(bytes(fetch_result.lines[1]))
+
+        results = await asyncio.gather(
+            *(trigger.handle_email(uid, email_message) for trigger in targets),
+            return_exceptions=True,
+        )
+        self.stats["deliveries"] += len(targets)
+
+        for trigger, result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Email trigger for workflow {trigger.workflow_id} failed on {uid}: {result}"
+                )
+
+        if any(result is True for result in results):
+            await self._client.uid("store", uid, "+FLAGS", "(\\Seen)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "server": self.server,
+            "user": self.user[:5] + "***" if self.user else None,
+            "folder": self.folder,
+            "subscribers": self.subscriber_count,
+            "connected": self._client is not None,
+            "idle_supported": self._idle_supported,
+            "last_uid": self._last_uid,
+            **self.stats,
+        }
+
+
+class IMAPConnectionManager:
+    """Registry of shared mailbox sessions keyed by (server, user, folder)"""
+
+    def __init__(
+        self,
+        client_factory: Optional[ClientFactory] = None,
+        idle_timeout: float = 300.0,
+    ):
+        self._client_factory = client_factory or _default_client_factory
+        self._idle_timeout = idle_timeout
+        self._sessions: Dict[MailboxKey, MailboxSession] = {}
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, trigger: "EmailTrigger") -> bool:
+        """
+        Attach an EmailTrigger to the shared session for its mailbox
+
+        Returns:
+            False if the mailbox could not be opened with the trigger's credentials
+        """
+        key = (trigger.imap_server, trigger.email_user, trigger.folder)
+
+        async with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = MailboxSession(
+                    key,
+                    trigger.email_password,
+                    self._client_factory,
+                    idle_timeout=self._idle_timeout,
+                )
+                session.add_subscriber(trigger)
+                if not await session.start():
+                    return False
+                self._sessions[key] = session
+            else:
+                session.add_subscriber(trigger)
+
+        logger.info(
+            f"Workflow {trigger.workflow_id} subscribed to mailbox "
+            f"{trigger.email_user}@{trigger.imap_server}/{trigger.folder} "
+            f"({session.subscriber_count} subscribers)"
+        )
+        return True
+
+    async def unsubscribe(self, trigger: "EmailTrigger") -> None:
+        """Detach an EmailTrigger, closing the session when nobody is left"""
+        key = (trigger.imap_server, trigger.email_user, trigger.folder)
+
+        async with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                return
+            session.remove_subscriber(trigger)
+            if session.subscriber_count == 0:
+                del self._sessions[key]
+                await session.close()
+
+    def is_subscribed(self, trigger: "EmailTrigger") -> bool:
+        key = (trigger.imap_server, trigger.email_user, trigger.folder)
+        session = self._sessions.get(key)
+        return bool(session and session.is_running and id(trigger) in session._subscribers)
+
+    async def close_all(self) -> None:
+        async with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            await session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "active_sessions": len(self._sessions),
+            "sessions": [session.get_stats() for session in self._sessions.values()],
+        }
+
+
+# Global instance
+_imap_manager: Optional[IMAPConnectionManager] = None
+
+
+def get_imap_connection_manager() -> IMAPConnectionManager:
+    """Get or create the global IMAP connection manager instance"""
+    global _imap_manager
+    if _imap_manager is None:
+        _imap_manager = IMAPConnectionManager(idle_timeout=settings.email_idle_timeout)
+    return _imap_manager
+
+
+async def cleanup_imap_connection_manager() -> None:
+    """Close every shared IMAP session"""
+    global _imap_manager
+    if _imap_manager:
+        await _imap_manager.close_all()
+        _imap_manager = None
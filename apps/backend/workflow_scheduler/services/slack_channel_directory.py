@@ -0,0 +1,256 @@
+"""
+Slack Channel Directory
+
+Per-workspace cache of channel name <-> ID mappings, shared by deployment
+(resolving channel names in trigger configs to IDs) and trigger matching.
+
+A workspace's directory is loaded once with a fully paginated
+``conversations.list`` and then kept current from Slack events
+(``channel_created``, ``channel_rename``, ...) instead of being re-listed for
+every channel of every trigger. A name that is still unknown triggers at most
+one reload per ``miss_refresh_interval``, so a bulk redeploy makes O(1) Slack
+calls per workspace. A failed listing keeps the directory as it was and is
+retried after ``error_backoff_seconds``.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional
+
+from shared.sdks.transport import get_transport
+
+logger = logging.getLogger(__name__)
+
+CONVERSATIONS_LIST_URL = "https://slack.com/api/conversations.list"
+PAGE_SIZE = 1000  # Slack's max limit
+
+# Events that change which channels exist or what they are called
+CHANNEL_EVENTS = {
+    "channel_created",
+    "channel_rename",
+    "channel_deleted",
+    "channel_archive",
+    "channel_unarchive",
+    "group_rename",
+    "group_deleted",
+    "group_archive",
+    "group_unarchive",
+}
+
+
+@dataclass
+class _Directory:
+    by_name: Dict[str, str] = field(default_factory=dict)
+    by_id: Dict[str, str] = field(default_factory=dict)
+    loaded_at: float = 0.0
+    stale: bool = True
+    retry_at: float = 0.0  # no reload before this after a failed listing
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def put(self, channel_id: str, name: str) -> None:
+        old_name = self.by_id.get(channel_id)
+        if old_name is not None and self.by_name.get(old_name) == channel_id:
+            del self.by_name[old_name]
+        self.by_id[channel_id] = name
+        self.by_name[name] = channel_id
+
+    def remove(self, channel_id: str) -> None:
+        name = self.by_id.pop(channel_id, None)
+        if name is not None and self.by_name.get(name) == channel_id:
+            del self.by_name[name]
+
+
+class SlackChannelDirectory:
+    """Workspace channel directories with single-flight, paginated loading"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        miss_refresh_interval: float = 60,
+        error_backoff_seconds: float = 10,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.miss_refresh_interval = miss_refresh_interval
+        self.error_backoff_seconds = error_backoff_seconds
+        self._directories: Dict[str, _Directory] = {}
+        self._transport = get_transport("slack")
+        self.stats = {"loads": 0, "api_calls": 0, "hits": 0, "misses": 0, "events": 0}
+
+    @staticmethod
+    def _key(workspace_id: Optional[str], token: Optional[str]) -> Optional[str]:
+        if workspace_id:
+            return workspace_id
+        if token:
+            return "token:" + hashlib.sha256(token.encode()).hexdigest()[:16]
+        return None
+
+    def _directory(self, key: str) -> _Directory:
+        directory = self._directories.get(key)
+        if directory is None:
+            directory = self._directories[key] = _Directory()
+        return directory
+
+    def is_fresh(self, workspace_id: Optional[str]) -> bool:
+        """True if the workspace's directory can answer lookups without calling Slack."""
+        directory = self._directories.get(workspace_id or "")
+        return (
+            directory is not None
+            and not directory.stale
+            and time.monotonic() - directory.loaded_at < self.ttl_seconds
+        )
+
+    async def _ensure_loaded(
+        self, key: str, token: str, force_after: Optional[float] = None
+    ) -> _Directory:
+        """
+        Load the directory if it is stale or expired, or if ``force_after`` is
+        given and the last load is older than that many seconds.
+        """
+        directory = self._directory(key)
+
+        def needs_load() -> bool:
+            now = time.monotonic()
+            if now < directory.retry_at:
+                return False
+            age = now - directory.loaded_at
+            if directory.stale or age >= self.ttl_seconds:
+                return True
+            return force_after is not None and age >= force_after
+
+        if not needs_load():
+            return directory
+        async with directory.lock:
+            # Another caller may have loaded it while we waited
+            if needs_load():
+                await self._load(directory, token)
+        return directory
+
+    async def _load(self, directory: _Directory, token: str) -> None:
+        by_name: Dict[str, str] = {}
+        by_id: Dict[str, str] = {}
+        cursor = None
+        while True:
+            params: Dict[str, Any] = {
+                "types": "public_channel,private_channel",
+                "exclude_archived": "true",
+                "limit": PAGE_SIZE,
+            }
+            if cursor:
+                params["cursor"] = cursor
+            response = await self._transport.request(
+                "GET",
+                CONVERSATIONS_LIST_URL,
+                headers={"Authorization": f"Bearer {token}"},
+                params=params,
+            )
+            self.stats["api_calls"] += 1
+            data = response.json() if response.status_code == 200 else {}
+            if not data.get("ok"):
+                error = data.get("error") or f"HTTP {response.status_code}"
+                logger.warning(f"Slack API error listing channels: {error}")
+                # Keep serving what we had, still stale or expired; retry after a short backoff
+                directory.retry_at = time.monotonic() + self.error_backoff_seconds
+                return
+
+            for channel in data.get("channels", []):
+                if channel.get("id") and channel.get("name"):
+                    by_name[channel["name"]] = channel["id"]
+                    by_id[channel["id"]] = channel["name"]
+            cursor = (data.get("response_metadata") or {}).get("next_cursor")
+            if not cursor:
+                break
+
+        directory.by_name, directory.by_id = by_name, by_id
+        directory.loaded_at = time.monotonic()
+        directory.stale = False
+        self.stats["loads"] += 1
+        logger.debug(f"Loaded {len(by_id)} Slack channels into directory")
+
+    async def resolve_names(
+        self, workspace_id: Optional[str], token: str, names: Iterable[str]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Map channel names (with or without ``#``) to channel IDs.
+
+        Returns:
+            Dict[str, Optional[str]]: name -> channel ID, or None if not found
+        """
+        key = self._key(workspace_id, token)
+        names = [name.strip() for name in names]
+        directory = await self._ensure_loaded(key, token)
+
+        def lookup(name: str) -> Optional[str]:
+            return directory.by_name.get(name.lstrip("#"))
+
+        if any(lookup(name) is None for name in names):
+            # Possibly created since the last load; reload at most once per interval
+            directory = await self._ensure_loaded(
+                key, token, force_after=self.miss_refresh_interval
+            )
+
+        resolved = {name: lookup(name) for name in names}
+        for channel_id in resolved.values():
+            self.stats["hits" if channel_id else "misses"] += 1
+        return resolved
+
+    async def channel_name(
+        self, workspace_id: Optional[str], token: Optional[str], channel_id: str
+    ) -> Optional[str]:
+        """Channel name for an ID; without a token only the cached directory is used."""
+        key = self._key(workspace_id, token)
+        if key is None:
+            return None
+        if token:
+            directory = await self._ensure_loaded(key, token)
+        else:
+            directory = self._directories.get(key)
+            if directory is None:
+                return None
+        return directory.by_id.get(channel_id)
+
+    def apply_event(self, workspace_id: Optional[str], event: Dict[str, Any]) -> None:
+        """Keep a loaded workspace directory current from a Slack channel event."""
+        event_type = event.get("type")
+        directory = self._directories.get(workspace_id or "")
+        if event_type not in CHANNEL_EVENTS or directory is None:
+            return
+        self.stats["events"] += 1
+
+        channel = event.get("channel")
+        if isinstance(channel, dict) and channel.get("id") and channel.get("name"):
+            # channel_created / *_rename carry the channel object
+            directory.put(channel["id"], channel["name"])
+        elif isinstance(channel, str) and event_type.endswith(("_deleted", "_archive")):
+            directory.remove(channel)
+        else:
+            # e.g. *_unarchive only carries the ID; reload on the next lookup
+            directory.stale = True
+
+    def invalidate(self, workspace_id: Optional[str] = None) -> None:
+        """Drop one workspace's directory, or all of them."""
+        if workspace_id is None:
+            self._directories.clear()
+        else:
+            self._directories.pop(workspace_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "workspaces": len(self._directories),
+            "channels": sum(len(d.by_id) for d in self._directories.values()),
+        }
+
+
+# Global instance
+_channel_directory: Optional[SlackChannelDirectory] = None
+
+
+def get_slack_channel_directory() -> SlackChannelDirectory:
+    """Get the global Slack channel directory instance."""
+    global _channel_directory
+    if _channel_directory is None:
+        _channel_directory = SlackChannelDirectory()
+    return _channel_directory
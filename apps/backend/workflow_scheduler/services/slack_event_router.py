@@ -10,6 +10,7 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from shared.models.workflow import WorkflowExecutionResponse
+from workflow_scheduler.services.slack_channel_directory import get_slack_channel_directory
 
 logger = logging.getLogger(__name__)
 
@@ -114,6 +115,9 @@ class SlackEventRouter:
 
         logger.info(f"🎯 Routing Slack event: {event_type} from workspace {workspace_id}")
 
+        # Keep the shared channel directory in step with channel creates/renames
+        get_slack_channel_directory().apply_event(workspace_id, event_data.get("event") or {})
+
         results = []
         processed_count = 0
 
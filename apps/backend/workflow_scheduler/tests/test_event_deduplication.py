@@ -0,0 +1,175 @@
+"""
+Tests for EventDeduplicationService local pre-filter and pipelined Redis checks
+"""
+
+import asyncio
+
+import pytest
+
+from workflow_scheduler.services.event_deduplication import (
+    EventDeduplicationService,
+    LocalSeenFilter,
+)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return [await getattr(self.redis, name)(*a, **kw) for name, a, kw in self.commands]
+
+
+class FakeRedis:
+    """Minimal in-memory Redis covering the commands the service issues"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.hashes = {}
+        self.round_trips = 0
+        self.keys_called = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        self.ttls[key] = ex if ex is not None else -1
+        return True
+
+    async def ttl(self, key):
+        return self.ttls.get(key, -2)
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return True
+
+    async def hincrby(self, name, field, amount):
+        bucket = self.hashes.setdefault(name, {})
+        bucket[field] = bucket.get(field, 0) + amount
+        return bucket[field]
+
+    async def hgetall(self, name):
+        return dict(self.hashes.get(name, {}))
+
+    async def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+    async def keys(self, pattern):
+        self.keys_called = True
+        return []
+
+
+@pytest.fixture
+def service():
+    service = EventDeduplicationService()
+    service._redis = FakeRedis()
+    return service
+
+
+class TestLocalSeenFilter:
+    def test_entries_expire_and_are_bounded(self):
+        local = LocalSeenFilter(max_size=2, ttl_seconds=10)
+        local.add("a", now=0)
+        local.add("b", now=1)
+        local.add("c", now=2)
+
+        assert not local.contains("a", now=3)
+        assert local.contains("c", now=3)
+        assert not local.contains("b", now=11)
+        assert local.prune(now=20) == 1
+
+
+class TestEventDeduplicationService:
+    @pytest.mark.asyncio
+    async def test_repeat_is_served_locally(self, service):
+        assert await service.is_duplicate_event("Ev1") is False
+        trips = service._redis.round_trips
+
+        assert await service.is_duplicate_event("Ev1") is True
+        assert service._redis.round_trips == trips
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_share_one_pipeline(self, service):
+        results = await asyncio.gather(
+            *(service.is_duplicate_event(f"Ev{i}") for i in range(20)),
+            service.is_duplicate_event("Ev0"),
+        )
+
+        assert results[:20] == [False] * 20
+        assert results[20] is True
+        # One SET NX pipeline plus one counter pipeline
+        assert service._redis.round_trips == 2
+
+    @pytest.mark.asyncio
+    async def test_duplicate_claimed_by_another_instance(self, service):
+        await service._redis.set("dedup:slack:Ev9", 1, nx=True, ex=300)
+
+        results = await service.check_duplicate_events(["Ev9", "Ev10", "Ev10"])
+
+        assert results == {"Ev9": True, "Ev10": False}
+
+    @pytest.mark.asyncio
+    async def test_stats_and_cleanup_use_scan(self, service):
+        await service.check_duplicate_events(["A", "B"], "slack")
+        await service.check_duplicate_events(["C"], "github")
+        service._redis.ttls["dedup:github:C"] = -1  # lost its expiry
+
+        assert await service.cleanup_expired_events() == 1
+        assert service._redis.ttls["dedup:github:C"] == 300
+
+        stats = await service.get_stats()
+        assert stats["total_active_events"] == 3
+        assert stats["by_source"] == {"slack": 2, "github": 1}
+        assert stats["lifetime_counters"] == {"slack:new": 2, "github:new": 1}
+        assert service._redis.keys_called is False
+        assert stats["active_events_complete"] is True
+
+    @pytest.mark.asyncio
+    async def test_stats_scan_is_capped(self, service):
+        await service.check_duplicate_events([f"Ev{i}" for i in range(50)], "slack")
+        scanned = []
+        scan_iter = service._redis.scan_iter
+
+        async def counting_scan_iter(match=None, count=None):
+            async for key in scan_iter(match=match, count=count):
+                scanned.append(key)
+                yield key
+
+        service._redis.scan_iter = counting_scan_iter
+
+        stats = await service.get_stats(max_scan_keys=10)
+
+        assert stats["total_active_events"] == 10
+        assert stats["active_events_complete"] is False
+        assert len(scanned) == 11
+        # Outcome totals still come from the counters, not the scan
+        assert stats["lifetime_counters"] == {"slack:new": 50}
+        assert stats["new_events"] == 50
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_allows_processing(self):
+        service = EventDeduplicationService()
+        assert await service.is_duplicate_event("Ev1") is False
+        assert await service.check_duplicate_events(["Ev1"]) == {"Ev1": False}
@@ -0,0 +1,177 @@
+"""
+Tests for the deadline-driven Google Calendar token refresh manager
+"""
+
+import asyncio
+import datetime
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from shared.sdks.transport import ProviderTransport, RetryPolicy
+from workflow_scheduler.services import google_calendar_token_manager as module
+from workflow_scheduler.services.google_calendar_token_manager import GoogleCalendarTokenManager
+
+NOW = 1_700_000_000.0
+
+
+def _iso(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc).isoformat()
+
+
+def _token(token_id: str, expires_in: float, refresh_token: str = "r") -> dict:
+    return {
+        "id": token_id,
+        "user_id": f"user-{token_id}",
+        "provider": "google",
+        "refresh_token": f"{refresh_token}-{token_id}",
+        "expires_at": _iso(NOW + expires_in),
+        "credential_data": {"user_email": f"{token_id}@example.com"},
+    }
+
+
+class FakeSupabase:
+    """Records upserts made through table(...).upsert(...).execute()"""
+
+    def __init__(self):
+        self.upserts = []
+
+    def table(self, name):
+        table = Mock()
+
+        def upsert(rows, on_conflict=None):
+            self.upserts.append((name, on_conflict, list(rows)))
+            return Mock(execute=Mock(return_value=Mock(data=list(rows))))
+
+        table.upsert = upsert
+        return table
+
+
+@pytest.fixture
+def supabase(monkeypatch):
+    fake = FakeSupabase()
+    monkeypatch.setattr(module, "get_supabase_client", lambda: fake)
+    return fake
+
+
+def _manager(handler, clock=lambda: NOW, **kwargs):
+    manager = GoogleCalendarTokenManager(clock=clock, **kwargs)
+    manager._transport = ProviderTransport(
+        "google_oauth",
+        retry=RetryPolicy(max_retries=0),
+        http_transport=httpx.MockTransport(handler),
+    )
+    return manager
+
+
+async def test_due_tokens_refresh_concurrently_in_one_batch(supabase):
+    in_flight, peak = [0], [0]
+
+    async def handler(request):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return httpx.Response(200, json={"access_token": "new", "expires_in": 3600})
+
+    manager = _manager(handler, concurrency=4)
+    for i in range(10):
+        manager.schedule_token(_token(str(i), expires_in=60))
+    manager.schedule_token(_token("later", expires_in=3 * 3600))
+
+    refreshed = await manager._refresh_due_tokens(manager._pop_due(NOW))
+
+    assert refreshed == 10
+    assert peak[0] == 4
+    assert len(supabase.upserts) == 1
+    name, on_conflict, rows = supabase.upserts[0]
+    assert (name, on_conflict, len(rows)) == ("oauth_tokens", "id", 10)
+    # The old refresh token is kept when Google omits a new one
+    assert all(row["refresh_token"] == f"r-{row['id']}" for row in rows)
+
+    # Each token is rescheduled from its new expiry, ahead of it by lead + jitter
+    for i in range(10):
+        refresh_at = manager._scheduled[str(i)]
+        assert NOW + 3600 - 15 * 60 <= refresh_at <= NOW + 3600 - 10 * 60
+    assert len(manager._scheduled) == 11
+
+    metrics = manager.metrics.snapshot()
+    assert metrics["refreshed"] == 10
+    assert metrics["expired_before_refresh"] == 0
+    assert metrics["expiry_margin_seconds"]["min"] == 60
+
+
+async def test_invalid_grant_backs_off_until_the_user_reconnects(supabase):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return httpx.Response(400, json={"error": "invalid_grant"})
+
+    now = [NOW]
+    manager = _manager(handler, clock=lambda: now[0])
+    manager.schedule_token(_token("a", expires_in=60))
+
+    assert await manager._refresh_due_tokens(manager._pop_due(now[0])) == 0
+    assert supabase.upserts == []
+    assert manager.metrics.invalid_grant == 1
+    retry_at = manager._scheduled["a"]
+    assert retry_at >= NOW + 0.8 * 15 * 60
+
+    # A periodic sync of the same row does not bring the token forward
+    manager.schedule_token(_token("a", expires_in=60))
+    assert manager._pop_due(NOW + 60) == []
+
+    # A second rejection doubles the wait
+    now[0] = retry_at
+    await manager._refresh_due_tokens(manager._pop_due(now[0]))
+    assert manager._scheduled["a"] >= retry_at + 0.8 * 30 * 60
+    assert len(calls) == 2
+
+    # Reconnecting issues a new refresh token, which is retried right away
+    manager.schedule_token(_token("a", expires_in=60, refresh_token="new"))
+    assert "a" not in manager._backoff
+    assert [record["id"] for record, _ in manager._pop_due(now[0])] == ["a"]
+
+
+async def test_failed_database_write_retries_soon(supabase, monkeypatch):
+    async def handler(request):
+        return httpx.Response(200, json={"access_token": "new", "expires_in": 3600})
+
+    manager = _manager(handler)
+    manager.schedule_token(_token("a", expires_in=60))
+
+    async def write_fails(rows):
+        return False
+
+    monkeypatch.setattr(manager, "_write_refreshed_tokens", write_fails)
+    assert await manager._refresh_due_tokens(manager._pop_due(NOW)) == 0
+
+    assert manager.metrics.refreshed == 0
+    assert NOW + 20 <= manager._scheduled["a"] <= NOW + 40
+
+
+async def test_one_failing_token_does_not_abort_the_batch(supabase):
+    async def handler(request):
+        body = request.content.decode()
+        if "r-broken" in body:
+            return httpx.Response(500, text="backend error")
+        if "r-slow" in body:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200, json={"access_token": "new", "expires_in": 3600})
+
+    manager = _manager(handler)
+    for token_id in ("a", "broken", "b", "slow"):
+        manager.schedule_token(_token(token_id, expires_in=60))
+
+    assert await manager._refresh_due_tokens(manager._pop_due(NOW)) == 2
+
+    _, _, rows = supabase.upserts[0]
+    assert sorted(row["id"] for row in rows) == ["a", "b"]
+    # Transient failures back off briefly and stay scheduled
+    for token_id in ("broken", "slow"):
+        assert manager._backoff[token_id].failures == 1
+        assert NOW + 20 <= manager._scheduled[token_id] <= NOW + 40
+    assert manager.metrics.failed == 2
+    assert manager.metrics.refreshed == 2
@@ -0,0 +1,189 @@
+"""
+Tests for the shared IMAP connection manager used by EmailTrigger
+Uses an in-process IMAP stand-in instead of a real mail server
+"""
+
+import asyncio
+from email.mime.text import MIMEText
+from unittest.mock import AsyncMock, Mock
+
+import aioimaplib
+import pytest
+
+from shared.models.execution_new import ExecutionStatus
+from workflow_scheduler.core.config import settings
+from workflow_scheduler.services.imap_connection_manager import IMAPConnectionManager
+from workflow_scheduler.triggers import email_trigger as email_trigger_module
+from workflow_scheduler.triggers.email_trigger import EmailTrigger
+
+
+class FakeMailbox:
+    """Server-side state shared by every fake client connection"""
+
+    def __init__(self, idle: bool = True):
+        self.idle = idle
+        self.messages = {}
+        self.seen = set()
+        self.next_uid = 1
+        self.connections = 0
+        self.fetches = 0
+        self.push_queue: asyncio.Queue = asyncio.Queue()
+
+    def deliver(self, sender: str, subject: str, body: str = "hello") -> int:
+        msg = MIMEText(body)
+        msg["From"] = sender
+        msg["To"] = "bot@example.com"
+        msg["Subject"] = subject
+        uid = self.next_uid
+        self.next_uid += 1
+        self.messages[uid] = msg.as_bytes()
+        self.push_queue.put_nowait([f"{uid} EXISTS".encode()])
+        return uid
+
+
+class FakeIMAPClient:
+    def __init__(self, mailbox: FakeMailbox):
+        self.mailbox = mailbox
+        mailbox.connections += 1
+
+    async def wait_hello_from_server(self):
+        return None
+
+    async def login(self, user, password):
+        return aioimaplib.Response("OK" if password == "secret" else "NO", [])
+
+    async def select(self, folder):
+        return aioimaplib.Response("OK", [b"OK [UIDVALIDITY 42] UIDs valid"])
+
+    def has_capability(self, capability):
+        return capability == "IDLE" and self.mailbox.idle
+
+    async def uid_search(self, *criteria):
+        unseen = [str(uid) for uid in self.mailbox.messages if uid not in self.mailbox.seen]
+        return aioimaplib.Response("OK", [" ".join(unseen).encode()])
+
+    async def uid(self, command, uid, *args):
+        if command == "fetch":
+            self.mailbox.fetches += 1
+            return aioimaplib.Response(
+                "OK", [f"{uid} FETCH (RFC822".encode(), self.mailbox.messages[int(uid)]]
+            )
+        if command == "store":
+            self.mailbox.seen.add(int(uid))
+        return aioimaplib.Response("OK", [])
+
+    async def idle_start(self, timeout):
+        return asyncio.ensure_future(asyncio.sleep(0))
+
+    async def wait_server_push(self, timeout):
+        return await asyncio.wait_for(self.mailbox.push_queue.get(), timeout=timeout)
+
+    def idle_done(self):
+        return None
+
+    async def stop_wait_server_push(self):
+        self.mailbox.push_queue.put_nowait(aioimaplib.STOP_WAIT_SERVER_PUSH)
+        return True
+
+    async def logout(self):
+        return aioimaplib.Response("OK", [])
+
+
+@pytest.fixture
+def mailbox():
+    return FakeMailbox()
+
+
+@pytest.fixture
+def manager(mailbox, monkeypatch):
+    manager = IMAPConnectionManager(client_factory=lambda host, port: FakeIMAPClient(mailbox))
+    monkeypatch.setattr(email_trigger_module, "get_imap_connection_manager", lambda: manager)
+    monkeypatch.setattr(settings, "email_user", "bot@example.com")
+    monkeypatch.setattr(settings, "email_password", "secret")
+    return manager
+
+
+def make_trigger(workflow_id: str, email_filter: str = "", **config) -> EmailTrigger:
+    trigger = EmailTrigger(workflow_id, {"email_filter": email_filter, **config})
+    trigger._trigger_workflow = AsyncMock(
+        return_value=Mock(status=ExecutionStatus.RUNNING, execution_id=f"exec_{workflow_id}")
+    )
+    return trigger
+
+
+async def wait_for(predicate, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class TestIMAPConnectionManager:
+    @pytest.mark.asyncio
+    async def test_triggers_share_one_session(self, manager, mailbox):
+        mailbox.deliver("alerts@vendor.com", "Server down")
+
+        alerts = make_trigger("wf_alerts", "from:alerts@vendor.com")
+        invoices = make_trigger("wf_invoices", "subject:invoice")
+        assert await alerts.start()
+        assert await invoices.start()
+
+        await wait_for(lambda: alerts._trigger_workflow.await_count == 1)
+        assert mailbox.connections == 1
+        assert manager.get_stats()["active_sessions"] == 1
+
+        mailbox.deliver("billing@vendor.com", "Invoice #7")
+        await wait_for(lambda: invoices._trigger_workflow.await_count == 1)
+
+        # Each message is fetched once and fanned out, filters applied per trigger
+        assert mailbox.fetches == 2
+        assert alerts._trigger_workflow.await_count == 1
+        assert mailbox.seen == {1, 2}
+
+        await alerts.stop()
+        await invoices.stop()
+        assert manager.get_stats()["active_sessions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_late_subscriber_receives_existing_unseen(self, manager, mailbox):
+        first = make_trigger("wf_first", "subject:report", mark_as_read=False)
+        assert await first.start()
+
+        mailbox.deliver("ops@example.com", "Daily report")
+        await wait_for(lambda: first._trigger_workflow.await_count == 1)
+
+        late = make_trigger("wf_late", "subject:report", mark_as_read=False)
+        assert await late.start()
+        await wait_for(lambda: late._trigger_workflow.await_count == 1)
+
+        # The original subscriber is not re-triggered for the same message
+        assert first._trigger_workflow.await_count == 1
+        assert mailbox.seen == set()
+
+        await manager.close_all()
+
+    @pytest.mark.asyncio
+    async def test_polling_fallback_without_idle(self, monkeypatch):
+        mailbox = FakeMailbox(idle=False)
+        manager = IMAPConnectionManager(client_factory=lambda host, port: FakeIMAPClient(mailbox))
+        monkeypatch.setattr(email_trigger_module, "get_imap_connection_manager", lambda: manager)
+        monkeypatch.setattr(settings, "email_user", "bot@example.com")
+        monkeypatch.setattr(settings, "email_password", "secret")
+
+        trigger = make_trigger("wf_poll", check_interval=0.05)
+        assert await trigger.start()
+
+        mailbox.deliver("someone@example.com", "Hi")
+        await wait_for(lambda: trigger._trigger_workflow.await_count == 1)
+        assert manager.get_stats()["sessions"][0]["idle_supported"] is False
+
+        await manager.close_all()
+
+    @pytest.mark.asyncio
+    async def test_login_failure_does_not_register_session(self, manager, monkeypatch):
+        monkeypatch.setattr(settings, "email_password", "wrong")
+        trigger = make_trigger("wf_bad")
+
+        assert await trigger.start() is False
+        assert manager.get_stats()["active_sessions"] == 0
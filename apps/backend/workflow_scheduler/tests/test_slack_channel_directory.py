@@ -0,0 +1,109 @@
+"""
+Tests for the shared Slack channel directory used by deployment and trigger matching
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from shared.sdks.transport import ProviderTransport
+from workflow_scheduler.services.deployment_service import DeploymentService
+from workflow_scheduler.services.slack_channel_directory import SlackChannelDirectory
+
+
+def _slack(pages):
+    """conversations.list stub serving ``pages`` (lists of (id, name)) by cursor"""
+    calls = []
+
+    async def handler(request):
+        calls.append(dict(request.url.params))
+        await asyncio.sleep(0.01)
+        index = int(request.url.params.get("cursor") or 0)
+        body = {
+            "ok": True,
+            "channels": [{"id": cid, "name": name} for cid, name in pages[index]],
+            "response_metadata": {"next_cursor": str(index + 1) if index + 1 < len(pages) else ""},
+        }
+        return httpx.Response(200, json=body)
+
+    directory = SlackChannelDirectory()
+    directory._transport = ProviderTransport("slack", http_transport=httpx.MockTransport(handler))
+    return directory, calls
+
+
+async def test_resolves_across_pages_with_one_listing_per_workspace():
+    directory, calls = _slack(
+        [[("C1", "general"), ("C2", "random")], [("C3", "alerts")], [("C4", "hil")]]
+    )
+
+    results = await asyncio.gather(
+        *(directory.resolve_names("T1", "xoxb", ["general", "#hil", "alerts"]) for _ in range(50))
+    )
+
+    assert results[0] == {"general": "C1", "#hil": "C4", "alerts": "C3"}
+    assert len(calls) == 3  # one paginated listing shared by every caller
+    assert [c.get("cursor") for c in calls] == [None, "1", "2"]
+
+    # Unknown names reload at most once per miss_refresh_interval
+    assert await directory.resolve_names("T1", "xoxb", ["nope"]) == {"nope": None}
+    assert await directory.resolve_names("T1", "xoxb", ["nope"]) == {"nope": None}
+    assert len(calls) == 3
+
+
+async def test_channel_events_update_the_directory_in_place():
+    directory, calls = _slack([[("C1", "general")]])
+    await directory.resolve_names("T1", "xoxb", ["general"])
+
+    directory.apply_event(
+        "T1", {"type": "channel_created", "channel": {"id": "C9", "name": "launch"}}
+    )
+    directory.apply_event(
+        "T1", {"type": "channel_rename", "channel": {"id": "C1", "name": "town-square"}}
+    )
+
+    resolved = await directory.resolve_names("T1", "xoxb", ["launch", "town-square"])
+    assert resolved == {"launch": "C9", "town-square": "C1"}
+    assert await directory.channel_name("T1", None, "C1") == "town-square"
+    assert len(calls) == 1
+
+    directory.apply_event("T1", {"type": "channel_unarchive", "channel": "C5"})
+    assert not directory.is_fresh("T1")
+
+
+async def test_bulk_redeploy_lists_channels_once(monkeypatch):
+    directory, calls = _slack([[("C1", "general"), ("C2", "hil")]])
+    monkeypatch.setattr(
+        "workflow_scheduler.services.deployment_service.get_slack_channel_directory",
+        lambda: directory,
+    )
+    service = DeploymentService(trigger_manager=None, direct_db_service=object())
+
+    for _ in range(200):
+        resolved = await service._resolve_channel_names_to_ids("general, hil,C7", "xoxb", "T1")
+        assert resolved == "C1,C2,C7"
+
+    assert len(calls) == 1
+
+
+async def test_failed_listing_is_retried_after_a_short_backoff():
+    responses = [{"ok": False, "error": "ratelimited"}, {"ok": True, "channels": []}]
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=responses[min(len(calls), len(responses)) - 1])
+
+    directory = SlackChannelDirectory(error_backoff_seconds=30)
+    directory._transport = ProviderTransport("slack", http_transport=httpx.MockTransport(handler))
+
+    assert await directory.resolve_names("T1", "xoxb", ["general"]) == {"general": None}
+    assert await directory.resolve_names("T1", "xoxb", ["general"]) == {"general": None}
+    # The failure does not mark the directory as loaded, and the backoff holds off retries
+    assert not directory.is_fresh("T1")
+    assert len(calls) == 1
+
+    directory._directories["T1"].retry_at = 0.0  # backoff elapsed
+    await directory.resolve_names("T1", "xoxb", ["general"])
+    assert directory.is_fresh("T1")
+    assert len(calls) == 2
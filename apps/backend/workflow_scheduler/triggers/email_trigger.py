@@ -1,4 +1,3 @@
-import asyncio
 import base64
 import email
 import logging
@@ -8,20 +7,19 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Any, Dict, List, Optional
 
-import aioimaplib
-
 from shared.models.execution_new import ExecutionStatus
 from shared.models.node_enums import TriggerSubtype
 from shared.models.trigger import TriggerStatus
 from shared.models.workflow import WorkflowExecutionResponse
 from workflow_scheduler.core.config import settings
+from workflow_scheduler.services.imap_connection_manager import get_imap_connection_manager
 from workflow_scheduler.triggers.base import BaseTrigger
 
 logger = logging.getLogger(__name__)
 
 
 class EmailTrigger(BaseTrigger):
-    """Email-based trigger using IMAP monitoring"""
+    """Email-based trigger fed by a shared IMAP mailbox session"""
 
     def __init__(self, workflow_id: str, trigger_config: Dict[str, Any]):
         super().__init__(workflow_id, trigger_config)
@@ -37,11 +35,6 @@ class EmailTrigger(BaseTrigger):
         self.email_user = settings.email_user
         self.email_password = settings.email_password
 
-        # Internal state
-        self._monitoring_task: Optional[asyncio.Task] = None
-        self._stop_monitoring = False
-        self._last_uid = None  # Track last processed email UID
-
         if not self.email_user or not self.email_password:
             raise ValueError("Email credentials not configured")
 
@@ -57,17 +50,13 @@ class EmailTrigger(BaseTrigger):
                 self.status = TriggerStatus.PAUSED
                 return True
 
-            # Test IMAP connection first
-            connection_test = await self._test_imap_connection()
-            if not connection_test:
-                logger.error(f"IMAP connection test failed for workflow {self.workflow_id}")
+            # Join (or open) the shared IMAP session for this mailbox
+            subscribed = await get_imap_connection_manager().subscribe(self)
+            if not subscribed:
+                logger.error(f"IMAP connection failed for workflow {self.workflow_id}")
                 self.status = TriggerStatus.ERROR
                 return False
 
-            # Start monitoring task
-            self._stop_monitoring = False
-            self._monitoring_task = asyncio.create_task(self._monitor_emails())
-
             self.status = TriggerStatus.ACTIVE
             logger.info(f"Email trigger started for workflow {self.workflow_id}")
 
@@ -84,14 +73,7 @@ class EmailTrigger(BaseTrigger):
     async def stop(self) -> bool:
         """Stop email monitoring"""
         try:
-            self._stop_monitoring = True
-
-            if self._monitoring_task and not self._monitoring_task.done():
-                self._monitoring_task.cancel()
-                try:
-                    await self._monitoring_task
-                except asyncio.CancelledError:
-                    pass
+            await get_imap_connection_manager().unsubscribe(self)
 
             self.status = TriggerStatus.STOPPED
             logger.info(f"Email trigger stopped for workflow {self.workflow_id}")
@@ -105,120 +87,21 @@ class EmailTrigger(BaseTrigger):
             )
             return False
 
-    async def _test_imap_connection(self) -> bool:
-        """Test IMAP connection"""
-        try:
-            imap_client = aioimaplib.IMAP4_SSL(host=self.imap_server, port=993)
-            await imap_client.wait_hello_from_server()
-
-            login_result = await imap_client.login(self.email_user, self.email_password)
-            if login_result.result != "OK":
-                logger.error(f"IMAP login failed: {login_result}")
-                return False
-
-            await imap_client.logout()
-            return True
-
-        except Exception as e:
-            logger.error(f"IMAP connection test failed: {e}", exc_info=True)
-            return False
-
-    async def _monitor_emails(self) -> None:
-        """Main email monitoring loop"""
-        logger.info(f"Started email monitoring for workflow {self.workflow_id}")
-
-        while not self._stop_monitoring:
-            try:
-                await self._check_new_emails()
-                await asyncio.sleep(self.check_interval)
-
-            except asyncio.CancelledError:
-                logger.info(f"Email monitoring cancelled for workflow {self.workflow_id}")
-                break
-
-            except Exception as e:
-                logger.error(
-                    f"Error in email monitoring for workflow {self.workflow_id}: {e}",
-                    exc_info=True,
-                )
-                await asyncio.sleep(self.check_interval)
-
-        logger.info(f"Email monitoring stopped for workflow {self.workflow_id}")
+    async def handle_email(self, email_id: str, email_message: email.message.Message) -> bool:
+        """
+        Process an email delivered by the shared mailbox session
 
-    async def _check_new_emails(self) -> None:
-        """Check for new emails and process them"""
-        imap_client = None
-
-        try:
-            # Connect to IMAP server
-            imap_client = aioimaplib.IMAP4_SSL(host=self.imap_server, port=993)
-            await imap_client.wait_hello_from_server()
-
-            # Login
-            login_result = await imap_client.login(self.email_user, self.email_password)
-            if login_result.result != "OK":
-                logger.error(f"IMAP login failed: {login_result}")
-                return
-
-            # Select folder
-            select_result = await imap_client.select(self.folder)
-            if select_result.result != "OK":
-                logger.error(f"Failed to select folder {self.folder}: {select_result}")
-                return
-
-            # Search for unseen emails
-            search_result = await imap_client.search("UNSEEN")
-            if search_result.result != "OK":
-                logger.debug(f"No new emails found for workflow {self.workflow_id}")
-                return
-
-            email_ids = search_result.lines[0].decode().split() if search_result.lines else []
-
-            if not email_ids:
-                logger.debug(f"No new emails found for workflow {self.workflow_id}")
-                return
-
-            logger.info(f"Found {len(email_ids)} new emails for workflow {self.workflow_id}")
-
-            # Process each email
-            for email_id in email_ids:
-                try:
-                    await self._process_email(imap_client, email_id)
-                except Exception as e:
-                    logger.error(f"Error processing email {email_id}: {e}", exc_info=True)
-
-        except Exception as e:
-            logger.error(
-                f"Error checking emails for workflow {self.workflow_id}: {e}",
-                exc_info=True,
-            )
-
-        finally:
-            if imap_client:
-                try:
-                    await imap_client.logout()
-                except Exception:
-                    pass
-
-    async def _process_email(self, imap_client: aioimaplib.IMAP4_SSL, email_id: str) -> None:
-        """Process a single email"""
+        Returns:
+            True if the email should be marked as read on the server
+        """
         try:
-            # Fetch email
-            fetch_result = await imap_client.fetch(email_id, "(RFC822)")
-            if fetch_result.result != "OK":
-                logger.error(f"Failed to fetch email {email_id}: {fetch_result}")
-                return
-
-            email_data = fetch_result.lines[1]
-            email_message = email.message_from_bytes(email_data)
-
             # Extract email information
             email_info = await self._extract_email_info(email_message)
 
             # Apply email filter
             if not self._matches_filter(email_info):
                 logger.debug(f"Email {email_id} does not match filter, skipping")
-                return
+                return False
 
             # Prepare trigger data
             trigger_data = {
@@ -243,21 +126,19 @@ class EmailTrigger(BaseTrigger):
                 logger.info(
                     f"Email trigger executed successfully for workflow {self.workflow_id}: {result.execution_id}"
                 )
+                return self.mark_as_read
 
-                # Mark as read if configured
-                if self.mark_as_read:
-                    await imap_client.store(email_id, "+FLAGS", "\\Seen")
-
-            else:
-                logger.warning(
-                    f"Email trigger execution had issues for workflow {self.workflow_id}: {result.message}"
-                )
+            logger.warning(
+                f"Email trigger execution had issues for workflow {self.workflow_id}: {result.message}"
+            )
+            return False
 
         except Exception as e:
             logger.error(
                 f"Error processing email {email_id} for workflow {self.workflow_id}: {e}",
                 exc_info=True,
             )
+            return False
 
     async def _extract_email_info(
         self, email_message: email.message.EmailMessage
@@ -379,8 +260,7 @@ class EmailTrigger(BaseTrigger):
             "folder": self.folder,
             "mark_as_read": self.mark_as_read,
             "check_interval": self.check_interval,
-            "monitoring_active": self._monitoring_task is not None
-            and not self._monitoring_task.done(),
+            "monitoring_active": get_imap_connection_manager().is_subscribed(self),
             "imap_server": self.imap_server,
             "email_user": self.email_user[:5] + "***"
             if self.email_user
@@ -10,12 +10,11 @@ import os
 import re
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from shared.models.execution_new import ExecutionStatus
 from shared.models.node_enums import IntegrationProvider, SlackEventType, TriggerSubtype
 from shared.models.trigger import TriggerStatus
 from shared.models.workflow import WorkflowExecutionResponse
+from workflow_scheduler.services.slack_channel_directory import get_slack_channel_directory
 from workflow_scheduler.triggers.base import BaseTrigger
 
 logger = logging.getLogger(__name__)
@@ -75,8 +74,8 @@ class SlackTrigger(BaseTrigger):
         )
         self.require_thread = trigger_config.get("require_thread", False)
 
-        # Note: Channel filtering now uses channel IDs resolved during deployment
-        # No need for channel name cache since we don't make API calls during triggers
+        # Note: Channel filtering uses channel IDs resolved during deployment;
+        # unresolved names go through the shared Slack channel directory
 
         logger.info(f"Initialized SlackTrigger for workflow {workflow_id}")
         logger.info(f"  Workspace: {self.workspace_id}")
@@ -267,7 +266,10 @@ class SlackTrigger(BaseTrigger):
 
     async def _get_channel_name(self, channel_id: str) -> Optional[str]:
         """
-        Get channel name from channel ID using Slack API with user's OAuth token
+        Get channel name from channel ID using the shared Slack channel directory
+
+        The workflow owner's OAuth token is only looked up when the workspace's
+        directory has not been loaded yet (or has expired).
 
         Args:
             channel_id: The Slack channel ID
@@ -278,46 +280,18 @@ class SlackTrigger(BaseTrigger):
         if not channel_id:
             return None
 
-        # Check cache first
-        if channel_id in self._channel_name_cache:
-            return self._channel_name_cache[channel_id]
-
         try:
-            # Get user's Slack OAuth token from database
+            directory = get_slack_channel_directory()
+            if self.workspace_id and directory.is_fresh(self.workspace_id):
+                return await directory.channel_name(self.workspace_id, None, channel_id)
+
             slack_token = await self._get_user_slack_token()
             if not slack_token:
                 logger.warning(
                     f"No Slack OAuth token available for workflow {self.workflow_id} owner - channel name lookup failed"
                 )
                 return None
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://slack.com/api/conversations.info",
-                    headers={"Authorization": f"Bearer {slack_token}"},
-                    params={"channel": channel_id},
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("ok"):
-                        channel_name = data.get("channel", {}).get("name")
-                        if channel_name:
-                            # Cache the result
-                            self._channel_name_cache[channel_id] = channel_name
-                            logger.debug(f"Resolved channel {channel_id} to name: {channel_name}")
-                            return channel_name
-                    else:
-                        error_msg = data.get("error", "unknown")
-                        if error_msg == "missing_scope":
-                            logger.warning(
-                                f"Slack OAuth token missing 'channels:read' scope for channel lookup - "
-                                f"channel {channel_id} filtering will use channel ID only"
-                            )
-                        else:
-                            logger.warning(f"Slack API error for channel {channel_id}: {error_msg}")
-                else:
-                    logger.warning(f"HTTP error getting channel info: {response.status_code}")
+            return await directory.channel_name(self.workspace_id, slack_token, channel_id)
 
         except Exception as e:
             logger.warning(f"Failed to get channel name for {channel_id}: {e}")
@@ -411,10 +385,11 @@ class SlackTrigger(BaseTrigger):
 
     async def _matches_channel_filter_async(self, channel_id: str) -> bool:
         """
-        Match channel filter using channel ID comparison (no API calls needed)
+        Match channel filter using channel ID comparison
 
-        Channel filters should be resolved to channel IDs during deployment time,
-        so we only need to do simple string comparison here.
+        Channel filters are resolved to channel IDs during deployment time, so
+        this is normally a simple string comparison. Names left unresolved fall
+        back to the shared channel directory.
 
         Args:
             channel_id: The Slack channel ID
@@ -428,13 +403,15 @@ class SlackTrigger(BaseTrigger):
         try:
             # The channel_filter should now always be a channel ID (resolved during deployment)
             # Support both single channel ID and comma-separated list of channel IDs
-            if "," in self.channel_filter:
-                # Multiple channel IDs
-                allowed_channels = [ch.strip() for ch in self.channel_filter.split(",")]
-                matches = channel_id in allowed_channels
-            else:
-                # Single channel ID
-                matches = channel_id == self.channel_filter
+            allowed_channels = [ch.strip() for ch in self.channel_filter.split(",")]
+            matches = channel_id in allowed_channels
+            if not matches and any(not ch.startswith("C") for ch in allowed_channels):
+                # A name that could not be resolved at deployment (e.g. the channel
+                # was created later); compare against the cached channel directory
+                channel_name = await self._get_channel_name(channel_id)
+                matches = channel_name is not None and (
+                    channel_name in allowed_channels or f"#{channel_name}" in allowed_channels
+                )
 
             if matches:
                 logger.debug(f"Channel {channel_id} matches filter '{self.channel_filter}'")
@@ -0,0 +1,52 @@
+-- Migration: Server-side statistics for persistent vector memory
+-- Description: PersistentVectorDatabaseMemory.get_statistics used to download every
+--              embeddings row for a memory node and count in Python. This function
+--              returns the same aggregates computed in the database.
+-- Created: 2026-10-18
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION get_embedding_statistics(
+    p_user_id UUID,
+    p_memory_node_id TEXT
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    result JSONB;
+BEGIN
+    WITH node_embeddings AS (
+        SELECT
+            COALESCE(metadata->>'namespace', 'default') AS namespace,
+            COALESCE(metadata->>'document_type', 'text') AS document_type,
+            created_at
+        FROM embeddings
+        WHERE user_id = p_user_id
+          AND memory_node_id = p_memory_node_id
+    )
+    SELECT jsonb_build_object(
+        'total_vectors', (SELECT COUNT(*) FROM node_embeddings),
+        'oldest_vector', (SELECT MIN(created_at) FROM node_embeddings),
+        'newest_vector', (SELECT MAX(created_at) FROM node_embeddings),
+        'by_namespace', COALESCE(
+            (SELECT jsonb_object_agg(namespace, n)
+             FROM (SELECT namespace, COUNT(*) AS n FROM node_embeddings GROUP BY namespace) ns),
+            '{}'::jsonb
+        ),
+        'by_document_type', COALESCE(
+            (SELECT jsonb_object_agg(document_type, n)
+             FROM (SELECT document_type, COUNT(*) AS n FROM node_embeddings GROUP BY document_type) dt),
+            '{}'::jsonb
+        )
+    ) INTO result;
+
+    RETURN result;
+END;
+$$;
+
+COMMENT ON FUNCTION get_embedding_statistics(UUID, TEXT) IS
+    'Aggregate counts and time range of a memory node''s embeddings for vector memory statistics';
+
+COMMIT;
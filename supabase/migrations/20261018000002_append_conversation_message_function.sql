@@ -0,0 +1,53 @@
+-- Migration: Atomic append for persistent conversation buffer memory
+-- Description: PersistentConversationBufferMemory.store used to download every
+--              message_order of a buffer to compute the next one, then re-scan it to
+--              enforce max_messages. This function assigns the order, inserts the
+--              message and trims the buffer in one call. Appends to the same buffer
+--              are serialised with a transaction-scoped advisory lock; MAX() is served
+--              by the unique_conversation_order index.
+-- Created: 2026-10-18
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION append_conversation_message(
+    p_user_id UUID,
+    p_memory_node_id TEXT,
+    p_role TEXT,
+    p_content TEXT,
+    p_metadata JSONB DEFAULT '{}'::jsonb,
+    p_max_messages INTEGER DEFAULT 0
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_order INTEGER;
+    v_created_at TIMESTAMPTZ;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtextextended(p_user_id::text || ':' || p_memory_node_id, 0));
+
+    SELECT COALESCE(MAX(message_order), -1) + 1
+    INTO v_order
+    FROM conversation_buffers
+    WHERE user_id = p_user_id
+      AND memory_node_id = p_memory_node_id;
+
+    INSERT INTO conversation_buffers (user_id, memory_node_id, message_order, role, content, metadata)
+    VALUES (p_user_id, p_memory_node_id, v_order, p_role, p_content, COALESCE(p_metadata, '{}'::jsonb))
+    RETURNING created_at INTO v_created_at;
+
+    IF p_max_messages > 0 THEN
+        DELETE FROM conversation_buffers
+        WHERE user_id = p_user_id
+          AND memory_node_id = p_memory_node_id
+          AND message_order <= v_order - p_max_messages;
+    END IF;
+
+    RETURN jsonb_build_object('message_order', v_order, 'created_at', v_created_at);
+END;
+$$;
+
+COMMENT ON FUNCTION append_conversation_message(UUID, TEXT, TEXT, TEXT, JSONB, INTEGER) IS
+    'Append a message to a conversation buffer with the next message_order and trim it to p_max_messages';
+
+COMMIT;
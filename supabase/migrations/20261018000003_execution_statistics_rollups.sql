@@ -0,0 +1,264 @@
+-- Migration: Execution statistics rollups and chunked retention
+-- Description: SupabaseExecutionRepositoryV2.get_execution_statistics used to pull up to
+--              thousands of workflow_executions rows into Python to count statuses, and
+--              delete_old_executions issued one unbounded DELETE. This migration adds:
+--              * workflow_execution_daily_stats: per workflow, per UTC day, per status
+--                counts and duration sums, kept up to date incrementally by statement-level
+--                triggers (transition tables) on workflow_executions;
+--              * get_execution_statistics(): totals, status distribution, average duration
+--                and a daily series read from the rollup;
+--              * delete_old_executions_batch(): deletes one bounded chunk of expired
+--                executions per call so retention can run in many short transactions.
+-- Created: 2026-10-18
+
+BEGIN;
+
+-- start_time is epoch milliseconds; used by the last-24h count and retention
+CREATE INDEX IF NOT EXISTS idx_workflow_executions_start_time ON workflow_executions(start_time);
+
+CREATE TABLE IF NOT EXISTS workflow_execution_daily_stats (
+    workflow_id UUID NOT NULL,
+    day DATE NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    execution_count BIGINT NOT NULL DEFAULT 0,
+    duration_count BIGINT NOT NULL DEFAULT 0,
+    total_duration_ms BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (workflow_id, day, status)
+);
+
+CREATE INDEX IF NOT EXISTS idx_workflow_execution_daily_stats_day
+    ON workflow_execution_daily_stats(day);
+
+-- Only the service role (and the SECURITY DEFINER trigger below) touch the rollup
+ALTER TABLE workflow_execution_daily_stats ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE workflow_execution_daily_stats IS
+    'Incrementally maintained execution counts and duration sums per workflow, UTC day and status';
+
+-- UTC day an execution is counted under (executions without workflow_id use the nil UUID)
+CREATE OR REPLACE FUNCTION workflow_execution_stats_day(p_start_time BIGINT, p_created_at TIMESTAMPTZ)
+RETURNS DATE
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT (COALESCE(to_timestamp(p_start_time / 1000.0), p_created_at, to_timestamp(0))
+            AT TIME ZONE 'UTC')::date
+$$;
+
+CREATE OR REPLACE FUNCTION workflow_execution_stats_refresh()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO workflow_execution_daily_stats AS s
+            (workflow_id, day, status, execution_count, duration_count, total_duration_ms)
+        SELECT
+            COALESCE(workflow_id, '00000000-0000-0000-0000-000000000000'::uuid),
+            workflow_execution_stats_day(start_time, created_at),
+            status,
+            COUNT(*),
+            COUNT(end_time - start_time),
+            COALESCE(SUM(end_time - start_time), 0)
+        FROM new_rows
+        GROUP BY 1, 2, 3
+        ON CONFLICT (workflow_id, day, status) DO UPDATE SET
+            execution_count = s.execution_count + EXCLUDED.execution_count,
+            duration_count = s.duration_count + EXCLUDED.duration_count,
+            total_duration_ms = s.total_duration_ms + EXCLUDED.total_duration_ms;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO workflow_execution_daily_stats AS s
+            (workflow_id, day, status, execution_count, duration_count, total_duration_ms)
+        SELECT
+            COALESCE(workflow_id, '00000000-0000-0000-0000-000000000000'::uuid),
+            workflow_execution_stats_day(start_time, created_at),
+            status,
+            -COUNT(*),
+            -COUNT(end_time - start_time),
+            -COALESCE(SUM(end_time - start_time), 0)
+        FROM old_rows
+        GROUP BY 1, 2, 3
+        ON CONFLICT (workflow_id, day, status) DO UPDATE SET
+            execution_count = s.execution_count + EXCLUDED.execution_count,
+            duration_count = s.duration_count + EXCLUDED.duration_count,
+            total_duration_ms = s.total_duration_ms + EXCLUDED.total_duration_ms;
+
+    ELSE
+        -- Executions are re-saved many times while running; only net changes are written
+        INSERT INTO workflow_execution_daily_stats AS s
+            (workflow_id, day, status, execution_count, duration_count, total_duration_ms)
+        SELECT workflow_id, day, status, SUM(n), SUM(dn), SUM(d)
+        FROM (
+            SELECT
+                COALESCE(workflow_id, '00000000-0000-0000-0000-000000000000'::uuid) AS workflow_id,
+                workflow_execution_stats_day(start_time, created_at) AS day,
+                status,
+                -1 AS n,
+                -(end_time - start_time IS NOT NULL)::int AS dn,
+                -COALESCE(end_time - start_time, 0) AS d
+            FROM old_rows
+            UNION ALL
+            SELECT
+                COALESCE(workflow_id, '00000000-0000-0000-0000-000000000000'::uuid),
+                workflow_execution_stats_day(start_time, created_at),
+                status,
+                1,
+                (end_time - start_time IS NOT NULL)::int,
+                COALESCE(end_time - start_time, 0)
+            FROM new_rows
+        ) delta
+        GROUP BY workflow_id, day, status
+        HAVING SUM(n) <> 0 OR SUM(dn) <> 0 OR SUM(d) <> 0
+        ON CONFLICT (workflow_id, day, status) DO UPDATE SET
+            execution_count = s.execution_count + EXCLUDED.execution_count,
+            duration_count = s.duration_count + EXCLUDED.duration_count,
+            total_duration_ms = s.total_duration_ms + EXCLUDED.total_duration_ms;
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS workflow_execution_stats_insert ON workflow_executions;
+DROP TRIGGER IF EXISTS workflow_execution_stats_update ON workflow_executions;
+DROP TRIGGER IF EXISTS workflow_execution_stats_delete ON workflow_executions;
+
+CREATE TRIGGER workflow_execution_stats_insert
+    AFTER INSERT ON workflow_executions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION workflow_execution_stats_refresh();
+
+CREATE TRIGGER workflow_execution_stats_update
+    AFTER UPDATE ON workflow_executions
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION workflow_execution_stats_refresh();
+
+CREATE TRIGGER workflow_execution_stats_delete
+    AFTER DELETE ON workflow_executions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION workflow_execution_stats_refresh();
+
+-- Backfill from existing executions (writers wait until the migration commits)
+LOCK TABLE workflow_executions IN SHARE MODE;
+TRUNCATE workflow_execution_daily_stats;
+INSERT INTO workflow_execution_daily_stats
+    (workflow_id, day, status, execution_count, duration_count, total_duration_ms)
+SELECT
+    COALESCE(workflow_id, '00000000-0000-0000-0000-000000000000'::uuid),
+    workflow_execution_stats_day(start_time, created_at),
+    status,
+    COUNT(*),
+    COUNT(end_time - start_time),
+    COALESCE(SUM(end_time - start_time), 0)
+FROM workflow_executions
+GROUP BY 1, 2, 3;
+
+CREATE OR REPLACE FUNCTION get_execution_statistics(
+    p_workflow_id UUID DEFAULT NULL,
+    p_days INTEGER DEFAULT 30
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_last_24h_ms BIGINT := (EXTRACT(EPOCH FROM now() - INTERVAL '24 hours') * 1000)::BIGINT;
+    v_first_day DATE := (now() AT TIME ZONE 'UTC')::date - GREATEST(p_days - 1, 0);
+    result JSONB;
+BEGIN
+    WITH scoped AS (
+        SELECT *
+        FROM workflow_execution_daily_stats
+        WHERE p_workflow_id IS NULL OR workflow_id = p_workflow_id
+    ),
+    by_status AS (
+        SELECT status, SUM(execution_count) AS n
+        FROM scoped
+        GROUP BY status
+        HAVING SUM(execution_count) > 0
+    ),
+    by_day AS (
+        SELECT
+            day,
+            SUM(execution_count) AS n,
+            SUM(execution_count) FILTER (WHERE status = 'ERROR') AS errors,
+            SUM(total_duration_ms)::float8 / NULLIF(SUM(duration_count), 0) AS avg_duration
+        FROM scoped
+        WHERE day >= v_first_day
+        GROUP BY day
+        HAVING SUM(execution_count) > 0
+    )
+    SELECT jsonb_build_object(
+        'total_executions', COALESCE((SELECT SUM(execution_count) FROM scoped), 0),
+        'status_distribution', COALESCE((SELECT jsonb_object_agg(status, n) FROM by_status), '{}'::jsonb),
+        'average_duration_ms',
+            (SELECT SUM(total_duration_ms)::float8 / NULLIF(SUM(duration_count), 0) FROM scoped),
+        'executions_last_24h', (
+            SELECT COUNT(*)
+            FROM workflow_executions
+            WHERE start_time >= v_last_24h_ms
+              AND (p_workflow_id IS NULL OR workflow_id = p_workflow_id)
+        ),
+        'daily', COALESCE(
+            (SELECT jsonb_agg(
+                        jsonb_build_object(
+                            'day', day,
+                            'executions', n,
+                            'errors', COALESCE(errors, 0),
+                            'average_duration_ms', avg_duration
+                        ) ORDER BY day)
+             FROM by_day),
+            '[]'::jsonb
+        )
+    ) INTO result;
+
+    RETURN result;
+END;
+$$;
+
+COMMENT ON FUNCTION get_execution_statistics(UUID, INTEGER) IS
+    'Execution totals, status distribution, average duration and a p_days daily series from workflow_execution_daily_stats';
+
+CREATE OR REPLACE FUNCTION delete_old_executions_batch(
+    p_cutoff_ms BIGINT,
+    p_batch_size INTEGER DEFAULT 5000
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_deleted INTEGER;
+BEGIN
+    WITH expired AS (
+        SELECT id
+        FROM workflow_executions
+        WHERE start_time < p_cutoff_ms
+        ORDER BY start_time
+        LIMIT p_batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    DELETE FROM workflow_executions we
+    USING expired
+    WHERE we.id = expired.id;
+
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+
+    -- Drop rollup rows emptied by this and earlier chunks
+    DELETE FROM workflow_execution_daily_stats
+    WHERE execution_count = 0
+      AND day <= workflow_execution_stats_day(p_cutoff_ms, NULL);
+
+    RETURN jsonb_build_object(
+        'deleted', v_deleted,
+        'has_more', EXISTS (SELECT 1 FROM workflow_executions WHERE start_time < p_cutoff_ms)
+    );
+END;
+$$;
+
+COMMENT ON FUNCTION delete_old_executions_batch(BIGINT, INTEGER) IS
+    'Delete up to p_batch_size executions that started before p_cutoff_ms; call repeatedly until has_more is false';
+
+COMMIT;
@@ -0,0 +1,41 @@
+-- Migration: Workflow definition version
+-- Description: The workflow engine caches parsed workflow definitions and revalidates them
+--              with a query that skips workflow_data. updated_at is not a reliable stamp:
+--              several writers change workflow_data without touching it, and per-run
+--              columns (latest_execution_*) are updated on every execution. This migration
+--              adds definition_version, bumped by a trigger whenever a column the engine
+--              reads into a Workflow changes.
+-- Created: 2026-10-18
+
+BEGIN;
+
+ALTER TABLE workflows ADD COLUMN IF NOT EXISTS definition_version BIGINT NOT NULL DEFAULT 1;
+
+COMMENT ON COLUMN workflows.definition_version IS
+    'Incremented on every change to workflow_data, name, description, version, deployment_status, user_id or active';
+
+CREATE OR REPLACE FUNCTION bump_workflow_definition_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.workflow_data IS DISTINCT FROM OLD.workflow_data
+       OR NEW.name IS DISTINCT FROM OLD.name
+       OR NEW.description IS DISTINCT FROM OLD.description
+       OR NEW.version IS DISTINCT FROM OLD.version
+       OR NEW.deployment_status IS DISTINCT FROM OLD.deployment_status
+       OR NEW.user_id IS DISTINCT FROM OLD.user_id
+       OR NEW.active IS DISTINCT FROM OLD.active THEN
+        NEW.definition_version := OLD.definition_version + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS workflows_definition_version ON workflows;
+
+CREATE TRIGGER workflows_definition_version
+    BEFORE UPDATE ON workflows
+    FOR EACH ROW EXECUTE FUNCTION bump_workflow_definition_version();
+
+COMMIT;